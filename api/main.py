@@ -160,8 +160,10 @@ async def get_config_options():
         ],
         "save_options": [
             {"value": "json", "label": "JSON File"},
+            {"value": "jsonl", "label": "JSON Lines File"},
             {"value": "csv", "label": "CSV File"},
             {"value": "excel", "label": "Excel File"},
+            {"value": "parquet", "label": "Parquet File"},
             {"value": "sqlite", "label": "SQLite Database"},
             {"value": "db", "label": "MySQL Database"},
             {"value": "mongodb", "label": "MongoDB Database"},
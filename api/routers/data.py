@@ -21,32 +21,51 @@ import json
 from pathlib import Path
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.background import BackgroundTask
+
+from tools import utils
+from tools.file_metadata_index import get_file_metadata_index
+from tools.task_cancel import TaskCancelled, check_cancelled
+
+from ..services import (
+    DataTaskTimeout,
+    TableQueryError,
+    build_table_query,
+    cached_record_count,
+    list_tables,
+    open_table_page,
+    preview_file,
+    resolve_db_type,
+    run_blocking,
+    stream_table_page,
+)
 
 router = APIRouter(prefix="/data", tags=["data"])
 
 # Data directory
 DATA_DIR = Path(__file__).parent.parent.parent / "data"
 
+SUPPORTED_EXTENSIONS = {".json", ".jsonl", ".csv", ".xlsx", ".xls"}
 
-def get_file_info(file_path: Path) -> dict:
-    """Get file information"""
-    stat = file_path.stat()
-    record_count = None
 
-    # Try to get record count
+async def run_data_task(func, *args, request: Optional[Request] = None):
+    """Run blocking file work in the data worker pool, off the event loop"""
     try:
-        if file_path.suffix == ".json":
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                if isinstance(data, list):
-                    record_count = len(data)
-        elif file_path.suffix == ".csv":
-            with open(file_path, "r", encoding="utf-8") as f:
-                record_count = sum(1 for _ in f) - 1  # Subtract header row
-    except Exception:
-        pass
+        return await run_blocking(func, *args, request=request)
+    except DataTaskTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except TaskCancelled:
+        # The client is gone, nobody reads this response
+        raise HTTPException(status_code=499, detail="Client closed request")
+
+
+def get_file_info(file_path: Path) -> dict:
+    """Get file information, the record count comes from the metadata index while the file is unchanged"""
+    stat = file_path.stat()
+    record_count = cached_record_count(file_path, get_file_metadata_index(str(DATA_DIR)))
 
     return {
         "name": file_path.name,
@@ -58,20 +77,18 @@ def get_file_info(file_path: Path) -> dict:
     }
 
 
-@router.get("/files")
-async def list_data_files(platform: Optional[str] = None, file_type: Optional[str] = None):
-    """Get data file list"""
-    if not DATA_DIR.exists():
-        return {"files": []}
-
+def scan_data_files(platform: Optional[str] = None, file_type: Optional[str] = None) -> list:
+    """Walk the data directory for the output files, newest first"""
     files = []
-    supported_extensions = {".json", ".csv", ".xlsx", ".xls"}
 
     for root, dirs, filenames in os.walk(DATA_DIR):
+        check_cancelled()
+        # Hidden directories hold crawler state (.seen, .checkpoint, .watermark), not output
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
         root_path = Path(root)
         for filename in filenames:
             file_path = root_path / filename
-            if file_path.suffix.lower() not in supported_extensions:
+            if file_path.suffix.lower() not in SUPPORTED_EXTENSIONS:
                 continue
 
             # Platform filter
@@ -86,18 +103,35 @@ async def list_data_files(platform: Optional[str] = None, file_type: Optional[st
 
             try:
                 files.append(get_file_info(file_path))
+            except TaskCancelled:
+                raise
             except Exception:
                 continue
 
     # Sort by modification time (newest first)
     files.sort(key=lambda x: x["modified_at"], reverse=True)
+    return files
+
+
+@router.get("/files")
+async def list_data_files(request: Request = None, platform: Optional[str] = None, file_type: Optional[str] = None):
+    """Get data file list"""
+    if not DATA_DIR.exists():
+        return {"files": []}
 
-    return {"files": files}
+    return {"files": await run_data_task(scan_data_files, platform, file_type, request=request)}
 
 
 @router.get("/files/{file_path:path}")
-async def get_file_content(file_path: str, preview: bool = True, limit: int = 100):
-    """Get file content or preview"""
+async def get_file_content(
+    file_path: str,
+    request: Request = None,
+    preview: bool = True,
+    limit: int = 100,
+    offset: int = 0,
+    page: Optional[int] = None,
+):
+    """Get file content or preview, page (1-based, limit records per page) takes precedence over offset"""
     full_path = DATA_DIR / file_path
 
     if not full_path.exists():
@@ -113,45 +147,24 @@ async def get_file_content(file_path: str, preview: bool = True, limit: int = 10
         raise HTTPException(status_code=403, detail="Access denied")
 
     if preview:
-        # Return preview data
+        if page is not None:
+            if page < 1:
+                raise HTTPException(status_code=400, detail="page must be at least 1")
+            offset = (page - 1) * limit
+        if offset < 0 or limit < 1:
+            raise HTTPException(status_code=400, detail="Invalid offset or limit")
+
+        # Return preview data, only the requested records are parsed and the total comes from the metadata index
         try:
-            if full_path.suffix == ".json":
-                with open(full_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    if isinstance(data, list):
-                        return {"data": data[:limit], "total": len(data)}
-                    return {"data": data, "total": 1}
-            elif full_path.suffix == ".csv":
-                import csv
-                with open(full_path, "r", encoding="utf-8") as f:
-                    reader = csv.DictReader(f)
-                    rows = []
-                    for i, row in enumerate(reader):
-                        if i >= limit:
-                            break
-                        rows.append(row)
-                    # Re-read to get total count
-                    f.seek(0)
-                    total = sum(1 for _ in f) - 1
-                    return {"data": rows, "total": total}
-            elif full_path.suffix.lower() in (".xlsx", ".xls"):
-                import pandas as pd
-                # Read first limit rows
-                df = pd.read_excel(full_path, nrows=limit)
-                # Get total row count (only read first column to save memory)
-                df_count = pd.read_excel(full_path, usecols=[0])
-                total = len(df_count)
-                # Convert to list of dictionaries, handle NaN values
-                rows = df.where(pd.notnull(df), None).to_dict(orient='records')
-                return {
-                    "data": rows,
-                    "total": total,
-                    "columns": list(df.columns)
-                }
-            else:
-                raise HTTPException(status_code=400, detail="Unsupported file type for preview")
+            return await run_data_task(
+                preview_file, full_path, limit, get_file_metadata_index(str(DATA_DIR)), offset, request=request
+            )
+        except HTTPException:
+            raise
         except json.JSONDecodeError:
             raise HTTPException(status_code=400, detail="Invalid JSON file")
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Unsupported file type for preview")
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
     else:
@@ -187,12 +200,65 @@ async def download_file(file_path: str):
     )
 
 
-@router.get("/stats")
-async def get_data_stats():
-    """Get data statistics"""
-    if not DATA_DIR.exists():
-        return {"total_files": 0, "total_size": 0, "by_platform": {}, "by_type": {}}
+@router.get("/tables")
+async def list_data_tables():
+    """Get the crawler tables with their columns and filterable columns"""
+    return {"tables": list_tables()}
+
+
+# Query parameters of /tables/{table} that are not column filters
+TABLE_QUERY_PARAMS = {"columns", "cursor", "limit", "order", "time_from", "time_to", "db_type"}
+
+
+@router.get("/tables/{table}")
+async def get_table_rows(
+    table: str,
+    request: Request,
+    columns: Optional[str] = None,
+    cursor: Optional[int] = None,
+    limit: int = 100,
+    order: str = "asc",
+    time_from: Optional[str] = None,
+    time_to: Optional[str] = None,
+    db_type: Optional[str] = None,
+):
+    """
+    Get a page of a table, streamed as {"columns", "data", "next_cursor"}
+    Other query parameters filter on columns (e.g. source_keyword=...&user_id=...),
+    pass next_cursor back as cursor to get the next page
+    """
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be asc or desc")
+    filters = {name: value for name, value in request.query_params.items() if name not in TABLE_QUERY_PARAMS}
+    try:
+        db_type = resolve_db_type(db_type)
+        stmt, selected = build_table_query(
+            table,
+            columns=[name.strip() for name in columns.split(",") if name.strip()] if columns else None,
+            filters=filters,
+            time_from=time_from,
+            time_to=time_to,
+            cursor=cursor,
+            limit=limit,
+            descending=order == "desc",
+        )
+    except TableQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        conn, result = await open_table_page(db_type, stmt)
+    except (SQLAlchemyError, OSError) as e:
+        utils.logger.error(f"[get_table_rows] Query of {table} failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to query table {table}: {e}")
+    return StreamingResponse(
+        stream_table_page(conn, result, selected, limit),
+        media_type="application/json",
+        # Closes the connection if the response is dropped before the stream starts
+        background=BackgroundTask(conn.close),
+    )
+
 
+def collect_data_stats() -> dict:
+    """Count the output files and their size by platform and type"""
     stats = {
         "total_files": 0,
         "total_size": 0,
@@ -200,13 +266,13 @@ async def get_data_stats():
         "by_type": {}
     }
 
-    supported_extensions = {".json", ".csv", ".xlsx", ".xls"}
-
     for root, dirs, filenames in os.walk(DATA_DIR):
+        check_cancelled()
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
         root_path = Path(root)
         for filename in filenames:
             file_path = root_path / filename
-            if file_path.suffix.lower() not in supported_extensions:
+            if file_path.suffix.lower() not in SUPPORTED_EXTENSIONS:
                 continue
 
             try:
@@ -228,3 +294,12 @@ async def get_data_stats():
                 continue
 
     return stats
+
+
+@router.get("/stats")
+async def get_data_stats(request: Request = None):
+    """Get data statistics"""
+    if not DATA_DIR.exists():
+        return {"total_files": 0, "total_size": 0, "by_platform": {}, "by_type": {}}
+
+    return await run_data_task(collect_data_stats, request=request)
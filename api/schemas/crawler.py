@@ -51,9 +51,11 @@ class SaveDataOptionEnum(str, Enum):
     CSV = "csv"
     DB = "db"
     JSON = "json"
+    JSONL = "jsonl"
     SQLITE = "sqlite"
     MONGODB = "mongodb"
     EXCEL = "excel"
+    PARQUET = "parquet"
 
 
 class CrawlerStartRequest(BaseModel):
@@ -70,6 +72,7 @@ class CrawlerStartRequest(BaseModel):
     save_option: SaveDataOptionEnum = SaveDataOptionEnum.JSON
     cookies: str = ""
     headless: bool = False
+    resume: bool = False  # Continue from the checkpoint of an interrupted run
 
 
 class CrawlerStatusResponse(BaseModel):
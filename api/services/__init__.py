@@ -17,5 +17,17 @@
 # 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
 
 from .crawler_manager import CrawlerManager, crawler_manager
+from .data_reader import cached_record_count, count_records, preview_file
+from .worker_pool import DataTaskTimeout, get_data_executor, run_blocking
+from .table_reader import (
+    TableQueryError,
+    build_table_query,
+    list_tables,
+    open_table_page,
+    resolve_db_type,
+    stream_table_page,
+)
 
-__all__ = ["CrawlerManager", "crawler_manager"]
+__all__ = ["CrawlerManager", "crawler_manager", "cached_record_count", "count_records", "preview_file",
+           "TableQueryError", "build_table_query", "list_tables", "open_table_page", "resolve_db_type", "stream_table_page",
+           "DataTaskTimeout", "get_data_executor", "run_blocking"]
@@ -229,6 +229,9 @@ class CrawlerManager:
 
         cmd.extend(["--headless", "true" if config.headless else "false"])
 
+        if config.resume:
+            cmd.append("--resume")
+
         return cmd
 
     async def _read_output(self):
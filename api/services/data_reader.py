@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/api/services/data_reader.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Data Reader
+Streaming readers behind the WebUI data preview. Only the previewed records are parsed and
+record totals come from the file metadata index, so memory stays flat whatever the file size.
+JSONL and CSV pages seek through the row offset index, other formats skip to the requested offset
+"""
+
+import csv
+import io
+import json
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+from tools.file_metadata_index import FileMetadataIndex, file_signature
+from tools.row_offset_index import RowOffsetIndex, get_row_offset_index
+from tools.task_cancel import TaskCancelled, cancellable, check_cancelled
+
+JSON_CHUNK_SIZE = 64 * 1024
+_JSON_WHITESPACE = " \t\n\r"
+_JSON_DELIMITERS = _JSON_WHITESPACE + ",]"
+
+
+def iter_json_array(f: TextIO, chunk_size: int = JSON_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Yield the items of a top-level JSON array one by one, reading the file in chunks
+    Only the item being decoded is held in memory
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    started = False
+
+    while True:
+        # Skip whitespace and separators, reading more when the buffer runs out
+        while pos < len(buffer) and (buffer[pos] in _JSON_WHITESPACE or (started and buffer[pos] == ",")):
+            pos += 1
+        if pos >= len(buffer):
+            if eof:
+                raise json.JSONDecodeError("Unterminated JSON array", buffer, pos)
+            check_cancelled()
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+
+        if not started:
+            if buffer[pos] != "[":
+                raise ValueError("Not a JSON array")
+            started = True
+            pos += 1
+            continue
+        if buffer[pos] == "]":
+            return
+
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            end = None
+        # A number cut by the chunk boundary decodes as a shorter one, only trust an item once its delimiter is read
+        if end is not None and not eof and (end == len(buffer) or buffer[end] not in _JSON_DELIMITERS):
+            end = None
+        if end is None:
+            check_cancelled()
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        yield item
+        pos = end
+
+
+def is_json_array(file_path: Path) -> bool:
+    """Whether the first non-whitespace character of the file opens an array"""
+    with open(file_path, "r", encoding="utf-8") as f:
+        while True:
+            chunk = f.read(1024)
+            if not chunk:
+                return False
+            stripped = chunk.lstrip(_JSON_WHITESPACE)
+            if stripped:
+                return stripped[0] == "["
+
+
+def iter_records(file_path: Path) -> Iterator[Any]:
+    """Yield the records of a JSON array, JSON Lines or CSV file"""
+    suffix = file_path.suffix.lower()
+    if suffix == ".json":
+        with open(file_path, "r", encoding="utf-8") as f:
+            yield from iter_json_array(f)
+    elif suffix == ".jsonl":
+        with open(file_path, "r", encoding="utf-8") as f:
+            for line in cancellable(f):
+                if line.strip():
+                    yield json.loads(line)
+    elif suffix == ".csv":
+        with open(file_path, "r", encoding="utf-8-sig", newline="") as f:
+            yield from cancellable(csv.DictReader(f))
+    else:
+        raise ValueError(f"Unsupported file type: {suffix}")
+
+
+def count_records(file_path: Path) -> Optional[int]:
+    """Count the records of a data file in one streaming pass, None when not countable"""
+    suffix = file_path.suffix.lower()
+    try:
+        if suffix == ".json":
+            if not is_json_array(file_path):
+                return None
+            with open(file_path, "r", encoding="utf-8") as f:
+                return sum(1 for _ in iter_json_array(f))
+        if suffix == ".jsonl":
+            with open(file_path, "r", encoding="utf-8") as f:
+                return sum(1 for line in cancellable(f) if line.strip())
+        if suffix == ".csv":
+            # Rows rather than lines, quoted fields may span several lines
+            with open(file_path, "r", encoding="utf-8-sig", newline="") as f:
+                return max(sum(1 for _ in cancellable(csv.reader(f))) - 1, 0)
+        if suffix == ".xlsx":
+            return count_excel_rows(file_path)
+    except TaskCancelled:
+        raise
+    except Exception:
+        pass
+    return None
+
+
+def count_excel_rows(file_path: Path) -> int:
+    """Data rows of the active sheet, from the sheet dimension when the file records it"""
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.active
+        total_rows = sheet.max_row
+        if total_rows is None:
+            total_rows = sum(1 for _ in cancellable(sheet.iter_rows(values_only=True)))
+        return max(total_rows - 1, 0)
+    finally:
+        workbook.close()
+
+
+def cached_record_count(file_path: Path, index: FileMetadataIndex) -> Optional[int]:
+    """Record count from the metadata index, counted once per version of the file"""
+    signature = file_signature(file_path)
+    record_count = index.get_record_count(file_path, signature)
+    if record_count is None:
+        record_count = count_records(file_path)
+        if record_count is not None:
+            index.set_record_count(file_path, record_count, signature)
+    return record_count
+
+
+def preview_file(file_path: Path, limit: int, index: FileMetadataIndex, offset: int = 0) -> Dict[str, Any]:
+    """
+    limit records of a data file from offset and its total record count
+    Only the previewed records are parsed, the total comes from the metadata index
+    """
+    suffix = file_path.suffix.lower()
+    if suffix == ".json" and not is_json_array(file_path):
+        # A single object, as the legacy preview returned it
+        with open(file_path, "r", encoding="utf-8") as f:
+            return {"data": json.load(f), "total": 1}
+    if suffix in (".jsonl", ".csv"):
+        return preview_indexed(file_path, limit, index, offset)
+    if suffix == ".json":
+        records = list(islice(iter_records(file_path), offset, offset + limit))
+        return {"data": records, "total": cached_record_count(file_path, index)}
+    if suffix == ".xlsx":
+        return preview_excel(file_path, limit, index, offset)
+    if suffix == ".xls":
+        return preview_legacy_excel(file_path, limit, offset)
+    raise ValueError(f"Unsupported file type: {suffix}")
+
+
+def preview_indexed(file_path: Path, limit: int, index: FileMetadataIndex, offset: int = 0) -> Dict[str, Any]:
+    """Seek to the page through the row offset index of a JSONL or CSV file"""
+    row_index = get_row_offset_index(file_path).refresh()
+    records = read_indexed_records(row_index, offset, limit)
+
+    signature = file_signature(file_path)
+    total = index.get_record_count(file_path, signature)
+    if total is None:
+        # The row index walked the whole file, its count saves the metadata index a pass
+        total = row_index.record_count
+        if row_index.indexed_size == signature[0]:
+            index.set_record_count(file_path, total, signature)
+    return {"data": records, "total": total}
+
+
+def read_indexed_records(row_index: RowOffsetIndex, offset: int, limit: int) -> List[Any]:
+    """Read up to limit records from offset, skipping fewer than a stride of records"""
+    limit = min(limit, row_index.record_count - offset)
+    if limit <= 0:
+        return []
+    start, skip = row_index.locate(offset)
+    with open(row_index.file_path, "rb") as raw:
+        if row_index.is_csv:
+            with open(row_index.file_path, "r", encoding="utf-8-sig", newline="") as f:
+                header = next(csv.reader(f), [])
+            raw.seek(start)
+            records = csv.DictReader(io.TextIOWrapper(raw, encoding="utf-8", newline=""), fieldnames=header)
+            return list(islice(records, skip, skip + limit))
+        raw.seek(start)
+        lines = (line for line in io.TextIOWrapper(raw, encoding="utf-8") if line.strip())
+        return [json.loads(line) for line in islice(lines, skip, skip + limit)]
+
+
+def preview_excel(file_path: Path, limit: int, index: FileMetadataIndex, offset: int = 0) -> Dict[str, Any]:
+    """Stream the first rows of the active sheet with openpyxl in read-only mode"""
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = cancellable(workbook.active.iter_rows(values_only=True))
+        header = next(rows, None)
+        columns: List[str] = [str(cell) if cell is not None else f"Unnamed: {i}" for i, cell in enumerate(header or ())]
+        data = [dict(zip(columns, row)) for row in islice(rows, offset, offset + limit)]
+    finally:
+        workbook.close()
+    return {"data": data, "total": cached_record_count(file_path, index), "columns": columns}
+
+
+def preview_legacy_excel(file_path: Path, limit: int, offset: int = 0) -> Dict[str, Any]:
+    """The .xls format is not supported by openpyxl, read the preview rows with pandas"""
+    import pandas as pd
+
+    df = pd.read_excel(file_path, skiprows=range(1, offset + 1), nrows=limit)
+    rows = df.where(pd.notnull(df), None).to_dict(orient="records")
+    return {"data": rows, "total": None, "columns": list(df.columns)}
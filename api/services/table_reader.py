@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/api/services/table_reader.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Table Reader
+Pages of the crawler tables (db or sqlite save option) for the WebUI. Pages are keyset paginated on
+the primary key, so a deep page costs the same as the first one, and rows are streamed to the
+client as they are fetched
+"""
+
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy import Column, Table, or_, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncResult
+from sqlalchemy.sql import Select
+
+import config
+from database.db_session import get_async_engine
+from database.models import Base
+from store.run_dedup import SOURCE_KEYWORD_SEPARATOR
+
+TABLE_PAGE_DEFAULT_LIMIT = 100
+TABLE_PAGE_MAX_LIMIT = 5000
+TABLE_DB_TYPES = ("db", "mysql", "sqlite")
+# Filterable even when not indexed, they are what the WebUI narrows crawl results by
+TABLE_FILTER_COLUMNS = ("source_keyword", "user_id")
+# Time column of a table for time_from / time_to, the first one the table has
+TABLE_TIME_COLUMNS = ("create_time", "time", "publish_time", "create_date_time", "add_ts")
+
+
+class TableQueryError(ValueError):
+    """A table page request naming an unknown table or column"""
+
+
+def get_table(table_name: str) -> Table:
+    table = Base.metadata.tables.get(table_name)
+    if table is None:
+        raise TableQueryError(f"Unknown table: {table_name}")
+    return table
+
+
+def filter_columns(table: Table) -> List[str]:
+    """Columns a page can be filtered on: indexed columns and TABLE_FILTER_COLUMNS"""
+    return [
+        column.name for column in table.columns
+        if column.index or column.unique or column.primary_key or column.name in TABLE_FILTER_COLUMNS
+    ]
+
+
+def time_column(table: Table) -> Optional[Column]:
+    for name in TABLE_TIME_COLUMNS:
+        if name in table.columns:
+            return table.columns[name]
+    return None
+
+
+def list_tables() -> List[Dict[str, Any]]:
+    """Tables of database/models.py with their columns, for the WebUI to build its queries"""
+    tables = []
+    for table in Base.metadata.sorted_tables:
+        time_col = time_column(table)
+        tables.append({
+            "name": table.name,
+            "columns": [column.name for column in table.columns],
+            "filter_columns": filter_columns(table),
+            "time_column": time_col.name if time_col is not None else None,
+        })
+    return tables
+
+
+def _coerce(column: Column, value: str) -> Any:
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is int:
+        try:
+            return int(value)
+        except ValueError:
+            raise TableQueryError(f"Column {column.name} expects an integer, got {value!r}")
+    return value
+
+
+def build_table_query(
+    table_name: str,
+    columns: Optional[List[str]] = None,
+    filters: Optional[Dict[str, str]] = None,
+    time_from: Optional[str] = None,
+    time_to: Optional[str] = None,
+    cursor: Optional[int] = None,
+    limit: int = TABLE_PAGE_DEFAULT_LIMIT,
+    descending: bool = False,
+) -> Tuple[Select, List[str]]:
+    """
+    Build the select of one page of a table
+    Args:
+        table_name: Table name from database/models.py
+        columns: Columns to return, all when empty
+        filters: column -> value equality filters, on the columns of filter_columns
+        time_from: Lower bound (inclusive) of the time column, in the column's own format
+        time_to: Upper bound (exclusive) of the time column
+        cursor: next_cursor of the previous page, the id the page starts after
+        limit: Page size, at most TABLE_PAGE_MAX_LIMIT
+        descending: Newest rows first
+
+    Returns:
+        (select statement, returned column names), the statement always selects id first
+    """
+    table = get_table(table_name)
+    columns = columns or [column.name for column in table.columns]
+    unknown = [name for name in columns if name not in table.columns]
+    if unknown:
+        raise TableQueryError(f"Unknown columns of {table_name}: {', '.join(unknown)}")
+    if not 1 <= limit <= TABLE_PAGE_MAX_LIMIT:
+        raise TableQueryError(f"limit must be between 1 and {TABLE_PAGE_MAX_LIMIT}")
+
+    key = table.columns["id"]
+    stmt = select(key, *[table.columns[name] for name in columns])
+
+    allowed = filter_columns(table)
+    for name, value in (filters or {}).items():
+        if name not in allowed:
+            raise TableQueryError(f"Column {name} of {table_name} is not filterable, use one of: {', '.join(allowed)}")
+        column = table.columns[name]
+        if name == "source_keyword":
+            # A note found under several keywords stores them comma joined
+            sep = SOURCE_KEYWORD_SEPARATOR
+            stmt = stmt.where(or_(
+                column == value,
+                column.startswith(value + sep, autoescape=True),
+                column.endswith(sep + value, autoescape=True),
+                column.contains(sep + value + sep, autoescape=True),
+            ))
+        else:
+            stmt = stmt.where(column == _coerce(column, value))
+
+    if time_from is not None or time_to is not None:
+        time_col = time_column(table)
+        if time_col is None:
+            raise TableQueryError(f"Table {table_name} has no time column")
+        if time_from is not None:
+            stmt = stmt.where(time_col >= _coerce(time_col, time_from))
+        if time_to is not None:
+            stmt = stmt.where(time_col < _coerce(time_col, time_to))
+
+    if cursor is not None:
+        stmt = stmt.where(key < cursor if descending else key > cursor)
+    stmt = stmt.order_by(key.desc() if descending else key).limit(limit)
+    return stmt, columns
+
+
+def resolve_db_type(db_type: Optional[str] = None) -> str:
+    """The requested database, SAVE_DATA_OPTION by default"""
+    db_type = db_type or config.SAVE_DATA_OPTION
+    if db_type not in TABLE_DB_TYPES:
+        raise TableQueryError(f"Tables are only stored with the {', '.join(TABLE_DB_TYPES)} save options, got {db_type}")
+    return db_type
+
+
+async def open_table_page(db_type: str, stmt: Select) -> Tuple[AsyncConnection, AsyncResult]:
+    """
+    Connect and start the query of a page, before any of the response is sent, so that a database
+    error still gets its status code
+    Returns:
+        (connection, streamed result), the connection is closed by stream_table_page
+    """
+    engine = get_async_engine(db_type)
+    conn = await engine.connect()
+    try:
+        result = await conn.stream(stmt)
+    except BaseException:
+        await conn.close()
+        raise
+    return conn, result
+
+
+async def stream_table_page(conn: AsyncConnection, result: AsyncResult, columns: List[str], limit: int) -> AsyncIterator[str]:
+    """
+    Stream a page opened by open_table_page as a JSON object {"columns", "data", "next_cursor"}, row by row
+    next_cursor is None on the last page
+    """
+    try:
+        yield '{"columns": ' + json.dumps(columns, ensure_ascii=False) + ', "data": ['
+        last_id = None
+        count = 0
+        async for row in result:
+            last_id = row[0]
+            record = dict(zip(columns, row[1:]))
+            yield ("," if count else "") + json.dumps(record, ensure_ascii=False, default=str)
+            count += 1
+        next_cursor = last_id if count == limit else None
+        yield '], "next_cursor": ' + json.dumps(next_cursor) + "}"
+    finally:
+        await conn.close()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/api/services/worker_pool.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Worker Pool
+Bounded thread pool running the blocking file work of the data API (directory scans, previews,
+counts), so the event loop keeps serving the crawler control routes and the log WebSocket.
+A request stops waiting on timeout or when its client disconnects, and the worker is told to
+stop through tools.task_cancel
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from starlette.requests import Request
+
+import config
+from tools.task_cancel import TaskCancelled, cancel_event_var
+
+# How often a waiting request checks whether its client is still connected
+DISCONNECT_POLL_SEC = 0.5
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+class DataTaskTimeout(Exception):
+    """The task did not finish within its timeout"""
+
+
+def get_data_executor() -> ThreadPoolExecutor:
+    """
+    Get the thread pool of the data API, DATA_API_MAX_WORKERS threads at most
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=config.DATA_API_MAX_WORKERS, thread_name_prefix="data-api")
+    return _executor
+
+
+async def run_blocking(
+    func: Callable[..., Any],
+    *args: Any,
+    request: Optional[Request] = None,
+    timeout: Optional[float] = None,
+) -> Any:
+    """
+    Run a blocking function in the data API pool
+    Args:
+        func: The blocking function, long loops in it call tools.task_cancel.check_cancelled
+        *args: Its arguments
+        request: The request it serves, the function is cancelled when its client disconnects
+        timeout: Seconds to wait, DATA_API_TIMEOUT_SEC by default, time queued for a worker included
+
+    Returns:
+        The return value of func
+
+    Raises:
+        DataTaskTimeout: func did not finish in time
+        TaskCancelled: The client disconnected
+    """
+    timeout = config.DATA_API_TIMEOUT_SEC if timeout is None else timeout
+    cancel_event = threading.Event()
+
+    def run():
+        token = cancel_event_var.set(cancel_event)
+        try:
+            return func(*args)
+        finally:
+            cancel_event_var.reset(token)
+
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(get_data_executor(), run)
+    deadline = loop.time() + timeout
+    try:
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise DataTaskTimeout(f"Data task {getattr(func, '__name__', func)} timed out after {timeout}s")
+            done, _ = await asyncio.wait({future}, timeout=min(remaining, DISCONNECT_POLL_SEC))
+            if done:
+                return future.result()
+            if request is not None and await request.is_disconnected():
+                raise TaskCancelled()
+    finally:
+        if not future.done():
+            # A queued task is dropped, a running one stops at its next check
+            cancel_event.set()
+            future.cancel()
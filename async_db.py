@@ -23,10 +23,49 @@ Provides unified interface for MySQL and SQLite operations
 """
 
 import asyncio
-from typing import Dict, List, Union, Any
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple, Union, Any
 from var import db_conn_pool_var
 import aiosqlite
 
+from config import db_config
+
+
+# Generated statements are cached by table and column tuple, the column order matches the parameter order
+@lru_cache(maxsize=256)
+def build_insert_sql(table_name: str, columns: Tuple[str, ...], placeholder: str) -> str:
+    placeholders = ', '.join([placeholder] * len(columns))
+    return f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+
+
+@lru_cache(maxsize=256)
+def build_update_sql(table_name: str, columns: Tuple[str, ...], id_field: str, placeholder: str) -> str:
+    set_clause = ', '.join([f"{column} = {placeholder}" for column in columns])
+    return f"UPDATE {table_name} SET {set_clause} WHERE {id_field} = {placeholder}"
+
+
+@lru_cache(maxsize=256)
+def build_mysql_upsert_sql(table_name: str, columns: Tuple[str, ...], update_columns: Tuple[str, ...]) -> str:
+    insert_sql = build_insert_sql(table_name, columns, "%s")
+    update_clause = ', '.join([f"{column} = VALUES({column})" for column in update_columns])
+    return f"{insert_sql} ON DUPLICATE KEY UPDATE {update_clause}"
+
+
+@lru_cache(maxsize=256)
+def build_sqlite_upsert_sql(table_name: str, columns: Tuple[str, ...], key: str, update_columns: Tuple[str, ...]) -> str:
+    insert_sql = build_insert_sql(table_name, columns, "?")
+    if not update_columns:
+        return f"{insert_sql} ON CONFLICT({key}) DO NOTHING"
+    update_clause = ', '.join([f"{column} = excluded.{column}" for column in update_columns])
+    return f"{insert_sql} ON CONFLICT({key}) DO UPDATE SET {update_clause}"
+
+
+def _get_update_columns(columns: Sequence[str], key: str, update_columns: Optional[List[str]]) -> Tuple[str, ...]:
+    if update_columns is None:
+        return tuple(column for column in columns if column != key)
+    return tuple(column for column in update_columns if column in columns)
+
 
 class AsyncMysqlDB:
     """
@@ -36,6 +75,8 @@ class AsyncMysqlDB:
 
     def __init__(self):
         self._pool = None
+        # task -> connection of the transaction() it runs
+        self._transaction_conns: Dict[asyncio.Task, Any] = {}
 
     async def _ensure_pool(self):
         """Ensure connection pool is initialized"""
@@ -44,6 +85,47 @@ class AsyncMysqlDB:
         if self._pool is None:
             raise RuntimeError("MySQL connection pool not initialized")
 
+    @asynccontextmanager
+    async def _use_connection(self):
+        """
+        Yield a pooled connection and whether the statement should be committed right away,
+        inside transaction() the transaction's connection is reused and the commit left to it
+        """
+        conn = self._transaction_conns.get(asyncio.current_task())
+        if conn is not None:
+            yield conn, False
+            return
+        await self._ensure_pool()
+        async with self._pool.acquire() as conn:
+            yield conn, True
+
+    @asynccontextmanager
+    async def transaction(self):
+        """
+        Run several statements on one connection in one transaction with a single commit
+
+        Usage:
+            async with db.transaction():
+                await db.items_to_table("xhs_note_comment", comments)
+                await db.update_table("xhs_note", item, "note_id", note_id)
+        """
+        task = asyncio.current_task()
+        if task in self._transaction_conns:
+            yield self
+            return
+        await self._ensure_pool()
+        async with self._pool.acquire() as conn:
+            self._transaction_conns[task] = conn
+            try:
+                await conn.begin()
+                yield self
+                await conn.commit()
+            except BaseException:
+                await conn.rollback()
+                raise
+            finally:
+                del self._transaction_conns[task]
+
     async def query(self, sql: str, params: tuple = None) -> List[Dict]:
         """
         Execute SELECT query
@@ -55,9 +137,7 @@ class AsyncMysqlDB:
         Returns:
             List of result dictionaries
         """
-        await self._ensure_pool()
-
-        async with self._pool.acquire() as conn:
+        async with self._use_connection() as (conn, _):
             async with conn.cursor() as cursor:
                 await cursor.execute(sql, params or ())
                 columns = [desc[0] for desc in cursor.description] if cursor.description else []
@@ -72,12 +152,11 @@ class AsyncMysqlDB:
             sql: SQL query string
             *params: Query parameters
         """
-        await self._ensure_pool()
-
-        async with self._pool.acquire() as conn:
+        async with self._use_connection() as (conn, autocommit):
             async with conn.cursor() as cursor:
                 await cursor.execute(sql, params)
-                await conn.commit()
+                if autocommit:
+                    await conn.commit()
 
     async def item_to_table(self, table_name: str, item: Dict) -> int:
         """
@@ -90,18 +169,14 @@ class AsyncMysqlDB:
         Returns:
             Last inserted row ID
         """
-        await self._ensure_pool()
-
-        columns = ', '.join(item.keys())
-        placeholders = ', '.join(['%s'] * len(item))
+        sql = build_insert_sql(table_name, tuple(item.keys()), "%s")
         values = tuple(item.values())
 
-        sql = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
-
-        async with self._pool.acquire() as conn:
+        async with self._use_connection() as (conn, autocommit):
             async with conn.cursor() as cursor:
                 await cursor.execute(sql, values)
-                await conn.commit()
+                if autocommit:
+                    await conn.commit()
                 return cursor.lastrowid
 
     async def update_table(self, table_name: str, item: Dict, id_field: str, id_value: str) -> int:
@@ -117,24 +192,104 @@ class AsyncMysqlDB:
         Returns:
             Number of affected rows
         """
-        await self._ensure_pool()
-
-        set_clause = ', '.join([f"{k} = %s" for k in item.keys()])
+        sql = build_update_sql(table_name, tuple(item.keys()), id_field, "%s")
         values = tuple(item.values()) + (id_value,)
 
-        sql = f"UPDATE {table_name} SET {set_clause} WHERE {id_field} = %s"
-
-        async with self._pool.acquire() as conn:
+        async with self._use_connection() as (conn, autocommit):
             async with conn.cursor() as cursor:
                 await cursor.execute(sql, values)
-                await conn.commit()
+                if autocommit:
+                    await conn.commit()
+                return cursor.rowcount
+
+    async def update_items(self, table_name: str, items: List[Dict], id_field: str) -> int:
+        """
+        Update table rows with one executemany and one commit
+
+        Args:
+            table_name: Target table name
+            items: Data to update, each item carries its id_field value and all items must have the same keys
+            id_field: ID field name
+
+        Returns:
+            Number of affected rows
+        """
+        if not items:
+            return 0
+
+        columns = tuple(column for column in items[0].keys() if column != id_field)
+        sql = build_update_sql(table_name, columns, id_field, "%s")
+        values = [tuple(item[column] for column in columns) + (item[id_field],) for item in items]
+
+        async with self._use_connection() as (conn, autocommit):
+            async with conn.cursor() as cursor:
+                await cursor.executemany(sql, values)
+                if autocommit:
+                    await conn.commit()
+                return cursor.rowcount
+
+    async def items_to_table(self, table_name: str, items: List[Dict]) -> int:
+        """
+        Insert items into table, executemany sends them as one multi-row VALUES list with one commit
+
+        Args:
+            table_name: Target table name
+            items: Data to insert, all items must have the same keys
+
+        Returns:
+            Number of inserted rows
+        """
+        if not items:
+            return 0
+
+        columns = tuple(items[0].keys())
+        sql = build_insert_sql(table_name, columns, "%s")
+        values = [tuple(item[column] for column in columns) for item in items]
+
+        async with self._use_connection() as (conn, autocommit):
+            async with conn.cursor() as cursor:
+                await cursor.executemany(sql, values)
+                if autocommit:
+                    await conn.commit()
+                return cursor.rowcount
+
+    async def upsert_items(self, table_name: str, items: List[Dict], key: str,
+                           update_columns: Optional[List[str]] = None) -> int:
+        """
+        Insert items or update the rows they collide with, as one multi-row INSERT ... ON DUPLICATE KEY UPDATE
+        The key column must have a unique index, otherwise every item is inserted
+
+        Args:
+            table_name: Target table name
+            items: Data to write, all items must have the same keys
+            key: Unique column identifying a row
+            update_columns: Columns refreshed on existing rows, all columns except key by default
+
+        Returns:
+            Affected rows as reported by MySQL (1 per insert, 2 per changed row)
+        """
+        if not items:
+            return 0
+
+        columns = tuple(items[0].keys())
+        # MySQL needs at least one assignment, re-assigning the key makes it a no-op
+        update_columns = _get_update_columns(columns, key, update_columns) or (key,)
+        sql = build_mysql_upsert_sql(table_name, columns, update_columns)
+        values = [tuple(item[column] for column in columns) for item in items]
+
+        async with self._use_connection() as (conn, autocommit):
+            async with conn.cursor() as cursor:
+                await cursor.executemany(sql, values)
+                if autocommit:
+                    await conn.commit()
                 return cursor.rowcount
 
 
 class AsyncSqliteDB:
     """
     SQLite database abstraction class
-    Uses aiosqlite for database operations
+    Keeps one aiosqlite connection open for the whole run, in WAL mode with synchronous=NORMAL,
+    statements from concurrent tasks are serialized on it
     """
 
     def __init__(self, db_path: str = None):
@@ -145,6 +300,69 @@ class AsyncSqliteDB:
             db_path: Path to SQLite database file
         """
         self.db_path = db_path
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._lock = asyncio.Lock()
+        self._transaction_task: Optional[asyncio.Task] = None
+
+    async def connect(self):
+        """Open the connection and apply the journal and sync pragmas, no-op when already open"""
+        if self._conn is not None:
+            return
+        conn = await aiosqlite.connect(self.db_path)
+        conn.row_factory = aiosqlite.Row
+        await conn.execute(f"PRAGMA journal_mode={db_config.SQLITE_JOURNAL_MODE}")
+        await conn.execute(f"PRAGMA synchronous={db_config.SQLITE_SYNCHRONOUS}")
+        self._conn = conn
+
+    async def close(self):
+        """Commit pending writes and close the connection"""
+        async with self._lock:
+            if self._conn is None:
+                return
+            await self._conn.commit()
+            await self._conn.close()
+            self._conn = None
+
+    def _in_transaction(self) -> bool:
+        return self._transaction_task is not None and self._transaction_task is asyncio.current_task()
+
+    @asynccontextmanager
+    async def _use_connection(self):
+        """
+        Yield the connection and whether the statement should be committed right away,
+        inside transaction() the commit is left to the transaction
+        """
+        if self._in_transaction():
+            yield self._conn, False
+            return
+        async with self._lock:
+            await self.connect()
+            yield self._conn, True
+
+    @asynccontextmanager
+    async def transaction(self):
+        """
+        Run several statements in one transaction with a single commit, e.g. a whole page of comments
+
+        Usage:
+            async with db.transaction():
+                await db.items_to_table("xhs_note_comment", comments)
+                await db.update_table("xhs_note", item, "note_id", note_id)
+        """
+        if self._in_transaction():
+            yield self
+            return
+        async with self._lock:
+            await self.connect()
+            self._transaction_task = asyncio.current_task()
+            try:
+                yield self
+                await self._conn.commit()
+            except BaseException:
+                await self._conn.rollback()
+                raise
+            finally:
+                self._transaction_task = None
 
     async def query(self, sql: str, params: tuple = None) -> List[Dict]:
         """
@@ -157,12 +375,24 @@ class AsyncSqliteDB:
         Returns:
             List of result dictionaries
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute(sql, params or ()) as cursor:
+        async with self._use_connection() as (conn, _):
+            async with conn.execute(sql, params or ()) as cursor:
                 rows = await cursor.fetchall()
                 return [dict(row) for row in rows]
 
+    async def execute(self, sql: str, *params):
+        """
+        Execute SQL statement (for compatibility with chat modules)
+
+        Args:
+            sql: SQL query string
+            *params: Query parameters
+        """
+        async with self._use_connection() as (conn, autocommit):
+            await conn.execute(sql, params)
+            if autocommit:
+                await conn.commit()
+
     async def item_to_table(self, table_name: str, item: Dict) -> int:
         """
         Insert item into table
@@ -174,17 +404,37 @@ class AsyncSqliteDB:
         Returns:
             Last inserted row ID
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            columns = ', '.join(item.keys())
-            placeholders = ', '.join(['?'] * len(item))
-            values = tuple(item.values())
-
-            sql = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
+        sql = build_insert_sql(table_name, tuple(item.keys()), "?")
+        values = tuple(item.values())
 
-            async with db.execute(sql, values) as cursor:
-                await db.commit()
+        async with self._use_connection() as (conn, autocommit):
+            async with conn.execute(sql, values) as cursor:
+                if autocommit:
+                    await conn.commit()
                 return cursor.lastrowid
 
+    async def items_to_table(self, table_name: str, items: List[Dict]) -> int:
+        """
+        Insert items into table with one executemany and one commit
+
+        Args:
+            table_name: Target table name
+            items: Data to insert, all items must have the same keys
+
+        Returns:
+            Number of inserted rows
+        """
+        if not items:
+            return 0
+        columns = tuple(items[0].keys())
+        sql = build_insert_sql(table_name, columns, "?")
+
+        async with self._use_connection() as (conn, autocommit):
+            async with conn.executemany(sql, [tuple(item[column] for column in columns) for item in items]) as cursor:
+                if autocommit:
+                    await conn.commit()
+                return cursor.rowcount
+
     async def update_table(self, table_name: str, item: Dict, id_field: str, id_value: str) -> int:
         """
         Update table row
@@ -198,12 +448,61 @@ class AsyncSqliteDB:
         Returns:
             Number of affected rows
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            set_clause = ', '.join([f"{k} = ?" for k in item.keys()])
-            values = tuple(item.values()) + (id_value,)
+        sql = build_update_sql(table_name, tuple(item.keys()), id_field, "?")
+        values = tuple(item.values()) + (id_value,)
 
-            sql = f"UPDATE {table_name} SET {set_clause} WHERE {id_field} = ?"
+        async with self._use_connection() as (conn, autocommit):
+            async with conn.execute(sql, values) as cursor:
+                if autocommit:
+                    await conn.commit()
+                return cursor.rowcount
+
+    async def update_items(self, table_name: str, items: List[Dict], id_field: str) -> int:
+        """
+        Update table rows with one executemany and one commit
 
-            async with db.execute(sql, values) as cursor:
-                await db.commit()
+        Args:
+            table_name: Target table name
+            items: Data to update, each item carries its id_field value and all items must have the same keys
+            id_field: ID field name
+
+        Returns:
+            Number of affected rows
+        """
+        if not items:
+            return 0
+        columns = tuple(column for column in items[0].keys() if column != id_field)
+        sql = build_update_sql(table_name, columns, id_field, "?")
+        params = [tuple(item[column] for column in columns) + (item[id_field],) for item in items]
+        async with self._use_connection() as (conn, autocommit):
+            async with conn.executemany(sql, params) as cursor:
+                if autocommit:
+                    await conn.commit()
+                return cursor.rowcount
+
+    async def upsert_items(self, table_name: str, items: List[Dict], key: str,
+                           update_columns: Optional[List[str]] = None) -> int:
+        """
+        Insert items or update the rows they collide with, as INSERT ... ON CONFLICT DO UPDATE with one commit
+        The key column must have a unique index
+
+        Args:
+            table_name: Target table name
+            items: Data to write, all items must have the same keys
+            key: Unique column identifying a row
+            update_columns: Columns refreshed on existing rows, all columns except key by default
+
+        Returns:
+            Number of inserted or updated rows
+        """
+        if not items:
+            return 0
+        columns = tuple(items[0].keys())
+        sql = build_sqlite_upsert_sql(table_name, columns, key, _get_update_columns(columns, key, update_columns))
+
+        params = [tuple(item[column] for column in columns) for item in items]
+        async with self._use_connection() as (conn, autocommit):
+            async with conn.executemany(sql, params) as cursor:
+                if autocommit:
+                    await conn.commit()
                 return cursor.rowcount
@@ -99,6 +99,19 @@ class AbstractStore(ABC):
     async def store_creator(self, creator: Dict):
         pass
 
+    async def close(self):
+        """
+        Flush buffered data and release resources, called once at the end of the run
+        """
+        pass
+
+    async def update_source_keyword(self, content_id, source_keyword: str) -> bool:
+        """
+        Rewrite the source_keyword of a stored content in place
+        Returns False when the store only appends records and cannot update one
+        """
+        return False
+
 
 class AbstractStoreImage(ABC):
     # TODO: support all platform
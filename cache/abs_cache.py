@@ -25,7 +25,7 @@
 # @Desc    : Abstract class
 
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 
 class AbstractCache(ABC):
@@ -60,3 +60,94 @@ class AbstractCache(ABC):
         :return:
         """
         raise NotImplementedError
+
+    @abstractmethod
+    def scan(self, pattern: str = "*", count: int = 100) -> Iterator[str]:
+        """
+        Iterate over the keys matching a glob pattern (fnmatch semantics, case-sensitive)
+        Keys are fetched incrementally, so large keyspaces are never listed in one call
+        :param pattern: Matching pattern, e.g. xhs:note:*
+        :param count: Number of keys examined per step
+        :return:
+        """
+        raise NotImplementedError
+
+    def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Get the values of several keys, None for the missing ones
+        Backends that support batching override this to fetch in one round trip
+        :param keys: The keys
+        :return: Values in the same order as keys
+        """
+        return [self.get(key) for key in keys]
+
+    def mget_with_ttl(self, keys: List[str]) -> List[Tuple[Optional[Any], Optional[float]]]:
+        """
+        Get the values of several keys together with their remaining time to live in seconds
+        The ttl is None when the key is missing, never expires or the backend cannot tell
+        :param keys: The keys
+        :return: (value, ttl) pairs in the same order as keys
+        """
+        return [(value, None) for value in self.mget(keys)]
+
+    def mset(self, mapping: Dict[str, Any], expire_time: int) -> None:
+        """
+        Set several keys sharing the same expiration time
+        :param mapping: Key to value mapping
+        :param expire_time: Expiration time
+        :return:
+        """
+        for key, value in mapping.items():
+            self.set(key, value, expire_time)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """
+        Async variant of get, the default delegates to the sync method
+        Network backends override the async methods so they do not block the event loop
+        :param key: The key
+        :return:
+        """
+        return self.get(key)
+
+    async def aset(self, key: str, value: Any, expire_time: int) -> None:
+        """
+        Async variant of set
+        :param key: The key
+        :param value: The value
+        :param expire_time: Expiration time
+        :return:
+        """
+        self.set(key, value, expire_time)
+
+    async def akeys(self, pattern: str) -> List[str]:
+        """
+        Async variant of keys
+        :param pattern: Matching pattern
+        :return:
+        """
+        return self.keys(pattern)
+
+    async def amget(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Async variant of mget
+        :param keys: The keys
+        :return: Values in the same order as keys
+        """
+        return self.mget(keys)
+
+    async def amget_with_ttl(self, keys: List[str]) -> List[Tuple[Optional[Any], Optional[float]]]:
+        """
+        Async variant of mget_with_ttl
+        :param keys: The keys
+        :return: (value, ttl) pairs in the same order as keys
+        """
+        return self.mget_with_ttl(keys)
+
+    async def amset(self, mapping: Dict[str, Any], expire_time: int) -> None:
+        """
+        Async variant of mset
+        :param mapping: Key to value mapping
+        :param expire_time: Expiration time
+        :return:
+        """
+        self.mset(mapping, expire_time)
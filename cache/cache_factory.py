@@ -33,17 +33,34 @@ class CacheFactory:
     @staticmethod
     def create_cache(cache_type: str, *args, **kwargs):
         """
-        Create cache object
+        Create cache object, wrapped with InstrumentedCache when cache metrics are enabled
         :param cache_type: Cache type
         :param args: Arguments
         :param kwargs: Keyword arguments
         :return:
         """
+        from config import db_config
+
         if cache_type == 'memory':
             from .local_cache import ExpiringLocalCache
-            return ExpiringLocalCache(*args, **kwargs)
+            cache = ExpiringLocalCache(*args, **kwargs)
         elif cache_type == 'redis':
             from .redis_cache import RedisCache
-            return RedisCache()
+            cache = RedisCache()
+        elif cache_type == 'disk':
+            from .disk_cache import DiskCache
+            kwargs.setdefault('path', db_config.CACHE_DISK_PATH)
+            cache = DiskCache(*args, **kwargs)
+        elif cache_type == 'tiered':
+            from .redis_cache import RedisCache
+            from .tiered_cache import TieredCache
+            kwargs.setdefault('l1_max_entries', db_config.CACHE_L1_MAX_ENTRIES)
+            kwargs.setdefault('l1_ttl', db_config.CACHE_L1_TTL_SEC)
+            cache = TieredCache(RedisCache(), *args, **kwargs)
         else:
             raise ValueError(f'Unknown cache type: {cache_type}')
+
+        if not db_config.CACHE_METRICS_ENABLED:
+            return cache
+        from .instrumented_cache import InstrumentedCache
+        return InstrumentedCache(cache, name=cache_type, sample_every=db_config.CACHE_METRICS_SAMPLE_EVERY)
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/cache/disk_cache.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : Disk cache, a single SQLite file so cached values survive restarts without a Redis server
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from cache.abs_cache import AbstractCache
+
+
+class DiskCache(AbstractCache):
+    """
+    Persistent cache stored in a SQLite file, values are JSON encoded
+    The async methods run the queries in a worker thread, a write commits and waits for the disk
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: SQLite file, created with its directory when missing
+        :return:
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # The connection is shared by the worker threads of the async methods
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expire_at REAL NOT NULL)"
+            )
+            # Expired rows are only skipped by lookups, drop those left by previous runs
+            self._conn.execute("DELETE FROM cache WHERE expire_at <= ?", (time.time(),))
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get the value of a key, None when missing or expired
+        :param key:
+        :return:
+        """
+        return self.mget([key])[0]
+
+    def set(self, key: str, value: Any, expire_time: int) -> None:
+        """
+        Set the value of a key
+        :param key:
+        :param value:
+        :param expire_time: Expiration time in seconds
+        :return:
+        """
+        self.mset({key: value}, expire_time)
+
+    def keys(self, pattern: str) -> List[str]:
+        """
+        Get all keys matching the pattern
+        :param pattern:
+        :return:
+        """
+        return list(self.scan(pattern))
+
+    def scan(self, pattern: str = "*", count: int = 100) -> Iterator[str]:
+        """
+        Iterate over the keys matching the pattern (SQLite GLOB, case-sensitive), count keys per query
+        :param pattern:
+        :param count:
+        :return:
+        """
+        last_key = ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT key FROM cache WHERE key > ? AND key GLOB ? AND expire_at > ? ORDER BY key LIMIT ?",
+                    (last_key, pattern, time.time(), count),
+                ).fetchall()
+            for (key,) in rows:
+                yield key
+            if len(rows) < count:
+                return
+            last_key = rows[-1][0]
+
+    def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Get several keys in one query
+        :param keys:
+        :return:
+        """
+        return [value for value, _ in self.mget_with_ttl(keys)]
+
+    def mget_with_ttl(self, keys: List[str]) -> List[Tuple[Optional[Any], Optional[float]]]:
+        """
+        Get several keys in one query together with their remaining time to live
+        :param keys:
+        :return:
+        """
+        if not keys:
+            return []
+        now = time.time()
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, value, expire_at FROM cache WHERE key IN ({placeholders}) AND expire_at > ?",
+                (*keys, now),
+            ).fetchall()
+        found = {key: (json.loads(value), expire_at - now) for key, value, expire_at in rows}
+        return [found.get(key, (None, None)) for key in keys]
+
+    def mset(self, mapping: Dict[str, Any], expire_time: int) -> None:
+        """
+        Set several keys in one transaction
+        :param mapping:
+        :param expire_time:
+        :return:
+        """
+        if not mapping:
+            return
+        expire_at = time.time() + expire_time
+        rows = [
+            (key, json.dumps(value, ensure_ascii=False, separators=(",", ":")), expire_at)
+            for key, value in mapping.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO cache (key, value, expire_at) VALUES (?, ?, ?)", rows)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: Any, expire_time: int) -> None:
+        await asyncio.to_thread(self.set, key, value, expire_time)
+
+    async def akeys(self, pattern: str) -> List[str]:
+        return await asyncio.to_thread(self.keys, pattern)
+
+    async def amget(self, keys: List[str]) -> List[Optional[Any]]:
+        return await asyncio.to_thread(self.mget, keys)
+
+    async def amget_with_ttl(self, keys: List[str]) -> List[Tuple[Optional[Any], Optional[float]]]:
+        return await asyncio.to_thread(self.mget_with_ttl, keys)
+
+    async def amset(self, mapping: Dict[str, Any], expire_time: int) -> None:
+        await asyncio.to_thread(self.mset, mapping, expire_time)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
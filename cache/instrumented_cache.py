@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/cache/instrumented_cache.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : Cache instrumentation, hit/miss/expiration/eviction counters, value sizes and
+#            sampled latency histograms per key namespace
+
+import bisect
+import itertools
+import json
+import re
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from cache.abs_cache import AbstractCache
+
+# Upper bounds (milliseconds) of the latency histogram buckets, the last bucket is unbounded
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000)
+
+# Keys are grouped by the text before the first separator, e.g. xhs_13800000000 -> xhs
+_NAMESPACE_SEPARATOR = re.compile(r"[:_]")
+DEFAULT_NAMESPACE = "_default"
+# Namespaces beyond this count are folded together so odd key schemes cannot grow the metrics unbounded
+MAX_NAMESPACES = 64
+OVERFLOW_NAMESPACE = "_other"
+
+
+def key_namespace(key: str) -> str:
+    """
+    Get the namespace of a cache key
+    :param key:
+    :return:
+    """
+    match = _NAMESPACE_SEPARATOR.search(key)
+    return key[:match.start()] if match and match.start() > 0 else DEFAULT_NAMESPACE
+
+
+def value_size(value: Any) -> int:
+    """
+    Approximate size in bytes of a cached value, as JSON
+    :param value:
+    :return:
+    """
+    return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+class LatencyHistogram:
+    """Fixed bucket latency histogram"""
+
+    __slots__ = ("counts", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, elapsed_ms: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Upper bound of the bucket holding the given fraction of the samples, None when it is the unbounded bucket
+        """
+        total = sum(self.counts)
+        if not total:
+            return None
+        threshold = fraction * total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= threshold:
+                return LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else None
+        return None
+
+    def snapshot(self) -> Dict[str, Any]:
+        samples = sum(self.counts)
+        bounds = [str(bound) for bound in LATENCY_BUCKETS_MS] + ["inf"]
+        return {
+            "samples": samples,
+            "avg_ms": round(self.total_ms / samples, 4) if samples else 0.0,
+            "max_ms": round(self.max_ms, 4),
+            "p50_ms": self.percentile(0.5),
+            "p99_ms": self.percentile(0.99),
+            "buckets": {f"le_{bound}": count for bound, count in zip(bounds, self.counts)},
+        }
+
+
+class NamespaceMetrics:
+    """Counters of one key namespace"""
+
+    __slots__ = ("hits", "misses", "sets", "expirations", "evictions",
+                 "value_samples", "value_bytes", "value_max_bytes", "latency")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.value_samples = 0
+        self.value_bytes = 0
+        self.value_max_bytes = 0
+        self.latency: Dict[str, LatencyHistogram] = {}
+
+    def observe_value(self, size: int) -> None:
+        self.value_samples += 1
+        self.value_bytes += size
+        if size > self.value_max_bytes:
+            self.value_max_bytes = size
+
+    def observe_latency(self, operation: str, elapsed_ms: float) -> None:
+        histogram = self.latency.get(operation)
+        if histogram is None:
+            histogram = self.latency[operation] = LatencyHistogram()
+        histogram.observe(elapsed_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "sets": self.sets,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "value_bytes": {
+                "samples": self.value_samples,
+                "avg": round(self.value_bytes / self.value_samples, 1) if self.value_samples else 0.0,
+                "max": self.value_max_bytes,
+            },
+            "latency": {operation: histogram.snapshot() for operation, histogram in self.latency.items()},
+        }
+
+
+class CacheMetrics:
+    """
+    Metrics of every cache created under one name
+    Counters are plain attribute increments without locks, the cache is used from the event loop thread,
+    and only one operation out of sample_every is timed and has its value size measured
+    """
+
+    def __init__(self, sample_every: int = 10):
+        self.sample_every = max(1, sample_every)
+        self._namespaces: Dict[str, NamespaceMetrics] = {}
+        # next() on itertools.count is atomic in CPython, so sampling needs no lock either
+        self._operations = itertools.count()
+
+    def namespace(self, key: str) -> NamespaceMetrics:
+        """
+        Get the metrics of the namespace the key belongs to
+        :param key:
+        :return:
+        """
+        name = key_namespace(key)
+        metrics = self._namespaces.get(name)
+        if metrics is None:
+            if len(self._namespaces) >= MAX_NAMESPACES:
+                name = OVERFLOW_NAMESPACE
+                metrics = self._namespaces.get(name)
+            if metrics is None:
+                metrics = self._namespaces[name] = NamespaceMetrics()
+        return metrics
+
+    def sample(self) -> bool:
+        """
+        Whether the current operation should be timed
+        :return:
+        """
+        return next(self._operations) % self.sample_every == 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {name: metrics.snapshot() for name, metrics in sorted(self._namespaces.items())}
+
+
+# Cache name -> metrics, caches created under the same name share their metrics
+_metrics_registry: Dict[str, CacheMetrics] = {}
+
+
+def get_cache_metrics() -> Dict[str, Dict[str, Any]]:
+    """
+    Snapshot of the metrics of every instrumented cache in this process
+    :return: {cache name: {namespace: metrics}}
+    """
+    return {name: metrics.snapshot() for name, metrics in _metrics_registry.items()}
+
+
+class InstrumentedCache(AbstractCache):
+    """
+    Wrapper recording metrics around any AbstractCache implementation
+    Expirations and evictions are reported by caches exposing a removal_listener (ExpiringLocalCache),
+    Redis drops keys server side so they show up as misses instead
+    """
+
+    def __init__(self, cache: AbstractCache, name: str, sample_every: int = 10):
+        """
+        :param cache: Wrapped cache
+        :param name: Name the metrics are reported under
+        :param sample_every: Time one operation out of sample_every
+        :return:
+        """
+        self._cache = cache
+        self.name = name
+        self.metrics = _metrics_registry.get(name)
+        if self.metrics is None:
+            self.metrics = _metrics_registry[name] = CacheMetrics(sample_every)
+        if hasattr(cache, "removal_listener"):
+            cache.removal_listener = self._on_removal
+
+    def __getattr__(self, item: str) -> Any:
+        # Expose extra methods of the wrapped cache, e.g. TieredCache.stats()
+        if item == "_cache":
+            raise AttributeError(item)
+        return getattr(self._cache, item)
+
+    def get(self, key: str) -> Optional[Any]:
+        start = self._start()
+        value = self._cache.get(key)
+        self._record_lookups("get", [key], [value], start)
+        return value
+
+    def set(self, key: str, value: Any, expire_time: int) -> None:
+        start = self._start()
+        self._cache.set(key, value, expire_time)
+        self._record_sets("set", {key: value}, start)
+
+    def keys(self, pattern: str) -> List[str]:
+        start = self._start()
+        keys = self._cache.keys(pattern)
+        self._record_latency("keys", pattern, start)
+        return keys
+
+    def scan(self, pattern: str = "*", count: int = 100) -> Iterator[str]:
+        return self._cache.scan(pattern, count)
+
+    def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        start = self._start()
+        values = self._cache.mget(keys)
+        self._record_lookups("mget", keys, values, start)
+        return values
+
+    def mget_with_ttl(self, keys: List[str]) -> List[Tuple[Optional[Any], Optional[float]]]:
+        start = self._start()
+        results = self._cache.mget_with_ttl(keys)
+        self._record_lookups("mget", keys, [value for value, _ in results], start)
+        return results
+
+    def mset(self, mapping: Dict[str, Any], expire_time: int) -> None:
+        start = self._start()
+        self._cache.mset(mapping, expire_time)
+        self._record_sets("mset", mapping, start)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        start = self._start()
+        value = await self._cache.aget(key)
+        self._record_lookups("get", [key], [value], start)
+        return value
+
+    async def aset(self, key: str, value: Any, expire_time: int) -> None:
+        start = self._start()
+        await self._cache.aset(key, value, expire_time)
+        self._record_sets("set", {key: value}, start)
+
+    async def akeys(self, pattern: str) -> List[str]:
+        start = self._start()
+        keys = await self._cache.akeys(pattern)
+        self._record_latency("keys", pattern, start)
+        return keys
+
+    async def amget(self, keys: List[str]) -> List[Optional[Any]]:
+        start = self._start()
+        values = await self._cache.amget(keys)
+        self._record_lookups("mget", keys, values, start)
+        return values
+
+    async def amget_with_ttl(self, keys: List[str]) -> List[Tuple[Optional[Any], Optional[float]]]:
+        start = self._start()
+        results = await self._cache.amget_with_ttl(keys)
+        self._record_lookups("mget", keys, [value for value, _ in results], start)
+        return results
+
+    async def amset(self, mapping: Dict[str, Any], expire_time: int) -> None:
+        start = self._start()
+        await self._cache.amset(mapping, expire_time)
+        self._record_sets("mset", mapping, start)
+
+    def _start(self) -> Optional[float]:
+        """
+        Start timestamp when this operation is sampled, otherwise None
+        """
+        return time.perf_counter() if self.metrics.sample() else None
+
+    def _record_latency(self, operation: str, key: str, start: Optional[float]) -> None:
+        if start is not None:
+            self.metrics.namespace(key).observe_latency(operation, (time.perf_counter() - start) * 1000)
+
+    def _record_lookups(self, operation: str, keys: List[str], values: List[Optional[Any]],
+                        start: Optional[float]) -> None:
+        if not keys:
+            return
+        self._record_latency(operation, keys[0], start)
+        for key, value in zip(keys, values):
+            metrics = self.metrics.namespace(key)
+            if value is None:
+                metrics.misses += 1
+            else:
+                metrics.hits += 1
+
+    def _record_sets(self, operation: str, mapping: Dict[str, Any], start: Optional[float]) -> None:
+        if not mapping:
+            return
+        self._record_latency(operation, next(iter(mapping)), start)
+        for key, value in mapping.items():
+            metrics = self.metrics.namespace(key)
+            metrics.sets += 1
+            if start is not None:
+                try:
+                    metrics.observe_value(value_size(value))
+                except (TypeError, ValueError):
+                    pass
+
+    def _on_removal(self, key: str, reason: str) -> None:
+        metrics = self.metrics.namespace(key)
+        if reason == "expired":
+            metrics.expirations += 1
+        elif reason == "evicted":
+            metrics.evictions += 1
@@ -25,22 +25,39 @@
 # @Desc    : Local cache
 
 import asyncio
+import bisect
+import fnmatch
+import heapq
+import re
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from cache.abs_cache import AbstractCache
 
+# Everything before the first of these characters is a literal key prefix
+_GLOB_SPECIAL_CHARS = re.compile(r"[*?\[]")
+
 
 class ExpiringLocalCache(AbstractCache):
 
-    def __init__(self, cron_interval: int = 10):
+    def __init__(self, cron_interval: int = 10, max_entries: Optional[int] = None):
         """
         Initialize local cache
         :param cron_interval: Time interval for scheduled cache cleanup
+        :param max_entries: Maximum number of keys, the least recently used key is evicted beyond it, None means unbounded
         :return:
         """
         self._cron_interval = cron_interval
-        self._cache_container: Dict[str, Tuple[Any, float]] = {}
+        self._max_entries = max_entries
+        # Ordered from least to most recently used
+        self._cache_container: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        # Min-heap of (expire timestamp, key), entries left behind by overwrites are skipped when popped
+        self._expire_heap: List[Tuple[float, str]] = []
+        # All keys in sorted order, so a pattern prefix maps to one contiguous slice
+        self._sorted_keys: List[str] = []
+        # Called with (key, reason) when a key is dropped, reason is "expired" or "evicted"
+        self.removal_listener: Optional[Callable[[str, str], None]] = None
         self._cron_task: Optional[asyncio.Task] = None
         # Start scheduled cleanup task
         self._schedule_clear()
@@ -53,6 +70,13 @@ class ExpiringLocalCache(AbstractCache):
         if self._cron_task is not None:
             self._cron_task.cancel()
 
+    def __len__(self) -> int:
+        """
+        Number of keys held, expired ones included until the next cleanup
+        :return:
+        """
+        return len(self._cache_container)
+
     def get(self, key: str) -> Optional[Any]:
         """
         Get the value of a key from the cache
@@ -65,11 +89,27 @@ class ExpiringLocalCache(AbstractCache):
 
         # If the key has expired, delete it and return None
         if expire_time < time.time():
-            del self._cache_container[key]
+            self._delete(key, reason="expired")
             return None
 
+        self._cache_container.move_to_end(key)
         return value
 
+    def mget_with_ttl(self, keys: List[str]) -> List[Tuple[Optional[Any], Optional[float]]]:
+        """
+        Get several keys together with their remaining time to live
+        :param keys:
+        :return:
+        """
+        result = []
+        for key in keys:
+            value = self.get(key)
+            if value is None:
+                result.append((None, None))
+            else:
+                result.append((value, self._cache_container[key][1] - time.time()))
+        return result
+
     def set(self, key: str, value: Any, expire_time: int) -> None:
         """
         Set the value of a key in the cache
@@ -78,7 +118,22 @@ class ExpiringLocalCache(AbstractCache):
         :param expire_time:
         :return:
         """
-        self._cache_container[key] = (value, time.time() + expire_time)
+        expire_at = time.time() + expire_time
+        if key not in self._cache_container:
+            bisect.insort(self._sorted_keys, key)
+        self._cache_container[key] = (value, expire_at)
+        self._cache_container.move_to_end(key)
+        heapq.heappush(self._expire_heap, (expire_at, key))
+
+        if self._max_entries is not None and len(self._cache_container) > self._max_entries:
+            # Drop expired keys first so they are not kept at the expense of live ones
+            self._clear()
+            while len(self._cache_container) > self._max_entries:
+                self._delete(next(iter(self._cache_container)), reason="evicted")
+
+        # Overwritten and evicted keys leave stale heap entries behind, rebuild once they dominate
+        if len(self._expire_heap) > 2 * len(self._cache_container) + 64:
+            self._rebuild_expire_heap()
 
     def keys(self, pattern: str) -> List[str]:
         """
@@ -86,14 +141,47 @@ class ExpiringLocalCache(AbstractCache):
         :param pattern: Matching pattern
         :return:
         """
-        if pattern == '*':
-            return list(self._cache_container.keys())
-
-        # For local cache wildcard, temporarily replace * with empty string
-        if '*' in pattern:
-            pattern = pattern.replace('*', '')
+        return list(self.scan(pattern))
 
-        return [key for key in self._cache_container.keys() if pattern in key]
+    def scan(self, pattern: str = "*", count: int = 100) -> Iterator[str]:
+        """
+        Iterate over the unexpired keys matching the pattern
+        Only the sorted keys sharing the pattern's literal prefix are visited, count at a time,
+        so the cache may be modified between steps
+        :param pattern: Matching pattern
+        :param count: Number of keys examined per step
+        :return:
+        """
+        special = _GLOB_SPECIAL_CHARS.search(pattern)
+        prefix = pattern[:special.start()] if special else pattern
+        index = bisect.bisect_left(self._sorted_keys, prefix)
+        while True:
+            batch = self._sorted_keys[index:index + count]
+            if not batch:
+                return
+            now = time.time()
+            for key in batch:
+                if not key.startswith(prefix):
+                    return
+                entry = self._cache_container.get(key)
+                if entry is not None and entry[1] >= now and fnmatch.fnmatchcase(key, pattern):
+                    yield key
+            # Resume after the last examined key, the list may have changed while suspended
+            index = bisect.bisect_right(self._sorted_keys, batch[-1])
+
+    def _delete(self, key: str, reason: str):
+        """
+        Remove a key from the container and the sorted key index
+        :param key:
+        :param reason: Why the key is removed, passed on to the removal listener
+        :return:
+        """
+        del self._cache_container[key]
+        index = bisect.bisect_left(self._sorted_keys, key)
+        if index < len(self._sorted_keys) and self._sorted_keys[index] == key:
+            del self._sorted_keys[index]
+        if self.removal_listener is not None:
+            self.removal_listener(key, reason)
 
     def _schedule_clear(self):
         """
@@ -111,12 +199,24 @@ class ExpiringLocalCache(AbstractCache):
 
     def _clear(self):
         """
-        Clean up cache based on expiration time
+        Clean up cache based on expiration time, only the expired heap entries are visited
+        :return:
+        """
+        now = time.time()
+        while self._expire_heap and self._expire_heap[0][0] < now:
+            expire_at, key = heapq.heappop(self._expire_heap)
+            entry = self._cache_container.get(key)
+            # Skip keys that were overwritten with a later expiry or already removed
+            if entry is not None and entry[1] == expire_at:
+                self._delete(key, reason="expired")
+
+    def _rebuild_expire_heap(self):
+        """
+        Rebuild the expiry heap from the live keys, discarding stale entries
         :return:
         """
-        for key, (value, expire_time) in self._cache_container.items():
-            if expire_time < time.time():
-                del self._cache_container[key]
+        self._expire_heap = [(expire_at, key) for key, (_, expire_at) in self._cache_container.items()]
+        heapq.heapify(self._expire_heap)
 
     async def _start_clear_cron(self):
         """
@@ -23,21 +23,61 @@
 # @Name    : Programmer AJiang-Relakkes
 # @Time    : 2024/5/29 22:57
 # @Desc    : RedisCache implementation
-import pickle
+import fnmatch
+import json
 import time
-from typing import Any, List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from redis import Redis
+from redis import asyncio as aioredis
 
 from cache.abs_cache import AbstractCache
 from config import db_config
+from tools import utils
+
+
+def serialize_value(value: Any) -> bytes:
+    """
+    Serialize a cache value as compact JSON
+    JSON is used instead of pickle so that reading the cache never executes code
+    :param value: Any JSON serializable value
+    :return:
+    """
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _pttl_to_seconds(pttl: int) -> Optional[float]:
+    """
+    Convert a PTTL reply to seconds, -2 (missing key) and -1 (no expiry) become None
+    :param pttl:
+    :return:
+    """
+    return pttl / 1000 if pttl >= 0 else None
+
+
+def deserialize_value(raw: Optional[bytes]) -> Any:
+    """
+    Deserialize a cache value, undecodable payloads (e.g. written by older pickle based versions) count as a miss
+    :param raw: Raw bytes returned by redis
+    :return:
+    """
+    if raw is None:
+        return None
+    try:
+        return json.loads(raw)
+    except (UnicodeDecodeError, ValueError):
+        utils.logger.warning("[RedisCache.deserialize_value] skip undecodable cache value")
+        return None
 
 
 class RedisCache(AbstractCache):
+    # Connection pool shared by the async clients of all RedisCache instances
+    _async_pool: Optional[aioredis.ConnectionPool] = None
 
     def __init__(self) -> None:
         # Connect to redis, return redis client
         self._redis_client = self._connet_redis()
+        self._async_client: Optional[aioredis.Redis] = None
 
     @staticmethod
     def _connet_redis() -> Redis:
@@ -52,16 +92,30 @@ class RedisCache(AbstractCache):
             password=db_config.REDIS_DB_PWD,
         )
 
+    @property
+    def async_client(self) -> aioredis.Redis:
+        """
+        Async redis client, created lazily on top of the shared connection pool
+        :return:
+        """
+        if self._async_client is None:
+            if RedisCache._async_pool is None:
+                RedisCache._async_pool = aioredis.ConnectionPool(
+                    host=db_config.REDIS_DB_HOST,
+                    port=db_config.REDIS_DB_PORT,
+                    db=db_config.REDIS_DB_NUM,
+                    password=db_config.REDIS_DB_PWD,
+                )
+            self._async_client = aioredis.Redis(connection_pool=RedisCache._async_pool)
+        return self._async_client
+
     def get(self, key: str) -> Any:
         """
         Get the value of a key from the cache and deserialize it
         :param key:
         :return:
         """
-        value = self._redis_client.get(key)
-        if value is None:
-            return None
-        return pickle.loads(value)
+        return deserialize_value(self._redis_client.get(key))
 
     def set(self, key: str, value: Any, expire_time: int) -> None:
         """
@@ -71,13 +125,107 @@ class RedisCache(AbstractCache):
         :param expire_time:
         :return:
         """
-        self._redis_client.set(key, pickle.dumps(value), ex=expire_time)
+        self._redis_client.set(key, serialize_value(value), ex=expire_time)
 
     def keys(self, pattern: str) -> List[str]:
         """
         Get all keys matching the pattern
+        Uses SCAN instead of the blocking KEYS command
         """
-        return [key.decode() for key in self._redis_client.keys(pattern)]
+        return list(self.scan(pattern))
+
+    def scan(self, pattern: str = "*", count: int = 100) -> Iterator[str]:
+        """
+        Iterate over the keys matching the pattern with SCAN, count keys per round trip
+        MATCH only narrows the scan, keys are re-checked with fnmatch so every backend returns the same keys
+        """
+        for key in self._redis_client.scan_iter(match=pattern, count=count):
+            key = key.decode()
+            if fnmatch.fnmatchcase(key, pattern):
+                yield key
+
+    def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Get several keys with a single MGET
+        """
+        if not keys:
+            return []
+        return [deserialize_value(raw) for raw in self._redis_client.mget(keys)]
+
+    def mget_with_ttl(self, keys: List[str]) -> List[Tuple[Optional[Any], Optional[float]]]:
+        """
+        Get several keys and their PTTL in one pipelined round trip
+        """
+        if not keys:
+            return []
+        pipe = self._redis_client.pipeline(transaction=False)
+        pipe.mget(keys)
+        for key in keys:
+            pipe.pttl(key)
+        raw_values, *pttls = pipe.execute()
+        return [(deserialize_value(raw), _pttl_to_seconds(pttl)) for raw, pttl in zip(raw_values, pttls)]
+
+    def mset(self, mapping: Dict[str, Any], expire_time: int) -> None:
+        """
+        Set several keys in one pipelined round trip, MSET itself cannot set an expiration time
+        """
+        if not mapping:
+            return
+        pipe = self._redis_client.pipeline(transaction=False)
+        for key, value in mapping.items():
+            pipe.set(key, serialize_value(value), ex=expire_time)
+        pipe.execute()
+
+    async def aget(self, key: str) -> Any:
+        """
+        Get the value of a key without blocking the event loop
+        """
+        return deserialize_value(await self.async_client.get(key))
+
+    async def aset(self, key: str, value: Any, expire_time: int) -> None:
+        """
+        Set the value of a key without blocking the event loop
+        """
+        await self.async_client.set(key, serialize_value(value), ex=expire_time)
+
+    async def akeys(self, pattern: str) -> List[str]:
+        """
+        Get all keys matching the pattern with async SCAN, re-checked with fnmatch like scan
+        """
+        keys = [key.decode() async for key in self.async_client.scan_iter(match=pattern, count=100)]
+        return [key for key in keys if fnmatch.fnmatchcase(key, pattern)]
+
+    async def amget(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Get several keys with a single async MGET
+        """
+        if not keys:
+            return []
+        return [deserialize_value(raw) for raw in await self.async_client.mget(keys)]
+
+    async def amget_with_ttl(self, keys: List[str]) -> List[Tuple[Optional[Any], Optional[float]]]:
+        """
+        Get several keys and their PTTL in one async pipelined round trip
+        """
+        if not keys:
+            return []
+        async with self.async_client.pipeline(transaction=False) as pipe:
+            pipe.mget(keys)
+            for key in keys:
+                pipe.pttl(key)
+            raw_values, *pttls = await pipe.execute()
+        return [(deserialize_value(raw), _pttl_to_seconds(pttl)) for raw, pttl in zip(raw_values, pttls)]
+
+    async def amset(self, mapping: Dict[str, Any], expire_time: int) -> None:
+        """
+        Set several keys in one async pipelined round trip
+        """
+        if not mapping:
+            return
+        async with self.async_client.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                pipe.set(key, serialize_value(value), ex=expire_time)
+            await pipe.execute()
 
 
 if __name__ == '__main__':
@@ -89,7 +237,10 @@ if __name__ == '__main__':
     time.sleep(2)
     print(redis_cache.get("name"))  # None
 
-    # special python type usage
+    # batch usage, one round trip for all keys
+    redis_cache.mset({"k1": 1, "k2": {"a": 2}}, 10)
+    print(redis_cache.mget(["k1", "k2", "k3"]))  # [1, {'a': 2}, None]
+
     # list
     redis_cache.set("list", [1, 2, 3], 10)
     _value = redis_cache.get("list")
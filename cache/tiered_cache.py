@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/cache/tiered_cache.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+# -*- coding: utf-8 -*-
+# @Desc    : Two-tier cache, a bounded in-process L1 in front of a shared L2 (Redis)
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from cache.abs_cache import AbstractCache
+from cache.local_cache import ExpiringLocalCache
+
+
+class TieredCache(AbstractCache):
+    """
+    Read-through / write-through cache over two tiers
+    L2 is the source of truth shared across processes, L1 keeps hot keys in memory for at most
+    l1_ttl seconds (never longer than the key lives in L2), which bounds how stale a value
+    changed by another process can be
+    """
+
+    def __init__(self, l2: AbstractCache, l1_max_entries: int = 1024, l1_ttl: float = 60):
+        """
+        :param l2: Shared cache, usually RedisCache
+        :param l1_max_entries: Maximum number of keys kept in memory
+        :param l1_ttl: Maximum time in seconds a key stays in memory
+        :return:
+        """
+        self._l1 = ExpiringLocalCache(max_entries=l1_max_entries)
+        self._l2 = l2
+        self._l1_ttl = l1_ttl
+        self._counters: Dict[str, Dict[str, int]] = {
+            "l1": {"hits": 0, "misses": 0},
+            "l2": {"hits": 0, "misses": 0},
+        }
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a key from L1, falling back to L2 and filling L1 on a hit
+        :param key:
+        :return:
+        """
+        return self.mget([key])[0]
+
+    def set(self, key: str, value: Any, expire_time: int) -> None:
+        """
+        Write the key to L2 first, then to L1
+        :param key:
+        :param value:
+        :param expire_time:
+        :return:
+        """
+        self._l2.set(key, value, expire_time)
+        self._l1.set(key, value, min(expire_time, self._l1_ttl))
+
+    def keys(self, pattern: str) -> List[str]:
+        """
+        Get all keys matching the pattern from L2, L1 only holds a subset
+        :param pattern:
+        :return:
+        """
+        return self._l2.keys(pattern)
+
+    def scan(self, pattern: str = "*", count: int = 100) -> Iterator[str]:
+        """
+        Iterate over the keys matching the pattern in L2
+        :param pattern:
+        :param count:
+        :return:
+        """
+        return self._l2.scan(pattern, count)
+
+    def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Get several keys, the L1 misses are fetched from L2 in one batch
+        :param keys:
+        :return:
+        """
+        values, missing = self._lookup_l1(keys)
+        if missing:
+            self._fill_from_l2(keys, values, missing, self._l2.mget_with_ttl([keys[index] for index in missing]))
+        return values
+
+    def mset(self, mapping: Dict[str, Any], expire_time: int) -> None:
+        """
+        Write several keys to L2 in one batch, then to L1
+        :param mapping:
+        :param expire_time:
+        :return:
+        """
+        self._l2.mset(mapping, expire_time)
+        self._l1.mset(mapping, min(expire_time, self._l1_ttl))
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """
+        Async variant of get, only an L1 miss awaits L2
+        """
+        return (await self.amget([key]))[0]
+
+    async def aset(self, key: str, value: Any, expire_time: int) -> None:
+        """
+        Async variant of set
+        """
+        await self._l2.aset(key, value, expire_time)
+        self._l1.set(key, value, min(expire_time, self._l1_ttl))
+
+    async def akeys(self, pattern: str) -> List[str]:
+        """
+        Async variant of keys
+        """
+        return await self._l2.akeys(pattern)
+
+    async def amget(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Async variant of mget
+        """
+        values, missing = self._lookup_l1(keys)
+        if missing:
+            l2_results = await self._l2.amget_with_ttl([keys[index] for index in missing])
+            self._fill_from_l2(keys, values, missing, l2_results)
+        return values
+
+    async def amset(self, mapping: Dict[str, Any], expire_time: int) -> None:
+        """
+        Async variant of mset
+        """
+        await self._l2.amset(mapping, expire_time)
+        self._l1.mset(mapping, min(expire_time, self._l1_ttl))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Hit and miss counters per tier, an L2 lookup only happens on an L1 miss
+        :return:
+        """
+        stats: Dict[str, Dict[str, Any]] = {}
+        for tier, counters in self._counters.items():
+            lookups = counters["hits"] + counters["misses"]
+            stats[tier] = {
+                **counters,
+                "hit_ratio": round(counters["hits"] / lookups, 4) if lookups else 0.0,
+            }
+        stats["l1"]["size"] = len(self._l1)
+        return stats
+
+    def _lookup_l1(self, keys: List[str]) -> Tuple[List[Optional[Any]], List[int]]:
+        """
+        Look the keys up in L1
+        :param keys:
+        :return: Values in key order (None for the misses) and the positions of the keys missing from L1
+        """
+        values: List[Optional[Any]] = [self._l1.get(key) for key in keys]
+        missing = [index for index, value in enumerate(values) if value is None]
+        self._counters["l1"]["hits"] += len(keys) - len(missing)
+        self._counters["l1"]["misses"] += len(missing)
+        return values, missing
+
+    def _fill_from_l2(self, keys: List[str], values: List[Optional[Any]], missing: List[int],
+                      l2_results: List[Tuple[Optional[Any], Optional[float]]]) -> None:
+        """
+        Merge the L2 results into values and copy the hits into L1, never for longer than they live in L2
+        :param keys:
+        :param values:
+        :param missing:
+        :param l2_results:
+        :return:
+        """
+        for index, (value, ttl) in zip(missing, l2_results):
+            if value is None:
+                self._counters["l2"]["misses"] += 1
+                continue
+            self._counters["l2"]["hits"] += 1
+            values[index] = value
+            l1_ttl = self._l1_ttl if ttl is None else min(ttl, self._l1_ttl)
+            if l1_ttl > 0:
+                self._l1.set(keys[index], value, l1_ttl)
@@ -70,9 +70,11 @@ class SaveDataOptionEnum(str, Enum):
     CSV = "csv"
     DB = "db"
     JSON = "json"
+    JSONL = "jsonl"
     SQLITE = "sqlite"
     MONGODB = "mongodb"
     EXCEL = "excel"
+    PARQUET = "parquet"
 
 
 class InitDbOptionEnum(str, Enum):
@@ -210,7 +212,7 @@ async def parse_cmd(argv: Optional[Sequence[str]] = None):
             SaveDataOptionEnum,
             typer.Option(
                 "--save_data_option",
-                help="Data save option (csv=CSV file | db=MySQL database | json=JSON file | sqlite=SQLite database | mongodb=MongoDB database | excel=Excel file)",
+                help="Data save option (csv=CSV file | db=MySQL database | json=JSON file | jsonl=JSON Lines file | sqlite=SQLite database | mongodb=MongoDB database | excel=Excel file | parquet=Parquet file)",
                 rich_help_panel="Storage Configuration",
             ),
         ] = _coerce_enum(
@@ -248,6 +250,14 @@ async def parse_cmd(argv: Optional[Sequence[str]] = None):
                 rich_help_panel="Basic Configuration",
             ),
         ] = "",
+        resume: Annotated[
+            bool,
+            typer.Option(
+                "--resume",
+                help="Continue from the checkpoint left by an interrupted run, skipping the keywords and pages already completed",
+                rich_help_panel="Runtime Configuration",
+            ),
+        ] = config.RESUME_FROM_CHECKPOINT,
     ) -> SimpleNamespace:
         """MediaCrawler 命令行入口"""
 
@@ -272,6 +282,7 @@ async def parse_cmd(argv: Optional[Sequence[str]] = None):
         config.CDP_HEADLESS = enable_headless
         config.SAVE_DATA_OPTION = save_data_option.value
         config.COOKIES = cookies
+        config.RESUME_FROM_CHECKPOINT = resume
 
         # Set platform-specific ID lists for detail/creator mode
         if specified_id_list:
@@ -312,6 +323,7 @@ async def parse_cmd(argv: Optional[Sequence[str]] = None):
             cookies=config.COOKIES,
             specified_id=specified_id,
             creator_id=creator_id,
+            resume=config.RESUME_FROM_CHECKPOINT,
         )
 
     command = typer.main.get_command(app)
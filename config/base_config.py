@@ -70,8 +70,24 @@ BROWSER_LAUNCH_TIMEOUT = 60
 # 设置为False可以保持浏览器运行，便于调试
 AUTO_CLOSE_BROWSER = True
 
-# 数据保存类型选项配置,支持五种类型：csv、db、json、sqlite、excel, 最好保存到DB，有排重的功能。
-SAVE_DATA_OPTION = "db"  # csv or db or json or sqlite or excel
+# 数据保存类型选项配置,支持：csv、db、json、jsonl、sqlite、mongodb、excel、parquet, 最好保存到DB，有排重的功能。
+# jsonl 每行一条记录，只追加写入，数据量大时比 json 快得多
+SAVE_DATA_OPTION = "db"  # csv or db or json or jsonl or sqlite or excel or parquet
+
+# jsonl 模式下，程序退出时是否额外导出一份传统格式（带缩进的 JSON 数组）的 json 文件
+JSONL_EXPORT_JSON_ON_EXIT = False
+
+# csv 模式下缓冲写入，攒够行数或距上次写入超过间隔（秒）时写入磁盘，程序退出时会写入剩余数据
+# jsonl 模式下文件记录数索引（供 WebUI 数据列表使用）也按同样的行数和间隔批量更新
+CSV_FLUSH_BATCH_SIZE = 100
+CSV_FLUSH_INTERVAL_SEC = 5
+
+# excel 模式下使用流式写入（openpyxl write_only），数据边写边落盘，内存占用不随行数增长，适合大量数据
+# 流式写入的列宽根据表头和前 100 行估算，且写入后无法再读取单元格
+EXCEL_WRITE_ONLY = False
+
+# parquet 模式下每个 row group 的记录数，攒够后写入一个 row group，内存占用以此为上限
+PARQUET_ROW_GROUP_SIZE = 10000
 
 # 用户浏览器缓存的浏览器文件配置
 USER_DATA_DIR = "%s_user_data_dir"  # %s will be replaced by platform name
@@ -79,6 +95,11 @@ USER_DATA_DIR = "%s_user_data_dir"  # %s will be replaced by platform name
 # 爬取开始页数 默认从第一页开始
 START_PAGE = 1
 
+# 是否从上次中断的位置继续爬取（命令行 --resume）
+# 运行过程中每完成一页搜索结果，都会把进度（每个关键词已完成的页数、搜索会话 id、进行中帖子的评论游标）记录到 data/<平台>/.checkpoint/ 下
+# 正常结束时删除进度文件，异常中断后带 --resume 重新运行即可跳过已完成的关键词和页
+RESUME_FROM_CHECKPOINT = False
+
 # 爬取视频/帖子的数量控制
 CRAWLER_MAX_NOTES_COUNT = 15
 
@@ -98,6 +119,24 @@ CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES = 10
 # 老版本项目使用了 db, 则需参考 schema/tables.sql line 287 增加表字段
 ENABLE_GET_SUB_COMMENTS = False
 
+# 是否跳过之前运行已保存过的内容，已保存的内容/评论 ID 记录在 data/<平台>/.seen/ 下，首次开启时从数据库或已有的 json/jsonl/csv 数据中导入
+# 开启后关键词搜索时已保存的帖子/视频不再请求详情和评论，已保存的评论也不再重复写入，重复搜索同一关键词时基本只抓取新内容
+# 注意：已保存内容的点赞数、评论数等数据也就不会再更新
+ENABLE_SEEN_ID_INDEX = False
+
+# 是否增量抓取评论(目前支持小红书、抖音、B站)，每个帖子抓取到的最新一级评论记录在 data/<平台>/.watermark/ 下
+# 开启后再次抓取同一帖子的评论时只保存新增评论，B站改为按时间排序抓取，翻页到上次抓取过的评论就停止
+# 小红书、抖音的评论按热度排序返回，仍会翻完所有评论页，只跳过上次已抓取的评论，翻页被最大评论数截断时不记录水位
+# 注意：上次已抓取评论下新增的二级评论不会再抓取
+ENABLE_INCREMENTAL_COMMENTS = False
+
+# 是否缓存创作者主页信息(小红书、抖音、B站、知乎、贴吧)，同一创作者在缓存有效期内不再重复请求和解析主页
+ENABLE_CREATOR_PROFILE_CACHE = False
+# 创作者信息缓存类型：disk(本地 SQLite 文件，见 db_config.CACHE_DISK_PATH) 或 redis
+CREATOR_PROFILE_CACHE_TYPE = "disk"
+# 创作者信息缓存有效期(秒)，默认 1 天
+CREATOR_PROFILE_CACHE_TTL_SEC = 24 * 60 * 60
+
 # 词云相关
 # 是否开启生成评论词云图
 ENABLE_GET_WORDCLOUD = False
@@ -122,6 +161,12 @@ FONT_PATH = "./docs/STZHONGS.TTF"
 # 爬取间隔时间
 CRAWLER_MAX_SLEEP_SEC = 2.5
 
+# WebUI 数据接口相关
+# 数据文件的扫描、预览、统计在独立线程池中执行，不阻塞爬虫控制接口和日志推送，线程数即同时处理的数据请求上限
+DATA_API_MAX_WORKERS = 4
+# 单个数据请求的超时时间(秒)，超时或客户端断开后停止读取文件
+DATA_API_TIMEOUT_SEC = 30
+
 from .bilibili_config import *
 from .xhs_config import *
 from .dy_config import *
@@ -45,6 +45,20 @@ REDIS_DB_NUM = os.getenv("REDIS_DB_NUM", 0)  # your redis db num
 # cache type
 CACHE_TYPE_REDIS = "redis"
 CACHE_TYPE_MEMORY = "memory"
+CACHE_TYPE_TIERED = "tiered"  # 进程内 L1 + Redis L2，热点键无需网络往返
+CACHE_TYPE_DISK = "disk"  # 本地 SQLite 文件，无需 Redis 也能跨运行保留缓存
+
+# disk 缓存的文件路径
+CACHE_DISK_PATH = os.getenv("CACHE_DISK_PATH", os.path.join("data", ".cache", "cache.sqlite3"))
+
+# tiered 缓存的 L1 配置：最多缓存的键数量，以及键在 L1 中的最长存活时间（秒），即其他进程修改后本进程可能读到旧值的最长时间
+CACHE_L1_MAX_ENTRIES = int(os.getenv("CACHE_L1_MAX_ENTRIES", 1024))
+CACHE_L1_TTL_SEC = int(os.getenv("CACHE_L1_TTL_SEC", 60))
+
+# 缓存指标：按键前缀（如 xhs_、dy_）统计命中/未命中/过期/淘汰次数、值大小和操作耗时分布
+# 计数器无锁，耗时和值大小每 CACHE_METRICS_SAMPLE_EVERY 次操作采样一次，开销很小，可在生产环境常开
+CACHE_METRICS_ENABLED = os.getenv("CACHE_METRICS_ENABLED", "true").lower() == "true"
+CACHE_METRICS_SAMPLE_EVERY = int(os.getenv("CACHE_METRICS_SAMPLE_EVERY", 10))
 
 # sqlite config
 SQLITE_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "database", "sqlite_tables.db")
@@ -53,6 +67,21 @@ sqlite_db_config = {
     "db_path": SQLITE_DB_PATH
 }
 
+# SQLite 连接参数：WAL 模式下读写互不阻塞，synchronous=NORMAL 只在 checkpoint 时 fsync
+SQLITE_JOURNAL_MODE = "WAL"
+SQLITE_SYNCHRONOUS = "NORMAL"
+
+# db/sqlite/mongodb 模式下内容和评论先缓冲，攒够条数或距上次写入超过间隔（秒）时批量 upsert 写入数据库
+DB_WRITE_BATCH_SIZE = 50
+DB_WRITE_FLUSH_INTERVAL_SEC = 5
+
+# SQLAlchemy 连接池配置（db/sqlite 模式），MAX_CONCURRENCY_NUM > 1 时建议 DB_POOL_SIZE 不小于并发数
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))  # 常驻连接数
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))  # 连接池满时允许额外创建的连接数
+DB_POOL_TIMEOUT_SEC = int(os.getenv("DB_POOL_TIMEOUT_SEC", 30))  # 等待空闲连接的超时时间（秒）
+DB_POOL_RECYCLE_SEC = int(os.getenv("DB_POOL_RECYCLE_SEC", 3600))  # 连接最大存活时间（秒），应小于 MySQL wait_timeout
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"  # 取出连接前先 ping，自动替换已断开的连接
+
 # mongodb config
 MONGODB_HOST = os.getenv("MONGODB_HOST", "localhost")
 MONGODB_PORT = os.getenv("MONGODB_PORT", 27017)
@@ -30,7 +30,7 @@ if str(project_root) not in sys.path:
     sys.path.append(str(project_root))
 
 from tools import utils
-from database.db_session import create_tables
+from database.db_session import create_tables, dispose_engines, get_pool_stats
 from var import media_crawler_db_var
 from async_db import AsyncMysqlDB, AsyncSqliteDB
 from config import base_config
@@ -62,6 +62,7 @@ async def init_db(db_type: str = None):
         # SQLite
         from config.db_config import sqlite_db_config
         db_conn = AsyncSqliteDB(db_path=sqlite_db_config['db_path'])
+        await db_conn.connect()
     else:
         # 其他类型（如 json、csv）不需要数据库连接
         db_conn = None
@@ -73,6 +74,13 @@ async def init_db(db_type: str = None):
 
 async def close():
     """
-    Placeholder for closing database connections if needed in the future.
+    Log the connection pool usage of this run, dispose the SQLAlchemy engines
+    and close the SQLite connection opened by init_db
     """
-    pass
+    db_conn = media_crawler_db_var.get(None)
+    if isinstance(db_conn, AsyncSqliteDB):
+        await db_conn.close()
+    pool_stats = get_pool_stats()
+    if pool_stats:
+        utils.logger.info(f"[close] Database pool stats: {pool_stats}")
+    await dispose_engines()
@@ -16,17 +16,26 @@
 # 详细许可条款请参阅项目根目录下的LICENSE文件。
 # 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
 
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+import time
 from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from .models import Base
 import config
+from config import db_config
 from config.db_config import mysql_db_config, sqlite_db_config
 
 # Keep a cache of engines
 _engines = {}
 
+# One session factory per engine, keyed like _engines
+_session_factories = {}
+
+# Time spent waiting for a pooled connection, keyed like _engines
+_pool_wait_stats: Dict[str, Dict] = {}
+
 
 async def create_database_if_not_exists(db_type: str):
     if db_type == "mysql" or db_type == "db":
@@ -45,21 +54,101 @@ def get_async_engine(db_type: str = None):
     if db_type in _engines:
         return _engines[db_type]
 
-    if db_type in ["json", "csv"]:
+    if db_type in ["json", "jsonl", "csv"]:
         return None
 
+    pool_options = {
+        "pool_size": db_config.DB_POOL_SIZE,
+        "max_overflow": db_config.DB_MAX_OVERFLOW,
+        "pool_timeout": db_config.DB_POOL_TIMEOUT_SEC,
+    }
     if db_type == "sqlite":
         db_url = f"sqlite+aiosqlite:///{sqlite_db_config['db_path']}"
     elif db_type == "mysql" or db_type == "db":
         db_url = f"mysql+asyncmy://{mysql_db_config['user']}:{mysql_db_config['password']}@{mysql_db_config['host']}:{mysql_db_config['port']}/{mysql_db_config['db_name']}"
+        # Server side timeouts only apply to MySQL connections
+        pool_options["pool_recycle"] = db_config.DB_POOL_RECYCLE_SEC
+        pool_options["pool_pre_ping"] = db_config.DB_POOL_PRE_PING
     else:
         raise ValueError(f"Unsupported database type: {db_type}")
 
-    engine = create_async_engine(db_url, echo=False)
+    engine = create_async_engine(db_url, echo=False, **pool_options)
+    if db_type == "sqlite":
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
     _engines[db_type] = engine
     return engine
 
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={db_config.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={db_config.SQLITE_SYNCHRONOUS}")
+    cursor.close()
+
+
+def get_session_factory(db_type: str = None) -> Optional[async_sessionmaker]:
+    """
+    Get the cached session factory bound to the engine of db_type
+    """
+    if db_type is None:
+        db_type = config.SAVE_DATA_OPTION
+    engine = get_async_engine(db_type)
+    if not engine:
+        return None
+    factory = _session_factories.get(db_type)
+    if factory is None or factory.kw.get("bind") is not engine:
+        factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        _session_factories[db_type] = factory
+    return factory
+
+
+def get_pool_stats(db_type: str = None) -> Dict:
+    """
+    Get the connection pool usage of the engine of db_type
+
+    Returns:
+        Dict with the pool size, idle/checked-out/overflow connections and the time
+        sessions spent waiting for a connection, empty if the engine was not created
+    """
+    if db_type is None:
+        db_type = config.SAVE_DATA_OPTION
+    engine: AsyncEngine = _engines.get(db_type)
+    if engine is None:
+        return {}
+    pool = engine.pool
+    wait_stats = _pool_wait_stats.get(db_type, {})
+    checkouts = wait_stats.get("checkouts", 0)
+    total_wait_sec = wait_stats.get("total_wait_sec", 0.0)
+    return {
+        "pool_size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "checkouts": checkouts,
+        "avg_wait_ms": round(total_wait_sec / checkouts * 1000, 3) if checkouts else 0.0,
+        "max_wait_ms": round(wait_stats.get("max_wait_sec", 0.0) * 1000, 3),
+    }
+
+
+def _record_pool_wait(db_type: str, wait_sec: float):
+    wait_stats = _pool_wait_stats.setdefault(db_type, {"checkouts": 0, "total_wait_sec": 0.0, "max_wait_sec": 0.0})
+    wait_stats["checkouts"] += 1
+    wait_stats["total_wait_sec"] += wait_sec
+    wait_stats["max_wait_sec"] = max(wait_stats["max_wait_sec"], wait_sec)
+
+
+async def dispose_engines():
+    """
+    Dispose all cached engines and their session factories
+    """
+    engines = list(_engines.values())
+    _engines.clear()
+    _session_factories.clear()
+    _pool_wait_stats.clear()
+    for engine in engines:
+        await engine.dispose()
+
+
 async def create_tables(db_type: str = None):
     if db_type is None:
         db_type = config.SAVE_DATA_OPTION
@@ -72,13 +161,17 @@ async def create_tables(db_type: str = None):
 
 @asynccontextmanager
 async def get_session() -> AsyncSession:
-    engine = get_async_engine(config.SAVE_DATA_OPTION)
-    if not engine:
+    db_type = config.SAVE_DATA_OPTION
+    session_factory = get_session_factory(db_type)
+    if not session_factory:
         yield None
         return
-    AsyncSessionFactory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    session = AsyncSessionFactory()
+    session = session_factory()
     try:
+        # Check out the connection up front so the time spent waiting on the pool is measured
+        wait_start = time.perf_counter()
+        await session.connection()
+        _record_pool_wait(db_type, time.perf_counter() - wait_start)
         yield session
         await session.commit()
     except Exception as e:
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/database/db_upsert_buffer.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""Write-behind buffer that flushes ORM rows as batched upserts"""
+import asyncio
+import time
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import insert, inspect, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import db_config
+from database.db_session import get_session
+from tools import utils
+
+# Keep every statement below SQLite's historical limit of 999 bound parameters
+MAX_BIND_PARAMS = 900
+
+# Columns that are only written when a row is first inserted
+INSERT_ONLY_COLUMNS = ("id", "add_ts")
+
+
+class DbUpsertBuffer:
+    """
+    Collects rows for one table and writes them with one upsert statement per flush:
+    INSERT ... ON DUPLICATE KEY UPDATE on MySQL, INSERT ... ON CONFLICT DO UPDATE on SQLite.
+    Tables created before the key column was made unique fall back to one SELECT plus
+    a bulk INSERT and a bulk UPDATE per flush.
+    """
+
+    def __init__(
+        self,
+        model,
+        key_column: str,
+        update_columns: Optional[List[str]] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+    ):
+        """
+        Args:
+            model: ORM model class of the target table
+            key_column: Column identifying a record (note_id, comment_id, etc.)
+            update_columns: Columns refreshed when the record exists, all written columns except add_ts by default
+            batch_size: Flush once this many distinct records are buffered
+            flush_interval: Flush once this many seconds passed since the last flush, a timer flushes a quiet buffer
+        """
+        self.model = model
+        self.table = model.__table__
+        self.key_column = key_column
+        self.update_columns = update_columns
+        self.batch_size = batch_size or db_config.DB_WRITE_BATCH_SIZE
+        self.flush_interval = db_config.DB_WRITE_FLUSH_INTERVAL_SEC if flush_interval is None else flush_interval
+        self.lock = asyncio.Lock()
+        self._rows: Dict[str, Dict] = {}
+        self._last_flush_time = time.monotonic()
+        self._key_is_unique: Optional[bool] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def add(self, item: Dict):
+        """
+        Buffer one record, flushing when the batch is full or the flush interval has passed
+        A record buffered twice is written once with the latest values
+        """
+        row = {key: value for key, value in item.items() if key in self.table.c}
+        if row.get(self.key_column) is None:
+            return
+        async with self.lock:
+            row_key = str(row[self.key_column])
+            pending = self._rows.get(row_key)
+            self._rows[row_key] = {**pending, **row} if pending else row
+            if len(self._rows) >= self.batch_size or time.monotonic() - self._last_flush_time >= self.flush_interval:
+                await self._flush()
+            elif self._flush_task is None or self._flush_task.done():
+                self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def flush(self):
+        """Write all buffered records"""
+        async with self.lock:
+            await self._flush()
+
+    async def _flush_later(self):
+        """Flush the rows of a buffer no write came to once the flush interval has passed"""
+        while True:
+            await asyncio.sleep(max(self.flush_interval - (time.monotonic() - self._last_flush_time), 0))
+            async with self.lock:
+                if not self._rows:
+                    return
+                if time.monotonic() - self._last_flush_time < self.flush_interval:
+                    continue
+                try:
+                    await self._flush()
+                except Exception:
+                    # Logged by _flush, the rows are kept and retried after another interval
+                    continue
+
+    async def _flush(self):
+        """
+        Write the buffered records, they stay buffered for the next flush when the write fails
+        """
+        self._last_flush_time = time.monotonic()
+        if not self._rows:
+            return
+        rows = list(self._rows.values())
+
+        try:
+            async with get_session() as session:
+                if session is None:
+                    raise RuntimeError("no database session, SAVE_DATA_OPTION is not db or sqlite")
+                if self._key_is_unique is None:
+                    self._key_is_unique = await session.run_sync(self._check_key_is_unique)
+                dialect_name = session.bind.dialect.name
+                for chunk in self._chunks(rows):
+                    if self._key_is_unique and dialect_name in ("mysql", "sqlite"):
+                        await session.execute(self._build_upsert(dialect_name, chunk))
+                    else:
+                        await self._select_then_write(session, chunk)
+        except Exception as e:
+            utils.logger.error(
+                f"[DbUpsertBuffer._flush] Write of {len(rows)} {self.table.name} rows failed, kept for the next flush: {e}"
+            )
+            raise
+
+        # The lock is held, no record was buffered while writing
+        self._rows.clear()
+        if self._flush_task is not None and self._flush_task is not asyncio.current_task():
+            self._flush_task.cancel()
+            self._flush_task = None
+
+    def _check_key_is_unique(self, sync_session) -> bool:
+        inspector = inspect(sync_session.connection())
+        key_columns = [self.key_column]
+        for index in inspector.get_indexes(self.table.name):
+            if index.get("unique") and index.get("column_names") == key_columns:
+                return True
+        for constraint in inspector.get_unique_constraints(self.table.name):
+            if constraint.get("column_names") == key_columns:
+                return True
+        return False
+
+    def _chunks(self, rows: List[Dict]) -> Iterator[List[Dict]]:
+        """
+        Split rows into groups sharing the same columns, multi-row VALUES needs identical keys,
+        and keep each group within the bound parameter limit
+        """
+        groups: Dict[tuple, List[Dict]] = {}
+        for row in rows:
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+        for columns, group in groups.items():
+            step = max(1, MAX_BIND_PARAMS // len(columns))
+            for i in range(0, len(group), step):
+                yield group[i:i + step]
+
+    def _get_update_columns(self, row: Dict) -> List[str]:
+        if self.update_columns is not None:
+            return [column for column in self.update_columns if column in row]
+        return [column for column in row if column != self.key_column and column not in INSERT_ONLY_COLUMNS]
+
+    def _build_upsert(self, dialect_name: str, rows: List[Dict]):
+        update_columns = self._get_update_columns(rows[0])
+        if dialect_name == "mysql":
+            stmt = mysql_insert(self.table).values(rows)
+            # MySQL needs at least one assignment, re-assigning the key makes it a no-op
+            update_columns = update_columns or [self.key_column]
+            return stmt.on_duplicate_key_update({column: stmt.inserted[column] for column in update_columns})
+
+        stmt = sqlite_insert(self.table).values(rows)
+        if not update_columns:
+            return stmt.on_conflict_do_nothing(index_elements=[self.key_column])
+        return stmt.on_conflict_do_update(
+            index_elements=[self.key_column],
+            set_={column: stmt.excluded[column] for column in update_columns},
+        )
+
+    async def _select_then_write(self, session: AsyncSession, rows: List[Dict]):
+        key_column = self.table.c[self.key_column]
+        primary_key = list(self.table.primary_key.columns)[0]
+        result = await session.execute(
+            select(primary_key, key_column).where(key_column.in_([row[self.key_column] for row in rows]))
+        )
+        existing_ids: Dict[str, List] = {}
+        for row_id, row_key in result:
+            existing_ids.setdefault(str(row_key), []).append(row_id)
+
+        new_rows = [row for row in rows if str(row[self.key_column]) not in existing_ids]
+        if new_rows:
+            await session.execute(insert(self.table), new_rows)
+
+        updated_rows = []
+        for row in rows:
+            update_values = {column: row[column] for column in self._get_update_columns(row)}
+            if not update_values:
+                continue
+            for row_id in existing_ids.get(str(row[self.key_column]), []):
+                updated_rows.append({primary_key.name: row_id, **update_values})
+        if updated_rows:
+            await session.execute(update(self.model), updated_rows)
@@ -58,7 +58,7 @@ class BilibiliVideoComment(Base):
     avatar = Column(Text)
     add_ts = Column(String(32))
     last_modify_ts = Column(String(32))
-    comment_id = Column(BigInteger, index=True)
+    comment_id = Column(BigInteger, index=True, unique=True)
     video_id = Column(BigInteger, index=True)
     content = Column(Text)
     create_time = Column(String(32))
@@ -123,7 +123,7 @@ class DouyinAweme(Base):
     ip_location = Column(Text)
     add_ts = Column(String(32))
     last_modify_ts = Column(String(32))
-    aweme_id = Column(BigInteger, index=True)
+    aweme_id = Column(BigInteger, index=True, unique=True)
     aweme_type = Column(Text)
     title = Column(Text)
     desc = Column(Text)
@@ -153,7 +153,7 @@ class DouyinAwemeComment(Base):
     ip_location = Column(Text)
     add_ts = Column(String(32))
     last_modify_ts = Column(String(32))
-    comment_id = Column(BigInteger, index=True)
+    comment_id = Column(BigInteger, index=True, unique=True)
     aweme_id = Column(BigInteger, index=True)
     content = Column(Text)
     create_time = Column(String(32))
@@ -186,7 +186,7 @@ class KuaishouVideo(Base):
     avatar = Column(Text)
     add_ts = Column(String(32))
     last_modify_ts = Column(String(32))
-    video_id = Column(String(255), index=True)
+    video_id = Column(String(255), index=True, unique=True)
     video_type = Column(Text)
     title = Column(Text)
     desc = Column(Text)
@@ -206,7 +206,7 @@ class KuaishouVideoComment(Base):
     avatar = Column(Text)
     add_ts = Column(String(32))
     last_modify_ts = Column(String(32))
-    comment_id = Column(BigInteger, index=True)
+    comment_id = Column(BigInteger, index=True, unique=True)
     video_id = Column(String(255), index=True)
     content = Column(Text)
     create_time = Column(String(32))
@@ -223,7 +223,7 @@ class WeiboNote(Base):
     ip_location = Column(Text, default='')
     add_ts = Column(String(32))
     last_modify_ts = Column(String(32))
-    note_id = Column(BigInteger, index=True)
+    note_id = Column(BigInteger, index=True, unique=True)
     content = Column(Text)
     create_time = Column(String(32), index=True)
     create_date_time = Column(String(255), index=True)
@@ -244,7 +244,7 @@ class WeiboNoteComment(Base):
     ip_location = Column(Text, default='')
     add_ts = Column(String(32))
     last_modify_ts = Column(String(32))
-    comment_id = Column(BigInteger, index=True)
+    comment_id = Column(BigInteger, index=True, unique=True)
     note_id = Column(BigInteger, index=True)
     content = Column(Text)
     create_time = Column(String(32))
@@ -293,7 +293,7 @@ class XhsNote(Base):
     ip_location = Column(Text)
     add_ts = Column(String(32))
     last_modify_ts = Column(String(32))
-    note_id = Column(String(255), index=True)
+    note_id = Column(String(255), index=True, unique=True)
     type = Column(Text)
     title = Column(Text)
     desc = Column(Text)
@@ -319,7 +319,7 @@ class XhsNoteComment(Base):
     ip_location = Column(Text)
     add_ts = Column(String(32))
     last_modify_ts = Column(String(32))
-    comment_id = Column(String(255), index=True)
+    comment_id = Column(String(255), index=True, unique=True)
     create_time = Column(String(32), index=True)
     note_id = Column(String(255))
     content = Column(Text)
@@ -331,7 +331,7 @@ class XhsNoteComment(Base):
 class TiebaNote(Base):
     __tablename__ = 'tieba_note'
     id = Column(Integer, primary_key=True)
-    note_id = Column(String(644), index=True)
+    note_id = Column(String(644), index=True, unique=True)
     title = Column(Text)
     desc = Column(Text)
     note_url = Column(Text)
@@ -352,7 +352,7 @@ class TiebaNote(Base):
 class TiebaComment(Base):
     __tablename__ = 'tieba_comment'
     id = Column(Integer, primary_key=True)
-    comment_id = Column(String(255), index=True)
+    comment_id = Column(String(255), index=True, unique=True)
     parent_comment_id = Column(String(255), default='')
     content = Column(Text)
     user_link = Column(Text, default='')
@@ -387,7 +387,7 @@ class TiebaCreator(Base):
 class ZhihuContent(Base):
     __tablename__ = 'zhihu_content'
     id = Column(Integer, primary_key=True)
-    content_id = Column(String(64), index=True)
+    content_id = Column(String(64), index=True, unique=True)
     content_type = Column(Text)
     content_text = Column(Text)
     content_url = Column(Text)
@@ -416,7 +416,7 @@ class ZhihuContent(Base):
 class ZhihuComment(Base):
     __tablename__ = 'zhihu_comment'
     id = Column(Integer, primary_key=True)
-    comment_id = Column(String(64), index=True)
+    comment_id = Column(String(64), index=True, unique=True)
     parent_comment_id = Column(String(64))
     content = Column(Text)
     publish_time = Column(String(32), index=True)
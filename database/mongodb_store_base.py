@@ -18,8 +18,10 @@
 
 """MongoDB storage base class: Provides connection management and common storage methods"""
 import asyncio
-from typing import Dict, List, Optional
+import time
+from typing import Dict, List, Optional, Set, Tuple
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
+from pymongo import UpdateOne
 from config import db_config
 from tools import utils
 
@@ -30,6 +32,9 @@ class MongoDBConnection:
     _client: Optional[AsyncIOMotorClient] = None
     _db: Optional[AsyncIOMotorDatabase] = None
     _lock = asyncio.Lock()
+    # (collection name, field) pairs declared by the stores and not yet created
+    _pending_indexes: Set[Tuple[str, str]] = set()
+    _created_indexes: Set[Tuple[str, str]] = set()
 
     def __new__(cls):
         if cls._instance is None:
@@ -45,13 +50,38 @@ class MongoDBConnection:
         return self._client
 
     async def get_db(self) -> AsyncIOMotorDatabase:
-        """Get database"""
+        """Get database, creating declared indexes on first use"""
         if self._db is None:
             async with self._lock:
                 if self._db is None:
                     await self._connect()
+        if self._pending_indexes:
+            await self._ensure_indexes()
         return self._db
 
+    def register_index(self, collection_name: str, field: str):
+        """Declare an ascending index on field, created once the next time the database is used"""
+        index = (collection_name, field)
+        if index not in self._created_indexes:
+            self._pending_indexes.add(index)
+
+    async def _ensure_indexes(self):
+        """Create declared indexes, create_index is a no-op for indexes that already exist"""
+        async with self._lock:
+            failed = set()
+            while self._pending_indexes:
+                collection_name, field = self._pending_indexes.pop()
+                try:
+                    await self._db[collection_name].create_index([(field, 1)])
+                    utils.logger.info(f"[MongoDBConnection] Index on {collection_name}.{field} ready")
+                except Exception as e:
+                    utils.logger.error(f"[MongoDBConnection] Create index on {collection_name}.{field} failed: {e}")
+                    failed.add((collection_name, field))
+                    continue
+                self._created_indexes.add((collection_name, field))
+            # Retried the next time the database is used
+            self._pending_indexes.update(failed)
+
     async def _connect(self):
         """Establish connection"""
         try:
@@ -88,13 +118,27 @@ class MongoDBConnection:
 class MongoDBStoreBase:
     """MongoDB storage base class: Provides common CRUD operations"""
 
-    def __init__(self, collection_prefix: str):
+    def __init__(self, collection_prefix: str, indexes: Optional[Dict[str, str]] = None,
+                 batch_size: Optional[int] = None, flush_interval: Optional[float] = None):
         """Initialize storage base class
         Args:
             collection_prefix: Platform prefix (xhs/douyin/bilibili, etc.)
+            indexes: Key field per collection suffix, e.g. {"contents": "note_id"}, indexed on first connection
+            batch_size: save_or_update_buffered flushes once this many documents are pending
+            flush_interval: save_or_update_buffered flushes queued documents once this many seconds passed since the last flush
         """
         self.collection_prefix = collection_prefix
         self._connection = MongoDBConnection()
+        self.batch_size = batch_size or db_config.DB_WRITE_BATCH_SIZE
+        self.flush_interval = db_config.DB_WRITE_FLUSH_INTERVAL_SEC if flush_interval is None else flush_interval
+        self._buffer_lock = asyncio.Lock()
+        # collection suffix -> (key field, {key value: document})
+        self._pending: Dict[str, Tuple[str, Dict]] = {}
+        self._pending_count = 0
+        self._last_flush_time = time.monotonic()
+        self._flush_task: Optional[asyncio.Task] = None
+        for collection_suffix, field in (indexes or {}).items():
+            self._connection.register_index(f"{collection_prefix}_{collection_suffix}", field)
 
     async def get_collection(self, collection_suffix: str) -> AsyncIOMotorCollection:
         """Get collection: {prefix}_{suffix}"""
@@ -112,6 +156,78 @@ class MongoDBStoreBase:
             utils.logger.error(f"[MongoDBStoreBase] Save failed ({self.collection_prefix}_{collection_suffix}): {e}")
             return False
 
+    async def save_or_update_many(self, collection_suffix: str, key_field: str, items: List[Dict]) -> bool:
+        """Save or update documents with one unordered bulk_write, each matched on key_field"""
+        try:
+            await self._bulk_upsert(collection_suffix, key_field, items)
+            return True
+        except Exception as e:
+            utils.logger.error(f"[MongoDBStoreBase] Bulk save failed ({self.collection_prefix}_{collection_suffix}): {e}")
+            return False
+
+    async def _bulk_upsert(self, collection_suffix: str, key_field: str, items: List[Dict]):
+        if not items:
+            return
+        collection = await self.get_collection(collection_suffix)
+        operations = [UpdateOne({key_field: item[key_field]}, {"$set": item}, upsert=True) for item in items]
+        await collection.bulk_write(operations, ordered=False)
+
+    async def save_or_update_buffered(self, collection_suffix: str, key_field: str, data: Dict):
+        """Queue a document for save_or_update_many, flushing when the batch is full or the flush interval has passed
+        A document queued twice is written once with the merged fields
+        """
+        async with self._buffer_lock:
+            _, documents = self._pending.setdefault(collection_suffix, (key_field, {}))
+            key = data[key_field]
+            if key in documents:
+                documents[key] = {**documents[key], **data}
+            else:
+                documents[key] = data
+                self._pending_count += 1
+            if self._pending_count >= self.batch_size or time.monotonic() - self._last_flush_time >= self.flush_interval:
+                await self._flush()
+            elif self._flush_task is None or self._flush_task.done():
+                self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def flush(self):
+        """Write all queued documents"""
+        async with self._buffer_lock:
+            await self._flush()
+
+    async def _flush_later(self):
+        """Flush the documents of a buffer no write came to once the flush interval has passed"""
+        while True:
+            await asyncio.sleep(max(self.flush_interval - (time.monotonic() - self._last_flush_time), 0))
+            async with self._buffer_lock:
+                if not self._pending:
+                    return
+                if time.monotonic() - self._last_flush_time < self.flush_interval:
+                    continue
+                try:
+                    await self._flush()
+                except Exception:
+                    # Logged by _flush, the documents are kept and retried after another interval
+                    continue
+
+    async def _flush(self):
+        """Write the queued documents, a collection whose write fails stays queued for the next flush"""
+        self._last_flush_time = time.monotonic()
+        # The lock is held, no document is queued while writing
+        for collection_suffix, (key_field, documents) in list(self._pending.items()):
+            try:
+                await self._bulk_upsert(collection_suffix, key_field, list(documents.values()))
+            except Exception as e:
+                utils.logger.error(
+                    f"[MongoDBStoreBase] Bulk save of {len(documents)} documents failed "
+                    f"({self.collection_prefix}_{collection_suffix}), kept for the next flush: {e}"
+                )
+                raise
+            del self._pending[collection_suffix]
+            self._pending_count -= len(documents)
+        if self._flush_task is not None and self._flush_task is not asyncio.current_task():
+            self._flush_task.cancel()
+            self._flush_task = None
+
     async def find_one(self, collection_suffix: str, query: Dict) -> Optional[Dict]:
         """Query a single record"""
         try:
@@ -33,7 +33,11 @@ from media_platform.tieba import TieBaCrawler
 from media_platform.weibo import WeiboCrawler
 from media_platform.xhs import XiaoHongShuCrawler
 from media_platform.zhihu import ZhihuCrawler
+from store.run_dedup import close_run_dedups
+from store.seen_id_index import close_seen_id_indexes, load_seen_id_index
+from store.store_registry import StoreRegistry
 from tools.async_file_writer import AsyncFileWriter
+from tools.crawl_checkpoint import clear_crawl_checkpoints
 from var import crawler_type_var
 
 
@@ -59,6 +63,17 @@ class CrawlerFactory:
 
 crawler: Optional[AbstractCrawler] = None
 
+# data/<dir> used by the file stores, where it differs from the platform flag
+FILE_STORE_PLATFORM_DIRS = {
+    "dy": "douyin",
+    "ks": "kuaishou",
+    "wb": "weibo",
+}
+
+
+def _file_store_platform() -> str:
+    return FILE_STORE_PLATFORM_DIRS.get(config.PLATFORM, config.PLATFORM)
+
 
 def _flush_excel_if_needed() -> None:
     if config.SAVE_DATA_OPTION != "excel":
@@ -74,12 +89,12 @@ def _flush_excel_if_needed() -> None:
 
 
 async def _generate_wordcloud_if_needed() -> None:
-    if config.SAVE_DATA_OPTION != "json" or not config.ENABLE_GET_WORDCLOUD:
+    if config.SAVE_DATA_OPTION not in ("json", "jsonl") or not config.ENABLE_GET_WORDCLOUD:
         return
 
     try:
         file_writer = AsyncFileWriter(
-            platform=config.PLATFORM,
+            platform=_file_store_platform(),
             crawler_type=crawler_type_var.get(),
         )
         await file_writer.generate_wordcloud_from_comments()
@@ -87,6 +102,21 @@ async def _generate_wordcloud_if_needed() -> None:
         print(f"[Main] Error generating wordcloud: {e}")
 
 
+async def _export_jsonl_to_json_if_needed() -> None:
+    if config.SAVE_DATA_OPTION != "jsonl" or not config.JSONL_EXPORT_JSON_ON_EXIT:
+        return
+
+    try:
+        file_writer = AsyncFileWriter(
+            platform=_file_store_platform(),
+            crawler_type=crawler_type_var.get(),
+        )
+        written = await file_writer.finalize_jsonl()
+        print(f"[Main] Exported {len(written)} JSONL files to JSON")
+    except Exception as e:
+        print(f"[Main] Error exporting JSONL to JSON: {e}")
+
+
 async def _run_chat_automation_if_needed() -> None:
     """在数据存储完成后运行私信自动化"""
     # 只有当数据保存到数据库且启用了私信自动化时才运行
@@ -143,13 +173,23 @@ async def main() -> None:
         await db.init_db()
         print(f"[Main] Database initialized for {config.SAVE_DATA_OPTION} mode")
 
+    # Load the IDs stored by previous runs so they are not fetched again
+    await load_seen_id_index(_file_store_platform())
+
     crawler = CrawlerFactory.create_crawler(platform=config.PLATFORM)
     await crawler.start()
+    # The run finished, a later --resume has nothing to continue
+    clear_crawl_checkpoints()
+
+    # Flush buffered store writes before anything reads the saved data back
+    await StoreRegistry.close_all()
+    await close_seen_id_indexes()
+    await close_run_dedups()
 
     _flush_excel_if_needed()
 
     # Generate wordcloud after crawling is complete
-    # Only for JSON save mode
+    # Only for JSON/JSONL save mode
     await _generate_wordcloud_if_needed()
 
     # Run chat automation after data storage is complete
@@ -176,6 +216,16 @@ async def async_cleanup() -> None:
                 if "closed" not in error_msg and "disconnected" not in error_msg:
                     print(f"[Main] Error closing browser context: {e}")
 
+    # Flush and close the stores shared by this run
+    await StoreRegistry.close_all()
+    await close_seen_id_indexes()
+    await close_run_dedups()
+
+    await _export_jsonl_to_json_if_needed()
+
+    if config.SAVE_DATA_OPTION in ("csv", "jsonl"):
+        await AsyncFileWriter.close_all()
+
     if config.SAVE_DATA_OPTION in ("db", "sqlite"):
         await db.close()
 
@@ -34,6 +34,8 @@ import config
 from base.base_crawler import AbstractApiClient
 from proxy.proxy_mixin import ProxyRefreshMixin
 from tools import utils
+from tools.comment_watermark import CommentWatermarks
+from tools.creator_profile_cache import get_cached_creator_profile
 
 if TYPE_CHECKING:
     from proxy.proxy_ip_pool import ProxyIpPool
@@ -259,6 +261,7 @@ class BilibiliClient(AbstractApiClient, ProxyRefreshMixin):
         is_fetch_sub_comments=False,
         callback: Optional[Callable] = None,
         max_count: int = 10,
+        watermarks: Optional[CommentWatermarks] = None,
     ):
         """
         get video all comments include sub comments
@@ -267,6 +270,7 @@ class BilibiliClient(AbstractApiClient, ProxyRefreshMixin):
         :param is_fetch_sub_comments:
         :param callback:
         max_count: Maximum number of comments to crawl per note
+        :param watermarks: Stop paging at the comments fetched by previous runs, comments are then ordered by time
 
         :return:
         """
@@ -274,11 +278,12 @@ class BilibiliClient(AbstractApiClient, ProxyRefreshMixin):
         is_end = False
         next_page = 0
         max_retries = 3
+        order_mode = CommentOrderType.TIME if watermarks and watermarks.enabled else CommentOrderType.DEFAULT
         while not is_end and len(result) < max_count:
             comments_res = None
             for attempt in range(max_retries):
                 try:
-                    comments_res = await self.get_video_comments(video_id, CommentOrderType.DEFAULT, next_page)
+                    comments_res = await self.get_video_comments(video_id, order_mode, next_page)
                     break  # Success
                 except DataFetchError as e:
                     if attempt < max_retries - 1:
@@ -310,6 +315,10 @@ class BilibiliClient(AbstractApiClient, ProxyRefreshMixin):
             if not isinstance(is_end, bool):
                 utils.logger.warning(f"[BilibiliClient.get_video_all_comments] 'is_end' is not a boolean for video_id: {video_id}. Assuming end of comments.")
                 is_end = True
+            if watermarks:
+                comment_list, reached_watermark = watermarks.new_comments(video_id, comment_list)
+                if reached_watermark:
+                    is_end = True
             if is_fetch_sub_comments:
                 for comment in comment_list:
                     comment_id = comment['rpid']
@@ -317,6 +326,8 @@ class BilibiliClient(AbstractApiClient, ProxyRefreshMixin):
                         {await self.get_video_all_level_two_comments(video_id, comment_id, CommentOrderType.DEFAULT, 10, crawl_interval, callback)}
             if len(result) + len(comment_list) > max_count:
                 comment_list = comment_list[:max_count - len(result)]
+            if watermarks:
+                watermarks.observe(video_id, comment_list)
             if callback:  # If there is a callback function, execute it
                 await callback(video_id, comment_list)
             await asyncio.sleep(crawl_interval)
@@ -411,7 +422,7 @@ class BilibiliClient(AbstractApiClient, ProxyRefreshMixin):
         post_data = {
             "mid": creator_id,
         }
-        return await self.get(uri, post_data)
+        return await get_cached_creator_profile("bili", str(creator_id), lambda: self.get(uri, post_data))
 
     async def get_creator_fans(
         self,
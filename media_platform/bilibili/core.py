@@ -43,8 +43,12 @@ import config
 from base.base_crawler import AbstractCrawler
 from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
 from store import bilibili as bilibili_store
+from store.run_dedup import get_run_dedup
+from store.seen_id_index import get_seen_id_index
 from tools import utils
 from tools.cdp_browser import CDPBrowserManager
+from tools.comment_watermark import get_comment_watermarks
+from tools.crawl_checkpoint import get_crawl_checkpoint
 from var import crawler_type_var, source_keyword_var
 
 from .client import BilibiliClient
@@ -186,10 +190,14 @@ class BilibiliCrawler(AbstractCrawler):
         if config.CRAWLER_MAX_NOTES_COUNT < bili_limit_count:
             config.CRAWLER_MAX_NOTES_COUNT = bili_limit_count
         start_page = config.START_PAGE  # start page number
+        checkpoint = get_crawl_checkpoint("bili")
         for keyword in config.KEYWORDS.split(","):
             source_keyword_var.set(keyword)
+            if checkpoint.is_keyword_done(keyword):
+                utils.logger.info(f"[BilibiliCrawler.search_by_keywords] Skip keyword {keyword} completed by the previous run")
+                continue
             utils.logger.info(f"[BilibiliCrawler.search_by_keywords] Current search keyword: {keyword}")
-            page = 1
+            page = checkpoint.resume_page(keyword, 1)
             while (page - start_page + 1) * bili_limit_count <= config.CRAWLER_MAX_NOTES_COUNT:
                 if page < start_page:
                     utils.logger.info(f"[BilibiliCrawler.search_by_keywords] Skip page: {page}")
@@ -213,9 +221,14 @@ class BilibiliCrawler(AbstractCrawler):
                     break
 
                 semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+                seen_id_index = get_seen_id_index("bili")
                 task_list = []
                 try:
-                    task_list = [self.get_video_info_task(aid=video_item.get("aid"), bvid="", semaphore=semaphore) for video_item in video_list]
+                    task_list = [
+                        self.get_video_info_task(aid=video_item.get("aid"), bvid="", semaphore=semaphore)
+                        for video_item in video_list if not seen_id_index.has_content(video_item.get("aid"))
+                        and await get_run_dedup("bili").claim(video_item.get("aid"), keyword)
+                    ]
                 except Exception as e:
                     utils.logger.warning(f"[BilibiliCrawler.search_by_keywords] error in the task list. The video for this page will not be included. {e}")
                 video_items = await asyncio.gather(*task_list)
@@ -232,6 +245,8 @@ class BilibiliCrawler(AbstractCrawler):
                 utils.logger.info(f"[BilibiliCrawler.search_by_keywords] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after page {page-1}")
 
                 await self.batch_get_video_comments(video_id_list)
+                await checkpoint.complete_page(keyword, page - 1)
+            await checkpoint.complete_keyword(keyword)
 
     async def search_by_keywords_in_time_range(self, daily_limit: bool):
         """
@@ -288,7 +303,12 @@ class BilibiliCrawler(AbstractCrawler):
                             break
 
                         semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
-                        task_list = [self.get_video_info_task(aid=video_item.get("aid"), bvid="", semaphore=semaphore) for video_item in video_list]
+                        seen_id_index = get_seen_id_index("bili")
+                        task_list = [
+                            self.get_video_info_task(aid=video_item.get("aid"), bvid="", semaphore=semaphore)
+                            for video_item in video_list if not seen_id_index.has_content(video_item.get("aid"))
+                            and await get_run_dedup("bili").claim(video_item.get("aid"), keyword)
+                        ]
                         video_items = await asyncio.gather(*task_list)
 
                         for video_item in video_items:
@@ -348,13 +368,16 @@ class BilibiliCrawler(AbstractCrawler):
                 utils.logger.info(f"[BilibiliCrawler.get_comments] begin get video_id: {video_id} comments ...")
                 await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
                 utils.logger.info(f"[BilibiliCrawler.get_comments] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after fetching comments for video {video_id}")
+                watermarks = get_comment_watermarks("bili")
                 await self.bili_client.get_video_all_comments(
                     video_id=video_id,
                     crawl_interval=config.CRAWLER_MAX_SLEEP_SEC,
                     is_fetch_sub_comments=config.ENABLE_GET_SUB_COMMENTS,
                     callback=bilibili_store.batch_update_bilibili_video_comments,
                     max_count=config.CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES,
+                    watermarks=watermarks,
                 )
+                await watermarks.commit(video_id)
 
             except DataFetchError as ex:
                 utils.logger.error(f"[BilibiliCrawler.get_comments] get video_id: {video_id} comment error: {ex}")
@@ -29,6 +29,8 @@ from playwright.async_api import BrowserContext
 from base.base_crawler import AbstractApiClient
 from proxy.proxy_mixin import ProxyRefreshMixin
 from tools import utils
+from tools.comment_watermark import CommentWatermarks
+from tools.creator_profile_cache import get_cached_creator_profile
 from var import request_keyword_var
 
 if TYPE_CHECKING:
@@ -243,6 +245,7 @@ class DouYinClient(AbstractApiClient, ProxyRefreshMixin):
         is_fetch_sub_comments=False,
         callback: Optional[Callable] = None,
         max_count: int = 10,
+        watermarks: Optional[CommentWatermarks] = None,
     ):
         """
         获取帖子的所有评论，包括子评论
@@ -251,6 +254,7 @@ class DouYinClient(AbstractApiClient, ProxyRefreshMixin):
         :param is_fetch_sub_comments: 是否抓取子评论
         :param callback: 回调函数，用于处理抓取到的评论
         :param max_count: 一次帖子爬取的最大评论数量
+        :param watermarks: 增量抓取时跳过之前运行已抓取的评论，评论按热度排序返回，仍会翻完所有评论页
         :return: 评论列表
         """
         result = []
@@ -261,10 +265,21 @@ class DouYinClient(AbstractApiClient, ProxyRefreshMixin):
             comments_has_more = comments_res.get("has_more", 0)
             comments_cursor = comments_res.get("cursor", 0)
             comments = comments_res.get("comments", [])
+            if watermarks and comments:
+                comments, reached_watermark = watermarks.new_comments(aweme_id, comments)
+                if reached_watermark:
+                    comments_has_more = 0
+            if watermarks and not comments_has_more and len(result) + len(comments) <= max_count:
+                # 翻到最后一页且没有被 max_count 截断，才能移动热度排序评论的水位
+                watermarks.finish_paging(aweme_id)
             if not comments:
+                # 整页都是已抓取的评论时也要按间隔翻页
+                await asyncio.sleep(crawl_interval)
                 continue
             if len(result) + len(comments) > max_count:
                 comments = comments[:max_count - len(result)]
+            if watermarks:
+                watermarks.observe(aweme_id, comments)
             result.extend(comments)
             if callback:  # 如果有回调函数，就执行回调函数
                 await callback(aweme_id, comments)
@@ -302,7 +317,7 @@ class DouYinClient(AbstractApiClient, ProxyRefreshMixin):
             "publish_video_strategy_type": 2,
             "personal_center_strategy": 1,
         }
-        return await self.get(uri, params)
+        return await get_cached_creator_profile("douyin", sec_user_id, lambda: self.get(uri, params))
 
     async def get_user_aweme_posts(self, sec_user_id: str, max_cursor: str = "") -> Dict:
         uri = "/aweme/v1/web/aweme/post/"
@@ -35,8 +35,12 @@ import config
 from base.base_crawler import AbstractCrawler
 from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
 from store import douyin as douyin_store
+from store.run_dedup import get_run_dedup
+from store.seen_id_index import get_seen_id_index
 from tools import utils
 from tools.cdp_browser import CDPBrowserManager
+from tools.comment_watermark import get_comment_watermarks
+from tools.crawl_checkpoint import get_crawl_checkpoint
 from var import crawler_type_var, source_keyword_var
 
 from .client import DouYinClient
@@ -120,12 +124,17 @@ class DouYinCrawler(AbstractCrawler):
         if config.CRAWLER_MAX_NOTES_COUNT < dy_limit_count:
             config.CRAWLER_MAX_NOTES_COUNT = dy_limit_count
         start_page = config.START_PAGE  # start page number
+        checkpoint = get_crawl_checkpoint("douyin")
         for keyword in config.KEYWORDS.split(","):
             source_keyword_var.set(keyword)
+            if checkpoint.is_keyword_done(keyword):
+                utils.logger.info(f"[DouYinCrawler.search] Skip keyword {keyword} completed by the previous run")
+                continue
             utils.logger.info(f"[DouYinCrawler.search] Current keyword: {keyword}")
-            aweme_list: List[str] = []
-            page = 0
-            dy_search_id = ""
+            # Comments are fetched once the keyword is done, so the collected ids are part of the checkpoint
+            aweme_list: List[str] = checkpoint.pending_ids(keyword)
+            page = checkpoint.resume_page(keyword, 0)
+            dy_search_id = checkpoint.search_id(keyword)
             while (page - start_page + 1) * dy_limit_count <= config.CRAWLER_MAX_NOTES_COUNT:
                 if page < start_page:
                     utils.logger.info(f"[DouYinCrawler.search] Skip {page}")
@@ -151,19 +160,26 @@ class DouYinCrawler(AbstractCrawler):
                     utils.logger.error(f"[DouYinCrawler.search] search douyin keyword: {keyword} failed，账号也许被风控了。")
                     break
                 dy_search_id = posts_res.get("extra", {}).get("logid", "")
+                seen_id_index = get_seen_id_index("douyin")
                 for post_item in posts_res.get("data"):
                     try:
                         aweme_info: Dict = (post_item.get("aweme_info") or post_item.get("aweme_mix_info", {}).get("mix_items")[0])
                     except TypeError:
                         continue
+                    if seen_id_index.has_content(aweme_info.get("aweme_id")):
+                        continue
+                    if not await get_run_dedup("douyin").claim(aweme_info.get("aweme_id"), keyword):
+                        continue
                     aweme_list.append(aweme_info.get("aweme_id", ""))
                     await douyin_store.update_douyin_aweme(aweme_item=aweme_info)
                     await self.get_aweme_media(aweme_item=aweme_info)
+                await checkpoint.complete_page(keyword, page - 1, search_id=dy_search_id, pending_ids=aweme_list)
                 # Sleep after each page navigation
                 await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
                 utils.logger.info(f"[DouYinCrawler.search] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after page {page-1}")
             utils.logger.info(f"[DouYinCrawler.search] keyword:{keyword}, aweme_list:{aweme_list}")
             await self.batch_get_note_comments(aweme_list)
+            await checkpoint.complete_keyword(keyword)
 
     async def get_specified_awemes(self):
         """Get the information and comments of the specified post from URLs or IDs"""
@@ -238,13 +254,16 @@ class DouYinCrawler(AbstractCrawler):
                 # 将关键词列表传递给 get_aweme_all_comments 方法
                 # Use fixed crawling interval
                 crawl_interval = config.CRAWLER_MAX_SLEEP_SEC
+                watermarks = get_comment_watermarks("douyin")
                 await self.dy_client.get_aweme_all_comments(
                     aweme_id=aweme_id,
                     crawl_interval=crawl_interval,
                     is_fetch_sub_comments=config.ENABLE_GET_SUB_COMMENTS,
                     callback=douyin_store.batch_update_dy_aweme_comments,
                     max_count=config.CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES,
+                    watermarks=watermarks,
                 )
+                await watermarks.commit(aweme_id)
                 # Sleep after fetching comments
                 await asyncio.sleep(crawl_interval)
                 utils.logger.info(f"[DouYinCrawler.get_comments] Sleeping for {crawl_interval} seconds after fetching comments for aweme {aweme_id}")
@@ -38,8 +38,11 @@ from base.base_crawler import AbstractCrawler
 from model.m_kuaishou import VideoUrlInfo, CreatorUrlInfo
 from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
 from store import kuaishou as kuaishou_store
+from store.run_dedup import get_run_dedup
+from store.seen_id_index import get_seen_id_index
 from tools import utils
 from tools.cdp_browser import CDPBrowserManager
+from tools.crawl_checkpoint import get_crawl_checkpoint
 from var import comment_tasks_var, crawler_type_var, source_keyword_var
 
 from .client import KuaiShouClient
@@ -131,13 +134,17 @@ class KuaishouCrawler(AbstractCrawler):
         if config.CRAWLER_MAX_NOTES_COUNT < ks_limit_count:
             config.CRAWLER_MAX_NOTES_COUNT = ks_limit_count
         start_page = config.START_PAGE
+        checkpoint = get_crawl_checkpoint("kuaishou")
         for keyword in config.KEYWORDS.split(","):
-            search_session_id = ""
+            search_session_id = checkpoint.search_id(keyword)
             source_keyword_var.set(keyword)
+            if checkpoint.is_keyword_done(keyword):
+                utils.logger.info(f"[KuaishouCrawler.search] Skip keyword {keyword} completed by the previous run")
+                continue
             utils.logger.info(
                 f"[KuaishouCrawler.search] Current search keyword: {keyword}"
             )
-            page = 1
+            page = checkpoint.resume_page(keyword, 1)
             while (
                 page - start_page + 1
             ) * ks_limit_count <= config.CRAWLER_MAX_NOTES_COUNT:
@@ -167,7 +174,12 @@ class KuaishouCrawler(AbstractCrawler):
                     )
                     continue
                 search_session_id = vision_search_photo.get("searchSessionId", "")
+                seen_id_index = get_seen_id_index("kuaishou")
                 for video_detail in vision_search_photo.get("feeds"):
+                    if seen_id_index.has_content(video_detail.get("photo", {}).get("id")):
+                        continue
+                    if not await get_run_dedup("kuaishou").claim(video_detail.get("photo", {}).get("id"), keyword):
+                        continue
                     video_id_list.append(video_detail.get("photo", {}).get("id"))
                     await kuaishou_store.update_kuaishou_video(video_item=video_detail)
 
@@ -179,6 +191,8 @@ class KuaishouCrawler(AbstractCrawler):
                 utils.logger.info(f"[KuaishouCrawler.search] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after page {page-1}")
 
                 await self.batch_get_video_comments(video_id_list)
+                await checkpoint.complete_page(keyword, page - 1, search_id=search_session_id)
+            await checkpoint.complete_keyword(keyword)
 
     async def get_specified_videos(self):
         """Get the information and comments of the specified post"""
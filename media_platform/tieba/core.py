@@ -36,8 +36,12 @@ from base.base_crawler import AbstractCrawler
 from model.m_baidu_tieba import TiebaCreator, TiebaNote
 from proxy.proxy_ip_pool import IpInfoModel, ProxyIpPool, create_ip_pool
 from store import tieba as tieba_store
+from store.run_dedup import get_run_dedup
+from store.seen_id_index import get_seen_id_index
 from tools import utils
 from tools.cdp_browser import CDPBrowserManager
+from tools.crawl_checkpoint import get_crawl_checkpoint
+from tools.creator_profile_cache import get_cached_creator_profile
 from var import crawler_type_var, source_keyword_var
 
 from .client import BaiduTieBaClient
@@ -154,12 +158,16 @@ class TieBaCrawler(AbstractCrawler):
         if config.CRAWLER_MAX_NOTES_COUNT < tieba_limit_count:
             config.CRAWLER_MAX_NOTES_COUNT = tieba_limit_count
         start_page = config.START_PAGE
+        checkpoint = get_crawl_checkpoint("tieba")
         for keyword in config.KEYWORDS.split(","):
             source_keyword_var.set(keyword)
+            if checkpoint.is_keyword_done(keyword):
+                utils.logger.info(f"[BaiduTieBaCrawler.search] Skip keyword {keyword} completed by the previous run")
+                continue
             utils.logger.info(
                 f"[BaiduTieBaCrawler.search] Current search keyword: {keyword}"
             )
-            page = 1
+            page = checkpoint.resume_page(keyword, 1)
             while (
                 page - start_page + 1
             ) * tieba_limit_count <= config.CRAWLER_MAX_NOTES_COUNT:
@@ -184,24 +192,33 @@ class TieBaCrawler(AbstractCrawler):
                         utils.logger.info(
                             f"[BaiduTieBaCrawler.search] Search note list is empty"
                         )
+                        await checkpoint.complete_keyword(keyword)
                         break
                     utils.logger.info(
                         f"[BaiduTieBaCrawler.search] Note list len: {len(notes_list)}"
                     )
+                    seen_id_index = get_seen_id_index("tieba")
                     await self.get_specified_notes(
-                        note_id_list=[note_detail.note_id for note_detail in notes_list]
+                        note_id_list=[
+                            note_detail.note_id for note_detail in notes_list
+                            if not seen_id_index.has_content(note_detail.note_id)
+                            and await get_run_dedup("tieba").claim(note_detail.note_id, keyword)
+                        ]
                     )
 
                     # Sleep after page navigation
                     await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
                     utils.logger.info(f"[TieBaCrawler.search] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after page {page}")
 
+                    await checkpoint.complete_page(keyword, page)
                     page += 1
                 except Exception as ex:
                     utils.logger.error(
                         f"[BaiduTieBaCrawler.search] Search keywords error, current page: {page}, current keyword: {keyword}, err: {ex}"
                     )
                     break
+            else:
+                await checkpoint.complete_keyword(keyword)
 
     async def get_specified_tieba_notes(self):
         """
@@ -354,6 +371,26 @@ class TieBaCrawler(AbstractCrawler):
                 max_count=config.CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES,
             )
 
+    async def get_creator_info(self, creator_url: str) -> Optional[TiebaCreator]:
+        """
+        Get creator information from the creator homepage, served from the creator profile cache when enabled
+        Args:
+            creator_url: Creator homepage URL
+
+        Returns:
+
+        """
+
+        async def fetch_creator_info() -> Optional[Dict]:
+            creator_page_html_content = await self.tieba_client.get_creator_info_by_url(
+                creator_url=creator_url
+            )
+            creator_info = self._page_extractor.extract_creator_info(creator_page_html_content)
+            return creator_info.model_dump() if creator_info else None
+
+        creator_info = await get_cached_creator_profile("tieba", creator_url, fetch_creator_info)
+        return TiebaCreator(**creator_info) if creator_info else None
+
     async def get_creators_and_notes(self) -> None:
         """
         Get creator's information and their notes and comments
@@ -364,12 +401,7 @@ class TieBaCrawler(AbstractCrawler):
             "[WeiboCrawler.get_creators_and_notes] Begin get weibo creators"
         )
         for creator_url in config.TIEBA_CREATOR_URL_LIST:
-            creator_page_html_content = await self.tieba_client.get_creator_info_by_url(
-                creator_url=creator_url
-            )
-            creator_info: TiebaCreator = self._page_extractor.extract_creator_info(
-                creator_page_html_content
-            )
+            creator_info: Optional[TiebaCreator] = await self.get_creator_info(creator_url)
             if creator_info:
                 utils.logger.info(
                     f"[WeiboCrawler.get_creators_and_notes] creator info: {creator_info}"
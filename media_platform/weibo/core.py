@@ -40,8 +40,11 @@ import config
 from base.base_crawler import AbstractCrawler
 from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
 from store import weibo as weibo_store
+from store.run_dedup import get_run_dedup
+from store.seen_id_index import get_seen_id_index
 from tools import utils
 from tools.cdp_browser import CDPBrowserManager
+from tools.crawl_checkpoint import get_crawl_checkpoint
 from var import crawler_type_var, source_keyword_var
 
 from .client import WeiboClient
@@ -157,10 +160,14 @@ class WeiboCrawler(AbstractCrawler):
             utils.logger.error(f"[WeiboCrawler.search] Invalid WEIBO_SEARCH_TYPE: {config.WEIBO_SEARCH_TYPE}")
             return
 
+        checkpoint = get_crawl_checkpoint("weibo")
         for keyword in config.KEYWORDS.split(","):
             source_keyword_var.set(keyword)
+            if checkpoint.is_keyword_done(keyword):
+                utils.logger.info(f"[WeiboCrawler.search] Skip keyword {keyword} completed by the previous run")
+                continue
             utils.logger.info(f"[WeiboCrawler.search] Current search keyword: {keyword}")
-            page = 1
+            page = checkpoint.resume_page(keyword, 1)
             while (page - start_page + 1) * weibo_limit_count <= config.CRAWLER_MAX_NOTES_COUNT:
                 if page < start_page:
                     utils.logger.info(f"[WeiboCrawler.search] Skip page: {page}")
@@ -170,6 +177,12 @@ class WeiboCrawler(AbstractCrawler):
                 search_res = await self.wb_client.get_note_by_keyword(keyword=keyword, page=page, search_type=search_type)
                 note_id_list: List[str] = []
                 note_list = filter_search_result_card(search_res.get("cards"))
+                seen_id_index = get_seen_id_index("weibo")
+                note_list = [
+                    note_item for note_item in note_list
+                    if not seen_id_index.has_content((note_item.get("mblog") or {}).get("id"))
+                    and await get_run_dedup("weibo").claim((note_item.get("mblog") or {}).get("id"), keyword)
+                ]
                 # If full text fetching is enabled, batch get full text of posts
                 note_list = await self.batch_get_notes_full_text(note_list)
                 for note_item in note_list:
@@ -187,6 +200,8 @@ class WeiboCrawler(AbstractCrawler):
                 utils.logger.info(f"[WeiboCrawler.search] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after page {page-1}")
 
                 await self.batch_get_notes_comments(note_id_list)
+                await checkpoint.complete_page(keyword, page - 1)
+            await checkpoint.complete_keyword(keyword)
 
     async def get_specified_notes(self):
         """
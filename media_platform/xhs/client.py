@@ -30,6 +30,8 @@ import config
 from base.base_crawler import AbstractApiClient
 from proxy.proxy_mixin import ProxyRefreshMixin
 from tools import utils
+from tools.comment_watermark import CommentWatermarks
+from tools.creator_profile_cache import get_cached_creator_profile
 
 if TYPE_CHECKING:
     from proxy.proxy_ip_pool import ProxyIpPool
@@ -375,6 +377,9 @@ class XiaoHongShuClient(AbstractApiClient, ProxyRefreshMixin):
         crawl_interval: float = 1.0,
         callback: Optional[Callable] = None,
         max_count: int = 10,
+        cursor: str = "",
+        cursor_callback: Optional[Callable] = None,
+        watermarks: Optional[CommentWatermarks] = None,
     ) -> List[Dict]:
         """
         Get all first-level comments under specified note, this method will continuously find all comment information under a post
@@ -384,12 +389,16 @@ class XiaoHongShuClient(AbstractApiClient, ProxyRefreshMixin):
             crawl_interval: Crawl delay per note (seconds)
             callback: Callback after one note crawl ends
             max_count: Maximum number of comments to crawl per note
+            cursor: Cursor of the first comment page, used to resume an interrupted note
+            cursor_callback: Called with (note_id, cursor) once a comment page has been handled
+            watermarks: Skip the comments fetched by previous runs, the pages come in hot order so all are still fetched
         Returns:
 
         """
         result = []
         comments_has_more = True
-        comments_cursor = ""
+        comments_cursor = cursor
+        truncated = False
         while comments_has_more and len(result) < max_count:
             comments_res = await self.get_note_comments(
                 note_id=note_id, xsec_token=xsec_token, cursor=comments_cursor
@@ -402,8 +411,17 @@ class XiaoHongShuClient(AbstractApiClient, ProxyRefreshMixin):
                 )
                 break
             comments = comments_res["comments"]
+            if watermarks:
+                comments, reached_watermark = watermarks.new_comments(note_id, comments)
+                if reached_watermark:
+                    comments_has_more = False
             if len(result) + len(comments) > max_count:
                 comments = comments[: max_count - len(result)]
+                truncated = True
+            if watermarks:
+                watermarks.observe(note_id, comments)
+                if not comments_has_more and not truncated:
+                    watermarks.finish_paging(note_id)
             if callback:
                 await callback(note_id, comments)
             await asyncio.sleep(crawl_interval)
@@ -415,6 +433,8 @@ class XiaoHongShuClient(AbstractApiClient, ProxyRefreshMixin):
                 callback=callback,
             )
             result.extend(sub_comments)
+            if cursor_callback and comments_has_more:
+                await cursor_callback(note_id, comments_cursor)
         return result
 
     async def get_comments_all_sub_comments(
@@ -503,10 +523,13 @@ class XiaoHongShuClient(AbstractApiClient, ProxyRefreshMixin):
         if xsec_token and xsec_source:
             uri = f"{uri}?xsec_token={xsec_token}&xsec_source={xsec_source}"
 
-        html_content = await self.request(
-            "GET", self._domain + uri, return_response=True, headers=self.headers
-        )
-        return self._extractor.extract_creator_info_from_html(html_content)
+        async def fetch_creator_info() -> Dict:
+            html_content = await self.request(
+                "GET", self._domain + uri, return_response=True, headers=self.headers
+            )
+            return self._extractor.extract_creator_info_from_html(html_content)
+
+        return await get_cached_creator_profile("xhs", user_id, fetch_creator_info)
 
     async def get_notes_by_creator(
         self,
@@ -38,8 +38,12 @@ from config import CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES
 from model.m_xiaohongshu import NoteUrlInfo, CreatorUrlInfo
 from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
 from store import xhs as xhs_store
+from store.run_dedup import get_run_dedup
+from store.seen_id_index import get_seen_id_index
 from tools import utils
 from tools.cdp_browser import CDPBrowserManager
+from tools.comment_watermark import get_comment_watermarks
+from tools.crawl_checkpoint import get_crawl_checkpoint
 from var import crawler_type_var, source_keyword_var
 
 from .client import XiaoHongShuClient
@@ -130,11 +134,15 @@ class XiaoHongShuCrawler(AbstractCrawler):
         if config.CRAWLER_MAX_NOTES_COUNT < xhs_limit_count:
             config.CRAWLER_MAX_NOTES_COUNT = xhs_limit_count
         start_page = config.START_PAGE
+        checkpoint = get_crawl_checkpoint("xhs")
         for keyword in config.KEYWORDS.split(","):
             source_keyword_var.set(keyword)
+            if checkpoint.is_keyword_done(keyword):
+                utils.logger.info(f"[XiaoHongShuCrawler.search] Skip keyword {keyword} completed by the previous run")
+                continue
             utils.logger.info(f"[XiaoHongShuCrawler.search] Current search keyword: {keyword}")
-            page = 1
-            search_id = get_search_id()
+            page = checkpoint.resume_page(keyword, 1)
+            search_id = checkpoint.search_id(keyword, default=get_search_id())
             while (page - start_page + 1) * xhs_limit_count <= config.CRAWLER_MAX_NOTES_COUNT:
                 if page < start_page:
                     utils.logger.info(f"[XiaoHongShuCrawler.search] Skip page {page}")
@@ -154,15 +162,20 @@ class XiaoHongShuCrawler(AbstractCrawler):
                     utils.logger.info(f"[XiaoHongShuCrawler.search] Search notes response: {notes_res}")
                     if not notes_res or not notes_res.get("has_more", False):
                         utils.logger.info("[XiaoHongShuCrawler.search] No more content!")
+                        await checkpoint.complete_keyword(keyword)
                         break
                     semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+                    seen_id_index = get_seen_id_index("xhs")
                     task_list = [
                         self.get_note_detail_async_task(
                             note_id=post_item.get("id"),
                             xsec_source=post_item.get("xsec_source"),
                             xsec_token=post_item.get("xsec_token"),
                             semaphore=semaphore,
-                        ) for post_item in notes_res.get("items", {}) if post_item.get("model_type") not in ("rec_query", "hot_query")
+                        ) for post_item in notes_res.get("items", {})
+                        if post_item.get("model_type") not in ("rec_query", "hot_query")
+                        and not seen_id_index.has_content(post_item.get("id"))
+                        and await get_run_dedup("xhs").claim(post_item.get("id"), keyword)
                     ]
                     note_details = await asyncio.gather(*task_list)
                     for note_detail in note_details:
@@ -174,6 +187,7 @@ class XiaoHongShuCrawler(AbstractCrawler):
                     page += 1
                     utils.logger.info(f"[XiaoHongShuCrawler.search] Note details: {note_details}")
                     await self.batch_get_note_comments(note_ids, xsec_tokens)
+                    await checkpoint.complete_page(keyword, page - 1, search_id=search_id)
 
                     # Sleep after each page navigation
                     await asyncio.sleep(config.CRAWLER_MAX_SLEEP_SEC)
@@ -181,6 +195,8 @@ class XiaoHongShuCrawler(AbstractCrawler):
                 except DataFetchError:
                     utils.logger.error("[XiaoHongShuCrawler.search] Get note detail error")
                     break
+            else:
+                await checkpoint.complete_keyword(keyword)
 
     async def get_creators_and_notes(self) -> None:
         """Get creator's notes and retrieve their comment information."""
@@ -339,13 +355,20 @@ class XiaoHongShuCrawler(AbstractCrawler):
             utils.logger.info(f"[XiaoHongShuCrawler.get_comments] Begin get note id comments {note_id}")
             # Use fixed crawling interval
             crawl_interval = config.CRAWLER_MAX_SLEEP_SEC
+            checkpoint = get_crawl_checkpoint("xhs")
+            watermarks = get_comment_watermarks("xhs")
             await self.xhs_client.get_note_all_comments(
                 note_id=note_id,
                 xsec_token=xsec_token,
                 crawl_interval=crawl_interval,
                 callback=xhs_store.batch_update_xhs_note_comments,
                 max_count=CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES,
+                cursor=checkpoint.comment_cursor(note_id),
+                cursor_callback=checkpoint.update_comment_cursor,
+                watermarks=watermarks,
             )
+            await checkpoint.complete_comments(note_id)
+            await watermarks.commit(note_id)
 
             # Sleep after fetching comments
             await asyncio.sleep(crawl_interval)
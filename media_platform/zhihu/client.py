@@ -34,6 +34,7 @@ from constant import zhihu as zhihu_constant
 from model.m_zhihu import ZhihuComment, ZhihuContent, ZhihuCreator
 from proxy.proxy_mixin import ProxyRefreshMixin
 from tools import utils
+from tools.creator_profile_cache import get_cached_creator_profile
 
 if TYPE_CHECKING:
     from proxy.proxy_ip_pool import ProxyIpPool
@@ -378,8 +379,14 @@ class ZhiHuClient(AbstractApiClient, ProxyRefreshMixin):
 
         """
         uri = f"/people/{url_token}"
-        html_content: str = await self.get(uri, return_response=True)
-        return self._extractor.extract_creator(url_token, html_content)
+
+        async def fetch_creator() -> Optional[Dict]:
+            html_content: str = await self.get(uri, return_response=True)
+            creator = self._extractor.extract_creator(url_token, html_content)
+            return creator.model_dump() if creator else None
+
+        creator_info = await get_cached_creator_profile("zhihu", url_token, fetch_creator)
+        return ZhihuCreator(**creator_info) if creator_info else None
 
     async def get_creator_answers(self, url_token: str, offset: int = 0, limit: int = 20) -> Dict:
         """
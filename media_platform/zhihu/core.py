@@ -39,8 +39,11 @@ from base.base_crawler import AbstractCrawler
 from model.m_zhihu import ZhihuContent, ZhihuCreator
 from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
 from store import zhihu as zhihu_store
+from store.run_dedup import get_run_dedup
+from store.seen_id_index import get_seen_id_index
 from tools import utils
 from tools.cdp_browser import CDPBrowserManager
+from tools.crawl_checkpoint import get_crawl_checkpoint
 from var import crawler_type_var, source_keyword_var
 
 from .client import ZhiHuClient
@@ -149,12 +152,16 @@ class ZhihuCrawler(AbstractCrawler):
         if config.CRAWLER_MAX_NOTES_COUNT < zhihu_limit_count:
             config.CRAWLER_MAX_NOTES_COUNT = zhihu_limit_count
         start_page = config.START_PAGE
+        checkpoint = get_crawl_checkpoint("zhihu")
         for keyword in config.KEYWORDS.split(","):
             source_keyword_var.set(keyword)
+            if checkpoint.is_keyword_done(keyword):
+                utils.logger.info(f"[ZhihuCrawler.search] Skip keyword {keyword} completed by the previous run")
+                continue
             utils.logger.info(
                 f"[ZhihuCrawler.search] Current search keyword: {keyword}"
             )
-            page = 1
+            page = checkpoint.resume_page(keyword, 1)
             while (
                 page - start_page + 1
             ) * zhihu_limit_count <= config.CRAWLER_MAX_NOTES_COUNT:
@@ -185,13 +192,21 @@ class ZhihuCrawler(AbstractCrawler):
                     utils.logger.info(f"[ZhihuCrawler.search] Sleeping for {config.CRAWLER_MAX_SLEEP_SEC} seconds after page {page-1}")
 
                     page += 1
+                    seen_id_index = get_seen_id_index("zhihu")
+                    content_list = [
+                        content for content in content_list
+                        if not seen_id_index.has_content(content.content_id)
+                        and await get_run_dedup("zhihu").claim(content.content_id, keyword)
+                    ]
                     for content in content_list:
                         await zhihu_store.update_zhihu_content(content)
 
                     await self.batch_get_content_comments(content_list)
+                    await checkpoint.complete_page(keyword, page - 1)
                 except DataFetchError:
                     utils.logger.error("[ZhihuCrawler.search] Search content error")
                     return
+            await checkpoint.complete_keyword(keyword)
 
     async def batch_get_content_comments(self, content_list: List[ZhihuContent]):
         """
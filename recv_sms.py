@@ -28,6 +28,7 @@ from pydantic import BaseModel
 import config
 from cache.abs_cache import AbstractCache
 from cache.cache_factory import CacheFactory
+from cache.instrumented_cache import get_cache_metrics
 from tools import utils
 
 app = FastAPI()
@@ -79,6 +80,14 @@ def receive_sms_notification(sms: SmsNotification):
     return {"status": "ok"}
 
 
+@app.get("/cache/metrics")
+def cache_metrics():
+    """
+    Hit/miss/expiration/eviction counters, value sizes and latency histograms of the caches in this process
+    """
+    return {"caches": get_cache_metrics()}
+
+
 @app.get("/", status_code=status.HTTP_404_NOT_FOUND)
 async def not_found():
     raise HTTPException(status_code=404, detail="Not Found")
@@ -25,6 +25,9 @@
 from typing import List
 
 import config
+from store.store_registry import StoreRegistry
+from store.run_dedup import get_run_dedup
+from store.seen_id_index import get_seen_id_index
 from var import source_keyword_var
 
 from ._store_impl import *
@@ -36,18 +39,27 @@ class BiliStoreFactory:
         "csv": BiliCsvStoreImplement,
         "db": BiliDbStoreImplement,
         "json": BiliJsonStoreImplement,
+        "jsonl": BiliJsonlStoreImplement,
         "sqlite": BiliSqliteStoreImplement,
         "mongodb": BiliMongoStoreImplement,
         "excel": BiliExcelStoreImplement,
+        "parquet": BiliParquetStoreImplement,
     }
 
     @staticmethod
     def create_store() -> AbstractStore:
         store_class = BiliStoreFactory.STORES.get(config.SAVE_DATA_OPTION)
         if not store_class:
-            raise ValueError("[BiliStoreFactory.create_store] Invalid save option only supported csv or db or json or sqlite or mongodb or excel ...")
+            raise ValueError("[BiliStoreFactory.create_store] Invalid save option only supported csv or db or json or jsonl or sqlite or mongodb or excel or parquet ...")
         return store_class()
 
+    @staticmethod
+    def get_store() -> AbstractStore:
+        """
+        Get the store shared by the whole run, created on first use
+        """
+        return StoreRegistry.get_store("bili", BiliStoreFactory.create_store)
+
 
 async def update_bilibili_video(video_item: Dict):
     video_item_view: Dict = video_item.get("View")
@@ -77,7 +89,10 @@ async def update_bilibili_video(video_item: Dict):
         "source_keyword": source_keyword_var.get(),
     }
     utils.logger.info(f"[store.bilibili.update_bilibili_video] bilibili video id:{video_id}, title:{save_content_item.get('title')}")
-    await BiliStoreFactory.create_store().store_content(content_item=save_content_item)
+    store = BiliStoreFactory.get_store()
+    await store.store_content(content_item=save_content_item)
+    await get_seen_id_index("bili").add_content(video_id)
+    get_run_dedup("bili").remember(video_id, save_content_item, store)
 
 
 async def update_up_info(video_item: Dict):
@@ -96,7 +111,7 @@ async def update_up_info(video_item: Dict):
         "is_official": video_item_card.get("official_verify").get("type"),
     }
     utils.logger.info(f"[store.bilibili.update_up_info] bilibili user_id:{video_item_card.get('mid')}")
-    await BiliStoreFactory.create_store().store_creator(creator=saver_up_info)
+    await BiliStoreFactory.get_store().store_creator(creator=saver_up_info)
 
 
 async def batch_update_bilibili_video_comments(video_id: str, comments: List[Dict]):
@@ -128,7 +143,11 @@ async def update_bilibili_video_comment(video_id: str, comment_item: Dict):
         "last_modify_ts": utils.get_current_timestamp(),
     }
     utils.logger.info(f"[store.bilibili.update_bilibili_video_comment] Bilibili video comment: {comment_id}, content: {save_comment_item.get('content')}")
-    await BiliStoreFactory.create_store().store_comment(comment_item=save_comment_item)
+    seen_id_index = get_seen_id_index("bili")
+    if seen_id_index.has_comment(comment_id):
+        return
+    await BiliStoreFactory.get_store().store_comment(comment_item=save_comment_item)
+    await seen_id_index.add_comment(comment_id)
 
 
 async def store_video(aid, video_content, extension_file_name):
@@ -211,7 +230,7 @@ async def update_bilibili_creator_contact(creator_info: Dict, fan_info: Dict):
         "last_modify_ts": utils.get_current_timestamp(),
     }
 
-    await BiliStoreFactory.create_store().store_contact(contact_item=save_contact_item)
+    await BiliStoreFactory.get_store().store_contact(contact_item=save_contact_item)
 
 
 async def update_bilibili_creator_dynamic(creator_info: Dict, dynamic_info: Dict):
@@ -228,4 +247,4 @@ async def update_bilibili_creator_dynamic(creator_info: Dict, dynamic_info: Dict
         "last_modify_ts": utils.get_current_timestamp(),
     }
 
-    await BiliStoreFactory.create_store().store_dynamic(dynamic_item=save_dynamic_item)
+    await BiliStoreFactory.get_store().store_dynamic(dynamic_item=save_dynamic_item)
@@ -36,11 +36,13 @@ from sqlalchemy.orm import sessionmaker
 import config
 from base.base_crawler import AbstractStore
 from database.db_session import get_session
+from database.db_upsert_buffer import DbUpsertBuffer
 from database.models import BilibiliVideoComment, BilibiliVideo, BilibiliUpInfo, BilibiliUpDynamic, BilibiliContactInfo
 from tools.async_file_writer import AsyncFileWriter
 from tools import utils, words
 from var import crawler_type_var
 from database.mongodb_store_base import MongoDBStoreBase
+from store.parquet_store_base import ParquetStoreBase
 
 
 class BiliCsvStoreImplement(AbstractStore):
@@ -120,27 +122,26 @@ class BiliCsvStoreImplement(AbstractStore):
             item_type="dynamics"
         )
 
+    async def close(self):
+        """
+        flush buffered rows to csv file
+        :return:
+        """
+        await self.file_writer.close()
+
 
 class BiliDbStoreImplement(AbstractStore):
+    def __init__(self):
+        self.content_buffer = DbUpsertBuffer(BilibiliVideo, key_column="video_id")
+        self.comment_buffer = DbUpsertBuffer(BilibiliVideoComment, key_column="comment_id")
+
     async def store_content(self, content_item: Dict):
         """
         Bilibili content DB storage implementation
         Args:
             content_item: content item dict
         """
-        video_id = content_item.get("video_id")
-        async with get_session() as session:
-            result = await session.execute(select(BilibiliVideo).where(BilibiliVideo.video_id == video_id))
-            video_detail = result.scalar_one_or_none()
-
-            if not video_detail:
-                content_item["add_ts"] = utils.get_current_timestamp()
-                new_content = BilibiliVideo(**content_item)
-                session.add(new_content)
-            else:
-                for key, value in content_item.items():
-                    setattr(video_detail, key, value)
-            await session.commit()
+        await self.content_buffer.add({**content_item, "add_ts": utils.get_current_timestamp()})
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -148,19 +149,14 @@ class BiliDbStoreImplement(AbstractStore):
         Args:
             comment_item: comment item dict
         """
-        comment_id = comment_item.get("comment_id")
-        async with get_session() as session:
-            result = await session.execute(select(BilibiliVideoComment).where(BilibiliVideoComment.comment_id == comment_id))
-            comment_detail = result.scalar_one_or_none()
+        await self.comment_buffer.add({**comment_item, "add_ts": utils.get_current_timestamp()})
 
-            if not comment_detail:
-                comment_item["add_ts"] = utils.get_current_timestamp()
-                new_comment = BilibiliVideoComment(**comment_item)
-                session.add(new_comment)
-            else:
-                for key, value in comment_item.items():
-                    setattr(comment_detail, key, value)
-            await session.commit()
+    async def close(self):
+        """
+        flush buffered contents and comments to database
+        """
+        await self.content_buffer.flush()
+        await self.comment_buffer.flush()
 
     async def store_creator(self, creator: Dict):
         """
@@ -225,6 +221,13 @@ class BiliDbStoreImplement(AbstractStore):
                     setattr(dynamic_detail, key, value)
             await session.commit()
 
+    async def update_source_keyword(self, content_id, source_keyword: str) -> bool:
+        """
+        Upsert the source_keyword of a stored content, merged into its buffered row when not written yet
+        """
+        await self.content_buffer.add({"video_id": content_id, "source_keyword": source_keyword})
+        return True
+
 
 class BiliJsonStoreImplement(AbstractStore):
     def __init__(self):
@@ -304,6 +307,83 @@ class BiliJsonStoreImplement(AbstractStore):
         )
 
 
+class BiliJsonlStoreImplement(AbstractStore):
+    def __init__(self):
+        self.file_writer = AsyncFileWriter(
+            crawler_type=crawler_type_var.get(),
+            platform="bili"
+        )
+
+    async def store_content(self, content_item: Dict):
+        """
+        content JSONL storage implementation
+        Args:
+            content_item:
+
+        Returns:
+
+        """
+        await self.file_writer.write_single_item_to_jsonl(
+            item=content_item,
+            item_type="contents"
+        )
+
+    async def store_comment(self, comment_item: Dict):
+        """
+        comment JSONL storage implementation
+        Args:
+            comment_item:
+
+        Returns:
+
+        """
+        await self.file_writer.write_single_item_to_jsonl(
+            item=comment_item,
+            item_type="comments"
+        )
+
+    async def store_creator(self, creator: Dict):
+        """
+        creator JSONL storage implementation
+        Args:
+            creator:
+
+        Returns:
+
+        """
+        await self.file_writer.write_single_item_to_jsonl(
+            item=creator,
+            item_type="creators"
+        )
+
+    async def store_contact(self, contact_item: Dict):
+        """
+        creator contact JSONL storage implementation
+        Args:
+            contact_item: creator's contact item dict
+
+        Returns:
+
+        """
+        await self.file_writer.write_single_item_to_jsonl(
+            item=contact_item,
+            item_type="contacts"
+        )
+
+    async def store_dynamic(self, dynamic_item: Dict):
+        """
+        creator dynamic JSONL storage implementation
+        Args:
+            dynamic_item: creator's contact item dict
+
+        Returns:
+
+        """
+        await self.file_writer.write_single_item_to_jsonl(
+            item=dynamic_item,
+            item_type="dynamics"
+        )
+
 
 class BiliSqliteStoreImplement(BiliDbStoreImplement):
     pass
@@ -313,7 +393,10 @@ class BiliMongoStoreImplement(AbstractStore):
     """Bilibili MongoDB storage implementation"""
 
     def __init__(self):
-        self.mongo_store = MongoDBStoreBase(collection_prefix="bilibili")
+        self.mongo_store = MongoDBStoreBase(
+            collection_prefix="bilibili",
+            indexes={"contents": "video_id", "comments": "comment_id", "creators": "user_id"},
+        )
 
     async def store_content(self, content_item: Dict):
         """
@@ -325,9 +408,9 @@ class BiliMongoStoreImplement(AbstractStore):
         if not video_id:
             return
 
-        await self.mongo_store.save_or_update(
+        await self.mongo_store.save_or_update_buffered(
             collection_suffix="contents",
-            query={"video_id": video_id},
+            key_field="video_id",
             data=content_item
         )
         utils.logger.info(f"[BiliMongoStoreImplement.store_content] Saved video {video_id} to MongoDB")
@@ -342,9 +425,9 @@ class BiliMongoStoreImplement(AbstractStore):
         if not comment_id:
             return
 
-        await self.mongo_store.save_or_update(
+        await self.mongo_store.save_or_update_buffered(
             collection_suffix="comments",
-            query={"comment_id": comment_id},
+            key_field="comment_id",
             data=comment_item
         )
         utils.logger.info(f"[BiliMongoStoreImplement.store_comment] Saved comment {comment_id} to MongoDB")
@@ -366,6 +449,23 @@ class BiliMongoStoreImplement(AbstractStore):
         )
         utils.logger.info(f"[BiliMongoStoreImplement.store_creator] Saved creator {user_id} to MongoDB")
 
+    async def close(self):
+        """
+        Flush queued contents and comments to MongoDB
+        """
+        await self.mongo_store.flush()
+
+    async def update_source_keyword(self, content_id, source_keyword: str) -> bool:
+        """
+        Upsert the source_keyword of a stored content, merged into its queued document when not written yet
+        """
+        await self.mongo_store.save_or_update_buffered(
+            collection_suffix="contents",
+            key_field="video_id",
+            data={"video_id": content_id, "source_keyword": source_keyword}
+        )
+        return True
+
 
 class BiliExcelStoreImplement:
     """Bilibili Excel storage implementation - Global singleton"""
@@ -376,3 +476,20 @@ class BiliExcelStoreImplement:
             platform="bilibili",
             crawler_type=crawler_type_var.get()
         )
+
+
+class BiliParquetStoreImplement(ParquetStoreBase):
+    """Bilibili Parquet storage implementation"""
+
+    def __init__(self):
+        super().__init__(
+            platform="bili",
+            crawler_type=crawler_type_var.get(),
+            table_models={
+                "contents": BilibiliVideo,
+                "comments": BilibiliVideoComment,
+                "creators": BilibiliUpInfo,
+                "contacts": BilibiliContactInfo,
+                "dynamics": BilibiliUpDynamic,
+            },
+        )
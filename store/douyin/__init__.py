@@ -24,6 +24,9 @@
 from typing import List
 
 import config
+from store.store_registry import StoreRegistry
+from store.run_dedup import get_run_dedup
+from store.seen_id_index import get_seen_id_index
 from var import source_keyword_var
 
 from ._store_impl import *
@@ -35,18 +38,27 @@ class DouyinStoreFactory:
         "csv": DouyinCsvStoreImplement,
         "db": DouyinDbStoreImplement,
         "json": DouyinJsonStoreImplement,
+        "jsonl": DouyinJsonlStoreImplement,
         "sqlite": DouyinSqliteStoreImplement,
         "mongodb": DouyinMongoStoreImplement,
         "excel": DouyinExcelStoreImplement,
+        "parquet": DouyinParquetStoreImplement,
     }
 
     @staticmethod
     def create_store() -> AbstractStore:
         store_class = DouyinStoreFactory.STORES.get(config.SAVE_DATA_OPTION)
         if not store_class:
-            raise ValueError("[DouyinStoreFactory.create_store] Invalid save option only supported csv or db or json or sqlite or mongodb or excel ...")
+            raise ValueError("[DouyinStoreFactory.create_store] Invalid save option only supported csv or db or json or jsonl or sqlite or mongodb or excel or parquet ...")
         return store_class()
 
+    @staticmethod
+    def get_store() -> AbstractStore:
+        """
+        Get the store shared by the whole run, created on first use
+        """
+        return StoreRegistry.get_store("douyin", DouyinStoreFactory.create_store)
+
 
 def _extract_note_image_list(aweme_detail: Dict) -> List[str]:
     """
@@ -183,7 +195,10 @@ async def update_douyin_aweme(aweme_item: Dict):
         "source_keyword": source_keyword_var.get(),
     }
     utils.logger.info(f"[store.douyin.update_douyin_aweme] douyin aweme id:{aweme_id}, title:{save_content_item.get('title')}")
-    await DouyinStoreFactory.create_store().store_content(content_item=save_content_item)
+    store = DouyinStoreFactory.get_store()
+    await store.store_content(content_item=save_content_item)
+    await get_seen_id_index("douyin").add_content(aweme_id)
+    get_run_dedup("douyin").remember(aweme_id, save_content_item, store)
 
 
 async def batch_update_dy_aweme_comments(aweme_id: str, comments: List[Dict]):
@@ -223,7 +238,11 @@ async def update_dy_aweme_comment(aweme_id: str, comment_item: Dict):
     }
     utils.logger.info(f"[store.douyin.update_dy_aweme_comment] douyin aweme comment: {comment_id}, content: {save_comment_item.get('content')}")
 
-    await DouyinStoreFactory.create_store().store_comment(comment_item=save_comment_item)
+    seen_id_index = get_seen_id_index("douyin")
+    if seen_id_index.has_comment(comment_id):
+        return
+    await DouyinStoreFactory.get_store().store_comment(comment_item=save_comment_item)
+    await seen_id_index.add_comment(comment_id)
 
 
 async def save_creator(user_id: str, creator: Dict):
@@ -244,7 +263,7 @@ async def save_creator(user_id: str, creator: Dict):
         "last_modify_ts": utils.get_current_timestamp(),
     }
     utils.logger.info(f"[store.douyin.save_creator] creator:{local_db_item}")
-    await DouyinStoreFactory.create_store().store_creator(local_db_item)
+    await DouyinStoreFactory.get_store().store_creator(local_db_item)
 
 
 async def update_dy_aweme_image(aweme_id, pic_content, extension_file_name):
@@ -28,16 +28,18 @@ import os
 import pathlib
 from typing import Dict
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 
 import config
 from base.base_crawler import AbstractStore
 from database.db_session import get_session
+from database.db_upsert_buffer import DbUpsertBuffer
 from database.models import DouyinAweme, DouyinAwemeComment, DyCreator
 from tools import utils, words
 from tools.async_file_writer import AsyncFileWriter
 from var import crawler_type_var
 from database.mongodb_store_base import MongoDBStoreBase
+from store.parquet_store_base import ParquetStoreBase
 
 
 class DouyinCsvStoreImplement(AbstractStore):
@@ -89,28 +91,32 @@ class DouyinCsvStoreImplement(AbstractStore):
             item_type="creators"
         )
 
+    async def close(self):
+        """
+        flush buffered rows to csv file
+        :return:
+        """
+        await self.file_writer.close()
+
 
 class DouyinDbStoreImplement(AbstractStore):
+    def __init__(self):
+        self.content_buffer = DbUpsertBuffer(DouyinAweme, key_column="aweme_id")
+        self.comment_buffer = DbUpsertBuffer(DouyinAwemeComment, key_column="comment_id")
+
     async def store_content(self, content_item: Dict):
         """
         Douyin content DB storage implementation
         Args:
             content_item: content item dict
         """
-        aweme_id = content_item.get("aweme_id")
-        async with get_session() as session:
-            result = await session.execute(select(DouyinAweme).where(DouyinAweme.aweme_id == aweme_id))
-            aweme_detail = result.scalar_one_or_none()
-
-            if not aweme_detail:
-                content_item["add_ts"] = utils.get_current_timestamp()
-                if content_item.get("title"):
-                    new_content = DouyinAweme(**content_item)
-                    session.add(new_content)
-            else:
-                for key, value in content_item.items():
-                    setattr(aweme_detail, key, value)
-            await session.commit()
+        if not content_item.get("title"):
+            # Awemes without title only refresh an existing row and are never inserted
+            aweme_id = content_item.get("aweme_id")
+            async with get_session() as session:
+                await session.execute(update(DouyinAweme).where(DouyinAweme.aweme_id == aweme_id).values(**content_item))
+            return
+        await self.content_buffer.add({**content_item, "add_ts": utils.get_current_timestamp()})
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -118,19 +124,14 @@ class DouyinDbStoreImplement(AbstractStore):
         Args:
             comment_item: comment item dict
         """
-        comment_id = comment_item.get("comment_id")
-        async with get_session() as session:
-            result = await session.execute(select(DouyinAwemeComment).where(DouyinAwemeComment.comment_id == comment_id))
-            comment_detail = result.scalar_one_or_none()
+        await self.comment_buffer.add({**comment_item, "add_ts": utils.get_current_timestamp()})
 
-            if not comment_detail:
-                comment_item["add_ts"] = utils.get_current_timestamp()
-                new_comment = DouyinAwemeComment(**comment_item)
-                session.add(new_comment)
-            else:
-                for key, value in comment_item.items():
-                    setattr(comment_detail, key, value)
-            await session.commit()
+    async def close(self):
+        """
+        flush buffered contents and comments to database
+        """
+        await self.content_buffer.flush()
+        await self.comment_buffer.flush()
 
     async def store_creator(self, creator: Dict):
         """
@@ -152,6 +153,13 @@ class DouyinDbStoreImplement(AbstractStore):
                     setattr(user_detail, key, value)
             await session.commit()
 
+    async def update_source_keyword(self, content_id, source_keyword: str) -> bool:
+        """
+        Upsert the source_keyword of a stored content, merged into its buffered row when not written yet
+        """
+        await self.content_buffer.add({"aweme_id": content_id, "source_keyword": source_keyword})
+        return True
+
 
 class DouyinJsonStoreImplement(AbstractStore):
     def __init__(self):
@@ -203,6 +211,55 @@ class DouyinJsonStoreImplement(AbstractStore):
         )
 
 
+class DouyinJsonlStoreImplement(AbstractStore):
+    def __init__(self):
+        self.file_writer = AsyncFileWriter(
+            crawler_type=crawler_type_var.get(),
+            platform="douyin"
+        )
+
+    async def store_content(self, content_item: Dict):
+        """
+        content JSONL storage implementation
+        Args:
+            content_item:
+
+        Returns:
+
+        """
+        await self.file_writer.write_single_item_to_jsonl(
+            item=content_item,
+            item_type="contents"
+        )
+
+    async def store_comment(self, comment_item: Dict):
+        """
+        comment JSONL storage implementation
+        Args:
+            comment_item:
+
+        Returns:
+
+        """
+        await self.file_writer.write_single_item_to_jsonl(
+            item=comment_item,
+            item_type="comments"
+        )
+
+    async def store_creator(self, creator: Dict):
+        """
+        creator JSONL storage implementation
+        Args:
+            creator:
+
+        Returns:
+
+        """
+        await self.file_writer.write_single_item_to_jsonl(
+            item=creator,
+            item_type="creators"
+        )
+
 
 class DouyinSqliteStoreImplement(DouyinDbStoreImplement):
     pass
@@ -212,7 +269,10 @@ class DouyinMongoStoreImplement(AbstractStore):
     """Douyin MongoDB storage implementation"""
 
     def __init__(self):
-        self.mongo_store = MongoDBStoreBase(collection_prefix="douyin")
+        self.mongo_store = MongoDBStoreBase(
+            collection_prefix="douyin",
+            indexes={"contents": "aweme_id", "comments": "comment_id", "creators": "user_id"},
+        )
 
     async def store_content(self, content_item: Dict):
         """
@@ -224,9 +284,9 @@ class DouyinMongoStoreImplement(AbstractStore):
         if not aweme_id:
             return
 
-        await self.mongo_store.save_or_update(
+        await self.mongo_store.save_or_update_buffered(
             collection_suffix="contents",
-            query={"aweme_id": aweme_id},
+            key_field="aweme_id",
             data=content_item
         )
         utils.logger.info(f"[DouyinMongoStoreImplement.store_content] Saved aweme {aweme_id} to MongoDB")
@@ -241,9 +301,9 @@ class DouyinMongoStoreImplement(AbstractStore):
         if not comment_id:
             return
 
-        await self.mongo_store.save_or_update(
+        await self.mongo_store.save_or_update_buffered(
             collection_suffix="comments",
-            query={"comment_id": comment_id},
+            key_field="comment_id",
             data=comment_item
         )
         utils.logger.info(f"[DouyinMongoStoreImplement.store_comment] Saved comment {comment_id} to MongoDB")
@@ -265,6 +325,23 @@ class DouyinMongoStoreImplement(AbstractStore):
         )
         utils.logger.info(f"[DouyinMongoStoreImplement.store_creator] Saved creator {user_id} to MongoDB")
 
+    async def close(self):
+        """
+        Flush queued contents and comments to MongoDB
+        """
+        await self.mongo_store.flush()
+
+    async def update_source_keyword(self, content_id, source_keyword: str) -> bool:
+        """
+        Upsert the source_keyword of a stored content, merged into its queued document when not written yet
+        """
+        await self.mongo_store.save_or_update_buffered(
+            collection_suffix="contents",
+            key_field="aweme_id",
+            data={"aweme_id": content_id, "source_keyword": source_keyword}
+        )
+        return True
+
 
 class DouyinExcelStoreImplement:
     """Douyin Excel storage implementation - Global singleton"""
@@ -275,3 +352,14 @@ class DouyinExcelStoreImplement:
             platform="douyin",
             crawler_type=crawler_type_var.get()
         )
+
+
+class DouyinParquetStoreImplement(ParquetStoreBase):
+    """Douyin Parquet storage implementation"""
+
+    def __init__(self):
+        super().__init__(
+            platform="douyin",
+            crawler_type=crawler_type_var.get(),
+            table_models={"contents": DouyinAweme, "comments": DouyinAwemeComment, "creators": DyCreator},
+        )
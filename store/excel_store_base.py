@@ -33,20 +33,42 @@ Provides Excel export functionality for crawled data with formatted sheets
 
 import threading
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from pathlib import Path
 
 try:
     import openpyxl
+    from openpyxl.cell import WriteOnlyCell
     from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
     from openpyxl.utils import get_column_letter
     EXCEL_AVAILABLE = True
+
+    # Style objects shared by every cell instead of being built per cell
+    THIN_BORDER = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+    HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    HEADER_FONT = Font(bold=True, color="FFFFFF", size=11)
+    HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="center", wrap_text=True)
+    CELL_ALIGNMENT = Alignment(vertical="top", wrap_text=True)
 except ImportError:
     EXCEL_AVAILABLE = False
 
+import config
 from base.base_crawler import AbstractStore
 from tools import utils
 
+# Column width bounds, in characters
+MIN_COLUMN_WIDTH = 10
+MAX_COLUMN_WIDTH = 50
+
+# In write-only mode column widths must be set before the first row is written,
+# so they are estimated from the header and this many rows held back per sheet
+WIDTH_SAMPLE_ROWS = 100
+
 
 class ExcelStoreBase(AbstractStore):
     """
@@ -92,13 +114,14 @@ class ExcelStoreBase(AbstractStore):
                     utils.logger.error(f"[ExcelStoreBase] Error flushing {key}: {e}")
             cls._instances.clear()
 
-    def __init__(self, platform: str, crawler_type: str = "search"):
+    def __init__(self, platform: str, crawler_type: str = "search", write_only: Optional[bool] = None):
         """
         Initialize Excel store
 
         Args:
             platform: Platform name (xhs, dy, ks, etc.)
             crawler_type: Type of crawler (search, detail, creator)
+            write_only: Stream rows to disk with a write-only workbook, defaults to config.EXCEL_WRITE_ONLY
         """
         if not EXCEL_AVAILABLE:
             raise ImportError(
@@ -115,8 +138,18 @@ class ExcelStoreBase(AbstractStore):
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
         # Initialize workbook
-        self.workbook = openpyxl.Workbook()
-        self.workbook.remove(self.workbook.active)  # Remove default sheet
+        self.write_only = config.EXCEL_WRITE_ONLY if write_only is None else write_only
+        if self.write_only:
+            self.workbook = openpyxl.Workbook(write_only=True)
+        else:
+            self.workbook = openpyxl.Workbook()
+            self.workbook.remove(self.workbook.active)  # Remove default sheet
+
+        # Per sheet title: rows written including the header, widest value per column,
+        # and in write-only mode the rows held back until the column widths are set
+        self._row_counts: Dict[str, int] = {}
+        self._column_widths: Dict[str, List[int]] = {}
+        self._sample_rows: Dict[str, List[List[Any]]] = {}
 
         # Create sheets
         self.contents_sheet = self.workbook.create_sheet("Contents")
@@ -148,43 +181,64 @@ class ExcelStoreBase(AbstractStore):
             sheet: Worksheet object
             row_num: Row number for headers (default: 1)
         """
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF", size=11)
-        header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-        border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-
         for cell in sheet[row_num]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = header_alignment
-            cell.border = border
+            cell.fill = HEADER_FILL
+            cell.font = HEADER_FONT
+            cell.alignment = HEADER_ALIGNMENT
+            cell.border = THIN_BORDER
 
-    def _auto_adjust_column_width(self, sheet):
+    def _track_column_widths(self, sheet, values: List[Any]):
         """
-        Auto-adjust column widths based on content
+        Widen the tracked column widths to fit values
 
         Args:
             sheet: Worksheet object
+            values: Row values in column order
         """
-        for column in sheet.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
+        widths = self._column_widths.setdefault(sheet.title, [])
+        for col_index, value in enumerate(values):
+            length = len(str(value)) if value else 0
+            if col_index == len(widths):
+                widths.append(length)
+            elif length > widths[col_index]:
+                widths[col_index] = length
 
-            for cell in column:
-                try:
-                    if cell.value:
-                        max_length = max(max_length, len(str(cell.value)))
-                except (TypeError, AttributeError):
-                    pass
+    def _auto_adjust_column_width(self, sheet):
+        """
+        Set column widths from the widths tracked while rows were written
 
+        Args:
+            sheet: Worksheet object
+        """
+        for col_num, max_length in enumerate(self._column_widths.get(sheet.title, []), 1):
             # Set width with min/max constraints
-            adjusted_width = min(max(max_length + 2, 10), 50)
-            sheet.column_dimensions[column_letter].width = adjusted_width
+            adjusted_width = min(max(max_length + 2, MIN_COLUMN_WIDTH), MAX_COLUMN_WIDTH)
+            sheet.column_dimensions[get_column_letter(col_num)].width = adjusted_width
+
+    def _write_only_cell(self, sheet, value: Any, is_header: bool = False) -> "WriteOnlyCell":
+        cell = WriteOnlyCell(sheet, value=value)
+        cell.border = THIN_BORDER
+        if is_header:
+            cell.fill = HEADER_FILL
+            cell.font = HEADER_FONT
+            cell.alignment = HEADER_ALIGNMENT
+        else:
+            cell.alignment = CELL_ALIGNMENT
+        return cell
+
+    def _release_sample_rows(self, sheet):
+        """
+        Write-only mode: fix the column widths and write the rows held back for the estimate
+
+        Args:
+            sheet: Worksheet object
+        """
+        sample_rows = self._sample_rows.pop(sheet.title, None)
+        if sample_rows is None:
+            return
+        self._auto_adjust_column_width(sheet)
+        for row_index, values in enumerate(sample_rows):
+            sheet.append([self._write_only_cell(sheet, value, is_header=row_index == 0) for value in values])
 
     def _write_headers(self, sheet, headers: List[str]):
         """
@@ -194,6 +248,13 @@ class ExcelStoreBase(AbstractStore):
             sheet: Worksheet object
             headers: List of header names
         """
+        self._row_counts[sheet.title] = 1
+        self._track_column_widths(sheet, headers)
+
+        if self.write_only:
+            self._sample_rows[sheet.title] = [list(headers)]
+            return
+
         for col_num, header in enumerate(headers, 1):
             sheet.cell(row=1, column=col_num, value=header)
 
@@ -208,9 +269,8 @@ class ExcelStoreBase(AbstractStore):
             data: Data dictionary
             headers: List of header names (defines column order)
         """
-        row_num = sheet.max_row + 1
-
-        for col_num, header in enumerate(headers, 1):
+        values = []
+        for header in headers:
             value = data.get(header, "")
 
             # Handle different data types
@@ -218,17 +278,29 @@ class ExcelStoreBase(AbstractStore):
                 value = str(value)
             elif value is None:
                 value = ""
+            values.append(value)
+
+        row_num = self._row_counts.get(sheet.title, 1) + 1
+        self._row_counts[sheet.title] = row_num
 
+        if self.write_only:
+            sample_rows = self._sample_rows.get(sheet.title)
+            if sample_rows is None:
+                sheet.append([self._write_only_cell(sheet, value) for value in values])
+                return
+            self._track_column_widths(sheet, values)
+            sample_rows.append(values)
+            if len(sample_rows) > WIDTH_SAMPLE_ROWS:
+                self._release_sample_rows(sheet)
+            return
+
+        self._track_column_widths(sheet, values)
+        for col_num, value in enumerate(values, 1):
             cell = sheet.cell(row=row_num, column=col_num, value=value)
 
             # Apply basic formatting
-            cell.alignment = Alignment(vertical="top", wrap_text=True)
-            cell.border = Border(
-                left=Side(style='thin'),
-                right=Side(style='thin'),
-                top=Side(style='thin'),
-                bottom=Side(style='thin')
-            )
+            cell.alignment = CELL_ALIGNMENT
+            cell.border = THIN_BORDER
 
     async def store_content(self, content_item: Dict):
         """
@@ -345,26 +417,18 @@ class ExcelStoreBase(AbstractStore):
         Save workbook to file
         """
         try:
-            # Auto-adjust column widths for all sheets
-            self._auto_adjust_column_width(self.contents_sheet)
-            self._auto_adjust_column_width(self.comments_sheet)
-            self._auto_adjust_column_width(self.creators_sheet)
-            if self.contacts_sheet is not None:
-                self._auto_adjust_column_width(self.contacts_sheet)
-            if self.dynamics_sheet is not None:
-                self._auto_adjust_column_width(self.dynamics_sheet)
-
-            # Remove empty sheets (only header row)
-            if self.contents_sheet.max_row == 1:
-                self.workbook.remove(self.contents_sheet)
-            if self.comments_sheet.max_row == 1:
-                self.workbook.remove(self.comments_sheet)
-            if self.creators_sheet.max_row == 1:
-                self.workbook.remove(self.creators_sheet)
-            if self.contacts_sheet is not None and self.contacts_sheet.max_row == 1:
-                self.workbook.remove(self.contacts_sheet)
-            if self.dynamics_sheet is not None and self.dynamics_sheet.max_row == 1:
-                self.workbook.remove(self.dynamics_sheet)
+            sheets = [self.contents_sheet, self.comments_sheet, self.creators_sheet,
+                      self.contacts_sheet, self.dynamics_sheet]
+            for sheet in sheets:
+                if sheet is None:
+                    continue
+                # Remove empty sheets (only header row)
+                if self._row_counts.get(sheet.title, 0) <= 1:
+                    self.workbook.remove(sheet)
+                elif self.write_only:
+                    self._release_sample_rows(sheet)
+                else:
+                    self._auto_adjust_column_width(sheet)
 
             # Check if there are any sheets left
             if len(self.workbook.sheetnames) == 0:
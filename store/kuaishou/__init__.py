@@ -25,6 +25,9 @@
 from typing import List
 
 import config
+from store.store_registry import StoreRegistry
+from store.run_dedup import get_run_dedup
+from store.seen_id_index import get_seen_id_index
 from var import source_keyword_var
 
 from ._store_impl import *
@@ -35,9 +38,11 @@ class KuaishouStoreFactory:
         "csv": KuaishouCsvStoreImplement,
         "db": KuaishouDbStoreImplement,
         "json": KuaishouJsonStoreImplement,
+        "jsonl": KuaishouJsonlStoreImplement,
         "sqlite": KuaishouSqliteStoreImplement,
         "mongodb": KuaishouMongoStoreImplement,
         "excel": KuaishouExcelStoreImplement,
+        "parquet": KuaishouParquetStoreImplement,
     }
 
     @staticmethod
@@ -45,9 +50,16 @@ class KuaishouStoreFactory:
         store_class = KuaishouStoreFactory.STORES.get(config.SAVE_DATA_OPTION)
         if not store_class:
             raise ValueError(
-                "[KuaishouStoreFactory.create_store] Invalid save option only supported csv or db or json or sqlite or mongodb or excel ...")
+                "[KuaishouStoreFactory.create_store] Invalid save option only supported csv or db or json or jsonl or sqlite or mongodb or excel or parquet ...")
         return store_class()
 
+    @staticmethod
+    def get_store() -> AbstractStore:
+        """
+        Get the store shared by the whole run, created on first use
+        """
+        return StoreRegistry.get_store("kuaishou", KuaishouStoreFactory.create_store)
+
 
 async def update_kuaishou_video(video_item: Dict):
     photo_info: Dict = video_item.get("photo", {})
@@ -74,7 +86,10 @@ async def update_kuaishou_video(video_item: Dict):
     }
     utils.logger.info(
         f"[store.kuaishou.update_kuaishou_video] Kuaishou video id:{video_id}, title:{save_content_item.get('title')}")
-    await KuaishouStoreFactory.create_store().store_content(content_item=save_content_item)
+    store = KuaishouStoreFactory.get_store()
+    await store.store_content(content_item=save_content_item)
+    await get_seen_id_index("kuaishou").add_content(video_id)
+    get_run_dedup("kuaishou").remember(video_id, save_content_item, store)
 
 
 async def batch_update_ks_video_comments(video_id: str, comments: List[Dict]):
@@ -100,7 +115,11 @@ async def update_ks_video_comment(video_id: str, comment_item: Dict):
     }
     utils.logger.info(
         f"[store.kuaishou.update_ks_video_comment] Kuaishou video comment: {comment_id}, content: {save_comment_item.get('content')}")
-    await KuaishouStoreFactory.create_store().store_comment(comment_item=save_comment_item)
+    seen_id_index = get_seen_id_index("kuaishou")
+    if seen_id_index.has_comment(comment_id):
+        return
+    await KuaishouStoreFactory.get_store().store_comment(comment_item=save_comment_item)
+    await seen_id_index.add_comment(comment_id)
 
 async def save_creator(user_id: str, creator: Dict):
     ownerCount = creator.get('ownerCount', {})
@@ -119,4 +138,4 @@ async def save_creator(user_id: str, creator: Dict):
         "last_modify_ts": utils.get_current_timestamp(),
     }
     utils.logger.info(f"[store.kuaishou.save_creator] creator:{local_db_item}")
-    await KuaishouStoreFactory.create_store().store_creator(local_db_item)
+    await KuaishouStoreFactory.get_store().store_creator(local_db_item)
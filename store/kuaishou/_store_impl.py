@@ -36,10 +36,12 @@ from sqlalchemy import select
 import config
 from base.base_crawler import AbstractStore
 from database.db_session import get_session
+from database.db_upsert_buffer import DbUpsertBuffer
 from database.models import KuaishouVideo, KuaishouVideoComment
 from tools import utils, words
 from var import crawler_type_var
 from database.mongodb_store_base import MongoDBStoreBase
+from store.parquet_store_base import ParquetStoreBase
 
 
 def calculate_number_of_files(file_store_path: str) -> int:
@@ -87,8 +89,19 @@ class KuaishouCsvStoreImplement(AbstractStore):
     async def store_creator(self, creator: Dict):
         pass
 
+    async def close(self):
+        """
+        flush buffered rows to csv file
+        :return:
+        """
+        await self.writer.close()
+
 
 class KuaishouDbStoreImplement(AbstractStore):
+    def __init__(self):
+        self.content_buffer = DbUpsertBuffer(KuaishouVideo, key_column="video_id")
+        self.comment_buffer = DbUpsertBuffer(KuaishouVideoComment, key_column="comment_id")
+
     async def store_creator(self, creator: Dict):
         pass
 
@@ -98,19 +111,7 @@ class KuaishouDbStoreImplement(AbstractStore):
         Args:
             content_item: content item dict
         """
-        video_id = content_item.get("video_id")
-        async with get_session() as session:
-            result = await session.execute(select(KuaishouVideo).where(KuaishouVideo.video_id == video_id))
-            video_detail = result.scalar_one_or_none()
-
-            if not video_detail:
-                content_item["add_ts"] = utils.get_current_timestamp()
-                new_content = KuaishouVideo(**content_item)
-                session.add(new_content)
-            else:
-                for key, value in content_item.items():
-                    setattr(video_detail, key, value)
-            await session.commit()
+        await self.content_buffer.add({**content_item, "add_ts": utils.get_current_timestamp()})
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -118,20 +119,21 @@ class KuaishouDbStoreImplement(AbstractStore):
         Args:
             comment_item: comment item dict
         """
-        comment_id = comment_item.get("comment_id")
-        async with get_session() as session:
-            result = await session.execute(
-                select(KuaishouVideoComment).where(KuaishouVideoComment.comment_id == comment_id))
-            comment_detail = result.scalar_one_or_none()
+        await self.comment_buffer.add({**comment_item, "add_ts": utils.get_current_timestamp()})
 
-            if not comment_detail:
-                comment_item["add_ts"] = utils.get_current_timestamp()
-                new_comment = KuaishouVideoComment(**comment_item)
-                session.add(new_comment)
-            else:
-                for key, value in comment_item.items():
-                    setattr(comment_detail, key, value)
-            await session.commit()
+    async def close(self):
+        """
+        flush buffered contents and comments to database
+        """
+        await self.content_buffer.flush()
+        await self.comment_buffer.flush()
+
+    async def update_source_keyword(self, content_id, source_keyword: str) -> bool:
+        """
+        Upsert the source_keyword of a stored content, merged into its buffered row when not written yet
+        """
+        await self.content_buffer.add({"video_id": content_id, "source_keyword": source_keyword})
+        return True
 
 
 class KuaishouJsonStoreImplement(AbstractStore):
@@ -165,6 +167,37 @@ class KuaishouJsonStoreImplement(AbstractStore):
         pass
 
 
+class KuaishouJsonlStoreImplement(AbstractStore):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.writer = AsyncFileWriter(platform="kuaishou", crawler_type=crawler_type_var.get())
+
+    async def store_content(self, content_item: Dict):
+        """
+        content JSONL storage implementation
+        Args:
+            content_item:
+
+        Returns:
+
+        """
+        await self.writer.write_single_item_to_jsonl(item_type="contents", item=content_item)
+
+    async def store_comment(self, comment_item: Dict):
+        """
+        comment JSONL storage implementation
+        Args:
+            comment_item:
+
+        Returns:
+
+        """
+        await self.writer.write_single_item_to_jsonl(item_type="comments", item=comment_item)
+
+    async def store_creator(self, creator: Dict):
+        pass
+
+
 class KuaishouSqliteStoreImplement(KuaishouDbStoreImplement):
     async def store_creator(self, creator: Dict):
         pass
@@ -174,7 +207,10 @@ class KuaishouMongoStoreImplement(AbstractStore):
     """Kuaishou MongoDB storage implementation"""
 
     def __init__(self):
-        self.mongo_store = MongoDBStoreBase(collection_prefix="kuaishou")
+        self.mongo_store = MongoDBStoreBase(
+            collection_prefix="kuaishou",
+            indexes={"contents": "video_id", "comments": "comment_id", "creators": "user_id"},
+        )
 
     async def store_content(self, content_item: Dict):
         """
@@ -186,9 +222,9 @@ class KuaishouMongoStoreImplement(AbstractStore):
         if not video_id:
             return
 
-        await self.mongo_store.save_or_update(
+        await self.mongo_store.save_or_update_buffered(
             collection_suffix="contents",
-            query={"video_id": video_id},
+            key_field="video_id",
             data=content_item
         )
         utils.logger.info(f"[KuaishouMongoStoreImplement.store_content] Saved video {video_id} to MongoDB")
@@ -203,9 +239,9 @@ class KuaishouMongoStoreImplement(AbstractStore):
         if not comment_id:
             return
 
-        await self.mongo_store.save_or_update(
+        await self.mongo_store.save_or_update_buffered(
             collection_suffix="comments",
-            query={"comment_id": comment_id},
+            key_field="comment_id",
             data=comment_item
         )
         utils.logger.info(f"[KuaishouMongoStoreImplement.store_comment] Saved comment {comment_id} to MongoDB")
@@ -227,6 +263,23 @@ class KuaishouMongoStoreImplement(AbstractStore):
         )
         utils.logger.info(f"[KuaishouMongoStoreImplement.store_creator] Saved creator {user_id} to MongoDB")
 
+    async def close(self):
+        """
+        Flush queued contents and comments to MongoDB
+        """
+        await self.mongo_store.flush()
+
+    async def update_source_keyword(self, content_id, source_keyword: str) -> bool:
+        """
+        Upsert the source_keyword of a stored content, merged into its queued document when not written yet
+        """
+        await self.mongo_store.save_or_update_buffered(
+            collection_suffix="contents",
+            key_field="video_id",
+            data={"video_id": content_id, "source_keyword": source_keyword}
+        )
+        return True
+
 
 class KuaishouExcelStoreImplement:
     """Kuaishou Excel storage implementation - Global singleton"""
@@ -237,3 +290,14 @@ class KuaishouExcelStoreImplement:
             platform="kuaishou",
             crawler_type=crawler_type_var.get()
         )
+
+
+class KuaishouParquetStoreImplement(ParquetStoreBase):
+    """Kuaishou Parquet storage implementation"""
+
+    def __init__(self):
+        super().__init__(
+            platform="kuaishou",
+            crawler_type=crawler_type_var.get(),
+            table_models={"contents": KuaishouVideo, "comments": KuaishouVideoComment},
+        )
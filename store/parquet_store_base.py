@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/store/parquet_store_base.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Parquet Store Base Implementation
+Writes crawled data to columnar Parquet files, one file per item type, in row groups of typed Arrow batches
+"""
+
+import asyncio
+import json
+import re
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+from sqlalchemy import BigInteger, Integer
+
+import config
+from base.base_crawler import AbstractStore
+from tools import utils
+
+# Count columns the models keep as text because the platforms render them for display, stored as int64
+NUMERIC_FIELD_NAMES = {"fans", "follows", "interaction", "video_danmaku", "video_comment"}
+NUMERIC_FIELD_SUFFIXES = ("_count",)
+# Fields of a record outside its declared schema, kept as one JSON object per row
+EXTRA_FIELDS_COLUMN = "extra_fields"
+
+# Counts the platforms render for display, e.g. "1.2万", "3w", "10+", "1,024"
+_DISPLAY_COUNT_PATTERN = re.compile(r"^(-?\d+(?:\.\d+)?)\s*([万wW千kK亿]?)\+?$")
+_DISPLAY_COUNT_UNITS = {"": 1, "千": 1000, "k": 1000, "K": 1000, "万": 10000, "w": 10000, "W": 10000, "亿": 100000000}
+
+
+def parse_int(value: Any) -> Optional[int]:
+    """
+    Parse an integer field as the platforms return it
+
+    Args:
+        value: int, float or display string such as "1.2万" or "10+"
+
+    Returns:
+        The integer, or None when value is empty or not a number
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+    text = str(value).strip().replace(",", "")
+    if not text:
+        return None
+    match = _DISPLAY_COUNT_PATTERN.match(text)
+    if not match:
+        return None
+    number, unit = match.groups()
+    # Decimal keeps 19 digit ids exact, a float would round them
+    return int(Decimal(number) * _DISPLAY_COUNT_UNITS[unit])
+
+
+def _is_numeric_field(name: str) -> bool:
+    return name in NUMERIC_FIELD_NAMES or name.endswith(NUMERIC_FIELD_SUFFIXES)
+
+
+def _to_string(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, (list, dict)):
+        return str(value)
+    return value if isinstance(value, str) else str(value)
+
+
+def model_schema(model: Optional[Type]) -> "pa.Schema":
+    """
+    Arrow schema of a database/models.py table: integer columns and display counts as int64,
+    the other columns as string, then the EXTRA_FIELDS_COLUMN. The autoincrement id is left out
+    """
+    fields = []
+    if model is not None:
+        for column in model.__table__.columns:
+            if column.primary_key:
+                continue
+            is_int = isinstance(column.type, (Integer, BigInteger)) or _is_numeric_field(column.name)
+            fields.append(pa.field(column.name, pa.int64() if is_int else pa.string()))
+    fields.append(pa.field(EXTRA_FIELDS_COLUMN, pa.string()))
+    return pa.schema(fields)
+
+
+class ParquetTableWriter:
+    """
+    Buffers the records of one item type and writes them to a Parquet file one row group at a time
+    The schema is declared up front, fields outside it and counts that are not numbers go to the
+    EXTRA_FIELDS_COLUMN as JSON
+    """
+
+    def __init__(self, file_path: Path, row_group_size: int, schema: "pa.Schema"):
+        self.file_path = file_path
+        self.row_group_size = row_group_size
+        self.schema = schema
+        self.rows: List[Dict] = []
+        self.rows_written = 0
+        self._writer: Optional["pq.ParquetWriter"] = None
+
+    def add(self, item: Dict) -> bool:
+        """Buffer a record, returns True once a full row group is buffered"""
+        self.rows.append(item)
+        return len(self.rows) >= self.row_group_size
+
+    def _row_columns(self, row: Dict) -> Tuple[Dict[str, Any], Optional[str], bool]:
+        """
+        Values of a record by declared column, the JSON of its EXTRA_FIELDS_COLUMN and whether a count
+        was not a number, such a count is left null in its int64 column and kept as text in the extra fields
+        """
+        values = {}
+        unparsed = False
+        extra = {name: value for name, value in row.items() if name not in self.schema.names}
+        for field in self.schema:
+            if field.name == EXTRA_FIELDS_COLUMN:
+                continue
+            value = row.get(field.name)
+            if not pa.types.is_integer(field.type):
+                values[field.name] = _to_string(value)
+                continue
+            number = parse_int(value)
+            if number is None and value not in (None, ""):
+                extra[field.name] = _to_string(value)
+                unparsed = True
+            values[field.name] = number
+        return values, json.dumps(extra, ensure_ascii=False, default=str) if extra else None, unparsed
+
+    def write_row_group(self):
+        """
+        Write the buffered records as one row group
+        The records stay buffered until the row group is written, a failed write is retried with the next one
+        """
+        if not self.rows:
+            return
+        rows = self.rows
+        converted = [self._row_columns(row) for row in rows]
+        unparsed = sum(1 for _, _, row_unparsed in converted if row_unparsed)
+        if unparsed:
+            utils.logger.warning(
+                f"[ParquetTableWriter] {self.file_path.name}: {unparsed} records with counts that are not numbers, "
+                f"kept as text in {EXTRA_FIELDS_COLUMN}"
+            )
+        columns = []
+        for field in self.schema:
+            if field.name == EXTRA_FIELDS_COLUMN:
+                values = [extra for _, extra, _ in converted]
+            else:
+                values = [row_values[field.name] for row_values, _, _ in converted]
+            columns.append(pa.array(values, type=field.type))
+
+        if self._writer is None:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = pq.ParquetWriter(str(self.file_path), self.schema, compression="snappy")
+        self._writer.write_table(pa.Table.from_arrays(columns, schema=self.schema), row_group_size=len(rows))
+        self.rows = self.rows[len(rows):]
+        self.rows_written += len(rows)
+
+    def close(self):
+        """Write the remaining records and finish the file footer"""
+        try:
+            self.write_row_group()
+        finally:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+
+class ParquetStoreBase(AbstractStore):
+    """
+    Base class for Parquet storage implementation
+    Writes data/{platform}/parquet/{crawler_type}_{item_type}_{timestamp}.parquet for each item type
+    """
+
+    def __init__(
+        self,
+        platform: str,
+        crawler_type: str = "search",
+        row_group_size: Optional[int] = None,
+        table_models: Optional[Dict[str, Type]] = None,
+    ):
+        """
+        Initialize Parquet store
+
+        Args:
+            platform: Platform name (xhs, douyin, bilibili, etc.)
+            crawler_type: Type of crawler (search, detail, creator)
+            row_group_size: Records per row group, defaults to config.PARQUET_ROW_GROUP_SIZE
+            table_models: item type -> database/models.py model declaring its schema,
+                an item type without a model keeps all its fields in the EXTRA_FIELDS_COLUMN
+        """
+        if not PARQUET_AVAILABLE:
+            raise ImportError(
+                "pyarrow is required for Parquet export. "
+                "Install it with: pip install pyarrow"
+            )
+
+        super().__init__()
+        self.platform = platform
+        self.crawler_type = crawler_type
+        self.row_group_size = row_group_size or config.PARQUET_ROW_GROUP_SIZE
+        self.data_dir = Path("data") / platform / "parquet"
+        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.table_models = table_models or {}
+        self.lock = asyncio.Lock()
+        self._tables: Dict[str, ParquetTableWriter] = {}
+
+    def _get_table(self, item_type: str) -> ParquetTableWriter:
+        table = self._tables.get(item_type)
+        if table is None:
+            file_path = self.data_dir / f"{self.crawler_type}_{item_type}_{self.timestamp}.parquet"
+            schema = model_schema(self.table_models.get(item_type))
+            table = ParquetTableWriter(file_path, self.row_group_size, schema)
+            self._tables[item_type] = table
+        return table
+
+    async def _store_item(self, item_type: str, item: Dict):
+        async with self.lock:
+            table = self._get_table(item_type)
+            if table.add(item):
+                try:
+                    # Converting and compressing a row group is CPU bound, keep it off the event loop
+                    await asyncio.to_thread(table.write_row_group)
+                except Exception as e:
+                    # The records stay buffered and go out with the next row group
+                    utils.logger.error(f"[ParquetStoreBase] Failed to write a row group to {table.file_path}: {e}")
+
+    async def store_content(self, content_item: Dict):
+        """
+        Store content data to Parquet
+
+        Args:
+            content_item: Content data dictionary
+        """
+        await self._store_item("contents", content_item)
+
+    async def store_comment(self, comment_item: Dict):
+        """
+        Store comment data to Parquet
+
+        Args:
+            comment_item: Comment data dictionary
+        """
+        await self._store_item("comments", comment_item)
+
+    async def store_creator(self, creator: Dict):
+        """
+        Store creator data to Parquet
+
+        Args:
+            creator: Creator data dictionary
+        """
+        await self._store_item("creators", creator)
+
+    async def store_contact(self, contact_item: Dict):
+        """
+        Store contact data to Parquet (for platforms like Bilibili)
+
+        Args:
+            contact_item: Contact data dictionary
+        """
+        await self._store_item("contacts", contact_item)
+
+    async def store_dynamic(self, dynamic_item: Dict):
+        """
+        Store dynamic data to Parquet (for platforms like Bilibili)
+
+        Args:
+            dynamic_item: Dynamic data dictionary
+        """
+        await self._store_item("dynamics", dynamic_item)
+
+    async def close(self):
+        """
+        Write the remaining records and close all Parquet files
+        """
+        async with self.lock:
+            tables = list(self._tables.values())
+            self._tables.clear()
+            for table in tables:
+                try:
+                    await asyncio.to_thread(table.close)
+                except Exception as e:
+                    utils.logger.error(
+                        f"[ParquetStoreBase] Failed to write {table.file_path}, {len(table.rows)} records not saved: {e}"
+                    )
+                    continue
+                utils.logger.info(f"[ParquetStoreBase] Saved {table.rows_written} rows to {table.file_path}")
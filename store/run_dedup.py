@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/store/run_dedup.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Run Dedup
+Content IDs returned by the keyword searches of the current run, so a note found under several
+keywords is detailed and comment-crawled once. Its later keywords are upserted into the stored
+source_keyword by the db, sqlite and mongodb stores. The append-only file stores get them in a
+data/<platform>/jsonl/<crawler_type>_source_keywords_<date>.jsonl sidecar instead, one line per
+change, the last line of a content holding all its keywords
+"""
+
+from typing import Any, Dict, List, Optional
+
+from base.base_crawler import AbstractStore
+from tools import utils
+from var import crawler_type_var
+
+SOURCE_KEYWORD_SEPARATOR = ","
+SOURCE_KEYWORDS_ITEM_TYPE = "source_keywords"
+
+
+class RunDedup:
+    """
+    Search results of one platform in the current run
+    """
+
+    def __init__(self, platform: str):
+        self.platform = platform
+        # content id -> keywords it was found under, in search order
+        self._keywords: Dict[str, List[str]] = {}
+        # content id -> the id as the store keyed it, for the contents stored from a keyword search
+        self._stored_ids: Dict[str, Any] = {}
+        self._store: Optional[AbstractStore] = None
+        self._file_writer = None
+
+    async def claim(self, content_id, keyword: str) -> bool:
+        """
+        Record that a search for keyword returned the content
+        Args:
+            content_id: Content ID
+            keyword: Current search keyword
+
+        Returns:
+            True the first time the content is seen in this run, the caller then fetches it
+        """
+        if content_id is None:
+            return True
+        content_id = str(content_id)
+        keywords = self._keywords.get(content_id)
+        if keywords is None:
+            self._keywords[content_id] = [keyword]
+            return True
+        if keyword in keywords:
+            return False
+        keywords.append(keyword)
+        utils.logger.info(f"[RunDedup.claim] {self.platform} content {content_id} already crawled, add keyword {keyword}")
+        if content_id in self._stored_ids:
+            await self._record_keywords(self._stored_ids[content_id], SOURCE_KEYWORD_SEPARATOR.join(keywords))
+        return False
+
+    async def _record_keywords(self, stored_id, source_keyword: str):
+        if await self._store.update_source_keyword(stored_id, source_keyword):
+            return
+        if self._file_writer is None:
+            from tools.async_file_writer import AsyncFileWriter
+
+            self._file_writer = AsyncFileWriter(platform=self.platform, crawler_type=crawler_type_var.get())
+        await self._file_writer.write_single_item_to_jsonl(
+            {"content_id": stored_id, "source_keyword": source_keyword}, SOURCE_KEYWORDS_ITEM_TYPE
+        )
+
+    def remember(self, content_id, item: Dict, store: AbstractStore):
+        """
+        Note a content item stored by a keyword search, so later keywords can be recorded for it
+        Args:
+            content_id: Content ID, as the store keys the content
+            item: The dict passed to store_content
+            store: The store it was written to
+        """
+        if not item.get("source_keyword") or content_id is None:
+            return
+        self._stored_ids[str(content_id)] = content_id
+        self._store = store
+
+    async def close(self):
+        """
+        Write the pending record counts of the keyword sidecar
+        """
+        if self._file_writer is not None:
+            await self._file_writer.close()
+
+    def __len__(self) -> int:
+        return len(self._keywords)
+
+
+# platform -> dedup of the current run
+_run_dedups: Dict[str, RunDedup] = {}
+
+
+def get_run_dedup(platform: str) -> RunDedup:
+    """
+    Get the dedup of a platform, shared by every keyword of the run
+    """
+    run_dedup = _run_dedups.get(platform)
+    if run_dedup is None:
+        run_dedup = RunDedup(platform)
+        _run_dedups[platform] = run_dedup
+    return run_dedup
+
+
+async def close_run_dedups():
+    """
+    Close the dedups of the run, called once at the end of the run
+    """
+    for run_dedup in _run_dedups.values():
+        await run_dedup.close()
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/store/seen_id_index.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Seen ID Index
+Per-platform set of the content and comment IDs already stored, persisted as append-only
+files under data/<platform>/.seen/ so repeat runs can skip them before fetching anything
+"""
+
+import csv
+import json
+import pathlib
+from typing import Dict, List, Optional, Set
+
+import aiofiles
+
+import config
+from tools import utils
+
+# platform -> (content model, content id field, comment model, comment id field)
+SEEN_ID_FIELDS: Dict[str, tuple] = {
+    "xhs": ("XhsNote", "note_id", "XhsNoteComment", "comment_id"),
+    "douyin": ("DouyinAweme", "aweme_id", "DouyinAwemeComment", "comment_id"),
+    "kuaishou": ("KuaishouVideo", "video_id", "KuaishouVideoComment", "comment_id"),
+    "bili": ("BilibiliVideo", "video_id", "BilibiliVideoComment", "comment_id"),
+    "weibo": ("WeiboNote", "note_id", "WeiboNoteComment", "comment_id"),
+    "tieba": ("TiebaNote", "note_id", "TiebaComment", "comment_id"),
+    "zhihu": ("ZhihuContent", "content_id", "ZhihuComment", "comment_id"),
+}
+
+# Newly seen IDs are appended to the index files once this many are pending
+FLUSH_PENDING_COUNT = 500
+
+
+class SeenIdIndex:
+    """
+    Content and comment IDs already stored for one platform
+    The whole set is kept in memory, lookups are O(1); only the IDs added since the last flush are written
+    """
+
+    def __init__(self, platform: str, enabled: bool = True, base_dir: str = "data"):
+        """
+        Args:
+            platform: Platform name used by the stores (xhs, douyin, bili, etc.)
+            enabled: When False every lookup misses and nothing is recorded
+            base_dir: Root data directory
+        """
+        self.platform = platform
+        self.enabled = enabled
+        self.index_dir = pathlib.Path(base_dir) / platform / ".seen"
+        self._base_dir = pathlib.Path(base_dir)
+        self._ids: Dict[str, Set[str]] = {"contents": set(), "comments": set()}
+        self._pending: Dict[str, List[str]] = {"contents": [], "comments": []}
+        self.loaded = False
+
+    def _index_file(self, item_type: str) -> pathlib.Path:
+        return self.index_dir / f"{item_type}.ids"
+
+    async def load(self):
+        """
+        Load the index files, seeding them from the database or the existing file output on first use
+        """
+        if not self.enabled or self.loaded:
+            return
+        self.loaded = True
+        for item_type in self._ids:
+            index_file = self._index_file(item_type)
+            if index_file.exists():
+                async with aiofiles.open(index_file, "r", encoding="utf-8") as f:
+                    async for line in f:
+                        seen_id = line.strip()
+                        if seen_id:
+                            self._ids[item_type].add(seen_id)
+            else:
+                seeded = await self._seed(item_type)
+                self._ids[item_type].update(seeded)
+                self._pending[item_type].extend(seeded)
+        await self.flush()
+        utils.logger.info(
+            f"[SeenIdIndex.load] {self.platform}: {len(self._ids['contents'])} contents, "
+            f"{len(self._ids['comments'])} comments already stored"
+        )
+
+    async def _seed(self, item_type: str) -> Set[str]:
+        """
+        Collect the IDs already saved by previous runs
+        """
+        model_name, content_field, comment_model_name, comment_field = SEEN_ID_FIELDS[self.platform]
+        if item_type == "comments":
+            model_name, id_field = comment_model_name, comment_field
+        else:
+            id_field = content_field
+
+        if config.SAVE_DATA_OPTION in ("db", "sqlite"):
+            return await self._seed_from_db(model_name, id_field)
+        return self._seed_from_files(item_type, id_field)
+
+    @staticmethod
+    async def _seed_from_db(model_name: str, id_field: str) -> Set[str]:
+        from sqlalchemy import select
+
+        from database import models
+        from database.db_session import get_session
+
+        column = getattr(getattr(models, model_name), id_field)
+        seeded = set()
+        try:
+            async with get_session() as session:
+                result = await session.stream_scalars(select(column))
+                async for seen_id in result:
+                    if seen_id is not None:
+                        seeded.add(str(seen_id))
+        except Exception as e:
+            utils.logger.warning(f"[SeenIdIndex._seed_from_db] Skip seeding from {model_name}: {e}")
+        return seeded
+
+    def _seed_from_files(self, item_type: str, id_field: str) -> Set[str]:
+        seeded = set()
+        platform_dir = self._base_dir / self.platform
+        for file_path in sorted(platform_dir.glob(f"*/*_{item_type}_*")):
+            try:
+                seeded.update(read_ids_from_file(file_path, id_field))
+            except Exception as e:
+                utils.logger.warning(f"[SeenIdIndex._seed_from_files] Skip {file_path}: {e}")
+        return seeded
+
+    def has_content(self, content_id) -> bool:
+        return self.enabled and content_id is not None and str(content_id) in self._ids["contents"]
+
+    def has_comment(self, comment_id) -> bool:
+        return self.enabled and comment_id is not None and str(comment_id) in self._ids["comments"]
+
+    async def add_content(self, content_id):
+        await self._add("contents", content_id)
+
+    async def add_comment(self, comment_id):
+        await self._add("comments", comment_id)
+
+    async def _add(self, item_type: str, seen_id):
+        # Until loaded, writing the index file would stop it from ever being seeded
+        if not self.enabled or not self.loaded or seen_id is None:
+            return
+        seen_id = str(seen_id)
+        if seen_id in self._ids[item_type]:
+            return
+        self._ids[item_type].add(seen_id)
+        self._pending[item_type].append(seen_id)
+        if len(self._pending[item_type]) >= FLUSH_PENDING_COUNT:
+            await self.flush()
+
+    async def flush(self):
+        """
+        Append the pending IDs to the index files
+        """
+        if not self.enabled:
+            return
+        for item_type, pending in self._pending.items():
+            if not pending:
+                continue
+            self._pending[item_type] = []
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            async with aiofiles.open(self._index_file(item_type), "a", encoding="utf-8") as f:
+                await f.write("".join(f"{seen_id}\n" for seen_id in pending))
+
+    async def close(self):
+        await self.flush()
+
+
+def read_ids_from_file(file_path: pathlib.Path, id_field: str) -> Set[str]:
+    """
+    Read one field of every record of a saved json, jsonl or csv file
+    """
+    ids = set()
+    if file_path.suffix == ".jsonl":
+        with open(file_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    ids.add(json.loads(line).get(id_field))
+    elif file_path.suffix == ".json":
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            ids.update(item.get(id_field) for item in data if isinstance(item, dict))
+    elif file_path.suffix == ".csv":
+        with open(file_path, "r", encoding="utf-8-sig", newline="") as f:
+            ids.update(row.get(id_field) for row in csv.DictReader(f))
+    return {str(seen_id) for seen_id in ids if seen_id not in (None, "")}
+
+
+# platform -> index shared by the whole run
+_indexes: Dict[str, SeenIdIndex] = {}
+
+
+def get_seen_id_index(platform: str) -> SeenIdIndex:
+    """
+    Get the seen ID index of a platform, a disabled index when ENABLE_SEEN_ID_INDEX is off
+    """
+    index = _indexes.get(platform)
+    if index is None:
+        index = SeenIdIndex(platform, enabled=config.ENABLE_SEEN_ID_INDEX)
+        _indexes[platform] = index
+    return index
+
+
+async def load_seen_id_index(platform: str) -> Optional[SeenIdIndex]:
+    """
+    Load the index of a platform at startup
+    """
+    if not config.ENABLE_SEEN_ID_INDEX or platform not in SEEN_ID_FIELDS:
+        return None
+    index = get_seen_id_index(platform)
+    await index.load()
+    return index
+
+
+async def close_seen_id_indexes():
+    """
+    Write the IDs recorded during this run, should be called at the end of crawler execution
+    """
+    indexes = list(_indexes.values())
+    _indexes.clear()
+    for index in indexes:
+        try:
+            await index.close()
+        except Exception as e:
+            utils.logger.error(f"[SeenIdIndex] Error writing {index.platform} index: {e}")
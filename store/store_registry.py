@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/store/store_registry.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Store Registry
+Keeps one store instance per platform, save option and crawler type for the whole run
+"""
+
+from typing import Callable, Dict, Tuple
+
+import config
+from base.base_crawler import AbstractStore
+from tools import utils
+from var import crawler_type_var
+
+
+class StoreRegistry:
+    """
+    Per-run registry of store instances
+    Stores are created lazily on first use and closed together at the end of the run,
+    so file writers, their locks and any write buffers are shared by every record
+    """
+
+    _instances: Dict[Tuple[str, str, str], AbstractStore] = {}
+
+    @classmethod
+    def get_store(cls, platform: str, create_store: Callable[[], AbstractStore]) -> AbstractStore:
+        """
+        Get the store of the current run, creating it on first use
+
+        Args:
+            platform: Platform name (xhs, douyin, bili, etc.)
+            create_store: Factory used when no store exists yet for the current save option and crawler type
+
+        Returns:
+            AbstractStore instance
+        """
+        key = (platform, config.SAVE_DATA_OPTION, crawler_type_var.get())
+        store = cls._instances.get(key)
+        if store is None:
+            store = create_store()
+            cls._instances[key] = store
+        return store
+
+    @classmethod
+    async def close_all(cls):
+        """
+        Close all store instances, flushing any buffered data
+        Should be called at the end of crawler execution
+        """
+        instances = list(cls._instances.items())
+        cls._instances.clear()
+        for key, store in instances:
+            try:
+                await store.close()
+                utils.logger.info(f"[StoreRegistry] Closed store: {key}")
+            except Exception as e:
+                utils.logger.error(f"[StoreRegistry] Error closing {key}: {e}")
@@ -23,6 +23,8 @@ from typing import List
 
 from model.m_baidu_tieba import TiebaComment, TiebaCreator, TiebaNote
 from var import source_keyword_var
+from store.run_dedup import get_run_dedup
+from store.seen_id_index import get_seen_id_index
 
 from ._store_impl import *
 
@@ -32,9 +34,11 @@ class TieBaStoreFactory:
         "csv": TieBaCsvStoreImplement,
         "db": TieBaDbStoreImplement,
         "json": TieBaJsonStoreImplement,
+        "jsonl": TieBaJsonlStoreImplement,
         "sqlite": TieBaSqliteStoreImplement,
         "mongodb": TieBaMongoStoreImplement,
         "excel": TieBaExcelStoreImplement,
+        "parquet": TieBaParquetStoreImplement,
     }
 
     @staticmethod
@@ -42,9 +46,16 @@ class TieBaStoreFactory:
         store_class = TieBaStoreFactory.STORES.get(config.SAVE_DATA_OPTION)
         if not store_class:
             raise ValueError(
-                "[TieBaStoreFactory.create_store] Invalid save option only supported csv or db or json or sqlite or mongodb or excel ...")
+                "[TieBaStoreFactory.create_store] Invalid save option only supported csv or db or json or jsonl or sqlite or mongodb or excel or parquet ...")
         return store_class()
 
+    @staticmethod
+    def get_store() -> AbstractStore:
+        """
+        Get the store shared by the whole run, created on first use
+        """
+        return StoreRegistry.get_store("tieba", TieBaStoreFactory.create_store)
+
 
 async def batch_update_tieba_notes(note_list: List[TiebaNote]):
     """
@@ -75,7 +86,10 @@ async def update_tieba_note(note_item: TiebaNote):
     save_note_item.update({"last_modify_ts": utils.get_current_timestamp()})
     utils.logger.info(f"[store.tieba.update_tieba_note] tieba note: {save_note_item}")
 
-    await TieBaStoreFactory.create_store().store_content(save_note_item)
+    store = TieBaStoreFactory.get_store()
+    await store.store_content(save_note_item)
+    await get_seen_id_index("tieba").add_content(save_note_item["note_id"])
+    get_run_dedup("tieba").remember(save_note_item["note_id"], save_note_item, store)
 
 
 async def batch_update_tieba_note_comments(note_id: str, comments: List[TiebaComment]):
@@ -107,7 +121,11 @@ async def update_tieba_note_comment(note_id: str, comment_item: TiebaComment):
     save_comment_item = comment_item.model_dump()
     save_comment_item.update({"last_modify_ts": utils.get_current_timestamp()})
     utils.logger.info(f"[store.tieba.update_tieba_note_comment] tieba note id: {note_id} comment:{save_comment_item}")
-    await TieBaStoreFactory.create_store().store_comment(save_comment_item)
+    seen_id_index = get_seen_id_index("tieba")
+    if seen_id_index.has_comment(save_comment_item["comment_id"]):
+        return
+    await TieBaStoreFactory.get_store().store_comment(save_comment_item)
+    await seen_id_index.add_comment(save_comment_item["comment_id"])
 
 
 async def save_creator(user_info: TiebaCreator):
@@ -122,4 +140,4 @@ async def save_creator(user_info: TiebaCreator):
     local_db_item = user_info.model_dump()
     local_db_item["last_modify_ts"] = utils.get_current_timestamp()
     utils.logger.info(f"[store.tieba.save_creator] creator:{local_db_item}")
-    await TieBaStoreFactory.create_store().store_creator(local_db_item)
+    await TieBaStoreFactory.get_store().store_creator(local_db_item)
@@ -38,9 +38,11 @@ from base.base_crawler import AbstractStore
 from database.models import TiebaNote, TiebaComment, TiebaCreator
 from tools import utils, words
 from database.db_session import get_session
+from database.db_upsert_buffer import DbUpsertBuffer
 from var import crawler_type_var
 from tools.async_file_writer import AsyncFileWriter
 from database.mongodb_store_base import MongoDBStoreBase
+from store.parquet_store_base import ParquetStoreBase
 
 
 def calculate_number_of_files(file_store_path: str) -> int:
@@ -96,26 +98,26 @@ class TieBaCsvStoreImplement(AbstractStore):
         """
         await self.writer.write_to_csv(item_type="creators", item=creator)
 
+    async def close(self):
+        """
+        flush buffered rows to csv file
+        :return:
+        """
+        await self.writer.close()
+
 
 class TieBaDbStoreImplement(AbstractStore):
+    def __init__(self):
+        self.content_buffer = DbUpsertBuffer(TiebaNote, key_column="note_id")
+        self.comment_buffer = DbUpsertBuffer(TiebaComment, key_column="comment_id")
+
     async def store_content(self, content_item: Dict):
         """
         tieba content DB storage implementation
         Args:
             content_item: content item dict
         """
-        note_id = content_item.get("note_id")
-        async with get_session() as session:
-            stmt = select(TiebaNote).where(TiebaNote.note_id == note_id)
-            res = await session.execute(stmt)
-            db_note = res.scalar_one_or_none()
-            if db_note:
-                for key, value in content_item.items():
-                    setattr(db_note, key, value)
-            else:
-                db_note = TiebaNote(**content_item)
-                session.add(db_note)
-            await session.commit()
+        await self.content_buffer.add(content_item)
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -123,18 +125,7 @@ class TieBaDbStoreImplement(AbstractStore):
         Args:
             comment_item: comment item dict
         """
-        comment_id = comment_item.get("comment_id")
-        async with get_session() as session:
-            stmt = select(TiebaComment).where(TiebaComment.comment_id == comment_id)
-            res = await session.execute(stmt)
-            db_comment = res.scalar_one_or_none()
-            if db_comment:
-                for key, value in comment_item.items():
-                    setattr(db_comment, key, value)
-            else:
-                db_comment = TiebaComment(**comment_item)
-                session.add(db_comment)
-            await session.commit()
+        await self.comment_buffer.add(comment_item)
 
     async def store_creator(self, creator: Dict):
         """
@@ -155,6 +146,20 @@ class TieBaDbStoreImplement(AbstractStore):
                 session.add(db_creator)
             await session.commit()
 
+    async def close(self):
+        """
+        flush buffered contents and comments to database
+        """
+        await self.content_buffer.flush()
+        await self.comment_buffer.flush()
+
+    async def update_source_keyword(self, content_id, source_keyword: str) -> bool:
+        """
+        Upsert the source_keyword of a stored content, merged into its buffered row when not written yet
+        """
+        await self.content_buffer.add({"note_id": content_id, "source_keyword": source_keyword})
+        return True
+
 
 class TieBaJsonStoreImplement(AbstractStore):
     def __init__(self, **kwargs):
@@ -195,6 +200,45 @@ class TieBaJsonStoreImplement(AbstractStore):
         await self.writer.write_single_item_to_json(item_type="creators", item=creator)
 
 
+class TieBaJsonlStoreImplement(AbstractStore):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.writer = AsyncFileWriter(platform="tieba", crawler_type=crawler_type_var.get())
+
+    async def store_content(self, content_item: Dict):
+        """
+        tieba content JSONL storage implementation
+        Args:
+            content_item: note item dict
+
+        Returns:
+
+        """
+        await self.writer.write_single_item_to_jsonl(item_type="contents", item=content_item)
+
+    async def store_comment(self, comment_item: Dict):
+        """
+        tieba comment JSONL storage implementation
+        Args:
+            comment_item: comment item dict
+
+        Returns:
+
+        """
+        await self.writer.write_single_item_to_jsonl(item_type="comments", item=comment_item)
+
+    async def store_creator(self, creator: Dict):
+        """
+        tieba content JSONL storage implementation
+        Args:
+            creator: creator dict
+
+        Returns:
+
+        """
+        await self.writer.write_single_item_to_jsonl(item_type="creators", item=creator)
+
+
 class TieBaSqliteStoreImplement(TieBaDbStoreImplement):
     """
     Tieba sqlite store implement
@@ -206,7 +250,10 @@ class TieBaMongoStoreImplement(AbstractStore):
     """Tieba MongoDB storage implementation"""
 
     def __init__(self):
-        self.mongo_store = MongoDBStoreBase(collection_prefix="tieba")
+        self.mongo_store = MongoDBStoreBase(
+            collection_prefix="tieba",
+            indexes={"contents": "note_id", "comments": "comment_id", "creators": "user_id"},
+        )
 
     async def store_content(self, content_item: Dict):
         """
@@ -218,9 +265,9 @@ class TieBaMongoStoreImplement(AbstractStore):
         if not note_id:
             return
 
-        await self.mongo_store.save_or_update(
+        await self.mongo_store.save_or_update_buffered(
             collection_suffix="contents",
-            query={"note_id": note_id},
+            key_field="note_id",
             data=content_item
         )
         utils.logger.info(f"[TieBaMongoStoreImplement.store_content] Saved note {note_id} to MongoDB")
@@ -235,9 +282,9 @@ class TieBaMongoStoreImplement(AbstractStore):
         if not comment_id:
             return
 
-        await self.mongo_store.save_or_update(
+        await self.mongo_store.save_or_update_buffered(
             collection_suffix="comments",
-            query={"comment_id": comment_id},
+            key_field="comment_id",
             data=comment_item
         )
         utils.logger.info(f"[TieBaMongoStoreImplement.store_comment] Saved comment {comment_id} to MongoDB")
@@ -259,6 +306,23 @@ class TieBaMongoStoreImplement(AbstractStore):
         )
         utils.logger.info(f"[TieBaMongoStoreImplement.store_creator] Saved creator {user_id} to MongoDB")
 
+    async def close(self):
+        """
+        Flush queued contents and comments to MongoDB
+        """
+        await self.mongo_store.flush()
+
+    async def update_source_keyword(self, content_id, source_keyword: str) -> bool:
+        """
+        Upsert the source_keyword of a stored content, merged into its queued document when not written yet
+        """
+        await self.mongo_store.save_or_update_buffered(
+            collection_suffix="contents",
+            key_field="note_id",
+            data={"note_id": content_id, "source_keyword": source_keyword}
+        )
+        return True
+
 
 class TieBaExcelStoreImplement:
     """Tieba Excel storage implementation - Global singleton"""
@@ -269,3 +333,14 @@ class TieBaExcelStoreImplement:
             platform="tieba",
             crawler_type=crawler_type_var.get()
         )
+
+
+class TieBaParquetStoreImplement(ParquetStoreBase):
+    """Tieba Parquet storage implementation"""
+
+    def __init__(self):
+        super().__init__(
+            platform="tieba",
+            crawler_type=crawler_type_var.get(),
+            table_models={"contents": TiebaNote, "comments": TiebaComment, "creators": TiebaCreator},
+        )
@@ -26,6 +26,8 @@ import re
 from typing import List
 
 from var import source_keyword_var
+from store.run_dedup import get_run_dedup
+from store.seen_id_index import get_seen_id_index
 
 from .weibo_store_media import *
 from ._store_impl import *
@@ -36,18 +38,27 @@ class WeibostoreFactory:
         "csv": WeiboCsvStoreImplement,
         "db": WeiboDbStoreImplement,
         "json": WeiboJsonStoreImplement,
+        "jsonl": WeiboJsonlStoreImplement,
         "sqlite": WeiboSqliteStoreImplement,
         "mongodb": WeiboMongoStoreImplement,
         "excel": WeiboExcelStoreImplement,
+        "parquet": WeiboParquetStoreImplement,
     }
 
     @staticmethod
     def create_store() -> AbstractStore:
         store_class = WeibostoreFactory.STORES.get(config.SAVE_DATA_OPTION)
         if not store_class:
-            raise ValueError("[WeibotoreFactory.create_store] Invalid save option only supported csv or db or json or sqlite or mongodb or excel ...")
+            raise ValueError("[WeibotoreFactory.create_store] Invalid save option only supported csv or db or json or jsonl or sqlite or mongodb or excel or parquet ...")
         return store_class()
 
+    @staticmethod
+    def get_store() -> AbstractStore:
+        """
+        Get the store shared by the whole run, created on first use
+        """
+        return StoreRegistry.get_store("weibo", WeibostoreFactory.create_store)
+
 
 async def batch_update_weibo_notes(note_list: List[Dict]):
     """
@@ -103,7 +114,10 @@ async def update_weibo_note(note_item: Dict):
         "source_keyword": source_keyword_var.get(),
     }
     utils.logger.info(f"[store.weibo.update_weibo_note] weibo note id:{note_id}, title:{save_content_item.get('content')[:24]} ...")
-    await WeibostoreFactory.create_store().store_content(content_item=save_content_item)
+    store = WeibostoreFactory.get_store()
+    await store.store_content(content_item=save_content_item)
+    await get_seen_id_index("weibo").add_content(note_id)
+    get_run_dedup("weibo").remember(note_id, save_content_item, store)
 
 
 async def batch_update_weibo_note_comments(note_id: str, comments: List[Dict]):
@@ -158,7 +172,11 @@ async def update_weibo_note_comment(note_id: str, comment_item: Dict):
         "avatar": user_info.get("profile_image_url", ""),
     }
     utils.logger.info(f"[store.weibo.update_weibo_note_comment] Weibo note comment: {comment_id}, content: {save_comment_item.get('content', '')[:24]} ...")
-    await WeibostoreFactory.create_store().store_comment(comment_item=save_comment_item)
+    seen_id_index = get_seen_id_index("weibo")
+    if seen_id_index.has_comment(comment_id):
+        return
+    await WeibostoreFactory.get_store().store_comment(comment_item=save_comment_item)
+    await seen_id_index.add_comment(comment_id)
 
 
 async def update_weibo_note_image(picid: str, pic_content, extension_file_name):
@@ -198,4 +216,4 @@ async def save_creator(user_id: str, user_info: Dict):
         "last_modify_ts": utils.get_current_timestamp(),
     }
     utils.logger.info(f"[store.weibo.save_creator] creator:{local_db_item}")
-    await WeibostoreFactory.create_store().store_creator(local_db_item)
+    await WeibostoreFactory.get_store().store_creator(local_db_item)
@@ -39,8 +39,10 @@ from database.models import WeiboCreator, WeiboNote, WeiboNoteComment
 from tools import utils, words
 from tools.async_file_writer import AsyncFileWriter
 from database.db_session import get_session
+from database.db_upsert_buffer import DbUpsertBuffer
 from var import crawler_type_var
 from database.mongodb_store_base import MongoDBStoreBase
+from store.parquet_store_base import ParquetStoreBase
 
 
 def calculate_number_of_files(file_store_path: str) -> int:
@@ -96,8 +98,18 @@ class WeiboCsvStoreImplement(AbstractStore):
         """
         await self.writer.write_to_csv(item_type="creators", item=creator)
 
+    async def close(self):
+        """
+        flush buffered rows to csv file
+        :return:
+        """
+        await self.writer.close()
+
 
 class WeiboDbStoreImplement(AbstractStore):
+    def __init__(self):
+        self.content_buffer = DbUpsertBuffer(WeiboNote, key_column="note_id")
+        self.comment_buffer = DbUpsertBuffer(WeiboNoteComment, key_column="comment_id")
 
     async def store_content(self, content_item: Dict):
         """
@@ -108,22 +120,8 @@ class WeiboDbStoreImplement(AbstractStore):
         Returns:
 
         """
-        note_id = content_item.get("note_id")
-        async with get_session() as session:
-            stmt = select(WeiboNote).where(WeiboNote.note_id == note_id)
-            res = await session.execute(stmt)
-            db_note = res.scalar_one_or_none()
-            if db_note:
-                db_note.last_modify_ts = utils.get_current_timestamp()
-                for key, value in content_item.items():
-                    if hasattr(db_note, key):
-                        setattr(db_note, key, value)
-            else:
-                content_item["add_ts"] = utils.get_current_timestamp()
-                content_item["last_modify_ts"] = utils.get_current_timestamp()
-                db_note = WeiboNote(**content_item)
-                session.add(db_note)
-            await session.commit()
+        now_ts = utils.get_current_timestamp()
+        await self.content_buffer.add({**content_item, "add_ts": now_ts, "last_modify_ts": now_ts})
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -134,22 +132,8 @@ class WeiboDbStoreImplement(AbstractStore):
         Returns:
 
         """
-        comment_id = comment_item.get("comment_id")
-        async with get_session() as session:
-            stmt = select(WeiboNoteComment).where(WeiboNoteComment.comment_id == comment_id)
-            res = await session.execute(stmt)
-            db_comment = res.scalar_one_or_none()
-            if db_comment:
-                db_comment.last_modify_ts = utils.get_current_timestamp()
-                for key, value in comment_item.items():
-                    if hasattr(db_comment, key):
-                        setattr(db_comment, key, value)
-            else:
-                comment_item["add_ts"] = utils.get_current_timestamp()
-                comment_item["last_modify_ts"] = utils.get_current_timestamp()
-                db_comment = WeiboNoteComment(**comment_item)
-                session.add(db_comment)
-            await session.commit()
+        now_ts = utils.get_current_timestamp()
+        await self.comment_buffer.add({**comment_item, "add_ts": now_ts, "last_modify_ts": now_ts})
 
     async def store_creator(self, creator: Dict):
         """
@@ -177,6 +161,20 @@ class WeiboDbStoreImplement(AbstractStore):
                 session.add(db_creator)
             await session.commit()
 
+    async def close(self):
+        """
+        flush buffered contents and comments to database
+        """
+        await self.content_buffer.flush()
+        await self.comment_buffer.flush()
+
+    async def update_source_keyword(self, content_id, source_keyword: str) -> bool:
+        """
+        Upsert the source_keyword of a stored content, merged into its buffered row when not written yet
+        """
+        await self.content_buffer.add({"note_id": content_id, "source_keyword": source_keyword})
+        return True
+
 
 class WeiboJsonStoreImplement(AbstractStore):
     def __init__(self, **kwargs):
@@ -217,6 +215,45 @@ class WeiboJsonStoreImplement(AbstractStore):
         await self.writer.write_single_item_to_json(item_type="creators", item=creator)
 
 
+class WeiboJsonlStoreImplement(AbstractStore):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.writer = AsyncFileWriter(platform="weibo", crawler_type=crawler_type_var.get())
+
+    async def store_content(self, content_item: Dict):
+        """
+        content JSONL storage implementation
+        Args:
+            content_item:
+
+        Returns:
+
+        """
+        await self.writer.write_single_item_to_jsonl(item_type="contents", item=content_item)
+
+    async def store_comment(self, comment_item: Dict):
+        """
+        comment JSONL storage implementation
+        Args:
+            comment_item:
+
+        Returns:
+
+        """
+        await self.writer.write_single_item_to_jsonl(item_type="comments", item=comment_item)
+
+    async def store_creator(self, creator: Dict):
+        """
+        creator JSONL storage implementation
+        Args:
+            creator:
+
+        Returns:
+
+        """
+        await self.writer.write_single_item_to_jsonl(item_type="creators", item=creator)
+
+
 class WeiboSqliteStoreImplement(WeiboDbStoreImplement):
     """
     Weibo content SQLite storage implementation
@@ -228,7 +265,10 @@ class WeiboMongoStoreImplement(AbstractStore):
     """Weibo MongoDB storage implementation"""
 
     def __init__(self):
-        self.mongo_store = MongoDBStoreBase(collection_prefix="weibo")
+        self.mongo_store = MongoDBStoreBase(
+            collection_prefix="weibo",
+            indexes={"contents": "note_id", "comments": "comment_id", "creators": "user_id"},
+        )
 
     async def store_content(self, content_item: Dict):
         """
@@ -240,9 +280,9 @@ class WeiboMongoStoreImplement(AbstractStore):
         if not note_id:
             return
 
-        await self.mongo_store.save_or_update(
+        await self.mongo_store.save_or_update_buffered(
             collection_suffix="contents",
-            query={"note_id": note_id},
+            key_field="note_id",
             data=content_item
         )
         utils.logger.info(f"[WeiboMongoStoreImplement.store_content] Saved note {note_id} to MongoDB")
@@ -257,9 +297,9 @@ class WeiboMongoStoreImplement(AbstractStore):
         if not comment_id:
             return
 
-        await self.mongo_store.save_or_update(
+        await self.mongo_store.save_or_update_buffered(
             collection_suffix="comments",
-            query={"comment_id": comment_id},
+            key_field="comment_id",
             data=comment_item
         )
         utils.logger.info(f"[WeiboMongoStoreImplement.store_comment] Saved comment {comment_id} to MongoDB")
@@ -281,6 +321,23 @@ class WeiboMongoStoreImplement(AbstractStore):
         )
         utils.logger.info(f"[WeiboMongoStoreImplement.store_creator] Saved creator {user_id} to MongoDB")
 
+    async def close(self):
+        """
+        Flush queued contents and comments to MongoDB
+        """
+        await self.mongo_store.flush()
+
+    async def update_source_keyword(self, content_id, source_keyword: str) -> bool:
+        """
+        Upsert the source_keyword of a stored content, merged into its queued document when not written yet
+        """
+        await self.mongo_store.save_or_update_buffered(
+            collection_suffix="contents",
+            key_field="note_id",
+            data={"note_id": content_id, "source_keyword": source_keyword}
+        )
+        return True
+
 
 class WeiboExcelStoreImplement:
     """Weibo Excel storage implementation - Global singleton"""
@@ -291,3 +348,14 @@ class WeiboExcelStoreImplement:
             platform="weibo",
             crawler_type=crawler_type_var.get()
         )
+
+
+class WeiboParquetStoreImplement(ParquetStoreBase):
+    """Weibo Parquet storage implementation"""
+
+    def __init__(self):
+        super().__init__(
+            platform="weibo",
+            crawler_type=crawler_type_var.get(),
+            table_models={"contents": WeiboNote, "comments": WeiboNoteComment, "creators": WeiboCreator},
+        )
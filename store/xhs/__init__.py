@@ -24,6 +24,9 @@
 from typing import List
 
 import config
+from store.store_registry import StoreRegistry
+from store.run_dedup import get_run_dedup
+from store.seen_id_index import get_seen_id_index
 from var import source_keyword_var
 
 from .xhs_store_media import *
@@ -35,18 +38,27 @@ class XhsStoreFactory:
         "csv": XhsCsvStoreImplement,
         "db": XhsDbStoreImplement,
         "json": XhsJsonStoreImplement,
+        "jsonl": XhsJsonlStoreImplement,
         "sqlite": XhsSqliteStoreImplement,
         "mongodb": XhsMongoStoreImplement,
         "excel": XhsExcelStoreImplement,
+        "parquet": XhsParquetStoreImplement,
     }
 
     @staticmethod
     def create_store() -> AbstractStore:
         store_class = XhsStoreFactory.STORES.get(config.SAVE_DATA_OPTION)
         if not store_class:
-            raise ValueError("[XhsStoreFactory.create_store] Invalid save option only supported csv or db or json or sqlite or mongodb or excel ...")
+            raise ValueError("[XhsStoreFactory.create_store] Invalid save option only supported csv or db or json or jsonl or sqlite or mongodb or excel or parquet ...")
         return store_class()
 
+    @staticmethod
+    def get_store() -> AbstractStore:
+        """
+        Get the store shared by the whole run, created on first use
+        """
+        return StoreRegistry.get_store("xhs", XhsStoreFactory.create_store)
+
 
 def get_video_url_arr(note_item: Dict) -> List:
     """
@@ -120,7 +132,10 @@ async def update_xhs_note(note_item: Dict):
         "xsec_token": note_item.get("xsec_token"),  # xsec_token
     }
     utils.logger.info(f"[store.xhs.update_xhs_note] xhs note: {local_db_item}")
-    await XhsStoreFactory.create_store().store_content(local_db_item)
+    store = XhsStoreFactory.get_store()
+    await store.store_content(local_db_item)
+    await get_seen_id_index("xhs").add_content(local_db_item["note_id"])
+    get_run_dedup("xhs").remember(local_db_item["note_id"], local_db_item, store)
 
 
 async def batch_update_xhs_note_comments(note_id: str, comments: List[Dict]):
@@ -169,7 +184,11 @@ async def update_xhs_note_comment(note_id: str, comment_item: Dict):
         "like_count": comment_item.get("like_count", 0),
     }
     utils.logger.info(f"[store.xhs.update_xhs_note_comment] xhs note comment:{local_db_item}")
-    await XhsStoreFactory.create_store().store_comment(local_db_item)
+    seen_id_index = get_seen_id_index("xhs")
+    if seen_id_index.has_comment(local_db_item["comment_id"]):
+        return
+    await XhsStoreFactory.get_store().store_comment(local_db_item)
+    await seen_id_index.add_comment(local_db_item["comment_id"])
 
 
 async def save_creator(user_id: str, creator: Dict):
@@ -218,7 +237,7 @@ async def save_creator(user_id: str, creator: Dict):
         "last_modify_ts": utils.get_current_timestamp(),  # Last modification timestamp (Generated by MediaCrawler, mainly used to record the latest update time of a record in DB storage)
     }
     utils.logger.info(f"[store.xhs.save_creator] creator:{local_db_item}")
-    await XhsStoreFactory.create_store().store_creator(local_db_item)
+    await XhsStoreFactory.get_store().store_creator(local_db_item)
 
 
 async def update_xhs_note_image(note_id, pic_content, extension_file_name):
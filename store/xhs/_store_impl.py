@@ -30,12 +30,14 @@ from sqlalchemy.orm import Session
 
 from base.base_crawler import AbstractStore
 from database.db_session import get_session
+from database.db_upsert_buffer import DbUpsertBuffer
 from database.models import XhsNote, XhsNoteComment, XhsCreator
 
 from tools.async_file_writer import AsyncFileWriter
 from tools.time_util import get_current_timestamp
 from var import crawler_type_var
 from database.mongodb_store_base import MongoDBStoreBase
+from store.parquet_store_base import ParquetStoreBase
 from tools import utils
 from store.excel_store_base import ExcelStoreBase
 
@@ -67,6 +69,13 @@ class XhsCsvStoreImplement(AbstractStore):
     def flush(self):
         pass
 
+    async def close(self):
+        """
+        flush buffered rows to csv file
+        :return:
+        """
+        await self.writer.close()
+
 
 class XhsJsonStoreImplement(AbstractStore):
     def __init__(self, **kwargs):
@@ -100,63 +109,82 @@ class XhsJsonStoreImplement(AbstractStore):
         pass
 
 
+class XhsJsonlStoreImplement(AbstractStore):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.writer = AsyncFileWriter(platform="xhs", crawler_type=crawler_type_var.get())
+
+    async def store_content(self, content_item: Dict):
+        """
+        store content data to jsonl file
+        :param content_item:
+        :return:
+        """
+        await self.writer.write_single_item_to_jsonl(item_type="contents", item=content_item)
+
+    async def store_comment(self, comment_item: Dict):
+        """
+        store comment data to jsonl file
+        :param comment_item:
+        :return:
+        """
+        await self.writer.write_single_item_to_jsonl(item_type="comments", item=comment_item)
+
+    async def store_creator(self, creator_item: Dict):
+        pass
+
+    def flush(self):
+        """
+        flush data to jsonl file
+        :return:
+        """
+        pass
+
 
 class XhsDbStoreImplement(AbstractStore):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        self.content_buffer = DbUpsertBuffer(
+            XhsNote,
+            key_column="note_id",
+            update_columns=["last_modify_ts", "liked_count", "collected_count", "comment_count", "share_count", "last_update_time", "source_keyword"],
+        )
+        self.comment_buffer = DbUpsertBuffer(
+            XhsNoteComment,
+            key_column="comment_id",
+            update_columns=["last_modify_ts", "like_count", "sub_comment_count"],
+        )
 
     async def store_content(self, content_item: Dict):
         note_id = content_item.get("note_id")
         if not note_id:
             return
-        async with get_session() as session:
-            if await self.content_is_exist(session, note_id):
-                await self.update_content(session, content_item)
-            else:
-                await self.add_content(session, content_item)
-
-    async def add_content(self, session: AsyncSession, content_item: Dict):
         add_ts = int(get_current_timestamp())
         last_modify_ts = int(get_current_timestamp())
-        note = XhsNote(
-            user_id=content_item.get("user_id"),
-            nickname=content_item.get("nickname"),
-            avatar=content_item.get("avatar"),
-            ip_location=content_item.get("ip_location"),
-            add_ts=add_ts,
-            last_modify_ts=last_modify_ts,
-            note_id=content_item.get("note_id"),
-            type=content_item.get("type"),
-            title=content_item.get("title"),
-            desc=content_item.get("desc"),
-            video_url=content_item.get("video_url"),
-            time=content_item.get("time"),
-            last_update_time=content_item.get("last_update_time"),
-            liked_count=str(content_item.get("liked_count")),
-            collected_count=str(content_item.get("collected_count")),
-            comment_count=str(content_item.get("comment_count")),
-            share_count=str(content_item.get("share_count")),
-            image_list=json.dumps(content_item.get("image_list")),
-            tag_list=json.dumps(content_item.get("tag_list")),
-            note_url=content_item.get("note_url"),
-            source_keyword=content_item.get("source_keyword", ""),
-            xsec_token=content_item.get("xsec_token", "")
-        )
-        session.add(note)
-
-    async def update_content(self, session: AsyncSession, content_item: Dict):
-        note_id = content_item.get("note_id")
-        last_modify_ts = int(get_current_timestamp())
-        update_data = {
+        await self.content_buffer.add({
+            "user_id": content_item.get("user_id"),
+            "nickname": content_item.get("nickname"),
+            "avatar": content_item.get("avatar"),
+            "ip_location": content_item.get("ip_location"),
+            "add_ts": add_ts,
             "last_modify_ts": last_modify_ts,
+            "note_id": note_id,
+            "type": content_item.get("type"),
+            "title": content_item.get("title"),
+            "desc": content_item.get("desc"),
+            "video_url": content_item.get("video_url"),
+            "time": content_item.get("time"),
+            "last_update_time": content_item.get("last_update_time"),
             "liked_count": str(content_item.get("liked_count")),
             "collected_count": str(content_item.get("collected_count")),
             "comment_count": str(content_item.get("comment_count")),
             "share_count": str(content_item.get("share_count")),
-            "last_update_time": content_item.get("last_update_time"),
-        }
-        stmt = update(XhsNote).where(XhsNote.note_id == note_id).values(**update_data)
-        await session.execute(stmt)
+            "image_list": json.dumps(content_item.get("image_list")),
+            "tag_list": json.dumps(content_item.get("tag_list")),
+            "note_url": content_item.get("note_url"),
+            "source_keyword": content_item.get("source_keyword", ""),
+            "xsec_token": content_item.get("xsec_token", ""),
+        })
 
     async def content_is_exist(self, session: AsyncSession, note_id: str) -> bool:
         stmt = select(XhsNote).where(XhsNote.note_id == note_id)
@@ -166,52 +194,41 @@ class XhsDbStoreImplement(AbstractStore):
     async def store_comment(self, comment_item: Dict):
         if not comment_item:
             return
-        async with get_session() as session:
-            comment_id = comment_item.get("comment_id")
-            if not comment_id:
-                return
-            if await self.comment_is_exist(session, comment_id):
-                await self.update_comment(session, comment_item)
-            else:
-                await self.add_comment(session, comment_item)
-
-    async def add_comment(self, session: AsyncSession, comment_item: Dict):
-        add_ts = int(get_current_timestamp())
-        last_modify_ts = int(get_current_timestamp())
-        comment = XhsNoteComment(
-            user_id=comment_item.get("user_id"),
-            nickname=comment_item.get("nickname"),
-            avatar=comment_item.get("avatar"),
-            ip_location=comment_item.get("ip_location"),
-            add_ts=add_ts,
-            last_modify_ts=last_modify_ts,
-            comment_id=comment_item.get("comment_id"),
-            create_time=comment_item.get("create_time"),
-            note_id=comment_item.get("note_id"),
-            content=comment_item.get("content"),
-            sub_comment_count=comment_item.get("sub_comment_count"),
-            pictures=json.dumps(comment_item.get("pictures")),
-            parent_comment_id=comment_item.get("parent_comment_id"),
-            like_count=str(comment_item.get("like_count"))
-        )
-        session.add(comment)
-
-    async def update_comment(self, session: AsyncSession, comment_item: Dict):
         comment_id = comment_item.get("comment_id")
+        if not comment_id:
+            return
+        add_ts = int(get_current_timestamp())
         last_modify_ts = int(get_current_timestamp())
-        update_data = {
+        await self.comment_buffer.add({
+            "user_id": comment_item.get("user_id"),
+            "nickname": comment_item.get("nickname"),
+            "avatar": comment_item.get("avatar"),
+            "ip_location": comment_item.get("ip_location"),
+            "add_ts": add_ts,
             "last_modify_ts": last_modify_ts,
-            "like_count": str(comment_item.get("like_count")),
+            "comment_id": comment_id,
+            "create_time": comment_item.get("create_time"),
+            "note_id": comment_item.get("note_id"),
+            "content": comment_item.get("content"),
             "sub_comment_count": comment_item.get("sub_comment_count"),
-        }
-        stmt = update(XhsNoteComment).where(XhsNoteComment.comment_id == comment_id).values(**update_data)
-        await session.execute(stmt)
+            "pictures": json.dumps(comment_item.get("pictures")),
+            "parent_comment_id": comment_item.get("parent_comment_id"),
+            "like_count": str(comment_item.get("like_count")),
+        })
 
     async def comment_is_exist(self, session: AsyncSession, comment_id: str) -> bool:
         stmt = select(XhsNoteComment).where(XhsNoteComment.comment_id == comment_id)
         result = await session.execute(stmt)
         return result.first() is not None
 
+    async def close(self):
+        """
+        flush buffered contents and comments to database
+        :return:
+        """
+        await self.content_buffer.flush()
+        await self.comment_buffer.flush()
+
     async def store_creator(self, creator_item: Dict):
         user_id = creator_item.get("user_id")
         if not user_id:
@@ -263,17 +280,26 @@ class XhsDbStoreImplement(AbstractStore):
         return result.first() is not None
 
     async def get_all_content(self) -> List[Dict]:
+        await self.content_buffer.flush()
         async with get_session() as session:
             stmt = select(XhsNote)
             result = await session.execute(stmt)
             return [item.__dict__ for item in result.scalars().all()]
 
     async def get_all_comments(self) -> List[Dict]:
+        await self.comment_buffer.flush()
         async with get_session() as session:
             stmt = select(XhsNoteComment)
             result = await session.execute(stmt)
             return [item.__dict__ for item in result.scalars().all()]
 
+    async def update_source_keyword(self, content_id, source_keyword: str) -> bool:
+        """
+        Upsert the source_keyword of a stored content, merged into its buffered row when not written yet
+        """
+        await self.content_buffer.add({"note_id": content_id, "source_keyword": source_keyword})
+        return True
+
 
 class XhsSqliteStoreImplement(XhsDbStoreImplement):
     def __init__(self, **kwargs):
@@ -285,7 +311,10 @@ class XhsMongoStoreImplement(AbstractStore):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.mongo_store = MongoDBStoreBase(collection_prefix="xhs")
+        self.mongo_store = MongoDBStoreBase(
+            collection_prefix="xhs",
+            indexes={"contents": "note_id", "comments": "comment_id", "creators": "user_id"},
+        )
 
     async def store_content(self, content_item: Dict):
         """
@@ -297,9 +326,9 @@ class XhsMongoStoreImplement(AbstractStore):
         if not note_id:
             return
 
-        await self.mongo_store.save_or_update(
+        await self.mongo_store.save_or_update_buffered(
             collection_suffix="contents",
-            query={"note_id": note_id},
+            key_field="note_id",
             data=content_item
         )
         utils.logger.info(f"[XhsMongoStoreImplement.store_content] Saved note {note_id} to MongoDB")
@@ -314,9 +343,9 @@ class XhsMongoStoreImplement(AbstractStore):
         if not comment_id:
             return
 
-        await self.mongo_store.save_or_update(
+        await self.mongo_store.save_or_update_buffered(
             collection_suffix="comments",
-            query={"comment_id": comment_id},
+            key_field="comment_id",
             data=comment_item
         )
         utils.logger.info(f"[XhsMongoStoreImplement.store_comment] Saved comment {comment_id} to MongoDB")
@@ -338,6 +367,23 @@ class XhsMongoStoreImplement(AbstractStore):
         )
         utils.logger.info(f"[XhsMongoStoreImplement.store_creator] Saved creator {user_id} to MongoDB")
 
+    async def close(self):
+        """
+        Flush queued contents and comments to MongoDB
+        """
+        await self.mongo_store.flush()
+
+    async def update_source_keyword(self, content_id, source_keyword: str) -> bool:
+        """
+        Upsert the source_keyword of a stored content, merged into its queued document when not written yet
+        """
+        await self.mongo_store.save_or_update_buffered(
+            collection_suffix="contents",
+            key_field="note_id",
+            data={"note_id": content_id, "source_keyword": source_keyword}
+        )
+        return True
+
 
 class XhsExcelStoreImplement:
     """Xiaohongshu Excel storage implementation - Global singleton"""
@@ -348,3 +394,14 @@ class XhsExcelStoreImplement:
             platform="xhs",
             crawler_type=crawler_type_var.get()
         )
+
+
+class XhsParquetStoreImplement(ParquetStoreBase):
+    """Xiaohongshu Parquet storage implementation"""
+
+    def __init__(self):
+        super().__init__(
+            platform="xhs",
+            crawler_type=crawler_type_var.get(),
+            table_models={"contents": XhsNote, "comments": XhsNoteComment, "creators": XhsCreator},
+        )
@@ -22,14 +22,19 @@
 from typing import List
 
 import config
+from store.store_registry import StoreRegistry
+from store.run_dedup import get_run_dedup
+from store.seen_id_index import get_seen_id_index
 from base.base_crawler import AbstractStore
 from model.m_zhihu import ZhihuComment, ZhihuContent, ZhihuCreator
 from ._store_impl import (ZhihuCsvStoreImplement,
                                           ZhihuDbStoreImplement,
                                           ZhihuJsonStoreImplement,
+                                          ZhihuJsonlStoreImplement,
                                           ZhihuSqliteStoreImplement,
                                           ZhihuMongoStoreImplement,
-                                          ZhihuExcelStoreImplement)
+                                          ZhihuExcelStoreImplement,
+                                          ZhihuParquetStoreImplement)
 from tools import utils
 from var import source_keyword_var
 
@@ -39,18 +44,27 @@ class ZhihuStoreFactory:
         "csv": ZhihuCsvStoreImplement,
         "db": ZhihuDbStoreImplement,
         "json": ZhihuJsonStoreImplement,
+        "jsonl": ZhihuJsonlStoreImplement,
         "sqlite": ZhihuSqliteStoreImplement,
         "mongodb": ZhihuMongoStoreImplement,
         "excel": ZhihuExcelStoreImplement,
+        "parquet": ZhihuParquetStoreImplement,
     }
 
     @staticmethod
     def create_store() -> AbstractStore:
         store_class = ZhihuStoreFactory.STORES.get(config.SAVE_DATA_OPTION)
         if not store_class:
-            raise ValueError("[ZhihuStoreFactory.create_store] Invalid save option only supported csv or db or json or sqlite or mongodb or excel ...")
+            raise ValueError("[ZhihuStoreFactory.create_store] Invalid save option only supported csv or db or json or jsonl or sqlite or mongodb or excel or parquet ...")
         return store_class()
 
+    @staticmethod
+    def get_store() -> AbstractStore:
+        """
+        Get the store shared by the whole run, created on first use
+        """
+        return StoreRegistry.get_store("zhihu", ZhihuStoreFactory.create_store)
+
 async def batch_update_zhihu_contents(contents: List[ZhihuContent]):
     """
     Batch update Zhihu contents
@@ -79,7 +93,10 @@ async def update_zhihu_content(content_item: ZhihuContent):
     local_db_item = content_item.model_dump()
     local_db_item.update({"last_modify_ts": utils.get_current_timestamp()})
     utils.logger.info(f"[store.zhihu.update_zhihu_content] zhihu content: {local_db_item}")
-    await ZhihuStoreFactory.create_store().store_content(local_db_item)
+    store = ZhihuStoreFactory.get_store()
+    await store.store_content(local_db_item)
+    await get_seen_id_index("zhihu").add_content(local_db_item["content_id"])
+    get_run_dedup("zhihu").remember(local_db_item["content_id"], local_db_item, store)
 
 
 
@@ -111,7 +128,11 @@ async def update_zhihu_content_comment(comment_item: ZhihuComment):
     local_db_item = comment_item.model_dump()
     local_db_item.update({"last_modify_ts": utils.get_current_timestamp()})
     utils.logger.info(f"[store.zhihu.update_zhihu_note_comment] zhihu content comment:{local_db_item}")
-    await ZhihuStoreFactory.create_store().store_comment(local_db_item)
+    seen_id_index = get_seen_id_index("zhihu")
+    if seen_id_index.has_comment(local_db_item["comment_id"]):
+        return
+    await ZhihuStoreFactory.get_store().store_comment(local_db_item)
+    await seen_id_index.add_comment(local_db_item["comment_id"])
 
 
 async def save_creator(creator: ZhihuCreator):
@@ -127,4 +148,4 @@ async def save_creator(creator: ZhihuCreator):
         return
     local_db_item = creator.model_dump()
     local_db_item.update({"last_modify_ts": utils.get_current_timestamp()})
-    await ZhihuStoreFactory.create_store().store_creator(local_db_item)
+    await ZhihuStoreFactory.get_store().store_creator(local_db_item)
@@ -36,11 +36,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 import config
 from base.base_crawler import AbstractStore
 from database.db_session import get_session
+from database.db_upsert_buffer import DbUpsertBuffer
 from database.models import ZhihuContent, ZhihuComment, ZhihuCreator
 from tools import utils, words
 from var import crawler_type_var
 from tools.async_file_writer import AsyncFileWriter
 from database.mongodb_store_base import MongoDBStoreBase
+from store.parquet_store_base import ParquetStoreBase
 
 def calculate_number_of_files(file_store_path: str) -> int:
     """Calculate the prefix sorting number for data save files, supporting writing to different files for each run
@@ -95,8 +97,19 @@ class ZhihuCsvStoreImplement(AbstractStore):
         """
         await self.writer.write_to_csv(item_type="creators", item=creator)
 
+    async def close(self):
+        """
+        flush buffered rows to csv file
+        :return:
+        """
+        await self.writer.close()
+
 
 class ZhihuDbStoreImplement(AbstractStore):
+    def __init__(self):
+        self.content_buffer = DbUpsertBuffer(ZhihuContent, key_column="content_id")
+        self.comment_buffer = DbUpsertBuffer(ZhihuComment, key_column="comment_id")
+
     async def store_content(self, content_item: Dict):
         """
         Zhihu content DB storage implementation
@@ -110,18 +123,7 @@ class ZhihuDbStoreImplement(AbstractStore):
             content_text = content_text[:10000]
             content_item["content_text"] = content_text
         
-        content_id = content_item.get("content_id")
-        async with get_session() as session:
-            stmt = select(ZhihuContent).where(ZhihuContent.content_id == content_id)
-            result = await session.execute(stmt)
-            existing_content = result.scalars().first()
-            if existing_content:
-                for key, value in content_item.items():
-                    setattr(existing_content, key, value)
-            else:
-                new_content = ZhihuContent(**content_item)
-                session.add(new_content)
-            await session.commit()
+        await self.content_buffer.add(content_item)
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -129,18 +131,7 @@ class ZhihuDbStoreImplement(AbstractStore):
         Args:
             comment_item: comment item dict
         """
-        comment_id = comment_item.get("comment_id")
-        async with get_session() as session:
-            stmt = select(ZhihuComment).where(ZhihuComment.comment_id == comment_id)
-            result = await session.execute(stmt)
-            existing_comment = result.scalars().first()
-            if existing_comment:
-                for key, value in comment_item.items():
-                    setattr(existing_comment, key, value)
-            else:
-                new_comment = ZhihuComment(**comment_item)
-                session.add(new_comment)
-            await session.commit()
+        await self.comment_buffer.add(comment_item)
 
     async def store_creator(self, creator: Dict):
         """
@@ -161,6 +152,20 @@ class ZhihuDbStoreImplement(AbstractStore):
                 session.add(new_creator)
             await session.commit()
 
+    async def close(self):
+        """
+        flush buffered contents and comments to database
+        """
+        await self.content_buffer.flush()
+        await self.comment_buffer.flush()
+
+    async def update_source_keyword(self, content_id, source_keyword: str) -> bool:
+        """
+        Upsert the source_keyword of a stored content, merged into its buffered row when not written yet
+        """
+        await self.content_buffer.add({"content_id": content_id, "source_keyword": source_keyword})
+        return True
+
 
 class ZhihuJsonStoreImplement(AbstractStore):
     def __init__(self, **kwargs):
@@ -201,6 +206,45 @@ class ZhihuJsonStoreImplement(AbstractStore):
         await self.writer.write_single_item_to_json(item_type="creators", item=creator)
 
 
+class ZhihuJsonlStoreImplement(AbstractStore):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.writer = AsyncFileWriter(platform="zhihu", crawler_type=crawler_type_var.get())
+
+    async def store_content(self, content_item: Dict):
+        """
+        content JSONL storage implementation
+        Args:
+            content_item:
+
+        Returns:
+
+        """
+        await self.writer.write_single_item_to_jsonl(item_type="contents", item=content_item)
+
+    async def store_comment(self, comment_item: Dict):
+        """
+        comment JSONL storage implementation
+        Args:
+            comment_item:
+
+        Returns:
+
+        """
+        await self.writer.write_single_item_to_jsonl(item_type="comments", item=comment_item)
+
+    async def store_creator(self, creator: Dict):
+        """
+        Zhihu content JSONL storage implementation
+        Args:
+            creator: creator dict
+
+        Returns:
+
+        """
+        await self.writer.write_single_item_to_jsonl(item_type="creators", item=creator)
+
+
 class ZhihuSqliteStoreImplement(ZhihuDbStoreImplement):
     """
     Zhihu content SQLite storage implementation
@@ -212,7 +256,10 @@ class ZhihuMongoStoreImplement(AbstractStore):
     """Zhihu MongoDB storage implementation"""
 
     def __init__(self):
-        self.mongo_store = MongoDBStoreBase(collection_prefix="zhihu")
+        self.mongo_store = MongoDBStoreBase(
+            collection_prefix="zhihu",
+            indexes={"contents": "note_id", "comments": "comment_id", "creators": "user_id"},
+        )
 
     async def store_content(self, content_item: Dict):
         """
@@ -224,9 +271,9 @@ class ZhihuMongoStoreImplement(AbstractStore):
         if not note_id:
             return
 
-        await self.mongo_store.save_or_update(
+        await self.mongo_store.save_or_update_buffered(
             collection_suffix="contents",
-            query={"note_id": note_id},
+            key_field="note_id",
             data=content_item
         )
         utils.logger.info(f"[ZhihuMongoStoreImplement.store_content] Saved note {note_id} to MongoDB")
@@ -241,9 +288,9 @@ class ZhihuMongoStoreImplement(AbstractStore):
         if not comment_id:
             return
 
-        await self.mongo_store.save_or_update(
+        await self.mongo_store.save_or_update_buffered(
             collection_suffix="comments",
-            query={"comment_id": comment_id},
+            key_field="comment_id",
             data=comment_item
         )
         utils.logger.info(f"[ZhihuMongoStoreImplement.store_comment] Saved comment {comment_id} to MongoDB")
@@ -265,6 +312,12 @@ class ZhihuMongoStoreImplement(AbstractStore):
         )
         utils.logger.info(f"[ZhihuMongoStoreImplement.store_creator] Saved creator {user_id} to MongoDB")
 
+    async def close(self):
+        """
+        Flush queued contents and comments to MongoDB
+        """
+        await self.mongo_store.flush()
+
 
 class ZhihuExcelStoreImplement:
     """Zhihu Excel storage implementation - Global singleton"""
@@ -275,3 +328,14 @@ class ZhihuExcelStoreImplement:
             platform="zhihu",
             crawler_type=crawler_type_var.get()
         )
+
+
+class ZhihuParquetStoreImplement(ParquetStoreBase):
+    """Zhihu Parquet storage implementation"""
+
+    def __init__(self):
+        super().__init__(
+            platform="zhihu",
+            crawler_type=crawler_type_var.get(),
+            table_models={"contents": ZhihuContent, "comments": ZhihuComment, "creators": ZhihuCreator},
+        )
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/test/test_disk_cache.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : DiskCache tests
+
+import os
+import tempfile
+import time
+import unittest
+
+from cache.disk_cache import DiskCache
+
+
+class TestDiskCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'cache', 'cache.sqlite3')
+        self.cache = DiskCache(self.path)
+
+    def test_set_and_get(self):
+        self.cache.set('key', {'nickname': '测试', 'fans': 10}, 10)
+        self.assertEqual(self.cache.get('key'), {'nickname': '测试', 'fans': 10})
+        self.assertIsNone(self.cache.get('missing'))
+
+    def test_values_survive_reopen(self):
+        self.cache.set('key', 'value', 10)
+        self.cache.close()
+        self.cache = DiskCache(self.path)
+        self.assertEqual(self.cache.get('key'), 'value')
+
+    def test_expired_key(self):
+        self.cache.set('key', 'value', 1)
+        time.sleep(1.1)
+        self.assertIsNone(self.cache.get('key'))
+        self.assertEqual(self.cache.keys('*'), [])
+
+    def test_mget_with_ttl(self):
+        self.cache.mset({'a': 1, 'b': 2}, 10)
+        results = self.cache.mget_with_ttl(['a', 'missing', 'b'])
+        self.assertEqual([value for value, _ in results], [1, None, 2])
+        self.assertTrue(9 < results[0][1] <= 10)
+        self.assertIsNone(results[1][1])
+
+    def test_scan_uses_glob_semantics(self):
+        for key in ['note:1', 'note:12', 'user:note:1', 'Note:3']:
+            self.cache.set(key, 'v', 10)
+        self.assertEqual(self.cache.keys('note:*'), ['note:1', 'note:12'])
+        self.assertEqual(self.cache.keys('note:?'), ['note:1'])
+        self.assertEqual(list(self.cache.scan('*note:1', count=1)), ['note:1', 'user:note:1'])
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp_dir.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -24,6 +24,7 @@
 # @Time    : 2024/6/2 10:35
 # @Desc    :
 
+import asyncio
 import time
 import unittest
 
@@ -51,6 +52,72 @@ class TestExpiringLocalCache(unittest.TestCase):
         time.sleep(12)
         self.assertIsNone(self.cache.get('key'))
 
+    def test_max_entries_evicts_least_recently_used(self):
+        cache = ExpiringLocalCache(cron_interval=10, max_entries=2)
+        cache.set('a', 1, 10)
+        cache.set('b', 2, 10)
+        cache.get('a')  # 'b' becomes the least recently used key
+        cache.set('c', 3, 10)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_clear_removes_only_expired_keys(self):
+        self.cache.set('short', 'value', 1)
+        self.cache.set('long', 'value', 100)
+        self.cache.set('short', 'value', 100)  # overwrite leaves a stale heap entry
+        self.cache.set('gone', 'value', 1)
+        time.sleep(1.1)
+        self.cache._clear()
+        self.assertEqual(sorted(self.cache._cache_container), ['long', 'short'])
+
+    def test_expire_heap_stays_bounded(self):
+        for i in range(1000):
+            self.cache.set('key', i, 100)
+        self.assertLess(len(self.cache._expire_heap), 100)
+
+    def test_keys_use_glob_semantics(self):
+        self.cache.set('note:1', 'a', 10)
+        self.cache.set('note:12', 'b', 10)
+        self.cache.set('user:note:1', 'c', 10)
+        self.cache.set('Note:3', 'd', 10)
+        self.assertEqual(self.cache.keys('note:*'), ['note:1', 'note:12'])
+        self.assertEqual(self.cache.keys('note:?'), ['note:1'])
+        self.assertEqual(self.cache.keys('*note:1'), ['note:1', 'user:note:1'])
+        self.assertEqual(self.cache.keys('note:1'), ['note:1'])
+        self.assertEqual(self.cache.keys('[Nn]ote:*'), ['Note:3', 'note:1', 'note:12'])
+
+    def test_scan_skips_expired_and_removed_keys(self):
+        self.cache.set('k:short', 'v', 1)
+        self.cache.set('k:long', 'v', 10)
+        time.sleep(1.1)
+        self.assertEqual(list(self.cache.scan('k:*')), ['k:long'])
+        self.cache._clear()
+        self.assertEqual(self.cache._sorted_keys, ['k:long'])
+
+    def test_scan_tolerates_changes_between_batches(self):
+        for i in range(10):
+            self.cache.set(f'k:{i}', i, 10)
+        scanned = []
+        for key in self.cache.scan('k:*', count=3):
+            scanned.append(key)
+            if key == 'k:1':
+                self.cache._delete('k:2', reason='evicted')
+        self.assertEqual(scanned, [f'k:{i}' for i in range(10) if i != 2])
+
+    def test_mset_and_mget(self):
+        self.cache.mset({'a': 1, 'b': 2}, 10)
+        self.assertEqual(self.cache.mget(['a', 'missing', 'b']), [1, None, 2])
+
+    def test_async_methods(self):
+        async def run():
+            await self.cache.aset('key', 'value', 10)
+            await self.cache.amset({'k1': 1, 'k2': 2}, 10)
+            return await self.cache.aget('key'), await self.cache.amget(['k1', 'k2']), await self.cache.akeys('k*')
+
+        result = asyncio.get_event_loop().run_until_complete(run())
+        self.assertEqual(result, ('value', [1, 2], ['k1', 'k2', 'key']))
+
     def tearDown(self):
         del self.cache
 
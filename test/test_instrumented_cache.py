@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/test/test_instrumented_cache.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : InstrumentedCache tests
+
+import asyncio
+import time
+import unittest
+
+from cache.instrumented_cache import InstrumentedCache, get_cache_metrics, key_namespace
+from cache.local_cache import ExpiringLocalCache
+
+
+class TestInstrumentedCache(unittest.TestCase):
+
+    def setUp(self):
+        self.inner = ExpiringLocalCache(cron_interval=10, max_entries=2)
+        self.cache = InstrumentedCache(self.inner, name=self.id(), sample_every=1)
+
+    def namespace_metrics(self, namespace):
+        return get_cache_metrics()[self.id()][namespace]
+
+    def test_key_namespace(self):
+        self.assertEqual(key_namespace('xhs_13800000000'), 'xhs')
+        self.assertEqual(key_namespace('note:1:comments'), 'note')
+        self.assertEqual(key_namespace('plain'), '_default')
+
+    def test_hits_and_misses_per_namespace(self):
+        self.cache.set('xhs_1', 'code', 10)
+        self.cache.get('xhs_1')
+        self.cache.get('xhs_2')
+        self.cache.get('dy_1')
+        xhs = self.namespace_metrics('xhs')
+        self.assertEqual((xhs['hits'], xhs['misses'], xhs['sets']), (1, 1, 1))
+        self.assertEqual(xhs['hit_ratio'], 0.5)
+        self.assertEqual(self.namespace_metrics('dy')['misses'], 1)
+
+    def test_expirations_and_evictions(self):
+        self.cache.set('xhs_1', 'a', 1)
+        self.cache.set('xhs_2', 'b', 10)
+        self.cache.set('xhs_3', 'c', 10)  # max_entries=2 evicts xhs_1
+        self.cache.set('dy_1', 'd', 1)  # evicts xhs_2
+        time.sleep(1.1)
+        self.assertIsNone(self.cache.get('dy_1'))
+        xhs = self.namespace_metrics('xhs')
+        self.assertEqual(xhs['evictions'], 2)
+        self.assertEqual(self.namespace_metrics('dy')['expirations'], 1)
+
+    def test_value_sizes_and_latency(self):
+        self.cache.set('xhs_1', 'abcd', 10)
+        self.cache.mget(['xhs_1', 'xhs_2'])
+        xhs = self.namespace_metrics('xhs')
+        self.assertEqual(xhs['value_bytes']['max'], len('"abcd"'))
+        self.assertEqual(xhs['latency']['set']['samples'], 1)
+        self.assertEqual(xhs['latency']['mget']['samples'], 1)
+        self.assertEqual(sum(xhs['latency']['mget']['buckets'].values()), 1)
+
+    def test_latency_is_sampled(self):
+        cache = InstrumentedCache(ExpiringLocalCache(cron_interval=10), name=self.id() + '.sampled', sample_every=5)
+        for i in range(10):
+            cache.get(f'xhs_{i}')
+        xhs = get_cache_metrics()[self.id() + '.sampled']['xhs']
+        self.assertEqual(xhs['misses'], 10)
+        self.assertEqual(xhs['latency']['get']['samples'], 2)
+
+    def test_async_methods(self):
+        async def run():
+            await self.cache.aset('xhs_1', 'a', 10)
+            return await self.cache.aget('xhs_1')
+
+        self.assertEqual(asyncio.get_event_loop().run_until_complete(run()), 'a')
+        self.assertEqual(self.namespace_metrics('xhs')['hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -255,6 +255,7 @@ class TestMongoDBRealConnection(unittest.TestCase):
             }
             await store.store_creator(creator_data)
 
+            await store.close()
             mongo_store = store.mongo_store
 
             note = await mongo_store.find_one("contents", {"note_id": "xhs_test_001"})
@@ -302,6 +303,7 @@ class TestMongoDBRealConnection(unittest.TestCase):
             }
             await store.store_creator(creator_data)
 
+            await store.close()
             mongo_store = store.mongo_store
 
             video = await mongo_store.find_one("contents", {"aweme_id": "dy_test_001"})
@@ -24,10 +24,12 @@
 # @Time    : 2024/6/2 19:54
 # @Desc    :
 
+import asyncio
+import pickle
 import time
 import unittest
 
-from cache.redis_cache import RedisCache
+from cache.redis_cache import RedisCache, deserialize_value, serialize_value
 
 
 class TestRedisCache(unittest.TestCase):
@@ -51,10 +53,42 @@ class TestRedisCache(unittest.TestCase):
         self.assertIn('key1', keys)
         self.assertIn('key2', keys)
 
+    def test_mset_and_mget(self):
+        self.redis_cache.mset({'batch1': [1, 2], 'batch2': {'a': 'b'}}, 10)
+        self.assertEqual(self.redis_cache.mget(['batch1', 'missing', 'batch2']), [[1, 2], None, {'a': 'b'}])
+
+    def test_mget_with_ttl(self):
+        self.redis_cache.set('ttl_key', 'value', 10)
+        (value, ttl), (missing, missing_ttl) = self.redis_cache.mget_with_ttl(['ttl_key', 'missing'])
+        self.assertEqual(value, 'value')
+        self.assertTrue(0 < ttl <= 10)
+        self.assertIsNone(missing)
+        self.assertIsNone(missing_ttl)
+
+    def test_async_mset_and_mget(self):
+        async def run():
+            await self.redis_cache.amset({'abatch1': 'v1', 'abatch2': 'v2'}, 10)
+            return await self.redis_cache.amget(['abatch1', 'abatch2'])
+
+        self.assertEqual(asyncio.run(run()), ['v1', 'v2'])
+
     def tearDown(self):
         # self.redis_cache._redis_client.flushdb()  # Clear redis database
         pass
 
 
+class TestRedisSerializer(unittest.TestCase):
+
+    def test_round_trip(self):
+        value = {'ip': '127.0.0.1', 'port': 8080, 'tags': ['a', '中文'], 'ok': True}
+        self.assertEqual(deserialize_value(serialize_value(value)), value)
+
+    def test_missing_value(self):
+        self.assertIsNone(deserialize_value(None))
+
+    def test_pickle_payload_is_not_loaded(self):
+        self.assertIsNone(deserialize_value(pickle.dumps(object())))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/test/test_tiered_cache.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : TieredCache tests, an ExpiringLocalCache stands in for the Redis L2
+
+import asyncio
+import time
+import unittest
+
+from cache.local_cache import ExpiringLocalCache
+from cache.tiered_cache import TieredCache
+
+
+class TestTieredCache(unittest.TestCase):
+
+    def setUp(self):
+        self.l2 = ExpiringLocalCache(cron_interval=10)
+        self.cache = TieredCache(self.l2, l1_max_entries=2, l1_ttl=60)
+
+    def test_write_through(self):
+        self.cache.set('key', 'value', 10)
+        self.assertEqual(self.l2.get('key'), 'value')
+        self.assertEqual(self.cache.get('key'), 'value')
+        self.assertEqual(self.cache.stats()['l1']['hits'], 1)
+        self.assertEqual(self.cache.stats()['l2']['hits'], 0)
+
+    def test_read_through_fills_l1(self):
+        self.l2.set('key', 'value', 10)
+        self.assertEqual(self.cache.get('key'), 'value')
+        self.assertEqual(self.cache.get('key'), 'value')
+        stats = self.cache.stats()
+        self.assertEqual((stats['l1']['hits'], stats['l1']['misses']), (1, 1))
+        self.assertEqual((stats['l2']['hits'], stats['l2']['misses']), (1, 0))
+        self.assertEqual(stats['l1']['hit_ratio'], 0.5)
+
+    def test_l1_does_not_outlive_l2(self):
+        self.l2.set('key', 'value', 1)
+        self.assertEqual(self.cache.get('key'), 'value')
+        time.sleep(1.1)
+        self.assertIsNone(self.cache.get('key'))
+        self.assertEqual(self.cache.stats()['l2']['misses'], 1)
+
+    def test_mget_fetches_only_l1_misses(self):
+        self.cache.set('a', 1, 10)
+        self.l2.set('b', 2, 10)
+        self.assertEqual(self.cache.mget(['a', 'b', 'c']), [1, 2, None])
+        stats = self.cache.stats()
+        self.assertEqual((stats['l1']['hits'], stats['l1']['misses']), (1, 2))
+        self.assertEqual((stats['l2']['hits'], stats['l2']['misses']), (1, 1))
+
+    def test_l1_is_bounded(self):
+        self.cache.mset({'a': 1, 'b': 2, 'c': 3}, 10)
+        self.assertEqual(self.cache.stats()['l1']['size'], 2)
+        self.assertEqual(self.cache.mget(['a', 'b', 'c']), [1, 2, 3])
+
+    def test_async_methods(self):
+        async def run():
+            await self.cache.aset('key', 'value', 10)
+            await self.cache.amset({'k1': 1}, 10)
+            return await self.cache.aget('key'), await self.cache.amget(['k1', 'k2']), await self.cache.akeys('k*')
+
+        result = asyncio.get_event_loop().run_until_complete(run())
+        self.assertEqual(result, ('value', [1, None], ['k1', 'key']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_async_db.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+Unit tests for async_db
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+
+from async_db import AsyncMysqlDB, AsyncSqliteDB, build_insert_sql
+
+
+class TestAsyncSqliteDB:
+    """Test cases for the persistent SQLite connection"""
+
+    @pytest_asyncio.fixture
+    async def db(self, tmp_path):
+        """Create AsyncSqliteDB with one table on a temporary database"""
+        db = AsyncSqliteDB(db_path=str(tmp_path / "test.db"))
+        await db.connect()
+        await db.execute("CREATE TABLE comment (id INTEGER PRIMARY KEY, comment_id TEXT UNIQUE, like_count INTEGER)")
+        yield db
+        await db.close()
+
+    @pytest.mark.asyncio
+    async def test_wal_mode(self, db):
+        """Test that the connection is opened in WAL mode"""
+        rows = await db.query("PRAGMA journal_mode")
+
+        assert rows[0]["journal_mode"] == "wal"
+
+    @pytest.mark.asyncio
+    async def test_writes_share_one_connection(self, db):
+        """Test that inserts and updates reuse the connection opened by connect"""
+        conn = db._conn
+        await db.item_to_table("comment", {"comment_id": "c1", "like_count": 1})
+        await db.update_table("comment", {"like_count": 5}, "comment_id", "c1")
+
+        assert db._conn is conn
+        assert await db.query("SELECT comment_id, like_count FROM comment") == [{"comment_id": "c1", "like_count": 5}]
+
+    @pytest.mark.asyncio
+    async def test_bulk_insert_and_update(self, db):
+        """Test that items_to_table and update_items write every row"""
+        inserted = await db.items_to_table("comment", [
+            {"comment_id": "c1", "like_count": 1},
+            {"comment_id": "c2", "like_count": 2},
+        ])
+        updated = await db.update_items("comment", [
+            {"comment_id": "c1", "like_count": 10},
+            {"comment_id": "c2", "like_count": 20},
+        ], id_field="comment_id")
+
+        assert inserted == 2
+        assert updated == 2
+        rows = await db.query("SELECT comment_id, like_count FROM comment ORDER BY comment_id")
+        assert rows == [{"comment_id": "c1", "like_count": 10}, {"comment_id": "c2", "like_count": 20}]
+
+    @pytest.mark.asyncio
+    async def test_transaction_rolls_back_on_error(self, db):
+        """Test that a failing transaction leaves no partial writes"""
+        with pytest.raises(RuntimeError):
+            async with db.transaction():
+                await db.item_to_table("comment", {"comment_id": "c1", "like_count": 1})
+                raise RuntimeError("page failed")
+
+        assert await db.query("SELECT * FROM comment") == []
+
+    @pytest.mark.asyncio
+    async def test_transaction_commits_once(self, db):
+        """Test that statements inside a transaction become visible together"""
+        async with db.transaction():
+            await db.item_to_table("comment", {"comment_id": "c1", "like_count": 1})
+            await db.update_table("comment", {"like_count": 5}, "comment_id", "c1")
+
+        rows = await db.query("SELECT like_count FROM comment")
+        assert rows == [{"like_count": 5}]
+
+    @pytest.mark.asyncio
+    async def test_upsert_items(self, db):
+        """Test that upsert_items inserts new keys and updates existing ones"""
+        await db.item_to_table("comment", {"comment_id": "c1", "like_count": 1})
+
+        await db.upsert_items("comment", [
+            {"comment_id": "c1", "like_count": 10},
+            {"comment_id": "c2", "like_count": 2},
+        ], key="comment_id")
+
+        rows = await db.query("SELECT comment_id, like_count FROM comment ORDER BY comment_id")
+        assert rows == [{"comment_id": "c1", "like_count": 10}, {"comment_id": "c2", "like_count": 2}]
+
+
+class TestAsyncMysqlDB:
+    """Test cases for the MySQL bulk writes against a mocked aiomysql pool"""
+
+    @pytest.fixture
+    def cursor(self):
+        cursor = MagicMock()
+        cursor.executemany = AsyncMock()
+        cursor.rowcount = 2
+        return cursor
+
+    @pytest.fixture
+    def db(self, cursor):
+        """Create AsyncMysqlDB whose pool hands out one mocked connection"""
+        conn = MagicMock()
+        conn.begin = AsyncMock()
+        conn.commit = AsyncMock()
+        conn.rollback = AsyncMock()
+        conn.cursor.return_value.__aenter__ = AsyncMock(return_value=cursor)
+        conn.cursor.return_value.__aexit__ = AsyncMock(return_value=False)
+        pool = MagicMock()
+        pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+        pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+        db = AsyncMysqlDB()
+        db._pool = pool
+        db.conn = conn
+        return db
+
+    @pytest.mark.asyncio
+    async def test_items_to_table(self, db, cursor):
+        """Test that all items go out in one executemany and one commit"""
+        await db.items_to_table("xhs_note_comment", [
+            {"comment_id": "c1", "like_count": 1},
+            {"comment_id": "c2", "like_count": 2},
+        ])
+
+        cursor.executemany.assert_awaited_once_with(
+            "INSERT INTO xhs_note_comment (comment_id, like_count) VALUES (%s, %s)",
+            [("c1", 1), ("c2", 2)],
+        )
+        db.conn.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_upsert_items(self, db, cursor):
+        """Test that upsert_items updates every column except the key"""
+        await db.upsert_items("xhs_note_comment", [{"comment_id": "c1", "like_count": 1}], key="comment_id")
+
+        sql, values = cursor.executemany.await_args.args
+        assert sql == (
+            "INSERT INTO xhs_note_comment (comment_id, like_count) VALUES (%s, %s) "
+            "ON DUPLICATE KEY UPDATE like_count = VALUES(like_count)"
+        )
+        assert values == [("c1", 1)]
+
+    @pytest.mark.asyncio
+    async def test_update_items(self, db, cursor):
+        """Test that update_items moves the id field to the WHERE parameter"""
+        await db.update_items("xhs_note", [
+            {"note_id": "n1", "liked_count": 1},
+            {"note_id": "n2", "liked_count": 2},
+        ], "note_id")
+
+        cursor.executemany.assert_awaited_once_with(
+            "UPDATE xhs_note SET liked_count = %s WHERE note_id = %s",
+            [(1, "n1"), (2, "n2")],
+        )
+        db.conn.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_transaction_commits_once(self, db, cursor):
+        """Test that writes inside transaction() share its connection and commit once"""
+        async with db.transaction():
+            await db.items_to_table("xhs_note_comment", [{"comment_id": "c1"}])
+            await db.update_items("xhs_note", [{"note_id": "n1", "liked_count": 1}], "note_id")
+
+        assert db._pool.acquire.call_count == 1
+        db.conn.begin.assert_awaited_once()
+        db.conn.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_transaction_rolls_back_on_error(self, db, cursor):
+        """Test that an error inside transaction() rolls back instead of committing"""
+        with pytest.raises(ValueError):
+            async with db.transaction():
+                await db.items_to_table("xhs_note_comment", [{"comment_id": "c1"}])
+                raise ValueError("boom")
+
+        db.conn.rollback.assert_awaited_once()
+        db.conn.commit.assert_not_awaited()
+        assert not db._transaction_conns
+
+    @pytest.mark.asyncio
+    async def test_empty_items_skip_database(self, db, cursor):
+        """Test that an empty batch does not touch the pool"""
+        assert await db.items_to_table("xhs_note_comment", []) == 0
+        assert await db.upsert_items("xhs_note_comment", [], key="comment_id") == 0
+        assert await db.update_items("xhs_note", [], "note_id") == 0
+        cursor.executemany.assert_not_awaited()
+
+
+def test_sql_cached_by_table_and_columns():
+    """Test that the same table and columns reuse the generated statement"""
+    build_insert_sql.cache_clear()
+    build_insert_sql("xhs_note", ("note_id", "title"), "%s")
+    build_insert_sql("xhs_note", ("note_id", "title"), "%s")
+
+    assert build_insert_sql.cache_info().hits == 1
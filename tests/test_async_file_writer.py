@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_async_file_writer.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Unit tests for AsyncFileWriter
+"""
+
+import asyncio
+import csv
+import json
+import os
+
+import pytest
+
+from tools.async_file_writer import AsyncFileWriter
+
+
+class TestAsyncFileWriterJsonl:
+    """Test cases for the JSON Lines output of AsyncFileWriter"""
+
+    @pytest.fixture
+    def writer(self, tmp_path, monkeypatch):
+        """Create AsyncFileWriter writing under a temporary data directory"""
+        monkeypatch.chdir(tmp_path)
+        return AsyncFileWriter(platform="test", crawler_type="search")
+
+    @pytest.mark.asyncio
+    async def test_write_single_item_to_jsonl(self, writer, sample_xhs_comment):
+        """Test that every item is appended as one line"""
+        await writer.write_single_item_to_jsonl(sample_xhs_comment, "comments")
+        await writer.write_single_item_to_jsonl({**sample_xhs_comment, "comment_id": "comment_456"}, "comments")
+
+        with open(writer._get_file_path("jsonl", "comments"), encoding="utf-8") as f:
+            lines = f.read().splitlines()
+
+        assert len(lines) == 2
+        assert json.loads(lines[0]) == sample_xhs_comment
+        assert json.loads(lines[1])["comment_id"] == "comment_456"
+
+    @pytest.mark.asyncio
+    async def test_read_items_skips_broken_line(self, writer, sample_xhs_comment):
+        """Test that a truncated last line does not break reading"""
+        await writer.write_single_item_to_jsonl(sample_xhs_comment, "comments")
+        with open(writer._get_file_path("jsonl", "comments"), "a", encoding="utf-8") as f:
+            f.write('{"comment_id": "trunc')
+
+        items = await writer.read_items("comments")
+
+        assert items == [sample_xhs_comment]
+
+    @pytest.mark.asyncio
+    async def test_convert_jsonl_to_json(self, writer, sample_xhs_note, sample_xhs_comment):
+        """Test that the exported file matches the legacy pretty JSON array"""
+        await writer.write_single_item_to_jsonl(sample_xhs_note, "contents")
+        await writer.write_single_item_to_jsonl(sample_xhs_comment, "comments")
+        await writer.write_single_item_to_jsonl(sample_xhs_comment, "comments")
+
+        written = await writer.finalize_jsonl()
+
+        assert len(written) == 2
+        with open(writer._get_file_path("json", "comments"), encoding="utf-8") as f:
+            content = f.read()
+        assert content == json.dumps([sample_xhs_comment] * 2, ensure_ascii=False, indent=4)
+
+    @pytest.mark.asyncio
+    async def test_convert_empty_jsonl(self, writer):
+        """Test that an empty JSONL file exports an empty JSON array"""
+        open(writer._get_file_path("jsonl", "comments"), "w").close()
+
+        json_file_path = await writer.convert_jsonl_to_json("comments")
+
+        with open(json_file_path, encoding="utf-8") as f:
+            assert json.load(f) == []
+
+
+class TestAsyncFileWriterCsv:
+    """Test cases for the buffered CSV output of AsyncFileWriter"""
+
+    @pytest.fixture
+    def writer(self, tmp_path, monkeypatch):
+        """Create AsyncFileWriter writing under a temporary data directory"""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr("config.CSV_FLUSH_BATCH_SIZE", 2)
+        monkeypatch.setattr("config.CSV_FLUSH_INTERVAL_SEC", 3600)
+        AsyncFileWriter._csv_writers.clear()
+        yield AsyncFileWriter(platform="test", crawler_type="search")
+        AsyncFileWriter._csv_writers.clear()
+
+    @staticmethod
+    def read_rows(file_path):
+        with open(file_path, newline="", encoding="utf-8-sig") as f:
+            return list(csv.DictReader(f))
+
+    @pytest.mark.asyncio
+    async def test_rows_flushed_by_batch_size(self, writer, sample_xhs_comment):
+        """Test that rows stay buffered until the batch is full"""
+        file_path = writer._get_file_path("csv", "comments")
+
+        await writer.write_to_csv(sample_xhs_comment, "comments")
+        assert not os.path.exists(file_path) or os.path.getsize(file_path) == 0
+
+        await writer.write_to_csv(sample_xhs_comment, "comments")
+        rows = self.read_rows(file_path)
+        assert len(rows) == 2
+        assert rows[0]["comment_id"] == sample_xhs_comment["comment_id"]
+
+    @pytest.mark.asyncio
+    async def test_quiet_rows_flushed_by_timer(self, writer, sample_xhs_comment, monkeypatch):
+        """Test that a partial batch is written once the flush interval passes without another row"""
+        monkeypatch.setattr("config.CSV_FLUSH_INTERVAL_SEC", 0.05)
+        AsyncFileWriter._csv_writers.clear()
+        file_path = writer._get_file_path("csv", "comments")
+
+        await writer.write_to_csv(sample_xhs_comment, "comments")
+        assert not os.path.exists(file_path) or os.path.getsize(file_path) == 0
+
+        await asyncio.sleep(0.2)
+        assert len(self.read_rows(file_path)) == 1
+        await AsyncFileWriter.close_all()
+
+    @pytest.mark.asyncio
+    async def test_close_all_flushes_remaining_rows(self, writer, sample_xhs_comment):
+        """Test that close_all writes out a partial batch"""
+        await writer.write_to_csv(sample_xhs_comment, "comments")
+        await AsyncFileWriter.close_all()
+
+        rows = self.read_rows(writer._get_file_path("csv", "comments"))
+        assert len(rows) == 1
+        assert AsyncFileWriter._csv_writers == {}
+
+    @pytest.mark.asyncio
+    async def test_header_written_once_across_writers(self, writer, sample_xhs_comment):
+        """Test that reopening an existing file keeps its header"""
+        await writer.write_to_csv(sample_xhs_comment, "comments")
+        await AsyncFileWriter.close_all()
+
+        other_writer = AsyncFileWriter(platform="test", crawler_type="search")
+        await other_writer.write_to_csv({**sample_xhs_comment, "extra_field": "x"}, "comments")
+        await AsyncFileWriter.close_all()
+
+        file_path = writer._get_file_path("csv", "comments")
+        with open(file_path, encoding="utf-8-sig") as f:
+            assert sum(1 for line in f if line.startswith("comment_id,")) == 1
+        rows = self.read_rows(file_path)
+        assert len(rows) == 2
+        assert "extra_field" not in rows[1]
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_cache.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+Unit tests for the cache backends
+"""
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from cache.disk_cache import DiskCache
+from cache.redis_cache import RedisCache
+
+
+class TestRedisCache:
+    """Test cases for RedisCache against a mocked redis client"""
+
+    # Redis MATCH reads "[^x]" as a negated class, fnmatch as a class of "^" and "x"
+    SCANNED_KEYS = [b"note:1", b"note:x", b"note:^"]
+
+    @pytest.fixture
+    def cache(self):
+        cache = RedisCache()
+        cache._redis_client = MagicMock()
+        cache._redis_client.scan_iter.return_value = iter(self.SCANNED_KEYS)
+
+        async def scan_iter(match=None, count=None):
+            for key in self.SCANNED_KEYS:
+                yield key
+
+        cache._async_client = MagicMock()
+        cache._async_client.scan_iter = scan_iter
+        return cache
+
+    def test_scan_rechecks_keys_with_fnmatch(self, cache):
+        """Test that scan drops the keys redis matched but fnmatch does not"""
+        assert list(cache.scan("note:[^x]")) == ["note:x", "note:^"]
+
+    @pytest.mark.asyncio
+    async def test_akeys_rechecks_keys_with_fnmatch(self, cache):
+        """Test that akeys filters the scanned keys the same way as scan"""
+        assert await cache.akeys("note:[^x]") == ["note:x", "note:^"]
+        assert await cache.akeys("note:*") == ["note:1", "note:x", "note:^"]
+
+
+class TestDiskCache:
+    """Test cases for the async methods of DiskCache"""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        cache = DiskCache(str(tmp_path / "cache.db"))
+        yield cache
+        cache.close()
+
+    @pytest.mark.asyncio
+    async def test_async_methods_run_off_the_event_loop(self, cache, monkeypatch):
+        """Test that aset and aget reach sqlite from a worker thread"""
+        threads = []
+        original_mset = cache.mset
+
+        def mset(*args):
+            threads.append(threading.current_thread())
+            original_mset(*args)
+
+        monkeypatch.setattr(cache, "mset", mset)
+
+        await cache.aset("note:1", {"title": "t"}, 60)
+
+        assert threads and threads[0] is not threading.main_thread()
+        assert await cache.aget("note:1") == {"title": "t"}
+        assert await cache.akeys("note:*") == ["note:1"]
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_comment_watermark.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Unit tests for CommentWatermarks
+"""
+
+import pytest
+
+from tools.comment_watermark import CommentWatermarks
+
+
+def xhs_comment(comment_id, create_time):
+    return {"id": comment_id, "create_time": create_time}
+
+
+class TestCommentWatermarks:
+    """Test cases for incremental comment fetching watermarks"""
+
+    @pytest.mark.asyncio
+    async def test_watermark_persists_newest_comment(self, tmp_path):
+        """Test that the newest first-level comment fetched becomes the note's watermark"""
+        watermarks = CommentWatermarks("xhs", base_dir=str(tmp_path))
+        watermarks.observe("n1", [xhs_comment("c3", 300), xhs_comment("c2", 200)])
+        watermarks.observe("n1", [xhs_comment("c1", 100)])
+        watermarks.finish_paging("n1")
+        await watermarks.commit("n1")
+
+        reloaded = CommentWatermarks("xhs", base_dir=str(tmp_path))
+        assert reloaded.get("n1") == {"note_id": "n1", "comment_id": "c3", "create_time": 300}
+
+    @pytest.mark.asyncio
+    async def test_uncommitted_paging_keeps_previous_watermark(self, tmp_path):
+        """Test that an interrupted note does not move its watermark"""
+        watermarks = CommentWatermarks("xhs", base_dir=str(tmp_path))
+        watermarks.observe("n1", [xhs_comment("c1", 100)])
+        watermarks.finish_paging("n1")
+        await watermarks.commit("n1")
+        watermarks.observe("n1", [xhs_comment("c2", 200)])
+
+        reloaded = CommentWatermarks("xhs", base_dir=str(tmp_path))
+        assert reloaded.get("n1")["comment_id"] == "c1"
+
+    @pytest.mark.asyncio
+    async def test_new_comments_stop_at_watermark(self, tmp_path):
+        """Test that paging stops on the page holding the watermark comment"""
+        watermarks = CommentWatermarks("bili", base_dir=str(tmp_path))
+        watermarks.observe("v1", [{"rpid": 2, "ctime": 200}])
+        await watermarks.commit("v1")
+
+        page = [{"rpid": 4, "ctime": 400}, {"rpid": 3, "ctime": 300}]
+        assert watermarks.new_comments("v1", page) == (page, False)
+
+        page = [{"rpid": 3, "ctime": 300}, {"rpid": 2, "ctime": 200}, {"rpid": 1, "ctime": 100}]
+        new_comments, reached = watermarks.new_comments("v1", page)
+        assert [comment["rpid"] for comment in new_comments] == [3]
+        assert reached
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("platform, id_field", [("xhs", "id"), ("douyin", "cid")])
+    async def test_hot_order_pages_never_stop(self, tmp_path, platform, id_field):
+        """Test that pages in hot order keep paging past old comments and the watermark comment"""
+        watermarks = CommentWatermarks(platform, base_dir=str(tmp_path))
+        watermarks.observe("n1", [{id_field: "c3", "create_time": 300}])
+        watermarks.finish_paging("n1")
+        await watermarks.commit("n1")
+
+        pages = [
+            [{id_field: "c1", "create_time": 100}, {id_field: "c2", "create_time": 200}],
+            [{id_field: "c3", "create_time": 300}, {id_field: "c5", "create_time": 500}],
+            [{id_field: "c4", "create_time": 400}],
+        ]
+        fetched = []
+        for page in pages:
+            new_comments, reached = watermarks.new_comments("n1", page)
+            assert not reached
+            fetched += [comment[id_field] for comment in new_comments]
+        assert fetched == ["c5", "c4"]
+
+    @pytest.mark.asyncio
+    async def test_page_without_new_comments_stops_paging(self, tmp_path):
+        """Test that a page of pinned or older comments ends paging even without the watermark comment"""
+        watermarks = CommentWatermarks("bili", base_dir=str(tmp_path))
+        watermarks.observe("v1", [{"rpid": 2, "ctime": 200}])
+        await watermarks.commit("v1")
+
+        assert watermarks.new_comments("v1", [{"rpid": 1, "ctime": 100}]) == ([], True)
+        # Notes never fetched before are paged in full
+        assert watermarks.new_comments("v2", [{"rpid": 1, "ctime": 100}]) == ([{"rpid": 1, "ctime": 100}], False)
+
+    @pytest.mark.asyncio
+    async def test_truncated_hot_order_paging_keeps_no_watermark(self, tmp_path):
+        """Test that a first run cut by max_count does not hide the older comments it never fetched"""
+        watermarks = CommentWatermarks("xhs", base_dir=str(tmp_path))
+        # The hottest comments, paging stopped at max_count before the last page
+        watermarks.observe("n1", [xhs_comment("c9", 900), xhs_comment("c2", 200)])
+        await watermarks.commit("n1")
+
+        reloaded = CommentWatermarks("xhs", base_dir=str(tmp_path))
+        assert reloaded.get("n1") is None
+        page = [xhs_comment("c5", 500)]
+        assert reloaded.new_comments("n1", page) == (page, False)
+
+    @pytest.mark.asyncio
+    async def test_disabled_watermarks(self, tmp_path):
+        """Test that disabled watermarks neither filter nor record anything"""
+        watermarks = CommentWatermarks("xhs", enabled=False, base_dir=str(tmp_path))
+        watermarks.observe("n1", [xhs_comment("c1", 100)])
+        await watermarks.commit("n1")
+
+        assert watermarks.get("n1") is None
+        assert not watermarks.path.exists()
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_crawl_checkpoint.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Unit tests for CrawlCheckpoint
+"""
+
+import json
+
+import pytest
+
+from tools.crawl_checkpoint import CrawlCheckpoint
+
+
+class TestCrawlCheckpoint:
+    """Test cases for search pagination and comment cursor checkpoints"""
+
+    @pytest.mark.asyncio
+    async def test_resume_search_pagination(self, tmp_path):
+        """Test that a resumed run continues after the last completed page in the same search session"""
+        checkpoint = CrawlCheckpoint("xhs", "search", base_dir=str(tmp_path))
+        await checkpoint.complete_page("python", 1, search_id="sid-1")
+        await checkpoint.complete_page("python", 2, search_id="sid-1")
+        await checkpoint.complete_keyword("golang")
+
+        resumed = CrawlCheckpoint("xhs", "search", resume=True, base_dir=str(tmp_path))
+        assert resumed.resume_page("python", 1) == 3
+        assert resumed.search_id("python", default="new") == "sid-1"
+        assert not resumed.is_keyword_done("python")
+        assert resumed.is_keyword_done("golang")
+        # Keywords never reached start from the configured page with a new session
+        assert resumed.resume_page("rust", 1) == 1
+        assert resumed.search_id("rust", default="new") == "new"
+
+    @pytest.mark.asyncio
+    async def test_resume_page_respects_start_page(self, tmp_path):
+        """Test that the resumed page never goes before the requested start page"""
+        checkpoint = CrawlCheckpoint("bili", "search", base_dir=str(tmp_path))
+        await checkpoint.complete_page("python", 2)
+
+        resumed = CrawlCheckpoint("bili", "search", resume=True, base_dir=str(tmp_path))
+        assert resumed.resume_page("python", 5) == 5
+
+    @pytest.mark.asyncio
+    async def test_pending_ids_and_comment_cursors(self, tmp_path):
+        """Test that collected IDs and in-flight comment cursors survive a restart"""
+        checkpoint = CrawlCheckpoint("douyin", "search", base_dir=str(tmp_path))
+        await checkpoint.complete_page("python", 0, search_id="log-1", pending_ids=["a1", "a2"])
+        await checkpoint.update_comment_cursor("a1", "cursor-20")
+        await checkpoint.update_comment_cursor("a2", "cursor-40")
+        await checkpoint.complete_comments("a2")
+
+        resumed = CrawlCheckpoint("douyin", "search", resume=True, base_dir=str(tmp_path))
+        assert resumed.pending_ids("python") == ["a1", "a2"]
+        assert resumed.comment_cursor("a1") == "cursor-20"
+        assert resumed.comment_cursor("a2") == ""
+
+        await resumed.complete_keyword("python")
+        assert resumed.pending_ids("python") == []
+
+    @pytest.mark.asyncio
+    async def test_start_fresh_without_resume(self, tmp_path):
+        """Test that a run without resume ignores the previous checkpoint"""
+        checkpoint = CrawlCheckpoint("xhs", "search", base_dir=str(tmp_path))
+        await checkpoint.complete_page("python", 4, search_id="sid-1")
+
+        fresh = CrawlCheckpoint("xhs", "search", base_dir=str(tmp_path))
+        assert fresh.resume_page("python", 1) == 1
+        assert fresh.search_id("python", default="new") == "new"
+
+    @pytest.mark.asyncio
+    async def test_save_is_atomic_and_clear_removes_file(self, tmp_path):
+        """Test that the checkpoint file is always complete JSON and removed once the run finishes"""
+        checkpoint = CrawlCheckpoint("xhs", "search", base_dir=str(tmp_path))
+        await checkpoint.complete_page("python", 1)
+        assert json.loads(checkpoint.path.read_text(encoding="utf-8"))["keywords"]["python"]["page"] == 1
+        assert not checkpoint.path.with_suffix(".json.tmp").exists()
+
+        checkpoint.clear()
+        assert not checkpoint.path.exists()
+
+    def test_unreadable_checkpoint_starts_from_scratch(self, tmp_path):
+        """Test that a corrupted checkpoint file does not prevent the run from starting"""
+        path = tmp_path / "xhs" / ".checkpoint" / "search.json"
+        path.parent.mkdir(parents=True)
+        path.write_text("{not json", encoding="utf-8")
+
+        checkpoint = CrawlCheckpoint("xhs", "search", resume=True, base_dir=str(tmp_path))
+        assert checkpoint.resume_page("python", 1) == 1
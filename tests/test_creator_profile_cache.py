@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_creator_profile_cache.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+Unit tests for the creator profile cache
+"""
+
+import pytest
+
+from cache.disk_cache import DiskCache
+from tools import creator_profile_cache
+from tools.creator_profile_cache import get_cached_creator_profile
+
+
+class TestCreatorProfileCache:
+    """Test cases for caching creator profiles across runs"""
+
+    @pytest.fixture
+    def disk_cache(self, tmp_path, monkeypatch):
+        cache = DiskCache(str(tmp_path / "cache.sqlite3"))
+        monkeypatch.setattr("config.ENABLE_CREATOR_PROFILE_CACHE", True)
+        monkeypatch.setattr(creator_profile_cache, "_profile_cache", cache)
+        yield cache
+        cache.close()
+
+    @staticmethod
+    def counting_fetch(profile):
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            return profile
+
+        return fetch, calls
+
+    @pytest.mark.asyncio
+    async def test_repeat_creator_is_not_fetched_again(self, disk_cache):
+        """Test that a cached profile is returned without calling fetch"""
+        fetch, calls = self.counting_fetch({"nickname": "creator"})
+        assert await get_cached_creator_profile("xhs", "u1", fetch) == {"nickname": "creator"}
+        assert await get_cached_creator_profile("xhs", "u1", fetch) == {"nickname": "creator"}
+        assert len(calls) == 1
+        # The same id on another platform is another creator
+        await get_cached_creator_profile("douyin", "u1", fetch)
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_empty_profile_is_not_cached(self, disk_cache):
+        """Test that a failed lookup is retried on the next call"""
+        fetch, calls = self.counting_fetch(None)
+        assert await get_cached_creator_profile("zhihu", "u1", fetch) is None
+        assert await get_cached_creator_profile("zhihu", "u1", fetch) is None
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_always_fetches(self, monkeypatch):
+        """Test that every call fetches when the cache is disabled"""
+        monkeypatch.setattr("config.ENABLE_CREATOR_PROFILE_CACHE", False)
+        fetch, calls = self.counting_fetch({"nickname": "creator"})
+        await get_cached_creator_profile("bili", "1", fetch)
+        await get_cached_creator_profile("bili", "1", fetch)
+        assert len(calls) == 2
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_data_reader.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+Unit tests for the streaming data file preview
+"""
+
+import io
+import json
+
+import openpyxl
+import pytest
+from fastapi import HTTPException
+
+from api.routers import data as data_router
+from api.services.data_reader import count_records, iter_json_array
+from tools.file_metadata_index import get_file_metadata_index
+
+
+class TestDataReader:
+    """Test cases for bounded-memory previews of data files"""
+
+    @pytest.fixture
+    def data_dir(self, tmp_path, monkeypatch):
+        """Point the data API at a temporary data directory"""
+        data_dir = tmp_path / "data"
+        data_dir.mkdir()
+        monkeypatch.setattr(data_router, "DATA_DIR", data_dir)
+        return data_dir
+
+    def test_iter_json_array_across_chunks(self):
+        """Test that items split over read chunks are decoded whole"""
+        items = []
+        for i in range(20):
+            items += [{"note_id": str(i), "desc": "多字节 " * i}, 12345 + i, 1.5e3, None, True, "a]b,c", [1, [2]]]
+        text = json.dumps(items, ensure_ascii=False, indent=2)
+
+        for chunk_size in (1, 7, 64):
+            assert list(iter_json_array(io.StringIO(text), chunk_size)) == items
+        assert list(iter_json_array(io.StringIO(" [ ] "))) == []
+
+    def test_iter_json_array_stops_reading_early(self):
+        """Test that taking the first items reads only the start of the file"""
+        f = io.StringIO("[" + ",".join(json.dumps({"i": i}) for i in range(10000)) + "]")
+        items = iter_json_array(f, chunk_size=32)
+        assert [next(items) for _ in range(3)] == [{"i": 0}, {"i": 1}, {"i": 2}]
+        assert f.tell() < 200
+
+    def test_iter_json_array_rejects_truncated_file(self):
+        """Test that an unterminated array raises a decode error"""
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_array(io.StringIO('[{"i": 1}, {"i": 2')))
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_array(io.StringIO('[{"i": 1}')))
+
+    @pytest.mark.asyncio
+    async def test_json_preview_uses_cached_total(self, data_dir):
+        """Test that the JSON preview returns limit items and takes the total from the index"""
+        file_path = data_dir / "xhs" / "json" / "search_contents.json"
+        file_path.parent.mkdir(parents=True)
+        file_path.write_text(json.dumps([{"note_id": str(i)} for i in range(50)]), encoding="utf-8")
+
+        result = await data_router.get_file_content("xhs/json/search_contents.json", limit=5)
+        assert result == {"data": [{"note_id": str(i)} for i in range(5)], "total": 50}
+
+        # A count the file content cannot produce proves the total came from the index
+        get_file_metadata_index(str(data_dir)).set_record_count(file_path, 42)
+        result = await data_router.get_file_content("xhs/json/search_contents.json", limit=5)
+        assert result["total"] == 42
+
+    @pytest.mark.asyncio
+    async def test_json_object_preview(self, data_dir):
+        """Test that a JSON file holding an object is returned as is"""
+        (data_dir / "stats.json").write_text('{"a": 1}', encoding="utf-8")
+        assert await data_router.get_file_content("stats.json") == {"data": {"a": 1}, "total": 1}
+
+    @pytest.mark.asyncio
+    async def test_csv_preview_counts_rows_not_lines(self, data_dir):
+        """Test that quoted multi-line fields count as one record"""
+        (data_dir / "comments.csv").write_text(
+            '﻿comment_id,content\n1,"a\nb"\n2,c\n3,"d,\ne"\n', encoding="utf-8"
+        )
+        result = await data_router.get_file_content("comments.csv", limit=2)
+        assert result == {"data": [{"comment_id": "1", "content": "a\nb"}, {"comment_id": "2", "content": "c"}], "total": 3}
+
+    @pytest.mark.asyncio
+    async def test_xlsx_preview(self, data_dir):
+        """Test that the XLSX preview streams the first rows with their columns"""
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(["note_id", "liked_count"])
+        for i in range(30):
+            sheet.append([str(i), i * 10])
+        workbook.save(data_dir / "contents.xlsx")
+
+        result = await data_router.get_file_content("contents.xlsx", limit=2)
+        assert result == {
+            "data": [{"note_id": "0", "liked_count": 0}, {"note_id": "1", "liked_count": 10}],
+            "total": 30,
+            "columns": ["note_id", "liked_count"],
+        }
+        assert count_records(data_dir / "contents.xlsx") == 30
+
+    @pytest.mark.asyncio
+    async def test_invalid_json_preview(self, data_dir):
+        """Test that a malformed JSON file is reported as a client error"""
+        (data_dir / "broken.json").write_text('[{"a": 1}, {"a": ', encoding="utf-8")
+        with pytest.raises(HTTPException) as exc_info:
+            await data_router.get_file_content("broken.json")
+        assert exc_info.value.status_code == 400
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_db_session.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Unit tests for the SQLAlchemy engine and session helpers
+"""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+
+from database import db_session
+
+
+class TestDbSession:
+    """Test cases for cached session factories and pool statistics"""
+
+    @pytest_asyncio.fixture
+    async def sqlite_db(self, tmp_path, monkeypatch):
+        """Point the sqlite engine at a temporary database"""
+        monkeypatch.setattr("config.SAVE_DATA_OPTION", "sqlite")
+        monkeypatch.setitem(db_session.sqlite_db_config, "db_path", str(tmp_path / "test.db"))
+        monkeypatch.setattr("config.db_config.DB_POOL_SIZE", 2)
+        await db_session.dispose_engines()
+        yield
+        await db_session.dispose_engines()
+
+    @pytest.mark.asyncio
+    async def test_session_factory_cached(self, sqlite_db):
+        """Test that every session of an engine comes from the same factory"""
+        factory = db_session.get_session_factory()
+
+        assert factory is db_session.get_session_factory()
+        assert factory.kw["bind"] is db_session.get_async_engine()
+
+    @pytest.mark.asyncio
+    async def test_pool_configured_from_db_config(self, sqlite_db):
+        """Test that pool options come from db_config"""
+        assert db_session.get_async_engine().pool.size() == 2
+
+    @pytest.mark.asyncio
+    async def test_pool_stats(self, sqlite_db):
+        """Test that checked-out connections and waits are reported"""
+        async with db_session.get_session() as session:
+            await session.execute(text("SELECT 1"))
+            assert db_session.get_pool_stats()["checked_out"] == 1
+
+        stats = db_session.get_pool_stats()
+        assert stats["checked_out"] == 0
+        assert stats["checkouts"] == 1
+        assert stats["max_wait_ms"] >= stats["avg_wait_ms"] >= 0
+
+    def test_pool_stats_without_engine(self, monkeypatch):
+        """Test that file save options report no pool"""
+        monkeypatch.setattr("config.SAVE_DATA_OPTION", "json")
+
+        assert db_session.get_pool_stats() == {}
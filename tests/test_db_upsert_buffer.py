@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_db_upsert_buffer.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Unit tests for DbUpsertBuffer
+"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from database import db_session
+from database.db_upsert_buffer import DbUpsertBuffer
+from database.models import Base, XhsNoteComment
+
+
+class TestDbUpsertBuffer:
+    """Test cases for batched upserts against a temporary SQLite database"""
+
+    @pytest_asyncio.fixture
+    async def engine(self, tmp_path, monkeypatch):
+        """Create a SQLite engine used by get_session()"""
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        monkeypatch.setattr("config.SAVE_DATA_OPTION", "sqlite")
+        monkeypatch.setitem(db_session._engines, "sqlite", engine)
+        yield engine
+        await engine.dispose()
+
+    @staticmethod
+    async def fetch_comments(engine):
+        async with engine.connect() as conn:
+            result = await conn.execute(select(XhsNoteComment).order_by(XhsNoteComment.comment_id))
+            return result.mappings().all()
+
+    @staticmethod
+    def make_buffer(**kwargs):
+        return DbUpsertBuffer(
+            XhsNoteComment,
+            key_column="comment_id",
+            update_columns=["last_modify_ts", "like_count"],
+            flush_interval=3600,
+            **kwargs,
+        )
+
+    @pytest.mark.asyncio
+    async def test_rows_buffered_until_batch_full(self, engine, sample_xhs_comment):
+        """Test that nothing is written before the batch is full"""
+        buffer = self.make_buffer(batch_size=2)
+
+        await buffer.add({**sample_xhs_comment, "add_ts": 1, "last_modify_ts": 1})
+        assert await self.fetch_comments(engine) == []
+
+        await buffer.add({**sample_xhs_comment, "comment_id": "comment_456", "add_ts": 1, "last_modify_ts": 1})
+        assert len(await self.fetch_comments(engine)) == 2
+
+    @pytest.mark.asyncio
+    async def test_upsert_updates_existing_row(self, engine, sample_xhs_comment):
+        """Test that a second flush refreshes update columns and keeps insert-only ones"""
+        buffer = self.make_buffer()
+        await buffer.add({**sample_xhs_comment, "add_ts": 1, "last_modify_ts": 1})
+        await buffer.flush()
+
+        await buffer.add({**sample_xhs_comment, "like_count": 99, "content": "edited", "add_ts": 2, "last_modify_ts": 2})
+        await buffer.flush()
+
+        rows = await self.fetch_comments(engine)
+        assert buffer._key_is_unique is True
+        assert len(rows) == 1
+        assert rows[0]["like_count"] == "99"
+        assert rows[0]["last_modify_ts"] == "2"
+        assert rows[0]["add_ts"] == "1"
+        assert rows[0]["content"] == sample_xhs_comment["content"]
+
+    @pytest.mark.asyncio
+    async def test_select_then_write_fallback(self, engine, sample_xhs_comment):
+        """Test the fallback used by tables whose key column is not unique"""
+        buffer = self.make_buffer()
+        buffer._key_is_unique = False
+        await buffer.add({**sample_xhs_comment, "add_ts": 1, "last_modify_ts": 1})
+        await buffer.flush()
+
+        await buffer.add({**sample_xhs_comment, "like_count": 99, "add_ts": 2, "last_modify_ts": 2})
+        await buffer.add({**sample_xhs_comment, "comment_id": "comment_456", "add_ts": 2, "last_modify_ts": 2})
+        await buffer.flush()
+
+        rows = await self.fetch_comments(engine)
+        assert [row["comment_id"] for row in rows] == ["comment_123", "comment_456"]
+        assert rows[0]["like_count"] == "99"
+        assert rows[0]["add_ts"] == "1"
+
+    @pytest.mark.asyncio
+    async def test_duplicate_keys_merged_in_buffer(self, engine, sample_xhs_comment):
+        """Test that a record buffered twice is written once with the latest values"""
+        buffer = self.make_buffer()
+        await buffer.add({**sample_xhs_comment, "add_ts": 1, "last_modify_ts": 1})
+        await buffer.add({**sample_xhs_comment, "like_count": 42, "add_ts": 1, "last_modify_ts": 1})
+        await buffer.flush()
+
+        rows = await self.fetch_comments(engine)
+        assert len(rows) == 1
+        assert rows[0]["like_count"] == "42"
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_rows(self, engine, sample_xhs_comment, monkeypatch):
+        """Test that rows of a failed write stay buffered and are written by the next flush"""
+        buffer = self.make_buffer()
+        await buffer.add({**sample_xhs_comment, "add_ts": 1, "last_modify_ts": 1})
+
+        async def failing_execute(*args, **kwargs):
+            raise RuntimeError("database is locked")
+
+        with monkeypatch.context() as m:
+            m.setattr("sqlalchemy.ext.asyncio.AsyncSession.execute", failing_execute)
+            with pytest.raises(RuntimeError):
+                await buffer.flush()
+        assert len(buffer._rows) == 1
+        assert await self.fetch_comments(engine) == []
+
+        await buffer.flush()
+        assert len(await self.fetch_comments(engine)) == 1
+        assert buffer._rows == {}
+
+    @pytest.mark.asyncio
+    async def test_quiet_buffer_flushed_by_timer(self, engine, sample_xhs_comment):
+        """Test that buffered rows are written after the flush interval without another write"""
+        buffer = DbUpsertBuffer(XhsNoteComment, key_column="comment_id", flush_interval=0.05)
+        await buffer.add({**sample_xhs_comment, "add_ts": 1, "last_modify_ts": 1})
+        assert await self.fetch_comments(engine) == []
+
+        await asyncio.sleep(0.3)
+        assert len(await self.fetch_comments(engine)) == 1
+        assert buffer._flush_task.done()
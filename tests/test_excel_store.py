@@ -187,6 +187,60 @@ class TestExcelStoreBase:
         wb.close()
 
 
+@pytest.mark.skipif(not EXCEL_AVAILABLE, reason="openpyxl not installed")
+class TestExcelStoreWriteOnly:
+    """Test cases for the streaming write-only mode"""
+
+    @pytest.fixture
+    def excel_store(self, tmp_path, monkeypatch):
+        """Create write-only ExcelStoreBase instance for testing"""
+        monkeypatch.chdir(tmp_path)
+        return ExcelStoreBase(platform="test", crawler_type="search", write_only=True)
+
+    @pytest.mark.asyncio
+    async def test_rows_streamed_past_width_sample(self, excel_store):
+        """Test that rows beyond the width sample are written straight to the sheet"""
+        for i in range(150):
+            await excel_store.store_content({"note_id": f"note{i}", "title": f"Title {i}"})
+
+        assert excel_store.workbook.write_only is True
+        assert excel_store._sample_rows == {}
+
+        excel_store.flush()
+
+        wb = openpyxl.load_workbook(excel_store.filename)
+        sheet = wb["Contents"]
+        assert sheet.max_row == 151
+        assert sheet.cell(row=151, column=1).value == "note149"
+        assert sheet.cell(row=1, column=1).font.bold is True
+        wb.close()
+
+    @pytest.mark.asyncio
+    async def test_column_widths_from_written_values(self, excel_store):
+        """Test that column widths follow the longest value within the bounds"""
+        await excel_store.store_content({"note_id": "n1", "title": "x" * 30, "desc": "y" * 200})
+
+        excel_store.flush()
+
+        wb = openpyxl.load_workbook(excel_store.filename)
+        dimensions = wb["Contents"].column_dimensions
+        assert dimensions["A"].width == 10
+        assert dimensions["B"].width == 32
+        assert dimensions["C"].width == 50
+        wb.close()
+
+    @pytest.mark.asyncio
+    async def test_empty_sheets_removed(self, excel_store):
+        """Test that sheets without data rows are left out of the file"""
+        await excel_store.store_comment({"comment_id": "c1"})
+
+        excel_store.flush()
+
+        wb = openpyxl.load_workbook(excel_store.filename)
+        assert wb.sheetnames == ["Comments"]
+        wb.close()
+
+
 @pytest.mark.skipif(not EXCEL_AVAILABLE, reason="openpyxl not installed")
 def test_excel_import_availability():
     """Test that openpyxl is available"""
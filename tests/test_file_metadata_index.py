@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_file_metadata_index.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+Unit tests for the data file metadata index
+"""
+
+import threading
+
+import pytest
+
+from api.routers import data as data_router
+from tools.async_file_writer import AsyncFileWriter
+from tools.file_metadata_index import file_signature, get_file_metadata_index
+
+
+class TestFileMetadataIndex:
+    """Test cases for cached record counts of data files"""
+
+    @pytest.fixture
+    def writer(self, tmp_path, monkeypatch):
+        """Create AsyncFileWriter writing under a temporary data directory"""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(data_router, "DATA_DIR", tmp_path / "data")
+        return AsyncFileWriter(platform="xhs", crawler_type="search")
+
+    @pytest.mark.asyncio
+    async def test_writers_keep_counts_current(self, writer, monkeypatch):
+        """Test that JSONL, CSV and JSON writers update the record count of the files they write"""
+        monkeypatch.setattr("config.CSV_FLUSH_BATCH_SIZE", 2)
+        for i in range(3):
+            await writer.write_single_item_to_jsonl({"note_id": str(i)}, "contents")
+            await writer.write_to_csv({"note_id": str(i), "title": "a,\nb"}, "contents")
+            await writer.write_single_item_to_json({"note_id": str(i)}, "contents")
+        await writer.close()
+
+        index = get_file_metadata_index("data")
+        for file_type in ("jsonl", "csv", "json"):
+            file_path = writer._get_file_path(file_type, "contents")
+            assert index.get_record_count(file_path, file_signature(index.data_dir.parent / file_path)) == 3
+
+    @pytest.mark.asyncio
+    async def test_jsonl_counts_batched_off_event_loop(self, writer, monkeypatch):
+        """Test that JSONL appends update the index once per batch, from a worker thread"""
+        monkeypatch.setattr("config.CSV_FLUSH_BATCH_SIZE", 2)
+        monkeypatch.setattr("config.CSV_FLUSH_INTERVAL_SEC", 3600)
+        index = get_file_metadata_index("data")
+        add_records = index.add_records
+        threads = []
+
+        def tracked_add_records(*args):
+            threads.append(threading.current_thread())
+            add_records(*args)
+
+        monkeypatch.setattr(index, "add_records", tracked_add_records)
+        file_path = writer._get_file_path("jsonl", "contents")
+        for i in range(3):
+            await writer.write_single_item_to_jsonl({"note_id": str(i)}, "contents")
+        assert len(threads) == 1
+        assert index.get_record_count(file_path, file_signature(index.data_dir.parent / file_path)) is None
+
+        await writer.close()
+        assert len(threads) == 2
+        assert threading.main_thread() not in threads
+        assert index.get_record_count(file_path, file_signature(index.data_dir.parent / file_path)) == 3
+
+    @pytest.mark.asyncio
+    async def test_listing_uses_index_without_reading_files(self, writer):
+        """Test that an indexed, unchanged file is listed from its cached count"""
+        await writer.write_single_item_to_jsonl({"note_id": "1"}, "contents")
+        file_path = writer._get_file_path("jsonl", "contents")
+        index = get_file_metadata_index("data")
+        # A count the file content cannot produce proves the file was not read
+        index.set_record_count(file_path, 42)
+
+        files = (await data_router.list_data_files())["files"]
+        assert [(f["path"], f["record_count"]) for f in files] == [("xhs/jsonl/" + file_path.rsplit("/", 1)[1], 42)]
+
+    @pytest.mark.asyncio
+    async def test_changed_file_is_recounted(self, writer):
+        """Test that a file modified by something else than the writers is counted again"""
+        await writer.write_single_item_to_jsonl({"note_id": "1"}, "contents")
+        file_path = writer._get_file_path("jsonl", "contents")
+        with open(file_path, "a", encoding="utf-8") as f:
+            f.write('{"note_id": "2"}\n{"note_id": "3"}\n')
+
+        files = (await data_router.list_data_files())["files"]
+        assert files[0]["record_count"] == 3
+        index = get_file_metadata_index("data")
+        assert index.get_record_count(file_path, file_signature(index.data_dir.parent / file_path)) == 3
+
+    @pytest.mark.asyncio
+    async def test_listing_skips_crawler_state(self, writer, tmp_path):
+        """Test that files in hidden state directories are not listed"""
+        state_dir = tmp_path / "data" / "xhs" / ".checkpoint"
+        state_dir.mkdir(parents=True)
+        (state_dir / "search.json").write_text("{}", encoding="utf-8")
+
+        assert (await data_router.list_data_files())["files"] == []
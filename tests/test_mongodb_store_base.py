@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_mongodb_store_base.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+Unit tests for MongoDBStoreBase batching and index bootstrap, against mocked Motor objects
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pymongo import UpdateOne
+
+from database.mongodb_store_base import MongoDBConnection, MongoDBStoreBase
+
+
+@pytest.fixture
+def mongo_db(monkeypatch):
+    """Pretend MongoDBConnection is already connected to a mocked database"""
+    db = MagicMock()
+    collections = {}
+
+    def get_collection(name):
+        if name not in collections:
+            collection = MagicMock()
+            collection.bulk_write = AsyncMock()
+            collection.create_index = AsyncMock()
+            collections[name] = collection
+        return collections[name]
+
+    db.__getitem__.side_effect = get_collection
+    monkeypatch.setattr(MongoDBConnection, "_db", db)
+    monkeypatch.setattr(MongoDBConnection, "_pending_indexes", set())
+    monkeypatch.setattr(MongoDBConnection, "_created_indexes", set())
+    return get_collection
+
+
+class TestMongoDBStoreBase:
+    """Test cases for buffered bulk upserts"""
+
+    @pytest.mark.asyncio
+    async def test_buffered_documents_flushed_by_batch_size(self, mongo_db):
+        """Test that documents stay queued until the batch is full"""
+        store = MongoDBStoreBase(collection_prefix="xhs", batch_size=2, flush_interval=3600)
+        collection = mongo_db("xhs_comments")
+
+        await store.save_or_update_buffered("comments", "comment_id", {"comment_id": "c1", "like_count": 1})
+        collection.bulk_write.assert_not_awaited()
+
+        await store.save_or_update_buffered("comments", "comment_id", {"comment_id": "c2", "like_count": 2})
+        operations = collection.bulk_write.await_args.args[0]
+        assert operations == [
+            UpdateOne({"comment_id": "c1"}, {"$set": {"comment_id": "c1", "like_count": 1}}, upsert=True),
+            UpdateOne({"comment_id": "c2"}, {"$set": {"comment_id": "c2", "like_count": 2}}, upsert=True),
+        ]
+        assert collection.bulk_write.await_args.kwargs == {"ordered": False}
+
+    @pytest.mark.asyncio
+    async def test_duplicate_keys_merged_before_flush(self, mongo_db):
+        """Test that one document queued twice becomes one operation"""
+        store = MongoDBStoreBase(collection_prefix="xhs", batch_size=10, flush_interval=3600)
+
+        await store.save_or_update_buffered("contents", "note_id", {"note_id": "n1", "title": "a"})
+        await store.save_or_update_buffered("contents", "note_id", {"note_id": "n1", "liked_count": 5})
+        await store.flush()
+
+        operations = mongo_db("xhs_contents").bulk_write.await_args.args[0]
+        assert operations == [
+            UpdateOne({"note_id": "n1"}, {"$set": {"note_id": "n1", "title": "a", "liked_count": 5}}, upsert=True),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_declared_indexes_created_once(self, mongo_db):
+        """Test that key indexes are created on first use and not again"""
+        store = MongoDBStoreBase(collection_prefix="xhs", indexes={"contents": "note_id"})
+        MongoDBStoreBase(collection_prefix="xhs", indexes={"contents": "note_id"})
+
+        await store.get_collection("contents")
+        await store.get_collection("contents")
+
+        mongo_db("xhs_contents").create_index.assert_awaited_once_with([("note_id", 1)])
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_documents(self, mongo_db):
+        """Test that documents of a failed bulk write are written by the next flush"""
+        store = MongoDBStoreBase(collection_prefix="xhs", batch_size=10, flush_interval=3600)
+        collection = mongo_db("xhs_contents")
+        collection.bulk_write.side_effect = [RuntimeError("connection reset"), None]
+
+        await store.save_or_update_buffered("contents", "note_id", {"note_id": "n1"})
+        with pytest.raises(RuntimeError):
+            await store.flush()
+        await store.flush()
+
+        assert collection.bulk_write.await_count == 2
+        assert collection.bulk_write.await_args.args[0] == [
+            UpdateOne({"note_id": "n1"}, {"$set": {"note_id": "n1"}}, upsert=True),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_quiet_buffer_flushed_by_timer(self, mongo_db):
+        """Test that queued documents are written once the flush interval passes without another write"""
+        store = MongoDBStoreBase(collection_prefix="xhs", batch_size=10, flush_interval=0.05)
+        collection = mongo_db("xhs_contents")
+
+        await store.save_or_update_buffered("contents", "note_id", {"note_id": "n1"})
+        collection.bulk_write.assert_not_awaited()
+        await asyncio.sleep(0.2)
+
+        collection.bulk_write.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_index_retried(self, mongo_db):
+        """Test that an index whose creation failed is created again on the next use"""
+        store = MongoDBStoreBase(collection_prefix="xhs", indexes={"contents": "note_id"})
+        mongo_db("xhs_contents").create_index.side_effect = [RuntimeError("not primary"), None]
+
+        await store.get_collection("contents")
+        await store.get_collection("contents")
+        await store.get_collection("contents")
+
+        assert mongo_db("xhs_contents").create_index.await_count == 2
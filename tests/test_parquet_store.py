@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_parquet_store.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+Unit tests for Parquet export
+"""
+
+import json
+
+import pytest
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+from database.models import XhsCreator, XhsNote
+from store.parquet_store_base import EXTRA_FIELDS_COLUMN, ParquetStoreBase, parse_int
+
+
+@pytest.mark.parametrize("value, expected", [
+    (12, 12),
+    ("1,024", 1024),
+    ("1.2万", 12000),
+    ("3w", 30000),
+    ("10+", 10),
+    ("-5", -5),
+    ("7300000000000000001", 7300000000000000001),
+    ("", None),
+    ("2024-01-01", None),
+])
+def test_parse_int(value, expected):
+    """Test parsing of display counts"""
+    assert parse_int(value) == expected
+
+
+@pytest.mark.skipif(not PARQUET_AVAILABLE, reason="pyarrow not installed")
+class TestParquetStoreBase:
+    """Test cases for ParquetStoreBase"""
+
+    @pytest.fixture
+    def parquet_store(self, tmp_path, monkeypatch):
+        """Create ParquetStoreBase writing under a temporary data directory"""
+        monkeypatch.chdir(tmp_path)
+        return ParquetStoreBase(
+            platform="test",
+            crawler_type="search",
+            row_group_size=2,
+            table_models={"contents": XhsNote, "creators": XhsCreator},
+        )
+
+    @staticmethod
+    def file_path(store, item_type):
+        return store.data_dir / f"{store.crawler_type}_{item_type}_{store.timestamp}.parquet"
+
+    @pytest.mark.asyncio
+    async def test_row_groups_written_incrementally(self, parquet_store, sample_xhs_comment):
+        """Test that every full batch becomes one row group"""
+        for i in range(5):
+            await parquet_store.store_comment({**sample_xhs_comment, "comment_id": f"c{i}"})
+        await parquet_store.close()
+
+        parquet_file = pq.ParquetFile(self.file_path(parquet_store, "comments"))
+        assert parquet_file.metadata.num_rows == 5
+        assert parquet_file.metadata.num_row_groups == 3
+
+    @pytest.mark.asyncio
+    async def test_typed_schema(self, parquet_store, sample_xhs_note):
+        """Test that counts are stored as integers and ids as strings"""
+        await parquet_store.store_content({**sample_xhs_note, "liked_count": "1.2万"})
+        await parquet_store.store_content({**sample_xhs_note, "note_id": "n2", "liked_count": "5"})
+        await parquet_store.close()
+
+        table = pq.read_table(self.file_path(parquet_store, "contents"))
+        assert table.schema.field("liked_count").type == pa.int64()
+        assert table.schema.field("note_id").type == pa.string()
+        assert table.column("liked_count").to_pylist() == [12000, 5]
+
+    @pytest.mark.asyncio
+    async def test_schema_declared_by_model(self, parquet_store):
+        """Test that fields first seen in a later row group keep their declared column"""
+        await parquet_store.store_creator({"user_id": "u1", "fans": "10"})
+        await parquet_store.store_creator({"user_id": "u2", "fans": "20"})
+        await parquet_store.store_creator({"user_id": "u3", "nickname": "new", "follows": "1万"})
+        await parquet_store.close()
+
+        table = pq.read_table(self.file_path(parquet_store, "creators"))
+        assert "id" not in table.column_names
+        assert table.schema.field("follows").type == pa.int64()
+        assert table.column("fans").to_pylist() == [10, 20, None]
+        assert table.column("nickname").to_pylist() == [None, None, "new"]
+        assert table.column("follows").to_pylist() == [None, None, 10000]
+
+    @pytest.mark.asyncio
+    async def test_undeclared_fields_kept(self, parquet_store):
+        """Test that fields outside the model and item types without a model are kept as JSON"""
+        await parquet_store.store_creator({"user_id": "u1", "vip_level": 3})
+        await parquet_store.store_comment({"comment_id": "c1", "like_count": 5})
+        await parquet_store.close()
+
+        creators = pq.read_table(self.file_path(parquet_store, "creators"))
+        assert creators.column(EXTRA_FIELDS_COLUMN).to_pylist() == ['{"vip_level": 3}']
+        comments = pq.read_table(self.file_path(parquet_store, "comments"))
+        assert comments.column_names == [EXTRA_FIELDS_COLUMN]
+        assert json.loads(comments.column(EXTRA_FIELDS_COLUMN)[0].as_py()) == {"comment_id": "c1", "like_count": 5}
+
+    @pytest.mark.asyncio
+    async def test_unparseable_count_kept_as_text(self, parquet_store):
+        """Test that a count that is not a number neither fails the store call nor loses the row group"""
+        await parquet_store.store_creator({"user_id": "u1", "fans": "10"})
+        await parquet_store.store_creator({"user_id": "u2", "fans": "赞"})
+        await parquet_store.store_creator({"user_id": "u3", "fans": "-3"})
+        await parquet_store.close()
+
+        table = pq.read_table(self.file_path(parquet_store, "creators"))
+        assert table.column("user_id").to_pylist() == ["u1", "u2", "u3"]
+        assert table.column("fans").to_pylist() == [10, None, -3]
+        assert table.column(EXTRA_FIELDS_COLUMN).to_pylist() == [None, '{"fans": "赞"}', None]
+
+    @pytest.mark.asyncio
+    async def test_no_file_without_data(self, parquet_store):
+        """Test that closing an unused store creates no files"""
+        await parquet_store.close()
+
+        assert not parquet_store.data_dir.exists()
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_row_offset_index.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+Unit tests for the row offset index of JSONL and CSV outputs
+"""
+
+import csv
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from api.routers import data as data_router
+from api.services.data_reader import read_indexed_records
+from tools.row_offset_index import ROW_INDEX_DIR_NAME, RowOffsetIndex
+
+
+def write_jsonl(file_path, start, stop, mode="w"):
+    with open(file_path, mode, encoding="utf-8") as f:
+        for i in range(start, stop):
+            f.write(json.dumps({"comment_id": str(i)}) + "\n")
+
+
+class TestRowOffsetIndex:
+    """Test cases for random-access pages of data files"""
+
+    @pytest.fixture
+    def data_dir(self, tmp_path, monkeypatch):
+        """Point the data API at a temporary data directory"""
+        data_dir = tmp_path / "data"
+        (data_dir / "xhs" / "jsonl").mkdir(parents=True)
+        monkeypatch.setattr(data_router, "DATA_DIR", data_dir)
+        return data_dir
+
+    def test_offsets_every_stride_records(self, data_dir):
+        """Test that every stride-th record is indexed and located"""
+        file_path = data_dir / "xhs" / "jsonl" / "comments.jsonl"
+        write_jsonl(file_path, 0, 10)
+        index = RowOffsetIndex(file_path, stride=3).refresh()
+
+        assert index.record_count == 10
+        assert len(index.offsets) == 4
+        assert index.locate(7) == (index.offsets[2], 1)
+        assert read_indexed_records(index, 7, 10) == [{"comment_id": str(i)} for i in range(7, 10)]
+        assert read_indexed_records(index, 10, 10) == []
+
+    def test_append_extends_index(self, data_dir):
+        """Test that appended records are indexed from where the last refresh stopped"""
+        file_path = data_dir / "xhs" / "jsonl" / "comments.jsonl"
+        write_jsonl(file_path, 0, 5)
+        index = RowOffsetIndex(file_path, stride=2).refresh()
+        offsets = list(index.offsets)
+
+        write_jsonl(file_path, 5, 8, mode="a")
+        # A record still being written is left for the next refresh
+        with open(file_path, "a", encoding="utf-8") as f:
+            f.write('{"comment_id": "8"')
+        index.refresh()
+        assert index.offsets[:len(offsets)] == offsets
+        assert index.record_count == 8
+
+        # A new process reads the sidecar and finds the same offsets
+        reloaded = RowOffsetIndex(file_path, stride=2).refresh()
+        assert (reloaded.offsets, reloaded.record_count) == (index.offsets, 8)
+        assert read_indexed_records(reloaded, 6, 5) == [{"comment_id": "6"}, {"comment_id": "7"}]
+
+    def test_rewritten_file_is_reindexed(self, data_dir):
+        """Test that a file replaced by other content is indexed from scratch"""
+        file_path = data_dir / "xhs" / "jsonl" / "comments.jsonl"
+        write_jsonl(file_path, 0, 6)
+        index = RowOffsetIndex(file_path, stride=2).refresh()
+
+        write_jsonl(file_path, 100, 109)
+        index.refresh()
+        assert index.record_count == 9
+        assert read_indexed_records(index, 0, 1) == [{"comment_id": "100"}]
+
+    def test_csv_records_span_lines(self, data_dir):
+        """Test that quoted newlines do not split CSV records"""
+        file_path = data_dir / "xhs" / "comments.csv"
+        with open(file_path, "w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["comment_id", "content"])
+            for i in range(7):
+                writer.writerow([str(i), f'line "{i}"\nnext,line'])
+        index = RowOffsetIndex(file_path, stride=2).refresh()
+
+        assert index.record_count == 7
+        assert read_indexed_records(index, 5, 5) == [
+            {"comment_id": str(i), "content": f'line "{i}"\nnext,line'} for i in (5, 6)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_deep_page(self, data_dir):
+        """Test that a page far into the file is served from the sidecar index"""
+        file_path = data_dir / "xhs" / "jsonl" / "comments.jsonl"
+        write_jsonl(file_path, 0, 2500)
+
+        result = await data_router.get_file_content("xhs/jsonl/comments.jsonl", limit=10, page=201)
+        assert result == {"data": [{"comment_id": str(i)} for i in range(2000, 2010)], "total": 2500}
+        result = await data_router.get_file_content("xhs/jsonl/comments.jsonl", limit=3, offset=2498)
+        assert [r["comment_id"] for r in result["data"]] == ["2498", "2499"]
+
+        # The sidecar lives in a hidden directory the listing skips
+        assert (file_path.parent / ROW_INDEX_DIR_NAME / "comments.jsonl.json").exists()
+        files = (await data_router.list_data_files())["files"]
+        assert [f["path"] for f in files] == ["xhs/jsonl/comments.jsonl"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_page(self, data_dir):
+        """Test that a page below 1 is rejected"""
+        write_jsonl(data_dir / "xhs" / "jsonl" / "comments.jsonl", 0, 1)
+        with pytest.raises(HTTPException) as exc_info:
+            await data_router.get_file_content("xhs/jsonl/comments.jsonl", page=0)
+        assert exc_info.value.status_code == 400
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_run_dedup.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+Unit tests for RunDedup
+"""
+
+import json
+
+import pytest
+
+from base.base_crawler import AbstractStore
+from store.run_dedup import SOURCE_KEYWORDS_ITEM_TYPE, RunDedup
+
+
+class RecordingStore(AbstractStore):
+    """Store keeping what it was asked to write"""
+
+    def __init__(self, upserts: bool):
+        self.upserts = upserts
+        self.contents = []
+        self.keyword_updates = []
+
+    async def store_content(self, content_item):
+        self.contents.append(dict(content_item))
+
+    async def store_comment(self, comment_item):
+        pass
+
+    async def store_creator(self, creator):
+        pass
+
+    async def update_source_keyword(self, content_id, source_keyword):
+        if not self.upserts:
+            return False
+        self.keyword_updates.append((content_id, source_keyword))
+        return True
+
+
+class TestRunDedup:
+    """Test cases for deduplicating search results across keywords"""
+
+    @pytest.mark.asyncio
+    async def test_content_is_claimed_once(self):
+        """Test that only the first keyword returning a content fetches it"""
+        run_dedup = RunDedup("xhs")
+        assert await run_dedup.claim("n1", "python")
+        assert not await run_dedup.claim("n1", "python")
+        assert not await run_dedup.claim("n1", "golang")
+        assert await run_dedup.claim("n2", "golang")
+        assert len(run_dedup) == 2
+
+    @pytest.mark.asyncio
+    async def test_extra_keyword_upserted(self):
+        """Test that a later keyword is upserted by a store that updates records in place"""
+        store = RecordingStore(upserts=True)
+        run_dedup = RunDedup("douyin")
+        await run_dedup.claim(1, "python")
+        await store.store_content({"aweme_id": 1, "source_keyword": "python"})
+        run_dedup.remember(1, {"aweme_id": 1, "source_keyword": "python"}, store)
+
+        await run_dedup.claim("1", "golang")
+        await run_dedup.claim(1, "golang")
+        assert store.contents == [{"aweme_id": 1, "source_keyword": "python"}]
+        assert store.keyword_updates == [(1, "python,golang")]
+
+    @pytest.mark.asyncio
+    async def test_extra_keyword_in_sidecar_for_file_stores(self, tmp_path, monkeypatch):
+        """Test that append-only stores get one sidecar line per keyword change and no second record"""
+        monkeypatch.chdir(tmp_path)
+        store = RecordingStore(upserts=False)
+        run_dedup = RunDedup("xhs")
+        await run_dedup.claim("n1", "python")
+        await store.store_content({"note_id": "n1", "source_keyword": "python"})
+        run_dedup.remember("n1", {"note_id": "n1", "source_keyword": "python"}, store)
+
+        await run_dedup.claim("n1", "golang")
+        await run_dedup.claim("n1", "rust")
+        await run_dedup.close()
+
+        assert len(store.contents) == 1
+        (sidecar,) = (tmp_path / "data" / "xhs" / "jsonl").glob(f"*_{SOURCE_KEYWORDS_ITEM_TYPE}_*.jsonl")
+        lines = [json.loads(line) for line in sidecar.read_text(encoding="utf-8").splitlines()]
+        assert lines == [
+            {"content_id": "n1", "source_keyword": "python,golang"},
+            {"content_id": "n1", "source_keyword": "python,golang,rust"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_items_stored_outside_search_are_not_kept(self):
+        """Test that detail and creator mode items, which have no keyword, are not remembered"""
+        store = RecordingStore(upserts=True)
+        run_dedup = RunDedup("bili")
+        run_dedup.remember("v1", {"video_id": "v1", "source_keyword": ""}, store)
+        await run_dedup.claim("v1", "python")
+        await run_dedup.claim("v1", "golang")
+        assert store.keyword_updates == []
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_seen_id_index.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Unit tests for SeenIdIndex
+"""
+
+import csv
+import json
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from database import db_session
+from database.models import Base, XhsNote
+from store.seen_id_index import SeenIdIndex
+
+
+class TestSeenIdIndex:
+    """Test cases for the persistent seen ID index"""
+
+    @pytest.fixture(autouse=True)
+    def file_save_option(self, monkeypatch):
+        monkeypatch.setattr("config.SAVE_DATA_OPTION", "jsonl")
+
+    @staticmethod
+    def write_jsonl(path, items):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("".join(json.dumps(item) + "\n" for item in items), encoding="utf-8")
+
+    @pytest.mark.asyncio
+    async def test_seed_from_file_output(self, tmp_path):
+        """Test that the first load imports the IDs of previously saved json/jsonl/csv files"""
+        self.write_jsonl(tmp_path / "xhs" / "jsonl" / "search_contents_2025-01-01.jsonl", [{"note_id": "n1"}, {"note_id": "n2"}])
+        (tmp_path / "xhs" / "json").mkdir(parents=True)
+        (tmp_path / "xhs" / "json" / "search_comments_2025-01-01.json").write_text(
+            json.dumps([{"comment_id": "c1"}]), encoding="utf-8"
+        )
+        (tmp_path / "xhs" / "csv").mkdir(parents=True)
+        with open(tmp_path / "xhs" / "csv" / "search_contents_2025-01-02.csv", "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.DictWriter(f, fieldnames=["note_id", "title"])
+            writer.writeheader()
+            writer.writerow({"note_id": "n3", "title": "t"})
+
+        index = SeenIdIndex("xhs", base_dir=str(tmp_path))
+        await index.load()
+
+        assert all(index.has_content(note_id) for note_id in ("n1", "n2", "n3"))
+        assert index.has_comment("c1")
+        assert not index.has_content("n4")
+        assert sorted((tmp_path / "xhs" / ".seen" / "contents.ids").read_text().split()) == ["n1", "n2", "n3"]
+
+    @pytest.mark.asyncio
+    async def test_ids_persist_across_runs(self, tmp_path):
+        """Test that IDs recorded in one run are skipped by the next one"""
+        index = SeenIdIndex("douyin", base_dir=str(tmp_path))
+        await index.load()
+        await index.add_content(123)
+        await index.add_comment("c1")
+        await index.close()
+
+        next_run = SeenIdIndex("douyin", base_dir=str(tmp_path))
+        await next_run.load()
+        assert next_run.has_content("123")
+        assert next_run.has_comment("c1")
+
+    @pytest.mark.asyncio
+    async def test_index_file_is_append_only(self, tmp_path):
+        """Test that every ID is written once, whatever the number of flushes"""
+        index = SeenIdIndex("xhs", base_dir=str(tmp_path))
+        await index.load()
+        await index.add_content("n1")
+        await index.flush()
+        await index.add_content("n1")
+        await index.add_content("n2")
+        await index.flush()
+
+        assert (tmp_path / "xhs" / ".seen" / "contents.ids").read_text().split() == ["n1", "n2"]
+
+    @pytest.mark.asyncio
+    async def test_disabled_index(self, tmp_path):
+        """Test that a disabled index never matches and writes nothing"""
+        index = SeenIdIndex("xhs", enabled=False, base_dir=str(tmp_path))
+        await index.load()
+        await index.add_content("n1")
+        await index.close()
+
+        assert not index.has_content("n1")
+        assert not (tmp_path / "xhs").exists()
+
+    @pytest.mark.asyncio
+    async def test_not_recorded_before_load(self, tmp_path):
+        """Test that recording before load does not create an unseeded index file"""
+        index = SeenIdIndex("xhs", base_dir=str(tmp_path))
+        await index.add_content("n1")
+        await index.close()
+
+        assert not (tmp_path / "xhs" / ".seen").exists()
+
+    @pytest_asyncio.fixture
+    async def engine(self, tmp_path, monkeypatch):
+        """Create a SQLite engine used by get_session()"""
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        monkeypatch.setattr("config.SAVE_DATA_OPTION", "sqlite")
+        monkeypatch.setitem(db_session._engines, "sqlite", engine)
+        yield engine
+        await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_seed_from_database(self, engine, tmp_path):
+        """Test that the first load imports the IDs stored in the database"""
+        async with engine.begin() as conn:
+            await conn.execute(XhsNote.__table__.insert(), [{"note_id": "db1"}, {"note_id": "db2"}])
+
+        index = SeenIdIndex("xhs", base_dir=str(tmp_path))
+        await index.load()
+
+        assert index.has_content("db1")
+        assert index.has_content("db2")
+        assert not index.has_comment("db1")
@@ -4,16 +4,19 @@ Unit tests for Store Factory functionality
 """
 
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 
+from store.store_registry import StoreRegistry
 from store.xhs import XhsStoreFactory
 from store.xhs._store_impl import (
     XhsCsvStoreImplement,
     XhsJsonStoreImplement,
+    XhsJsonlStoreImplement,
     XhsDbStoreImplement,
     XhsSqliteStoreImplement,
     XhsMongoStoreImplement,
-    XhsExcelStoreImplement
+    XhsExcelStoreImplement,
+    XhsParquetStoreImplement
 )
 
 
@@ -31,6 +34,12 @@ class TestXhsStoreFactory:
         """Test creating JSON store"""
         store = XhsStoreFactory.create_store()
         assert isinstance(store, XhsJsonStoreImplement)
+
+    @patch('config.SAVE_DATA_OPTION', 'jsonl')
+    def test_create_jsonl_store(self):
+        """Test creating JSONL store"""
+        store = XhsStoreFactory.create_store()
+        assert isinstance(store, XhsJsonlStoreImplement)
     
     @patch('config.SAVE_DATA_OPTION', 'db')
     def test_create_db_store(self):
@@ -57,6 +66,12 @@ class TestXhsStoreFactory:
         store = XhsStoreFactory.create_store()
         assert isinstance(store, XhsExcelStoreImplement)
     
+    @patch('config.SAVE_DATA_OPTION', 'parquet')
+    def test_create_parquet_store(self):
+        """Test creating Parquet store"""
+        store = XhsStoreFactory.create_store()
+        assert isinstance(store, XhsParquetStoreImplement)
+    
     @patch('config.SAVE_DATA_OPTION', 'invalid')
     def test_invalid_store_option(self):
         """Test that invalid store option raises ValueError"""
@@ -67,9 +82,48 @@ class TestXhsStoreFactory:
     
     def test_all_stores_registered(self):
         """Test that all store types are registered"""
-        expected_stores = ['csv', 'json', 'db', 'sqlite', 'mongodb', 'excel']
+        expected_stores = ['csv', 'json', 'jsonl', 'db', 'sqlite', 'mongodb', 'excel', 'parquet']
         
         for store_type in expected_stores:
             assert store_type in XhsStoreFactory.STORES
         
         assert len(XhsStoreFactory.STORES) == len(expected_stores)
+
+
+class TestStoreRegistry:
+    """Test cases for the per-run store registry"""
+
+    @pytest.fixture(autouse=True)
+    def clear_registry(self):
+        """Clear registry state before and after each test"""
+        StoreRegistry._instances.clear()
+        yield
+        StoreRegistry._instances.clear()
+
+    @patch('config.SAVE_DATA_OPTION', 'json')
+    def test_get_store_reuses_instance(self):
+        """Test that the same store is returned for every record of a run"""
+        store = XhsStoreFactory.get_store()
+        assert isinstance(store, XhsJsonStoreImplement)
+        assert XhsStoreFactory.get_store() is store
+
+    def test_get_store_keyed_by_save_option(self):
+        """Test that each save option gets its own store"""
+        with patch('config.SAVE_DATA_OPTION', 'json'):
+            json_store = XhsStoreFactory.get_store()
+        with patch('config.SAVE_DATA_OPTION', 'csv'):
+            csv_store = XhsStoreFactory.get_store()
+        assert json_store is not csv_store
+        assert isinstance(csv_store, XhsCsvStoreImplement)
+
+    @pytest.mark.asyncio
+    @patch('config.SAVE_DATA_OPTION', 'json')
+    async def test_close_all(self):
+        """Test that close_all closes every store and empties the registry"""
+        store = XhsStoreFactory.get_store()
+        store.close = AsyncMock()
+
+        await StoreRegistry.close_all()
+
+        store.close.assert_awaited_once()
+        assert StoreRegistry._instances == {}
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_table_reader.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+Unit tests for the paginated table endpoint of the data API
+"""
+
+import json
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.routers import data_router
+from database import db_session
+from database.models import XhsNote
+
+
+class TestTableReader:
+    """Test cases for keyset pages of the crawler tables"""
+
+    @pytest_asyncio.fixture
+    async def client(self, tmp_path, monkeypatch):
+        """Serve the data router over a temporary sqlite database holding 25 notes"""
+        monkeypatch.setattr("config.SAVE_DATA_OPTION", "sqlite")
+        monkeypatch.setitem(db_session.sqlite_db_config, "db_path", str(tmp_path / "test.db"))
+        await db_session.dispose_engines()
+        await db_session.create_tables("sqlite")
+        async with db_session.get_session() as session:
+            for i in range(25):
+                session.add(XhsNote(
+                    note_id=f"note{i}",
+                    user_id=f"user{i % 2}",
+                    time=str(1700000000000 + i),
+                    source_keyword="旅游,美食" if i % 5 == 0 else "美食",
+                ))
+        app = FastAPI()
+        app.include_router(data_router, prefix="/api")
+        with TestClient(app) as client:
+            yield client
+        await db_session.dispose_engines()
+
+    def test_keyset_pages(self, client):
+        """Test that following next_cursor walks every row once"""
+        note_ids = []
+        cursor = None
+        while True:
+            params = {"limit": 10, "columns": "note_id"}
+            if cursor is not None:
+                params["cursor"] = cursor
+            page = client.get("/api/data/tables/xhs_note", params=params).json()
+            assert page["columns"] == ["note_id"]
+            note_ids += [row["note_id"] for row in page["data"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert note_ids == [f"note{i}" for i in range(25)]
+
+    def test_filters_and_order(self, client):
+        """Test column, time and comma joined keyword filters"""
+        page = client.get("/api/data/tables/xhs_note", params={
+            "columns": "note_id,source_keyword",
+            "source_keyword": "旅游",
+            "user_id": "user0",
+            "time_from": str(1700000000000 + 5),
+            "order": "desc",
+        }).json()
+        assert [row["note_id"] for row in page["data"]] == ["note20", "note10"]
+        assert page["next_cursor"] is None
+
+    def test_invalid_queries(self, client):
+        """Test that unknown tables and columns and unindexed filters are rejected"""
+        assert client.get("/api/data/tables/missing").status_code == 400
+        assert client.get("/api/data/tables/xhs_note", params={"columns": "nope"}).status_code == 400
+        response = client.get("/api/data/tables/xhs_note", params={"title": "x"})
+        assert response.status_code == 400
+        assert "not filterable" in response.json()["detail"]
+
+    @pytest.mark.asyncio
+    async def test_database_error_status(self, client, tmp_path, monkeypatch):
+        """Test that a failing query gets an error status instead of an empty 200"""
+        empty_db = tmp_path / "empty.db"
+        empty_db.touch()
+        monkeypatch.setitem(db_session.sqlite_db_config, "db_path", str(empty_db))
+        await db_session.dispose_engines()
+
+        response = client.get("/api/data/tables/xhs_note")
+        assert response.status_code == 500
+        assert "xhs_note" in response.json()["detail"]
+
+    def test_list_tables(self, client):
+        """Test that tables are listed with their filterable columns"""
+        tables = {table["name"]: table for table in client.get("/api/data/tables").json()["tables"]}
+        assert {"note_id", "source_keyword", "user_id"} <= set(tables["xhs_note"]["filter_columns"])
+        assert tables["xhs_note"]["time_column"] == "time"
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tests/test_worker_pool.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+"""
+Unit tests for the worker pool of the data API
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from api.routers import data as data_router
+from api.services.worker_pool import DataTaskTimeout, run_blocking
+from tools.task_cancel import TaskCancelled, check_cancelled
+
+
+def slow_scan(stopped: threading.Event, seconds: float = 5.0):
+    """Blocking loop checking for cancellation like the file scans do"""
+    deadline = time.monotonic() + seconds
+    try:
+        while time.monotonic() < deadline:
+            check_cancelled()
+            time.sleep(0.01)
+        return "done"
+    except TaskCancelled:
+        stopped.set()
+        raise
+
+
+class TestWorkerPool:
+    """Test cases for blocking data work run off the event loop"""
+
+    @pytest.mark.asyncio
+    async def test_event_loop_stays_responsive(self):
+        """Test that the loop keeps running other coroutines while a worker blocks"""
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        result = await run_blocking(slow_scan, threading.Event(), 0.3, timeout=5)
+        task.cancel()
+        assert result == "done"
+        assert ticks >= 10
+
+    @pytest.mark.asyncio
+    async def test_timeout_cancels_worker(self):
+        """Test that a timed out task is told to stop"""
+        stopped = threading.Event()
+        with pytest.raises(DataTaskTimeout):
+            await run_blocking(slow_scan, stopped, timeout=0.2)
+        assert stopped.wait(1)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_request_cancels_worker(self):
+        """Test that cancelling the awaiting request stops the worker"""
+        stopped = threading.Event()
+        task = asyncio.create_task(run_blocking(slow_scan, stopped, timeout=5))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert stopped.wait(1)
+
+    @pytest.mark.asyncio
+    async def test_preview_timeout_returns_504(self, tmp_path, monkeypatch):
+        """Test that a preview exceeding DATA_API_TIMEOUT_SEC is answered with 504"""
+        monkeypatch.setattr(data_router, "DATA_DIR", tmp_path)
+        monkeypatch.setattr("config.DATA_API_TIMEOUT_SEC", 0.2)
+        monkeypatch.setattr(data_router, "preview_file", lambda *args: slow_scan(threading.Event()))
+        (tmp_path / "comments.jsonl").write_text('{"a": 1}\n', encoding="utf-8")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await data_router.get_file_content("comments.jsonl")
+        assert exc_info.value.status_code == 504
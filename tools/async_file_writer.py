@@ -18,20 +18,155 @@
 
 import asyncio
 import csv
+import io
 import json
 import os
 import pathlib
-from typing import Dict, List
+import time
+from typing import Dict, List, Optional
 import aiofiles
 import config
+from tools.file_metadata_index import current_signature, record_appended, record_written
 from tools.utils import utils
 from tools.words import AsyncWordCloudGenerator
 
+
+class BufferedCsvWriter:
+    """
+    Keep one CSV file open for the whole run and write rows in batches
+    The header is fixed once, by the existing file header when appending, otherwise by the first row
+    """
+
+    def __init__(self, file_path: str, batch_size: int, flush_interval: float):
+        self.file_path = file_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.lock = asyncio.Lock()
+        self._file = None
+        self._fieldnames: Optional[List[str]] = None
+        self._header_pending = False
+        self._rows: List[Dict] = []
+        self._last_flush_time = time.monotonic()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def _open(self, first_item: Dict):
+        header = None
+        if os.path.exists(self.file_path) and os.path.getsize(self.file_path) > 0:
+            async with aiofiles.open(self.file_path, 'r', newline='', encoding='utf-8-sig') as f:
+                header = next(csv.reader([await f.readline()]), None)
+        self._fieldnames = header or list(first_item.keys())
+        self._header_pending = not header
+        self._file = await aiofiles.open(self.file_path, 'a', newline='', encoding='utf-8-sig')
+
+    async def write(self, item: Dict):
+        async with self.lock:
+            if self._file is None:
+                await self._open(item)
+            self._rows.append(item)
+            if len(self._rows) >= self.batch_size or time.monotonic() - self._last_flush_time >= self.flush_interval:
+                await self._flush()
+            elif self._flush_task is None or self._flush_task.done():
+                self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        """Flush the rows of a file no write came to once the flush interval has passed"""
+        while True:
+            await asyncio.sleep(max(self.flush_interval - (time.monotonic() - self._last_flush_time), 0))
+            async with self.lock:
+                if not self._rows:
+                    return
+                if time.monotonic() - self._last_flush_time < self.flush_interval:
+                    continue
+                try:
+                    await self._flush()
+                except Exception as e:
+                    utils.logger.error(f"[BufferedCsvWriter._flush_later] Failed to flush {self.file_path}: {e}")
+                    return
+
+    async def _flush(self):
+        self._last_flush_time = time.monotonic()
+        if self._flush_task is not None and self._flush_task is not asyncio.current_task():
+            self._flush_task.cancel()
+            self._flush_task = None
+        if self._file is None or not self._rows:
+            return
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=self._fieldnames, restval='', extrasaction='ignore')
+        if self._header_pending:
+            writer.writeheader()
+            self._header_pending = False
+        writer.writerows(self._rows)
+        added = len(self._rows)
+        self._rows.clear()
+        signature_before = await asyncio.to_thread(current_signature, self.file_path)
+        await self._file.write(buffer.getvalue())
+        await self._file.flush()
+        # The index is a sqlite file shared with the API process, its lock must not stall the event loop
+        await asyncio.to_thread(record_appended, self.file_path, added, signature_before)
+
+    async def flush(self):
+        async with self.lock:
+            await self._flush()
+
+    async def close(self):
+        async with self.lock:
+            await self._flush()
+            if self._file is not None:
+                await self._file.close()
+                self._file = None
+
+
+class RecordCountBatch:
+    """
+    Records appended to one file since its count in the file metadata index was last updated
+    The index is updated in a worker thread once per batch rather than on every append
+    """
+
+    def __init__(self, file_path: str, batch_size: int, flush_interval: float):
+        self.file_path = file_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # Held across an append and its count, so that a batch always matches the file content
+        self.lock = asyncio.Lock()
+        self._added = 0
+        self._signature_before = None
+        self._last_flush_time = time.monotonic()
+
+    async def before_append(self):
+        """Remember the file signature before the first append of a batch, call with lock held"""
+        if not self._added:
+            self._signature_before = await asyncio.to_thread(current_signature, self.file_path)
+
+    async def appended(self, added: int):
+        """Count appended records, updating the index once the batch is full, call with lock held"""
+        self._added += added
+        if self._added >= self.batch_size or time.monotonic() - self._last_flush_time >= self.flush_interval:
+            await self._flush()
+
+    async def _flush(self):
+        self._last_flush_time = time.monotonic()
+        if not self._added:
+            return
+        added, self._added = self._added, 0
+        await asyncio.to_thread(record_appended, self.file_path, added, self._signature_before)
+
+    async def flush(self):
+        async with self.lock:
+            await self._flush()
+
+
 class AsyncFileWriter:
+    # One buffered writer per csv file, shared by all AsyncFileWriter instances
+    _csv_writers: Dict[str, BufferedCsvWriter] = {}
+    # Pending record counts per jsonl file (absolute path), shared by all AsyncFileWriter instances
+    _record_counts: Dict[str, RecordCountBatch] = {}
+
     def __init__(self, platform: str, crawler_type: str):
         self.lock = asyncio.Lock()
         self.platform = platform
         self.crawler_type = crawler_type
+        self._csv_file_paths = set()
+        self._jsonl_file_paths = set()
         self.wordcloud_generator = AsyncWordCloudGenerator() if config.ENABLE_GET_WORDCLOUD else None
 
     def _get_file_path(self, file_type: str, item_type: str) -> str:
@@ -40,15 +175,69 @@ class AsyncFileWriter:
         file_name = f"{self.crawler_type}_{item_type}_{utils.get_current_date()}.{file_type}"
         return f"{base_path}/{file_name}"
 
+    @classmethod
+    def _get_csv_writer(cls, file_path: str) -> BufferedCsvWriter:
+        writer = cls._csv_writers.get(file_path)
+        if writer is None:
+            writer = BufferedCsvWriter(
+                file_path,
+                batch_size=config.CSV_FLUSH_BATCH_SIZE,
+                flush_interval=config.CSV_FLUSH_INTERVAL_SEC,
+            )
+            cls._csv_writers[file_path] = writer
+        return writer
+
+    @classmethod
+    def _get_record_count_batch(cls, file_path: str) -> RecordCountBatch:
+        key = os.path.abspath(file_path)
+        batch = cls._record_counts.get(key)
+        if batch is None:
+            batch = RecordCountBatch(
+                file_path,
+                batch_size=config.CSV_FLUSH_BATCH_SIZE,
+                flush_interval=config.CSV_FLUSH_INTERVAL_SEC,
+            )
+            cls._record_counts[key] = batch
+        return batch
+
+    @classmethod
+    async def close_all(cls):
+        """
+        Flush buffered rows and close all open csv files, then write the pending jsonl record counts
+        Should be called at the end of crawler execution
+        """
+        writers = list(cls._csv_writers.items())
+        cls._csv_writers.clear()
+        for file_path, writer in writers:
+            try:
+                await writer.close()
+            except Exception as e:
+                utils.logger.error(f"[AsyncFileWriter.close_all] Error closing {file_path}: {e}")
+        batches = list(cls._record_counts.values())
+        cls._record_counts.clear()
+        for batch in batches:
+            await batch.flush()
+
     async def write_to_csv(self, item: Dict, item_type: str):
         file_path = self._get_file_path('csv', item_type)
-        async with self.lock:
-            file_exists = os.path.exists(file_path)
-            async with aiofiles.open(file_path, 'a', newline='', encoding='utf-8-sig') as f:
-                writer = csv.DictWriter(f, fieldnames=item.keys())
-                if not file_exists or await f.tell() == 0:
-                    await writer.writeheader()
-                await writer.writerow(item)
+        self._csv_file_paths.add(file_path)
+        await self._get_csv_writer(file_path).write(item)
+
+    async def close(self):
+        """
+        Flush buffered rows and close the csv files written by this writer,
+        then write the pending record counts of its jsonl files
+        """
+        for file_path in self._csv_file_paths:
+            writer = self._csv_writers.pop(file_path, None)
+            if writer is not None:
+                await writer.close()
+        self._csv_file_paths.clear()
+        for file_path in self._jsonl_file_paths:
+            batch = self._record_counts.pop(os.path.abspath(file_path), None)
+            if batch is not None:
+                await batch.flush()
+        self._jsonl_file_paths.clear()
 
     async def write_single_item_to_json(self, item: Dict, item_type: str):
         file_path = self._get_file_path('json', item_type)
@@ -69,6 +258,107 @@ class AsyncFileWriter:
 
             async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
                 await f.write(json.dumps(existing_data, ensure_ascii=False, indent=4))
+            await asyncio.to_thread(record_written, file_path, len(existing_data))
+
+    async def write_single_item_to_jsonl(self, item: Dict, item_type: str):
+        """
+        Append a single item as one line of JSON Lines
+        Unlike write_single_item_to_json, the existing file is never read back, so every write is O(1)
+        """
+        file_path = self._get_file_path('jsonl', item_type)
+        line = json.dumps(item, ensure_ascii=False) + "\n"
+        self._jsonl_file_paths.add(file_path)
+        record_counts = self._get_record_count_batch(file_path)
+        async with record_counts.lock:
+            await record_counts.before_append()
+            async with aiofiles.open(file_path, 'a', encoding='utf-8') as f:
+                await f.write(line)
+            await record_counts.appended(1)
+
+    async def read_items(self, item_type: str) -> List[Dict]:
+        """
+        Read back all items of the given type written today
+        The JSON Lines file is preferred, falling back to the legacy JSON array file
+        """
+        jsonl_file_path = self._get_file_path('jsonl', item_type)
+        if os.path.exists(jsonl_file_path) and os.path.getsize(jsonl_file_path) > 0:
+            items = []
+            async with aiofiles.open(jsonl_file_path, 'r', encoding='utf-8') as f:
+                async for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        items.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # A crash can leave a truncated last line behind, skip it
+                        utils.logger.warning(f"[AsyncFileWriter.read_items] Skip broken line in {jsonl_file_path}")
+            return items
+
+        json_file_path = self._get_file_path('json', item_type)
+        if not os.path.exists(json_file_path) or os.path.getsize(json_file_path) == 0:
+            return []
+        async with aiofiles.open(json_file_path, 'r', encoding='utf-8') as f:
+            content = await f.read()
+        if not content:
+            return []
+        data = json.loads(content)
+        return data if isinstance(data, list) else [data]
+
+    async def convert_jsonl_to_json(self, item_type: str) -> Optional[str]:
+        """
+        Export today's JSON Lines file of the given type as a legacy pretty-printed JSON array
+        The output has the same path and layout as write_single_item_to_json, any existing file there is replaced
+        :return: the written json file path, None if there is nothing to convert
+        """
+        jsonl_file_path = self._get_file_path('jsonl', item_type)
+        if not os.path.exists(jsonl_file_path):
+            return None
+
+        json_file_path = self._get_file_path('json', item_type)
+        tmp_file_path = f"{json_file_path}.tmp"
+        count = 0
+        async with self.lock:
+            async with aiofiles.open(jsonl_file_path, 'r', encoding='utf-8') as src, \
+                    aiofiles.open(tmp_file_path, 'w', encoding='utf-8') as dst:
+                await dst.write("[")
+                async for line in src:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        item = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    # Stream item by item, output matches json.dumps(items, indent=4)
+                    item_text = json.dumps(item, ensure_ascii=False, indent=4).replace("\n", "\n    ")
+                    await dst.write(("," if count else "") + "\n    " + item_text)
+                    count += 1
+                await dst.write("\n]" if count else "]")
+            os.replace(tmp_file_path, json_file_path)
+            await asyncio.to_thread(record_written, json_file_path, count)
+
+        utils.logger.info(f"[AsyncFileWriter.convert_jsonl_to_json] Exported {count} items to {json_file_path}")
+        return json_file_path
+
+    async def finalize_jsonl(self) -> List[str]:
+        """
+        Convert all of today's JSON Lines files of this crawler type to legacy JSON array files
+        :return: the written json file paths
+        """
+        jsonl_base_path = pathlib.Path(f"data/{self.platform}/jsonl")
+        if not jsonl_base_path.exists():
+            return []
+
+        prefix = f"{self.crawler_type}_"
+        suffix = f"_{utils.get_current_date()}.jsonl"
+        written = []
+        for file_path in sorted(jsonl_base_path.glob(f"{prefix}*{suffix}")):
+            item_type = file_path.name[len(prefix):-len(suffix)]
+            json_file_path = await self.convert_jsonl_to_json(item_type)
+            if json_file_path:
+                written.append(json_file_path)
+        return written
 
     async def generate_wordcloud_from_comments(self):
         """
@@ -82,22 +372,12 @@ class AsyncFileWriter:
             return
 
         try:
-            # Read comments from JSON file
-            comments_file_path = self._get_file_path('json', 'comments')
-            if not os.path.exists(comments_file_path) or os.path.getsize(comments_file_path) == 0:
-                utils.logger.info(f"[AsyncFileWriter.generate_wordcloud_from_comments] No comments file found at {comments_file_path}")
+            # Read comments from JSONL or JSON file
+            comments_data = await self.read_items('comments')
+            if not comments_data:
+                utils.logger.info(f"[AsyncFileWriter.generate_wordcloud_from_comments] No comments found for {self.platform}/{self.crawler_type}")
                 return
 
-            async with aiofiles.open(comments_file_path, 'r', encoding='utf-8') as f:
-                content = await f.read()
-                if not content:
-                    utils.logger.info(f"[AsyncFileWriter.generate_wordcloud_from_comments] Comments file is empty")
-                    return
-
-                comments_data = json.loads(content)
-                if not isinstance(comments_data, list):
-                    comments_data = [comments_data]
-
             # Filter comments data to only include 'content' field
             # Handle different comment data structures across platforms
             filtered_data = []
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tools/comment_watermark.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Comment Watermarks
+Newest first-level comment (id and creation time) fetched per note, kept in the append-only file
+data/<platform>/.watermark/comments.jsonl, so revisiting a note only keeps the comments posted since
+the previous run, and stops paging at them where the pages come newest first
+"""
+
+import json
+import pathlib
+from typing import Dict, List, Optional, Set, Tuple
+
+import aiofiles
+
+import config
+from tools import utils
+
+# platform -> (comment id field, comment creation time field) of the raw API comments
+COMMENT_WATERMARK_FIELDS: Dict[str, Tuple[str, str]] = {
+    "xhs": ("id", "create_time"),
+    "douyin": ("cid", "create_time"),
+    "bili": ("rpid", "ctime"),
+}
+# Platforms whose comment pages are requested newest first, the others (xhs, douyin) come in hot order
+# where an old comment may precede new ones, so their paging never stops early at the watermark
+COMMENT_NEWEST_FIRST_PLATFORMS = {"bili"}
+
+
+class CommentWatermarks:
+    """
+    Comment watermarks of one platform
+    A note's watermark only moves once its comment paging finished, an interrupted note is paged again in full
+    """
+
+    def __init__(self, platform: str, enabled: bool = True, base_dir: str = "data"):
+        """
+        Args:
+            platform: Platform name (xhs, douyin, bili)
+            enabled: When False every comment is new and nothing is recorded
+            base_dir: Root data directory
+        """
+        self.platform = platform
+        self.enabled = enabled
+        self.id_field, self.time_field = COMMENT_WATERMARK_FIELDS[platform]
+        self.newest_first = platform in COMMENT_NEWEST_FIRST_PLATFORMS
+        self.path = pathlib.Path(base_dir) / platform / ".watermark" / "comments.jsonl"
+        self._watermarks: Dict[str, Dict] = {}
+        # note id -> newest comment fetched by the paging in progress
+        self._pending: Dict[str, Dict] = {}
+        # note ids whose paging in progress went through the last page
+        self._finished: Set[str] = set()
+        if enabled:
+            self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A line cut short by a crash, the note is simply paged in full again
+                    continue
+                self._watermarks[record["note_id"]] = record
+        utils.logger.info(f"[CommentWatermarks] {self.platform}: loaded watermarks of {len(self._watermarks)} notes")
+
+    def get(self, note_id: str) -> Optional[Dict]:
+        """
+        Newest comment fetched for the note by previous runs, {"comment_id": ..., "create_time": ...}
+        """
+        return self._watermarks.get(str(note_id)) if self.enabled else None
+
+    def new_comments(self, note_id: str, comments: List[Dict]) -> Tuple[List[Dict], bool]:
+        """
+        Split a page of first-level comments at the note's watermark
+        Newest first pages may start with pinned or hot comments, so paging stops on the page holding the
+        watermark comment itself or on a page without any new comment. Pages in hot order never reach it
+        Args:
+            note_id: Note ID
+            comments: One page of raw first-level comments
+
+        Returns:
+            The comments newer than the watermark, and whether paging can stop
+        """
+        watermark = self.get(note_id)
+        if not watermark:
+            return comments, False
+        new_comments = []
+        reached = False
+        for comment in comments:
+            if str(comment.get(self.id_field)) == watermark["comment_id"]:
+                reached = True
+            elif int(comment.get(self.time_field) or 0) > watermark["create_time"]:
+                new_comments.append(comment)
+        if not self.newest_first:
+            return new_comments, False
+        return new_comments, reached or not new_comments
+
+    def observe(self, note_id: str, comments: List[Dict]):
+        """
+        Remember the newest of the first-level comments fetched for the note
+        """
+        if not self.enabled:
+            return
+        note_id = str(note_id)
+        newest = self._pending.get(note_id)
+        for comment in comments:
+            create_time = int(comment.get(self.time_field) or 0)
+            if newest is None or create_time > newest["create_time"]:
+                newest = {"note_id": note_id, "comment_id": str(comment.get(self.id_field)), "create_time": create_time}
+        if newest is not None:
+            self._pending[note_id] = newest
+
+    def finish_paging(self, note_id: str):
+        """
+        Mark that the note's paging went through its last page, without being cut by max_count
+        """
+        if self.enabled:
+            self._finished.add(str(note_id))
+
+    async def commit(self, note_id: str):
+        """
+        Move the note's watermark to the newest comment fetched, once its comment paging has finished
+        Pages in hot order only move it when they were paged to the end, comments older than the newest
+        one fetched may otherwise not have been fetched yet
+        """
+        note_id = str(note_id)
+        newest = self._pending.pop(note_id, None)
+        finished = note_id in self._finished
+        self._finished.discard(note_id)
+        if newest is None:
+            return
+        if not self.newest_first and not finished:
+            utils.logger.info(f"[CommentWatermarks] {self.platform}: comments of {note_id} not paged to the end, keep its watermark")
+            return
+        self._watermarks[newest["note_id"]] = newest
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        async with aiofiles.open(self.path, "a", encoding="utf-8") as f:
+            await f.write(json.dumps(newest, ensure_ascii=False) + "\n")
+
+
+# platform -> watermarks shared by the whole run
+_watermarks: Dict[str, CommentWatermarks] = {}
+
+
+def get_comment_watermarks(platform: str) -> CommentWatermarks:
+    """
+    Get the comment watermarks of a platform, disabled when ENABLE_INCREMENTAL_COMMENTS is off
+    """
+    watermarks = _watermarks.get(platform)
+    if watermarks is None:
+        watermarks = CommentWatermarks(platform, enabled=config.ENABLE_INCREMENTAL_COMMENTS)
+        _watermarks[platform] = watermarks
+    return watermarks
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tools/crawl_checkpoint.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Crawl Checkpoint
+Records the progress of a run (last completed search page and search id per keyword, comment
+cursors of in-flight notes) in data/<platform>/.checkpoint/<crawler_type>.json so that a
+crashed run started again with --resume continues where it stopped
+"""
+
+import asyncio
+import json
+import os
+import pathlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiofiles
+
+import config
+from tools import utils
+from var import crawler_type_var
+
+
+class CrawlCheckpoint:
+    """
+    Progress of one platform and crawler type
+    The state is rewritten atomically after every completed page or comment page, a crash
+    therefore loses at most the page in progress
+    """
+
+    def __init__(self, platform: str, crawler_type: str, resume: bool = False, base_dir: str = "data"):
+        """
+        Args:
+            platform: Platform name (xhs, douyin, bili, etc.)
+            crawler_type: search | detail | creator
+            resume: Load the checkpoint left by the previous run instead of starting over
+            base_dir: Root data directory
+        """
+        self.platform = platform
+        self.crawler_type = crawler_type
+        self.path = pathlib.Path(base_dir) / platform / ".checkpoint" / f"{crawler_type}.json"
+        self._state: Dict[str, Any] = {"keywords": {}, "comment_cursors": {}}
+        self._lock = asyncio.Lock()
+        if resume:
+            self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            utils.logger.info(f"[CrawlCheckpoint] No checkpoint found at {self.path}, starting from scratch")
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            utils.logger.error(f"[CrawlCheckpoint] Ignore unreadable checkpoint {self.path}: {e}")
+            return
+        self._state["keywords"] = state.get("keywords", {})
+        self._state["comment_cursors"] = state.get("comment_cursors", {})
+        utils.logger.info(
+            f"[CrawlCheckpoint] Resuming {self.platform}/{self.crawler_type}: "
+            f"{len(self._state['keywords'])} keywords, {len(self._state['comment_cursors'])} in-flight comment cursors"
+        )
+
+    def _keyword_state(self, keyword: str) -> Dict[str, Any]:
+        return self._state["keywords"].get(keyword, {})
+
+    def is_keyword_done(self, keyword: str) -> bool:
+        return self._keyword_state(keyword).get("done", False)
+
+    def resume_page(self, keyword: str, page: int) -> int:
+        """
+        First page to crawl for a keyword, the page after the last completed one when resuming
+        """
+        completed_page = self._keyword_state(keyword).get("page")
+        return page if completed_page is None else max(page, completed_page + 1)
+
+    def search_id(self, keyword: str, default: str = "") -> str:
+        """
+        Search session id recorded with the last completed page, so pagination continues in the same session
+        """
+        return self._keyword_state(keyword).get("search_id") or default
+
+    def pending_ids(self, keyword: str) -> List[str]:
+        """
+        IDs collected on completed pages whose follow-up work (e.g. comments) has not run yet
+        """
+        return list(self._keyword_state(keyword).get("pending_ids", []))
+
+    async def complete_page(self, keyword: str, page: int, search_id: Optional[str] = None,
+                            pending_ids: Optional[List[str]] = None):
+        """
+        Record that a search page and the work on its results are finished
+        """
+        keyword_state = self._state["keywords"].setdefault(keyword, {})
+        keyword_state["page"] = page
+        if search_id is not None:
+            keyword_state["search_id"] = search_id
+        if pending_ids is not None:
+            keyword_state["pending_ids"] = list(pending_ids)
+        await self.save()
+
+    async def complete_keyword(self, keyword: str):
+        self._state["keywords"].setdefault(keyword, {}).update({"done": True, "pending_ids": []})
+        await self.save()
+
+    def comment_cursor(self, note_id: str, default: str = "") -> str:
+        """
+        Cursor of the next comment page of a note interrupted by the previous run
+        """
+        return self._state["comment_cursors"].get(str(note_id), default)
+
+    async def update_comment_cursor(self, note_id: str, cursor: str):
+        self._state["comment_cursors"][str(note_id)] = cursor
+        await self.save()
+
+    async def complete_comments(self, note_id: str):
+        if self._state["comment_cursors"].pop(str(note_id), None) is not None:
+            await self.save()
+
+    async def save(self):
+        """
+        Atomically rewrite the checkpoint file
+        """
+        async with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".json.tmp")
+            async with aiofiles.open(tmp_path, "w", encoding="utf-8") as f:
+                await f.write(json.dumps(self._state, ensure_ascii=False))
+            os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """
+        Remove the checkpoint file once the run has finished
+        """
+        if self.path.exists():
+            self.path.unlink()
+
+
+# (platform, crawler type) -> checkpoint of the current run
+_checkpoints: Dict[Tuple[str, str], CrawlCheckpoint] = {}
+
+
+def get_crawl_checkpoint(platform: str) -> CrawlCheckpoint:
+    """
+    Get the checkpoint of the current run, loading the previous one when RESUME_FROM_CHECKPOINT is set
+    """
+    key = (platform, crawler_type_var.get())
+    checkpoint = _checkpoints.get(key)
+    if checkpoint is None:
+        checkpoint = CrawlCheckpoint(platform, key[1], resume=config.RESUME_FROM_CHECKPOINT)
+        _checkpoints[key] = checkpoint
+    return checkpoint
+
+
+def clear_crawl_checkpoints():
+    """
+    Drop the checkpoints of a run that finished normally, the next run starts from scratch
+    """
+    checkpoints = list(_checkpoints.values())
+    _checkpoints.clear()
+    for checkpoint in checkpoints:
+        checkpoint.clear()
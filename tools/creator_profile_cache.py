@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tools/creator_profile_cache.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Creator Profile Cache
+Parsed creator profiles kept for CREATOR_PROFILE_CACHE_TTL_SEC in a persistent cache (disk or Redis),
+so a creator met again in the same or a later run costs neither a request nor a page parse
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import config
+from cache.abs_cache import AbstractCache
+from cache.cache_factory import CacheFactory
+from tools import utils
+
+_profile_cache: Optional[AbstractCache] = None
+
+
+def creator_profile_key(platform: str, creator_id: str) -> str:
+    return f"creator:{platform}:{creator_id}"
+
+
+def get_creator_profile_cache() -> Optional[AbstractCache]:
+    """
+    Get the cache shared by the run, None when ENABLE_CREATOR_PROFILE_CACHE is off
+    """
+    global _profile_cache
+    if not config.ENABLE_CREATOR_PROFILE_CACHE:
+        return None
+    if _profile_cache is None:
+        _profile_cache = CacheFactory.create_cache(config.CREATOR_PROFILE_CACHE_TYPE)
+    return _profile_cache
+
+
+async def get_cached_creator_profile(
+    platform: str,
+    creator_id: str,
+    fetch: Callable[[], Awaitable[Optional[Dict]]],
+) -> Optional[Dict]:
+    """
+    Get a creator profile from the cache, calling fetch and caching its result on a miss
+    Args:
+        platform: Platform name (xhs, douyin, bili, etc.)
+        creator_id: Creator ID on the platform
+        fetch: Requests and parses the profile, returns a JSON serializable dict
+
+    Returns:
+        The profile, None when fetch found nothing (empty results are not cached)
+    """
+    cache = get_creator_profile_cache()
+    if cache is None or not creator_id:
+        return await fetch()
+    key = creator_profile_key(platform, creator_id)
+    profile: Any = await cache.aget(key)
+    if profile is not None:
+        utils.logger.info(f"[CreatorProfileCache] Use cached profile of {platform} creator {creator_id}")
+        return profile
+    profile = await fetch()
+    if profile:
+        await cache.aset(key, profile, config.CREATOR_PROFILE_CACHE_TTL_SEC)
+    return profile
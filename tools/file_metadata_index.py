@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tools/file_metadata_index.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+File Metadata Index
+Record counts of the files under data/, keyed by path and valid only for the size and mtime they
+were computed at. The file writers keep the counts of the files they append to up to date, so
+listing the data directory only needs a stat per file
+"""
+
+import os
+import pathlib
+import sqlite3
+import threading
+from typing import Dict, Optional, Tuple
+
+from tools import utils
+
+INDEX_FILE_NAME = ".file_index.sqlite3"
+
+
+def file_signature(file_path: pathlib.Path) -> Tuple[int, int]:
+    """
+    (size, mtime in nanoseconds) identifying the current content of a file
+    """
+    stat = file_path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+class FileMetadataIndex:
+    """
+    SQLite table of (path, size, mtime_ns, record_count), shared by the crawler and the WebUI API processes
+    """
+
+    def __init__(self, data_dir: str = "data"):
+        """
+        Args:
+            data_dir: Root data directory, paths are stored relative to it
+        """
+        self.data_dir = pathlib.Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.data_dir / INDEX_FILE_NAME), timeout=5, check_same_thread=False)
+        # The connection is shared by the worker threads of the data API
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Losing the last updates on a power cut only costs a recount
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, record_count INTEGER NOT NULL)"
+            )
+
+    def _key(self, file_path: pathlib.Path) -> str:
+        file_path = pathlib.Path(file_path)
+        try:
+            return file_path.relative_to(self.data_dir).as_posix()
+        except ValueError:
+            return file_path.resolve().relative_to(self.data_dir.resolve()).as_posix()
+
+    def get_record_count(self, file_path: pathlib.Path, signature: Tuple[int, int]) -> Optional[int]:
+        """
+        Cached record count of the file, None when unknown or computed for another version of the file
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, record_count FROM files WHERE path = ?", (self._key(file_path),)
+            ).fetchone()
+        if row is None or (row[0], row[1]) != signature:
+            return None
+        return row[2]
+
+    def set_record_count(self, file_path: pathlib.Path, record_count: int, signature: Optional[Tuple[int, int]] = None):
+        """
+        Store the record count of the file as it is now (or at the given signature)
+        """
+        size, mtime_ns = signature or file_signature(pathlib.Path(file_path))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (path, size, mtime_ns, record_count) VALUES (?, ?, ?, ?)",
+                (self._key(file_path), size, mtime_ns, record_count),
+            )
+
+    def add_records(self, file_path: pathlib.Path, added: int, signature_before: Optional[Tuple[int, int]]):
+        """
+        Update the count after appending records to a file
+        Args:
+            file_path: The file appended to
+            added: Number of records appended
+            signature_before: Signature of the file before the append, None when it did not exist
+        """
+        if signature_before is None or signature_before[0] == 0:
+            previous = 0
+        else:
+            previous = self.get_record_count(file_path, signature_before)
+            if previous is None:
+                # Not indexed yet, the listing counts it once on its next visit
+                return
+        self.set_record_count(file_path, previous + added)
+
+    def remove_missing(self):
+        """
+        Drop the entries of files deleted since they were indexed
+        """
+        with self._lock:
+            paths = [row[0] for row in self._conn.execute("SELECT path FROM files")]
+        missing = [(path,) for path in paths if not (self.data_dir / path).exists()]
+        if missing:
+            with self._lock, self._conn:
+                self._conn.executemany("DELETE FROM files WHERE path = ?", missing)
+
+    def close(self):
+        self._conn.close()
+
+
+# resolved data directory -> index
+_indexes: Dict[str, FileMetadataIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_file_metadata_index(data_dir: str = "data") -> FileMetadataIndex:
+    """
+    Get the metadata index of a data directory, shared by the whole process
+    """
+    key = os.path.abspath(data_dir)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = FileMetadataIndex(data_dir)
+            _indexes[key] = index
+    return index
+
+
+def record_appended(file_path: str, added: int, signature_before: Optional[Tuple[int, int]], data_dir: str = "data"):
+    """
+    Keep the index current after a writer appended records, never failing the write itself
+    """
+    try:
+        get_file_metadata_index(data_dir).add_records(pathlib.Path(file_path), added, signature_before)
+    except (sqlite3.Error, OSError, ValueError) as e:
+        utils.logger.warning(f"[FileMetadataIndex] Skip updating the record count of {file_path}: {e}")
+
+
+def record_written(file_path: str, record_count: int, data_dir: str = "data"):
+    """
+    Keep the index current after a writer rewrote a whole file
+    """
+    try:
+        get_file_metadata_index(data_dir).set_record_count(pathlib.Path(file_path), record_count)
+    except (sqlite3.Error, OSError, ValueError) as e:
+        utils.logger.warning(f"[FileMetadataIndex] Skip updating the record count of {file_path}: {e}")
+
+
+def current_signature(file_path: str) -> Optional[Tuple[int, int]]:
+    """
+    Signature of a file about to be appended to, None when it does not exist yet
+    """
+    try:
+        return file_signature(pathlib.Path(file_path))
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tools/row_offset_index.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Row Offset Index
+Byte offset of every ROW_INDEX_STRIDE-th record of a JSONL or CSV output, kept in a sidecar file
+under a hidden .row_index directory next to it. Reading record N seeks to the closest indexed offset
+and skips fewer than ROW_INDEX_STRIDE records, so a deep page costs the same as the first one.
+The index is built on first use and extended from where it stopped when the writers append
+"""
+
+import json
+import os
+import pathlib
+import threading
+from typing import Dict, List, Tuple
+
+from tools import utils
+from tools.task_cancel import cancellable
+
+ROW_INDEX_DIR_NAME = ".row_index"
+ROW_INDEX_STRIDE = 1000
+# Bytes before the indexed end kept to detect a file rewritten rather than appended to
+_TAIL_SIZE = 64
+
+
+class RowOffsetIndex:
+    """
+    Sparse record offsets of one JSONL or CSV file
+    """
+
+    def __init__(self, file_path: pathlib.Path, stride: int = ROW_INDEX_STRIDE):
+        """
+        Args:
+            file_path: The JSONL or CSV file
+            stride: Number of records between two indexed offsets
+        """
+        self.file_path = pathlib.Path(file_path)
+        self.stride = stride
+        self.is_csv = self.file_path.suffix.lower() == ".csv"
+        self.sidecar_path = self.file_path.parent / ROW_INDEX_DIR_NAME / f"{self.file_path.name}.json"
+        self.offsets: List[int] = []
+        self.record_count = 0
+        # Byte where indexing stopped, always a record boundary, a record being written is left for later
+        self.indexed_size = 0
+        self._tail = ""
+        self._loaded = False
+        # The data API refreshes and reads from several worker threads
+        self.lock = threading.Lock()
+
+    def _reset(self):
+        self.offsets = []
+        self.record_count = 0
+        self.indexed_size = 0
+        self._tail = ""
+
+    def _load(self):
+        self._loaded = True
+        if not self.sidecar_path.exists():
+            return
+        try:
+            with open(self.sidecar_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("stride") != self.stride:
+                return
+            self.offsets = state["offsets"]
+            self.record_count = state["record_count"]
+            self.indexed_size = state["indexed_size"]
+            self._tail = state["tail"]
+        except (OSError, ValueError, KeyError) as e:
+            utils.logger.warning(f"[RowOffsetIndex] Ignore unreadable index {self.sidecar_path}: {e}")
+            self._reset()
+
+    def _save(self):
+        state = {
+            "stride": self.stride,
+            "offsets": self.offsets,
+            "record_count": self.record_count,
+            "indexed_size": self.indexed_size,
+            "tail": self._tail,
+        }
+        try:
+            self.sidecar_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.sidecar_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.sidecar_path)
+        except OSError as e:
+            # The index is rebuilt on the next read, a failed save only costs a scan
+            utils.logger.warning(f"[RowOffsetIndex] Skip saving {self.sidecar_path}: {e}")
+
+    def _read_tail(self, f) -> str:
+        start = max(self.indexed_size - _TAIL_SIZE, 0)
+        f.seek(start)
+        return f.read(self.indexed_size - start).hex()
+
+    def refresh(self) -> "RowOffsetIndex":
+        """
+        Index the records appended since the last refresh, from scratch when the file was rewritten
+        """
+        with self.lock:
+            if not self._loaded:
+                self._load()
+            size = self.file_path.stat().st_size
+            with open(self.file_path, "rb") as f:
+                if size < self.indexed_size or (self.indexed_size and self._read_tail(f) != self._tail):
+                    self._reset()
+                indexed_before = self.indexed_size
+                try:
+                    self._scan(f)
+                finally:
+                    # A cancelled scan keeps what it indexed, the next refresh goes on from there
+                    if self.indexed_size != indexed_before:
+                        self._tail = self._read_tail(f)
+                        self._save()
+        return self
+
+    def _scan(self, f):
+        """
+        Walk the complete records from indexed_size, a CSV record ends at a newline outside quotes
+        """
+        f.seek(self.indexed_size)
+        position = self.indexed_size
+        # The CSV header is the first record of the file but not a data record
+        header_pending = self.is_csv and self.indexed_size == 0
+        record_start = None
+        quotes = 0
+        for line in cancellable(f):
+            if not line.endswith(b"\n"):
+                break
+            line_start = position
+            position += len(line)
+            if record_start is None:
+                if not line.strip():
+                    if not header_pending:
+                        self.indexed_size = position
+                    continue
+                record_start = line_start
+            if self.is_csv:
+                # Escaped quotes come in pairs, the parity tells whether the newline is inside a field
+                quotes += line.count(b'"')
+                if quotes % 2:
+                    continue
+            if header_pending:
+                header_pending = False
+            else:
+                if self.record_count % self.stride == 0:
+                    self.offsets.append(record_start)
+                self.record_count += 1
+            record_start = None
+            quotes = 0
+            self.indexed_size = position
+
+    def locate(self, record: int) -> Tuple[int, int]:
+        """
+        Where to start reading a record
+        Args:
+            record: Zero-based record number, lower than record_count
+
+        Returns:
+            (byte offset of an indexed record, number of records to skip from it)
+        """
+        block = record // self.stride
+        with self.lock:
+            return self.offsets[block], record - block * self.stride
+
+
+# resolved file path -> index
+_row_offset_indexes: Dict[str, RowOffsetIndex] = {}
+_row_offset_indexes_lock = threading.Lock()
+
+
+def get_row_offset_index(file_path: pathlib.Path) -> RowOffsetIndex:
+    """
+    Get the row offset index of a file, shared by the whole process
+    """
+    key = os.path.abspath(file_path)
+    with _row_offset_indexes_lock:
+        index = _row_offset_indexes.get(key)
+        if index is None:
+            index = RowOffsetIndex(pathlib.Path(file_path))
+            _row_offset_indexes[key] = index
+    return index
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 relakkes@gmail.com
+#
+# This file is part of MediaCrawler project.
+# Repository: https://github.com/NanmiCoder/MediaCrawler/blob/main/tools/task_cancel.py
+# GitHub: https://github.com/NanmiCoder
+# Licensed under NON-COMMERCIAL LEARNING LICENSE 1.1
+#
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+"""
+Task Cancel
+Cooperative cancellation of blocking work running in a worker thread. A thread cannot be
+interrupted, so long file scans call check_cancelled between records and stop by raising
+TaskCancelled once the event of the running task is set
+"""
+
+import threading
+from contextvars import ContextVar
+from typing import Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Cancel event of the task running in the current thread, None outside a cancellable task
+cancel_event_var: ContextVar[Optional[threading.Event]] = ContextVar("cancel_event", default=None)
+
+# Items between two checks in cancellable(), keeps the check out of the per-record cost
+CANCEL_CHECK_INTERVAL = 4096
+
+
+class TaskCancelled(Exception):
+    """The task was cancelled (timeout or client gone) while running"""
+
+
+def check_cancelled():
+    event = cancel_event_var.get()
+    if event is not None and event.is_set():
+        raise TaskCancelled()
+
+
+def cancellable(iterable: Iterable[T], interval: int = CANCEL_CHECK_INTERVAL) -> Iterator[T]:
+    """
+    Yield from iterable, checking for cancellation every interval items
+    """
+    for i, item in enumerate(iterable):
+        if i % interval == 0:
+            check_cancelled()
+        yield item